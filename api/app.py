@@ -0,0 +1,250 @@
+"""
+KPI HTTP API (WSGI)
+===================
+Könnyűsúlyú, csak olvasó HTTP szolgáltatás a gyári eszközök (MES képernyők,
+Excel lekérdezések) számára, hogy ne a Streamlit oldalt kelljen kiolvasniuk.
+A ui/data_loader lekérdezéseit használja, külső webes keretrendszer nélkül
+(standard WSGI alkalmazás, bármely WSGI szerverrel futtatható).
+
+Végpontok (mind GET):
+- /api/machines                                   gépek listája
+- /api/summaries?machine=&start=&end=&format=     napi összesítők (JSON / CSV, darabolt válasz)
+- /api/events?machine=&start=&end=&format=        termelési események (JSON / CSV, darabolt válasz)
+- /api/trends?machine=&end=&days=                 KPI trendek (30 / 90 / 365 / all)
+- /api/pareto?machine=&date=&days=                leállási okok Pareto (JSON / CSV)
+
+Gyorsítótárazás: az ETag az érintett (gép, dátumtartomány) adatverziójából és a kérés
+paramétereiből képződik, így a változatlan adatra If-None-Match esetén 304 a válasz,
+lekérdezés nélkül.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from ui import data_loader
+
+logger = logging.getLogger(__name__)
+
+JSON_TYPE = "application/json; charset=utf-8"
+CSV_TYPE = "text/csv; charset=utf-8"
+
+HTTP_STATUS = {200: "200 OK", 304: "304 Not Modified", 400: "400 Bad Request",
+               404: "404 Not Found", 405: "405 Method Not Allowed", 500: "500 Internal Server Error"}
+
+# A trend végpont megengedett időszakai (None = teljes történet)
+TREND_DAYS = {"30": 30, "90": 90, "365": 365, "all": None}
+
+class ApiError(Exception):
+    """Kliens oldali hiba (hibás paraméter, ismeretlen végpont), a megadott HTTP státusszal."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Request:
+    """A WSGI környezet lekérdezési paramétereinek típusos elérése."""
+
+    def __init__(self, environ: Dict[str, Any]) -> None:
+        self.method = environ.get("REQUEST_METHOD", "GET")
+        self.path = environ.get("PATH_INFO", "/").rstrip("/") or "/"
+        self.params = {k: v[-1] for k, v in parse_qs(environ.get("QUERY_STRING", "")).items()}
+        self.if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Szöveges paraméter (hiányzó esetén az alapértelmezett)."""
+        return self.params.get(name, default)
+
+    def get_date(self, name: str, default: Optional[date] = None) -> date:
+        """Dátum paraméter (ÉÉÉÉ-HH-NN); hiányzó kötelező vagy hibás érték esetén 400."""
+        value = self.params.get(name)
+        if value is None:
+            if default is None:
+                raise ApiError(400, f"Hiányzó paraméter: {name}")
+            return default
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ApiError(400, f"Hibás dátum ({name}): {value}")
+
+    def get_int(self, name: str, default: int, allowed: Iterable[int]) -> int:
+        """Egész paraméter a megengedett értékek közül."""
+        value = self.params.get(name)
+        if value is None:
+            return default
+        if not value.isdigit() or int(value) not in allowed:
+            raise ApiError(400, f"Hibás érték ({name}): {value}")
+        return int(value)
+
+    def get_format(self) -> str:
+        """Válaszformátum: json (alapértelmezett) vagy csv."""
+        fmt = self.params.get("format", "json")
+        if fmt not in ("json", "csv"):
+            raise ApiError(400, f"Ismeretlen formátum: {fmt}")
+        return fmt
+
+    def date_range(self) -> Tuple[date, date]:
+        """A start / end paraméterpár (end alapértelmezetten a start)."""
+        start = self.get_date("start")
+        end = self.get_date("end", start)
+        if end < start:
+            raise ApiError(400, "A kezdő dátum nem lehet nagyobb a zárónál!")
+        return start, end
+
+    def etag(self, version: Any) -> str:
+        """Erős ETag a végpontból, a rendezett paraméterekből és az adatverzióból."""
+        key = f"{self.path}?{sorted(self.params.items())}|{version}"
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + '"'
+
+    def matches(self, etag: str) -> bool:
+        """Az If-None-Match fejléc tartalmazza-e az ETag-et (gyenge összevetéssel)."""
+        tags = [t.strip().removeprefix("W/") for t in self.if_none_match.split(",") if t.strip()]
+        return "*" in tags or etag in tags
+
+# --- VÁLASZ TÖRZSEK ---
+
+def _frame_json(df: pd.DataFrame) -> str:
+    """DataFrame rekordlistaként (ISO dátumokkal)."""
+    return df.to_json(orient="records", date_format="iso", force_ascii=False)
+
+def stream_json(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """DataFrame darabok egyetlen JSON tömbként, darabonként kiírva."""
+    yield b"["
+    first = True
+    for chunk in frames:
+        records = _frame_json(chunk)[1:-1]
+        if not records:
+            continue
+        yield (records if first else "," + records).encode("utf-8")
+        first = False
+    yield b"]"
+
+def stream_csv(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """DataFrame darabok egyetlen CSV-ként (fejléc csak az első darabnál)."""
+    header = True
+    for chunk in frames:
+        yield chunk.to_csv(index=False, header=header, date_format="%Y-%m-%dT%H:%M:%S").encode("utf-8")
+        header = False
+
+# --- ALKALMAZÁS ---
+
+Handler = Callable[[Request], Tuple[Any, Callable[[], Any]]]
+
+class KpiApi:
+    """
+    WSGI alkalmazás. Minden végpont két részből áll: az ETag alapjául szolgáló verzióból
+    (olcsó lekérdezés) és a válasz előállításából, amely csak ETag eltérés esetén fut le.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Handler] = {
+            "/api/machines": self.machines,
+            "/api/summaries": self.summaries,
+            "/api/events": self.events,
+            "/api/trends": self.trends,
+            "/api/pareto": self.pareto,
+        }
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        request = Request(environ)
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise ApiError(405, f"Nem támogatott metódus: {request.method}")
+            handler = self.routes.get(request.path)
+            if handler is None:
+                raise ApiError(404, f"Ismeretlen végpont: {request.path}")
+
+            version, build = handler(request)
+            etag = request.etag(version)
+            headers = [("ETag", etag), ("Cache-Control", "no-cache")]
+            if request.matches(etag):
+                start_response(HTTP_STATUS[304], headers)
+                return []
+
+            content_type, body = build()
+            start_response(HTTP_STATUS[200], [("Content-Type", content_type), *headers])
+            if request.method == "HEAD":
+                return []
+            return [body] if isinstance(body, bytes) else body
+        except ApiError as e:
+            return self._error(start_response, e.status, e.message)
+        except Exception as e:
+            logger.error(f"API hiba | {request.path}: {str(e)}")
+            return self._error(start_response, 500, "Belső hiba")
+
+    @staticmethod
+    def _error(start_response: Callable, status: int, message: str) -> List[bytes]:
+        start_response(HTTP_STATUS[status], [("Content-Type", JSON_TYPE)])
+        return [json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")]
+
+    @staticmethod
+    def _frames_body(request: Request, frames: Callable[[], Iterable[pd.DataFrame]]) -> Callable[[], Tuple[str, Iterable[bytes]]]:
+        """Darabolt (streamelt) válasz a kért formátumban."""
+        fmt = request.get_format()
+        if fmt == "csv":
+            return lambda: (CSV_TYPE, stream_csv(frames()))
+        return lambda: (JSON_TYPE, stream_json(frames()))
+
+    @staticmethod
+    def _frame_body(request: Request, frame: Callable[[], pd.DataFrame]) -> Callable[[], Tuple[str, bytes]]:
+        """Egyben előállított (kis méretű) táblázatos válasz a kért formátumban."""
+        fmt = request.get_format()
+        if fmt == "csv":
+            return lambda: (CSV_TYPE, frame().to_csv(index=False).encode("utf-8"))
+        return lambda: (JSON_TYPE, _frame_json(frame()).encode("utf-8"))
+
+    # --- VÉGPONTOK ---
+
+    def machines(self, request: Request):
+        """Gépek listája (törzsadat: az ETag a tartalomból képződik)."""
+        body = json.dumps([m.model_dump() for m in data_loader.load_machines()], ensure_ascii=False).encode("utf-8")
+        return hashlib.sha1(body).hexdigest(), lambda: (JSON_TYPE, body)
+
+    def summaries(self, request: Request):
+        """Napi összesítők egy dátumtartományra (opcionálisan egy gépre)."""
+        machine_id = request.get("machine")
+        start, end = request.date_range()
+        version = data_loader.get_data_version(machine_id, start, end)
+        return version, self._frames_body(request, lambda: data_loader.iter_daily_summary_frames(machine_id, start, end))
+
+    def events(self, request: Request):
+        """Termelési események egy dátumtartományra (opcionálisan egy gépre)."""
+        machine_id = request.get("machine")
+        start, end = request.date_range()
+        version = data_loader.get_data_version(machine_id, start, end)
+        return version, self._frames_body(request, lambda: data_loader.iter_events_frames(machine_id, start, end))
+
+    def trends(self, request: Request):
+        """KPI trendek 30 / 90 / 365 napra vagy a teljes történetre, automatikus felbontással."""
+        machine_id = self._require_machine(request)
+        end = request.get_date("end", date.today())
+        days_param = request.get("days", "30")
+        if days_param not in TREND_DAYS:
+            raise ApiError(400, f"Hibás érték (days): {days_param}")
+        days = TREND_DAYS[days_param]
+        # Heti / havi felbontásnál az első időszak a kezdőnap előtt indulhat (lásd ui.cache)
+        version = data_loader.get_data_version(machine_id, end - timedelta(days=days + 31) if days else None, end)
+        return version, self._frame_body(request, lambda: data_loader.get_kpi_trend(machine_id, end, days))
+
+    def pareto(self, request: Request):
+        """A leggyakoribb leállási okok az utolsó X napra."""
+        machine_id = self._require_machine(request)
+        target = request.get_date("date", date.today())
+        days = request.get_int("days", 30, allowed=(7, 30, 90))
+        version = data_loader.get_data_version(machine_id, target - timedelta(days=days), None)
+        return version, self._frame_body(request, lambda: data_loader.get_pareto_data(machine_id, target, days))
+
+    @staticmethod
+    def _require_machine(request: Request) -> str:
+        machine_id = request.get("machine")
+        if not machine_id:
+            raise ApiError(400, "Hiányzó paraméter: machine")
+        return machine_id
+
+application = KpiApi()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+DASHBOARD IMPORTIDŐ MÉRÉSE
+==========================
+A ui/app.py modulszintű importjainak betöltési ideje friss Python folyamatban
+(`python -X importtime`), vagyis az első oldalmegjelenítés előtti fix költség
+egy konténer újraindítása után. Az importlistát a ui/app.py forrásából olvassa
+ki, így mindig az aktuális állapotot méri.
+
+Ellenőrzi azt is, hogy a csak első használatkor szükséges alrendszerek
+(ReportLab, Pipeline, MES kinyerők) ne töltődjenek be induláskor.
+
+Használat:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --runs 5 --top 20 --json import_time.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+APP_PATH = project_root / "ui" / "app.py"
+
+# Ezek a modulok csak első használatkor töltődhetnek be
+LAZY_MODULES = ["reportlab", "ui.pdf_export", "src.pipeline", "src.extractors.events_extractor", "openpyxl"]
+
+def app_import_code() -> str:
+    """A ui/app.py modulszintű import utasításai (a sys.path módosítással együtt futtatható kódként)."""
+    tree = ast.parse(APP_PATH.read_text(encoding="utf-8"))
+    lines = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(lines)
+
+def parse_importtime(stderr: str) -> tuple:
+    """
+    A -X importtime kimenetének feldolgozása.
+
+    Returns:
+        Tuple: (legfelső szintű importok összideje µs-ban, modulonkénti kumulált idő µs-ban)
+    """
+    total, timings = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, raw_name = line.split("|", 2)
+        name = raw_name.strip()
+        # A behúzás a beágyazott importokat jelzi; csak a legfelső szint adódik össze
+        if len(raw_name) - len(raw_name.lstrip()) == 1:
+            total += int(cumulative_us)
+        timings[name] = max(timings.get(name, 0), int(cumulative_us))
+    return total, timings
+
+def measure_once(code: str) -> tuple:
+    """
+    Egy mérés friss folyamatban (az üres értelmező indulási importjai nélkül).
+
+    Returns:
+        Tuple: (összidő ms-ban, modulonkénti kumulált idő µs-ban, a betöltött lusta modulok listája)
+    """
+    probe = code + f"\nimport sys, json\nprint(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    env = {**os.environ, "PYTHONPATH": str(project_root)}
+
+    def run(source: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", source],
+            cwd=project_root, env=env, capture_output=True, text=True, check=True
+        )
+
+    baseline_total, baseline = parse_importtime(run("import sys, json").stderr)
+    proc = run(probe)
+    total, timings = parse_importtime(proc.stderr)
+    timings = {name: us for name, us in timings.items() if name not in baseline}
+    return (total - baseline_total) / 1000, timings, json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="A Dashboard modulszintű importjainak mérése")
+    parser.add_argument("--runs", type=int, default=3, help="Mérések száma (a medián számít)")
+    parser.add_argument("--top", type=int, default=15, help="A leglassabb modulok listájának hossza")
+    parser.add_argument("--json", type=Path, help="Eredmény mentése JSON fájlba (benchmark követéshez)")
+    args = parser.parse_args()
+
+    code = app_import_code()
+    runs = [measure_once(code) for _ in range(args.runs)]
+    totals = [total for total, _, _ in runs]
+    _, timings, loaded_lazy = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print("\nEcoPaper Solutions - Dashboard importidő")
+    print("-" * 60)
+    print(f"Összes importidő (medián, {args.runs} futás): {statistics.median(totals):.0f} ms")
+    print(f"\n{'Modul':<45} | {'Kumulált (ms)':>12}")
+    for name, cumulative in slowest:
+        print(f"{name:<45} | {cumulative / 1000:>12.1f}")
+
+    print("\nLusta betöltésű alrendszerek induláskor:")
+    for module in LAZY_MODULES:
+        print(f"  {module:<40} {'BETÖLTVE' if module in loaded_lazy else 'nincs betöltve'}")
+    print("-" * 60 + "\n")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "total_ms": round(statistics.median(totals), 1),
+            "runs_ms": [round(t, 1) for t in totals],
+            "slowest": [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in slowest],
+            "lazy_loaded_at_startup": loaded_lazy,
+        }, indent=2), encoding="utf-8")
+        print(f"Eredmény mentve: {args.json}")
+
+    if loaded_lazy:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
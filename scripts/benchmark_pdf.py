@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+PDF JELENTÉS MÉRÉSE
+===================
+A napi PDF jelentés készítésének jelentésenkénti futásideje szintetikus
+bemeneteken (egy napnyi, percenkénti esemény, minőségi mérések, összesítő).
+
+- Egyedi: az első (hideg) jelentés, amely a betűtípusokat és a sablont is
+  felépíti, majd a további (meleg) jelentések.
+- Köteg: egymás utáni jelentések a megosztott sablonnal.
+- Sablon: a ReportTemplate felépítésének ideje, amelyet korábban minden
+  jelentés megfizetett (stíluslap, stílusok, logó beolvasása és lemérése).
+- Melléklet (--appendix-days): jelentés fájlba, az adott számú nap percenkénti
+  eseményeit tartalmazó melléklettel; futásidő, fájlméret és a felépítés
+  memóriacsúcsa (tracemalloc) napszámonként. A memóriacsúcs a napok
+  számával csak a kész oldalak tömörített tartalmával nő.
+
+Használat:
+    python scripts/benchmark_pdf.py
+    python scripts/benchmark_pdf.py --events 5000 --batch 50
+    python scripts/benchmark_pdf.py --appendix-days 1 7 31
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import DailySummary, ProductionEvent, QualityMeasurement
+
+ARTICLES = {"A100": "Termék A", "B200": "Termék B", "C300": "Termék C"}
+STOP_REASONS = ["Szitacsere", "Filccsere", None, "Áramszünet"]
+
+def make_inputs(n_events: int, seed: int = 42) -> Tuple[DailySummary, List[ProductionEvent], List[QualityMeasurement]]:
+    """Egy napnyi szintetikus bemenet (összesítő, események, minőségi mérések)."""
+    rng = np.random.default_rng(seed)
+    day_start = datetime(2024, 1, 1)
+    step = 86400 // n_events
+    kinds = rng.choice(["RUN", "RUN", "RUN", "RUN", "STOP", "BREAK"], n_events)
+    article_ids = list(ARTICLES)
+    events = [
+        ProductionEvent(
+            timestamp=day_start + timedelta(seconds=i * step), duration_seconds=step,
+            event_type=kind, status="GOOD" if rng.random() > 0.05 else "SCRAP",
+            weight_kg=float(rng.uniform(50, 150)) if kind == "RUN" else 0.0,
+            average_speed=float(rng.uniform(800, 1000)) if kind == "RUN" else 0.0,
+            machine_id="PM1", article_id=article_ids[(i * len(article_ids)) // n_events],
+            description=STOP_REASONS[i % len(STOP_REASONS)] if kind != "RUN" else None
+        )
+        for i, kind in enumerate(kinds)
+    ]
+    quality = [
+        QualityMeasurement(
+            timestamp=day_start + timedelta(hours=h), machine_id="PM1", article_id=article_ids[h * len(article_ids) // 24],
+            moisture_pct=float(rng.uniform(6, 8)), gsm_measured=float(rng.uniform(78, 82)), strength_knm=float(rng.uniform(4, 6))
+        )
+        for h in range(0, 24, 2)
+    ]
+    summary = DailySummary(
+        date=day_start.date(), machine_id="PM1", oee_pct=81.2, availability_pct=91.0, performance_pct=93.5,
+        quality_pct=95.4, total_tons=120.0, good_tons=114.5, scrap_tons=5.5, target_tons=130.0,
+        total_downtime_min=130.0, break_count=4, avg_speed_m_min=905.0, spec_electricity_kwh_t=480.0,
+        spec_water_m3_t=9.5, spec_steam_t_t=1.6, spec_fiber_t_t=1.05
+    )
+    return summary, events, quality
+
+def run_reports(count: int, inputs: Tuple) -> List[float]:
+    """count darab jelentés egymás után; jelentésenkénti futásidők milliszekundumban."""
+    from ui.pdf_export import generate_pdf_report
+
+    summary, events, quality = inputs
+    timings = []
+    for i in range(count):
+        t0 = time.perf_counter()
+        generate_pdf_report("PM1", date(2024, 1, 1) + timedelta(days=i), summary, events, quality=quality, article_names=ARTICLES)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+def build_templates(count: int) -> List[float]:
+    """A sablon felépítésének ideje milliszekundumban (a betűtípusok már regisztrálva)."""
+    from ui.pdf_export import ReportTemplate
+
+    timings = []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        ReportTemplate()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+def appendix_frames(days: int, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """days napnyi percenkénti esemény DataFrame darabokban (mint a data_loader.iter_events_frames)."""
+    rng = np.random.default_rng(7)
+    total = days * 1440
+    for start in range(0, total, chunk_size):
+        n = min(chunk_size, total - start)
+        kinds = rng.choice(["RUN", "RUN", "RUN", "STOP"], n)
+        yield pd.DataFrame({
+            "timestamp": pd.date_range(datetime(2024, 1, 1) + timedelta(minutes=start), periods=n, freq="min"),
+            "duration_seconds": 60, "event_type": kinds, "status": "GOOD",
+            "weight_kg": np.where(kinds == "RUN", rng.uniform(50, 150, n), 0.0),
+            "average_speed": np.where(kinds == "RUN", rng.uniform(800, 1000, n), 0.0),
+            "article_id": rng.choice(list(ARTICLES), n),
+            "description": np.where(kinds == "STOP", "Szitacsere", None),
+        })
+
+def run_appendix(days: int, inputs: Tuple) -> Tuple[float, float, int]:
+    """Jelentés fájlba days napnyi melléklettel; (futásidő ms, memóriacsúcs MB, fájlméret bájt)."""
+    from ui.pdf_export import generate_pdf_report
+
+    summary, events, quality = inputs
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        path = generate_pdf_report("PM1", date(2024, 1, 1), summary, events, quality=quality, article_names=ARTICLES,
+                                   appendix=(appendix_frames(days), iter([])), output_path=Path(tmp) / "report.pdf")
+        elapsed = (time.perf_counter() - t0) * 1000
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        return elapsed, peak, path.stat().st_size
+
+def describe(label: str, timings: List[float]) -> None:
+    """Egy mérési sor kiírása (átlag, medián, p95, összesen)."""
+    p95 = float(np.percentile(timings, 95))
+    print(f"{label:<32} | {len(timings):>5} | {statistics.mean(timings):>9.1f} | {statistics.median(timings):>10.1f} "
+          f"| {p95:>8.1f} | {sum(timings) / 1000:>9.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PDF jelentéskészítés futásidejének mérése")
+    parser.add_argument("--events", type=int, default=1440, help="Események száma jelentésenként")
+    parser.add_argument("--batch", type=int, default=20, help="Jelentések száma a kötegelt mérésben")
+    parser.add_argument("--appendix-days", type=int, nargs="*", default=[], help="Melléklet mérése ennyi napnyi eseménnyel")
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.events)
+
+    print("\nEcoPaper Solutions - PDF jelentés mérése")
+    print("-" * 88)
+    print(f"{'Mérés':<32} | {'Db':>5} | {'Átlag (ms)':>9} | {'Medián (ms)':>10} | {'p95 (ms)':>8} | {'Össz. (mp)':>9}")
+
+    t0 = time.perf_counter()
+    import ui.pdf_export  # noqa: F401  (a ReportLab betöltése ne a hideg jelentéshez számítson)
+    import_ms = (time.perf_counter() - t0) * 1000
+
+    describe("Egyedi, hideg (első jelentés)", run_reports(1, inputs))
+    describe("Egyedi, meleg", run_reports(5, inputs))
+    describe("Köteg, megosztott sablon", run_reports(args.batch, inputs))
+    describe("Sablon felépítése", build_templates(args.batch))
+
+    print("-" * 88)
+    print(f"Modul betöltése: {import_ms:.0f} ms | események jelentésenként: {args.events}\n")
+
+    if args.appendix_days:
+        # A tracemalloc lassítja a futást; az idők egymáshoz viszonyítva értelmezendők
+        print(f"{'Melléklet (nap)':<16} | {'Idő (ms)':>9} | {'Memóriacsúcs (MB)':>17} | {'Fájl (kB)':>9}")
+        for days in args.appendix_days:
+            elapsed, peak, size = run_appendix(days, inputs)
+            print(f"{days:<16} | {elapsed:>9.0f} | {peak:>17.1f} | {size / 1024:>9.0f}")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+SZAKASZ-ÖSSZEVONÁS MÉRÉSE
+=========================
+Az idővonal szakasz-összevonásának futásideje szintetikus eseményeken
+(10 ezer és 100 ezer esemény). A korábbi, soronkénti (iloc) ciklus
+referenciaként csak a kisebb méreten fut, mert nagy méreten percekig tartana.
+
+Használat:
+    python scripts/benchmark_segments.py
+    python scripts/benchmark_segments.py --sizes 10000 100000 1000000 --legacy
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.segments import run_length_segments, state_durations
+
+STATES = ["GOOD", "GOOD", "GOOD", "SCRAP", "STOP", "BREAK"]
+ARTICLES = ["Termék A", "Termék B", "Termék C"]
+
+def make_events(n: int, seed: int = 42) -> pd.DataFrame:
+    """Időrendbe rendezett, 60 mp-es szintetikus események hosszabb azonos állapotú blokkokkal."""
+    rng = np.random.default_rng(seed)
+    # Átlagosan ~8 egymást követő esemény azonos állapotban
+    block_ids = np.cumsum(rng.random(n) < 0.125)
+    states = np.array(STATES)[rng.integers(0, len(STATES), block_ids.max() + 1)][block_ids]
+    articles = np.array(ARTICLES)[(np.arange(n) // 2000) % len(ARTICLES)]
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(n) * 60, unit="s")
+    return pd.DataFrame({
+        "Kezdet": start,
+        "Vége": start + pd.Timedelta(seconds=60),
+        "Állapot": states,
+        "Termék": articles,
+    })
+
+def legacy_segments(df: pd.DataFrame) -> pd.DataFrame:
+    """A korábbi, soronkénti összevonás (összehasonlításhoz)."""
+    merged = []
+    current = df.iloc[0].to_dict()
+    for i in range(1, len(df)):
+        row = df.iloc[i]
+        if row["Állapot"] == current["Állapot"] and row["Termék"] == current["Termék"]:
+            current["Vége"] = row["Vége"]
+        else:
+            merged.append(current)
+            current = row.to_dict()
+    merged.append(current)
+    return pd.DataFrame(merged)
+
+def timed(func, *args) -> tuple:
+    """Egy hívás futásideje milliszekundumban és az eredmény."""
+    t0 = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - t0) * 1000, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Szakasz-összevonás futásidejének mérése")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Eseményszámok")
+    parser.add_argument("--legacy", action="store_true", help="A soronkénti ciklus minden méreten fusson")
+    args = parser.parse_args()
+
+    print("\nEcoPaper Solutions - Szakasz-összevonás mérése")
+    print("-" * 70)
+    print(f"{'Események':>10} | {'Szakaszok':>9} | {'Vektoros (ms)':>13} | {'Összesítés (ms)':>15} | {'Ciklus (ms)':>11}")
+
+    for n in args.sizes:
+        df = make_events(n)
+        seg_ms, segments = timed(run_length_segments, df, ["Állapot", "Termék"], "Kezdet", "Vége")
+        agg_ms, _ = timed(state_durations, segments, "Állapot", "Kezdet", "Vége")
+
+        legacy = "-"
+        if args.legacy or n <= 10_000:
+            legacy_ms, reference = timed(legacy_segments, df)
+            if len(reference) != len(segments):
+                raise SystemExit(f"Eltérő eredmény: {len(reference)} != {len(segments)} szakasz")
+            legacy = f"{legacy_ms:.1f}"
+
+        print(f"{n:>10} | {len(segments):>9} | {seg_ms:>13.1f} | {agg_ms:>15.1f} | {legacy:>11}")
+
+    print("-" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+EGYEDI JELENTÉS MELLÉKLETTEL
+============================
+Egy gép napi, heti vagy havi PDF jelentése közvetlenül fájlba, opcionálisan
+a teljes eseménynaplót és labor méréseket tartalmazó melléklettel. A melléklet
+sorai darabokban érkeznek az adatbázisból és oldalnyi táblázatokként íródnak,
+így egy havi melléklet sem tartja a memóriában a teljes eseménylistát.
+
+Használat:
+    python scripts/build_report.py --machine PM1 --date 2024-01-15
+    python scripts/build_report.py --machine PM1 --date 2024-01-15 --period month --appendix --output havi.pdf
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.logging_config import setup_logging
+from src.config import settings
+from src.transformers.rollups import period_start, period_end
+from ui import data_loader
+from ui.pdf_export import generate_pdf_report, generate_period_report
+
+def main() -> None:
+    """Egy jelentés elkészítése fájlba."""
+    parser = argparse.ArgumentParser(description="Napi / heti / havi PDF jelentés (opcionális teljes melléklettel)")
+    parser.add_argument("--machine", required=True, help="Gép azonosító")
+    parser.add_argument("--date", type=date.fromisoformat, required=True, help="A nap, illetve az időszak bármely napja (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--period", choices=["day", "week", "month"], default="day", help="Jelentés típusa")
+    parser.add_argument("--appendix", action="store_true", help="Melléklet minden eseménnyel és labor méréssel")
+    parser.add_argument("--output", type=Path, default=None, help="Kimeneti fájl (alapértelmezett: a kötegelt jelentések könyvtára)")
+    args = parser.parse_args()
+
+    setup_logging(settings.LOG_LEVEL)
+
+    if args.period == "day":
+        start_date = end_date = args.date
+    else:
+        start_date = period_start(args.date, args.period)
+        end_date = period_end(start_date, args.period)
+
+    suffix = "_full" if args.appendix else ""
+    kind = "" if args.period == "day" else f"{args.period}_"
+    output = args.output or settings.REPORT_BATCH_DIR / f"Report_{args.machine}_{kind}{start_date.isoformat()}{suffix}.pdf"
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    appendix = None
+    if args.appendix:
+        appendix = (
+            data_loader.iter_events_frames(args.machine, start_date, end_date),
+            data_loader.iter_quality_frames(args.machine, start_date, end_date),
+        )
+    article_names = data_loader.load_articles_map()
+
+    t0 = time.perf_counter()
+    if args.period == "day":
+        events, summary, quality = data_loader.get_daily_data(args.machine, args.date)
+        if not events:
+            raise SystemExit(f"Nincs adat: {args.machine} | {args.date}")
+        path = generate_pdf_report(args.machine, args.date, summary, events, quality=quality, article_names=article_names,
+                                   appendix=appendix, output_path=output)
+    else:
+        data = data_loader.get_period_report_data(args.machine, args.period, args.date)
+        if not data[1]:
+            raise SystemExit(f"Nincs napi összesítő: {args.machine} | {start_date} - {end_date}")
+        path = generate_period_report(args.machine, args.period, start_date, end_date, data, article_names=article_names,
+                                      appendix=appendix, output_path=output)
+
+    print(f"\nJelentés elkészült: {path} ({path.stat().st_size / 1024:.0f} kB, {time.perf_counter() - t0:.1f} mp)\n")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Létrehozza a teszteléshez szükséges Excel fájlokat havi bontásban (plannin
 Realisztikus, ipari adatokkal tölti fel a rendszert a demózáshoz.
 """
 
+import argparse
 import sys
 import random
 from pathlib import Path
@@ -108,8 +109,8 @@ def create_lab_data() -> None:
     """Laboratóriumi adatok generálása."""
     print("Minőségi adatok (lab_data) generálása...")
     
-    data: Dict[str, List[Any]] = {
-        'Timestamp': [], 'Machine': [], 'Article': [], 'Moisture_%': [], 'GSM': [], 'Strength_kNm': []
+    samples: Dict[str, List[Any]] = {
+        'Timestamp': [], 'Machine': [], 'Fallback': [], 'Moisture_f': [], 'GSM_f': [], 'Strength_f': []
     }
     
     start_dt = datetime.combine(START_DATE, datetime.min.time())
@@ -120,27 +121,47 @@ def create_lab_data() -> None:
     
     events_df['timestamp'] = pd.to_datetime(events_df['timestamp'])
     events_df.sort_values('timestamp', inplace=True)
+    first_run = events_df.groupby('machine_id')['timestamp'].min()
     
+    # A véletlen sorsolások sorrendje napi / gépi / 2 órás bontásban változatlan (azonos seed = azonos kimenet);
+    # cikk sorsolás csak a gép első RUN eseménye előtti mintáknál történik
     for day in range(NUM_DAYS + 1):
         for machine in MACHINES:
-            machine_events = events_df[events_df['machine_id'] == machine]
+            first = first_run.get(machine)
             
             for hour in range(0, 24, 2):
                 timestamp = start_dt + timedelta(days=day, hours=hour, minutes=random.randint(0, 10))
-                past_events = machine_events[machine_events['timestamp'] <= timestamp]
-                if not past_events.empty:
-                    article = past_events.iloc[-1]['article_id']
+                if first is None or timestamp < first:
+                    fallback = random.choice(list(ARTICLE_QUALITY.keys()))
                 else:
-                    article = random.choice(list(ARTICLE_QUALITY.keys()))
-                
-                specs = ARTICLE_QUALITY[article]
+                    fallback = None
                 
-                data['Timestamp'].append(timestamp)
-                data['Machine'].append(machine)
-                data['Article'].append(article)
-                data['Moisture_%'].append(round(specs['moisture'] * random.uniform(0.95, 1.05), 1))
-                data['GSM'].append(round(specs['gsm'] * random.uniform(0.97, 1.03), 1))
-                data['Strength_kNm'].append(round(specs['strength'] * random.uniform(0.95, 1.05), 1))
+                samples['Timestamp'].append(timestamp)
+                samples['Machine'].append(machine)
+                samples['Fallback'].append(fallback)
+                samples['Moisture_f'].append(random.uniform(0.95, 1.05))
+                samples['GSM_f'].append(random.uniform(0.97, 1.03))
+                samples['Strength_f'].append(random.uniform(0.95, 1.05))
+    
+    df = pd.DataFrame(samples)
+    
+    # Mintánként a gép utolsó, legkésőbb a mintavételkor kezdődött RUN eseményének cikke (egyetlen as-of join)
+    matched = pd.merge_asof(
+        df[['Timestamp', 'Machine']].reset_index().sort_values('Timestamp', kind='stable'),
+        events_df[['timestamp', 'machine_id', 'article_id']],
+        left_on='Timestamp', right_on='timestamp', left_by='Machine', right_by='machine_id', direction='backward'
+    ).set_index('index')['article_id'].reindex(df.index)
+    articles = matched.astype(object).where(matched.notna(), df['Fallback'])
+    
+    specs = [ARTICLE_QUALITY[article] for article in articles]
+    data: Dict[str, List[Any]] = {
+        'Timestamp': df['Timestamp'],
+        'Machine': df['Machine'],
+        'Article': articles.tolist(),
+        'Moisture_%': [round(s['moisture'] * f, 1) for s, f in zip(specs, samples['Moisture_f'])],
+        'GSM': [round(s['gsm'] * f, 1) for s, f in zip(specs, samples['GSM_f'])],
+        'Strength_kNm': [round(s['strength'] * f, 1) for s, f in zip(specs, samples['Strength_f'])],
+    }
     
     df = pd.DataFrame(data).sort_values('Timestamp')
     save_by_year_month(df, 'lab_data', 'Timestamp', settings.LAB_DATA_DIR)
@@ -177,6 +198,15 @@ def create_utilities_data() -> None:
     save_by_year_month(df, 'utilities', 'Date', settings.UTILITIES_DIR)
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Minta adatok generálása (Excel + MES)")
+    parser.add_argument("--seed", type=int, default=None, help="Véletlenszám seed (megadva a teljes minta adatkészlet reprodukálható)")
+    args = parser.parse_args()
+    
+    simulator = ["python3", "scripts/simulate_events.py"]
+    if args.seed is not None:
+        random.seed(args.seed)
+        simulator += ["--seed", str(args.seed)]
+    
     settings.DATA_DIR.mkdir(exist_ok=True)
     settings.NETWORK_SHARE_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -186,7 +216,7 @@ def main() -> None:
     create_planning_data()
     
     print("\nTermelési folyamat szimulálása (MES events)...")
-    subprocess.run(["python3", "scripts/simulate_events.py"], check=True)
+    subprocess.run(simulator, check=True)
     
     create_lab_data()
     create_utilities_data()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+TÖMEGES ADATEXPORT INDÍTÓ
+=========================
+Termelési események vagy napi összesítők exportja Parquet / CSV fájlba,
+darabolt (streaming) lekérdezéssel, opcionális gzip / zstd tömörítéssel.
+
+Használat:
+    python scripts/export_data.py events --start 2024-01-01 --end 2024-03-31 --machine PM1
+    python scripts/export_data.py events --start 2024-01-01 --end 2024-12-31 --event-type STOP --event-type BREAK --format csv --compression gzip
+    python scripts/export_data.py summaries --start 2024-01-01 --end 2024-12-31 -o summaries_2024.parquet
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.logging_config import setup_logging
+from src.config import settings
+from src.exporter import Exporter, DATASETS, FORMATS, COMPRESSIONS, file_extension
+
+def main() -> None:
+    """Egy szűrt adatkör exportja fájlba."""
+    parser = argparse.ArgumentParser(description="Események / napi összesítők exportja Parquet vagy CSV fájlba")
+    parser.add_argument("dataset", choices=list(DATASETS), help="Az exportált adatkör")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="Első nap (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Utolsó nap (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--machine", default=None, help="Csak ezt a gépet exportálja")
+    parser.add_argument("--event-type", action="append", dest="event_types", help="Eseménytípus szűrés (ismételhető)")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Kimeneti formátum")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default=None, help="Tömörítés")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Darabonként lekérdezett sorok száma")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Kimeneti fájl (alapértelmezett: generált név)")
+    args = parser.parse_args()
+
+    setup_logging(settings.LOG_LEVEL)
+
+    output = args.output or Path(
+        f"{args.dataset}_{args.machine or 'all'}_{args.start}_{args.end}{file_extension(args.format, args.compression)}"
+    )
+
+    print("\nEcoPaper Solutions - Adatexport")
+    print("-" * 60)
+    t0 = time.perf_counter()
+    rows = Exporter(chunk_size=args.chunk_size).export(
+        args.dataset, output, args.start, args.end,
+        machine_id=args.machine, event_types=args.event_types,
+        fmt=args.format, compression=args.compression
+    )
+    print(f"Kész! {rows:,} sor -> {output} ({output.stat().st_size / 1024 / 1024:.1f} MB, {time.perf_counter() - t0:.1f} mp)")
+    print("-" * 60 + "\n")
+
+if __name__ == "__main__":
+    main()
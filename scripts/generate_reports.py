@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+KÖTEGELT NAPI JELENTÉSEK
+========================
+Napi PDF jelentések minden gépre (vagy a megadott gépekre) egy dátumtartományban,
+párhuzamos munkafolyamatokkal. A változatlan adatú, már elkészült jelentéseket
+a manifest alapján kihagyja, így a havi csomag újrafuttatása csak a frissült
+napokat készíti el.
+
+Használat:
+    python scripts/generate_reports.py --start 2024-01-01 --end 2024-01-31
+    python scripts/generate_reports.py --start 2024-01-01 --end 2024-01-31 --machine PM1 --workers 4 --force
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.logging_config import setup_logging
+from src.config import settings
+from ui.report_batch import BatchReportRunner
+
+def main() -> None:
+    """Napi jelentések kötegelt elkészítése."""
+    parser = argparse.ArgumentParser(description="Napi PDF jelentések kötegelt készítése")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="Első nap (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Utolsó nap (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--machine", action="append", dest="machines", help="Csak ez a gép (ismételhető)")
+    parser.add_argument("--output-dir", type=Path, default=None, help=f"Kimeneti könyvtár (alapértelmezett: {settings.REPORT_BATCH_DIR})")
+    parser.add_argument("--workers", type=int, default=None, help="Párhuzamos munkafolyamatok száma (alapértelmezett: CPU magok)")
+    parser.add_argument("--force", action="store_true", help="A változatlan jelentéseket is újra elkészíti")
+    args = parser.parse_args()
+
+    setup_logging(settings.LOG_LEVEL)
+
+    runner = BatchReportRunner(output_dir=args.output_dir, workers=args.workers)
+    print("\nEcoPaper Solutions - Kötegelt jelentéskészítés")
+    print("-" * 60)
+    t0 = time.perf_counter()
+    stats = runner.run(args.start, args.end, machine_ids=args.machines, force=args.force)
+    print(f"Időszak: {args.start} -> {args.end} | Kimenet: {runner.output_dir}")
+    print(f"Elkészült: {stats['rendered']} | Változatlan: {stats['skipped']} | Üres: {stats['empty']} | Hibás: {stats['failed']}")
+    print(f"Futásidő: {time.perf_counter() - t0:.1f} mp")
+    print("-" * 60 + "\n")
+
+if __name__ == "__main__":
+    main()
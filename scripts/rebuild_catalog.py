@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+ADATKATALÓGUS ÚJRAÉPÍTÉSE
+=========================
+Feltölti a szinkronizált napok (synced_days) és a gépenkénti statisztika
+(machine_data_stats) tábláit a meglévő eseményekből. Normál üzemben a pipeline
+karbantartja őket, erre a scriptre csak első telepítéskor van szükség.
+"""
+
+import sys
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import get_db
+from src.catalog import rebuild_catalog
+
+def main() -> None:
+    """A katalógus újraépítése minden gépre."""
+    print("\nEcoPaper Solutions - Adatkatalógus újraépítése")
+    print("-" * 50)
+    
+    with get_db() as db:
+        count = rebuild_catalog(db)
+    
+    print(f"Kész! {count} szinkronizált nap rögzítve.")
+    print("-" * 50 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+IDŐSZAKOS ÖSSZESÍTŐK ÚJRAÉPÍTÉSE
+================================
+Újraszámolja a heti, havi és éves összesítőket a napi összesítő táblából.
+Normál üzemben a pipeline inkrementálisan karbantartja őket, erre a scriptre
+csak első telepítéskor vagy séma-frissítés után van szükség.
+"""
+
+import sys
+from pathlib import Path
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import get_db
+from src.transformers.rollups import RollupCalculator
+
+def main() -> None:
+    """Az összesítők újraépítése minden gépre."""
+    print("\nEcoPaper Solutions - Időszakos összesítők újraépítése")
+    print("-" * 50)
+    
+    with get_db() as db:
+        count = RollupCalculator().rebuild(db)
+    
+    print(f"Kész! {count} napi összesítő feldolgozva.")
+    print("-" * 50 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+ADATEGYEZTETÉS (RECONCILIATION) INDÍTÓ
+======================================
+Összeveti a MES forrás és a riport adatbázis napi eseményszámait, és frissíti
+az elavult napok listáját. A --sync kapcsolóval az elavult napokat azonnal
+újra is szinkronizálja.
+
+Használat:
+    python scripts/reconcile.py --days 365 [--machine PM1] [--sync]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from datetime import date, timedelta
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.logging_config import setup_logging
+from src.config import settings
+from src.reconciliation import Reconciler
+from src.pipeline import Pipeline
+
+def main() -> None:
+    """Egyeztetés a megadott időszakra, opcionálisan az elavult napok újraszinkronizálásával."""
+    parser = argparse.ArgumentParser(description="MES forrás és riport adatbázis egyeztetése")
+    parser.add_argument("--days", type=int, default=365, help="Az egyeztetett időszak hossza napokban (mától visszafelé)")
+    parser.add_argument("--machine", default=None, help="Csak ezt a gépet egyezteti")
+    parser.add_argument("--sync", action="store_true", help="Az elavult napok újraszinkronizálása")
+    args = parser.parse_args()
+    
+    setup_logging(settings.LOG_LEVEL)
+    
+    print("\nEcoPaper Solutions - Adategyeztetés")
+    print("-" * 60)
+    
+    end_date = date.today()
+    start_date = end_date - timedelta(days=args.days - 1)
+    stale = Reconciler().reconcile(start_date, end_date, args.machine)
+    
+    print(f"Időszak: {start_date} -> {end_date}")
+    print(f"Elavult napok: {len(stale)}")
+    for machine_id, day, reason in stale[:20]:
+        print(f"  {machine_id} | {day} | {reason}")
+    if len(stale) > 20:
+        print(f"  ... és további {len(stale) - 20} nap")
+    
+    if args.sync and stale:
+        synced = Pipeline().run_stale_days(machine_id=args.machine)
+        print(f"Újraszinkronizálva: {synced} nap")
+    
+    print("-" * 60 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+KPI API INDÍTÁSA
+================
+A KPI HTTP API (api/app.py) futtatása a beépített WSGI szerverrel, szálanként
+egy kéréssel. Éles környezetben bármely WSGI szerver (pl. gunicorn
+"api.app:application") is használható.
+
+Használat:
+    python scripts/run_api.py --host 0.0.0.0 --port 8502
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIServer, make_server
+
+# Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.app import application
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI szerver, amely minden kérést külön szálon szolgál ki (egy hosszú export nem blokkol)."""
+    daemon_threads = True
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KPI HTTP API indítása")
+    parser.add_argument("--host", default="127.0.0.1", help="Figyelt cím (alapértelmezett: csak helyi)")
+    parser.add_argument("--port", type=int, default=8502, help="Port")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    with make_server(args.host, args.port, application, server_class=ThreadingWSGIServer) as server:
+        print(f"\nEcoPaper Solutions - KPI API: http://{args.host}:{args.port}/api/machines")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nLeállítva.")
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,30 @@ MES ESEMÉNY SZIMULÁTOR
 Létrehoz egy külön PostgreSQL adatbázist (mes_db), amely a gyári MES rendszert szimulálja.
 Ez az alapforrása a termelési eseményeknek (RUN, STOP, BREAK).
 Realisztikus gyártási naplót generál a teljes mintatartományra.
+
+Az események gépenként, évnyi blokkokban, NumPy tömbökként készülnek (egy nap
+összes sorsolása egy mátrix sora), és darabokban töltődnek be: PostgreSQL-en
+COPY, más adatbázison executemany. Azonos seed mellett a kimenet azonos; egy gép
+eseményei nem függnek attól, hány gépet szimulálunk.
+
+Használat:
+    python scripts/simulate_events.py
+    python scripts/simulate_events.py --machines 10 --years 5 --synthetic-plan --seed 7
 """
 
+import argparse
+import io
 import sys
+import time
 from pathlib import Path
-import random
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta, date
+from datetime import timedelta, date
 from functools import lru_cache
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase
 
 # Projekt gyökérkönyvtár hozzáadása a Python elérési úthoz
 project_root = Path(__file__).resolve().parent.parent
@@ -30,7 +43,7 @@ class SourceBase(DeclarativeBase):
 class SourceEvent(SourceBase):
     """Termelési esemény rekordja a forrás rendszerben."""
     __tablename__ = "events"
-    
+
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, nullable=False)
     duration_seconds = Column(Integer)
@@ -52,10 +65,30 @@ STOP_REASONS = [
     "Takarítás", "Kaparócsere", "Erőmű leállás", "Tekercsvágó hiba"
 ]
 
+# Szintetikus terv (Excel terv nélküli gépekhez / évekhez): cikkenkénti napi tonna
+SYNTHETIC_ARTICLE_TONS = {"KL_150": 600, "KL_175": 620, "TL_100": 1200, "TL_140": 1300, "WTL_120": 1250, "FL_90": 1100}
+
 # --- IDŐTARTAM BEÁLLÍTÁSOK ---
-START_DATE = date.today() - timedelta(days=365)
+# Alapértelmezés: egy év a mai napig (a --years / --end-date kapcsolókkal bővíthető)
 END_DATE = date.today()
-NUM_DAYS = (END_DATE - START_DATE).days
+
+# Események valószínűsége egy sorsolásnál (RUN / STOP / BREAK + felvezetés)
+RUN_PROBABILITY = 0.88
+STOP_PROBABILITY = 0.04
+SECONDS_PER_DAY = 86400
+RUN_SECONDS = EVENT_INTERVAL_MINUTES * 60
+# A legrövidebb sorsolás a 10 perces STOP, így egy napon legfeljebb ennyi esemény kezdődhet
+DRAWS_PER_DAY = SECONDS_PER_DAY // 600 + 1
+# Gépenként ennyi nap eseményei készülnek egyszerre (a memóriaigény így az évek számától független)
+DAYS_PER_BLOCK = 366
+
+EVENT_COLUMNS = [
+    "timestamp", "duration_seconds", "event_type", "status", "weight_kg",
+    "average_speed", "machine_id", "article_id", "description"
+]
+
+# Egy nap terve: (cikk kódok [nap, max cikk], cikkek száma [nap], napi cél tonna [nap], cikk nevek)
+DayPlan = Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]
 
 @lru_cache(maxsize=None)
 def load_planning_data_for_year(year: int) -> Optional[pd.DataFrame]:
@@ -65,117 +98,200 @@ def load_planning_data_for_year(year: int) -> Optional[pd.DataFrame]:
         return pd.concat(pd.read_excel(planning_file, sheet_name=None), ignore_index=True)
     return None
 
-def get_day_planning(target_date: date, machine_id: str) -> Optional[pd.DataFrame]:
-    """Lekéri az adott napra vonatkozó terveket az Excel fájlból."""
-    df = load_planning_data_for_year(target_date.year)
-    if df is None:
-        return None
-        
-    day_plan = df[
-        (df['Date'].dt.date == target_date) & 
-        (df['Machine'] == machine_id)
-    ]
-    return day_plan
-
-def generate_events_for_day(target_date: date, machine_id: str) -> List[SourceEvent]:
-    """Generálja egy nap 24 órájának termelési eseményeit."""
-    events = []
-    current_time = datetime.combine(target_date, datetime.min.time())
-    end_time = current_time + timedelta(days=1)
-
-    day_plan = get_day_planning(target_date, machine_id)
-    if day_plan is None or day_plan.empty:
-        raise ValueError(f"HIBA: Nincs gyártási terv a(z) {machine_id} géphez a mai napon ({target_date})!")
-
-    target_tons = float(day_plan['Target_Tons'].sum())
-    planned_articles = day_plan['Article'].tolist()
-    
-    current_article = planned_articles[0]
-    
-    estimated_run_intervals = (24 * 60 / EVENT_INTERVAL_MINUTES) * 0.88
-    base_weight_per_interval = float((target_tons * 1000) / estimated_run_intervals)
-    
-    while current_time < end_time:
-        rand = random.random()
-        
-        if rand < 0.88:
-            duration = EVENT_INTERVAL_MINUTES * 60
-            status = "GOOD" if random.random() < 0.95 else "SCRAP"
-            base_speed = random.uniform(750, 900)
-            weight = base_weight_per_interval * random.uniform(0.9, 1.1)
-            
-            events.append(SourceEvent(
-                timestamp=current_time, duration_seconds=duration,
-                event_type="RUN", status=status, weight_kg=round(weight, 1),
-                average_speed=round(base_speed, 1), machine_id=machine_id,
-                article_id=current_article, description=None
-            ))
-            current_time += timedelta(seconds=duration)
-            
-        elif rand < 0.92:
-            duration = random.randint(10, 45) * 60
-            events.append(SourceEvent(
-                timestamp=current_time, duration_seconds=duration,
-                event_type="STOP", status=None, weight_kg=0, average_speed=0,
-                machine_id=machine_id, article_id=None, description=random.choice(STOP_REASONS)
-            ))
-            current_time += timedelta(seconds=duration)
-            
-        else:
-            duration = random.randint(5, 20) * 60
-            events.append(SourceEvent(
-                timestamp=current_time, duration_seconds=duration,
-                event_type="BREAK", status=None, weight_kg=0, average_speed=0,
-                machine_id=machine_id, article_id=None, description="Papírszakadás"
-            ))
-            current_time += timedelta(seconds=duration)
-            
-            if current_time < end_time:
-                duration = EVENT_INTERVAL_MINUTES * 60
-                events.append(SourceEvent(
-                    timestamp=current_time, duration_seconds=duration,
-                    event_type="RUN", status="SCRAP", weight_kg=round(random.uniform(200, 500), 1),
-                    average_speed=round(random.uniform(400, 600), 1), machine_id=machine_id,
-                    article_id=current_article, description="Felvezetés szakadás után"
-                ))
-                current_time += timedelta(seconds=duration)
-        
-        if len(planned_articles) > 1:
-            slice_hours = 24 / len(planned_articles)
-            article_index = min(int(current_time.hour / slice_hours), len(planned_articles) - 1)
-            current_article = planned_articles[article_index]
-    
-    return events
+def excel_plan(machine_id: str, days: pd.DatetimeIndex) -> DayPlan:
+    """
+    A gép napi tervei az Excel tervfájlokból tömbökbe rendezve.
+
+    Raises:
+        ValueError: Ha valamelyik napra nincs gyártási terv.
+    """
+    frames = [load_planning_data_for_year(year) for year in sorted(set(days.year))]
+    plan = pd.concat([df for df in frames if df is not None] or [pd.DataFrame(columns=["Date", "Machine", "Article", "Target_Tons"])])
+    plan = plan[plan["Machine"] == machine_id]
+    plan = plan.assign(Date=pd.to_datetime(plan["Date"]).dt.normalize())
+
+    missing = days.difference(plan["Date"])
+    if len(missing):
+        raise ValueError(f"HIBA: Nincs gyártási terv a(z) {machine_id} géphez ({len(missing)} nap, első: {missing[0].date()})!")
+
+    plan = plan[plan["Date"].isin(days)]
+    codes, names = pd.factorize(plan["Article"])
+    day_index = days.get_indexer(plan["Date"])
+    # A cikkek napon belüli sorrendje a tervfájl sorrendje
+    slot = plan.groupby(day_index).cumcount().to_numpy()
+
+    articles = np.zeros((len(days), slot.max() + 1), dtype=np.int64)
+    articles[day_index, slot] = codes
+    counts = np.bincount(day_index, minlength=len(days))
+    target_tons = np.bincount(day_index, weights=plan["Target_Tons"].to_numpy(dtype=float), minlength=len(days))
+    return articles, counts, target_tons, list(names)
+
+def synthetic_plan(rng: np.random.Generator, day_count: int) -> DayPlan:
+    """Napi 2-4 véletlen cikk egyenlő tonnamegosztással (mint a create_sample_data terve)."""
+    names = list(SYNTHETIC_ARTICLE_TONS)
+    tons = np.array([SYNTHETIC_ARTICLE_TONS[a] for a in names], dtype=float)
+    counts = rng.integers(2, 5, day_count)
+    # Soronkénti véletlen permutáció, ebből az első counts darab a nap cikkei
+    articles = np.argsort(rng.random((day_count, len(names))), axis=1)[:, :4]
+    chosen = np.arange(4) < counts[:, None]
+    target_tons = (tons[articles] * chosen).sum(axis=1) / counts
+    return articles, counts, target_tons, names
+
+def generate_events(rng: np.random.Generator, machine_id: str, first_day: date, plan: DayPlan) -> pd.DataFrame:
+    """
+    Egymást követő napok eseményei egy gépre, vektorosan.
+
+    Minden nap DRAWS_PER_DAY sorsolást kap: RUN (15 perc), STOP (10-45 perc) vagy BREAK
+    (5-20 perc, utána 15 perces selejtes felvezetés). A napon belüli kezdőidő a sorsolások
+    időtartamának halmozott összege; a nap végén túl kezdődő sorsolások kimaradnak.
+    """
+    articles, counts, target_tons, names = plan
+    day_count = len(counts)
+    shape = (day_count, DRAWS_PER_DAY)
+
+    draw = rng.random(shape)
+    stop_seconds = rng.integers(10, 46, shape) * 60
+    break_seconds = rng.integers(5, 21, shape) * 60
+    good = rng.random(shape) < 0.95
+    speed = rng.uniform(750, 900, shape)
+    weight_factor = rng.uniform(0.9, 1.1, shape)
+    reason = rng.integers(0, len(STOP_REASONS), shape)
+    recovery_weight = rng.uniform(200, 500, shape)
+    recovery_speed = rng.uniform(400, 600, shape)
+
+    is_run = draw < RUN_PROBABILITY
+    is_stop = ~is_run & (draw < RUN_PROBABILITY + STOP_PROBABILITY)
+    is_break = ~is_run & ~is_stop
+
+    duration = np.where(is_run, RUN_SECONDS, np.where(is_stop, stop_seconds, break_seconds))
+    draw_seconds = duration + np.where(is_break, RUN_SECONDS, 0)
+    start = np.cumsum(draw_seconds, axis=1) - draw_seconds
+    valid = start < SECONDS_PER_DAY
+    recovery = is_break & valid & (start + duration < SECONDS_PER_DAY)
+    # A nap utolsó eseménye éjfélkor lezárul (a következő nap 00:00-kor kezdődik, nincs átfedés)
+    recovery_seconds = np.minimum(RUN_SECONDS, SECONDS_PER_DAY - (start + duration))
+    duration = np.minimum(duration, SECONDS_PER_DAY - start)
+
+    # A cikk a sorsolás kezdőórája szerinti tervszelet (a felvezetés a szakadás cikkét örökli)
+    day = np.broadcast_to(np.arange(day_count)[:, None], shape)
+    n = counts[:, None]
+    slot = np.minimum((start // 3600) * n // 24, n - 1)
+    article = np.take_along_axis(articles, np.clip(slot, 0, articles.shape[1] - 1), axis=1)
+
+    estimated_run_intervals = (24 * 60 / EVENT_INTERVAL_MINUTES) * RUN_PROBABILITY
+    base_weight = (target_tons * 1000 / estimated_run_intervals)[:, None]
+
+    event_type = np.where(is_run, "RUN", np.where(is_stop, "STOP", "BREAK")).astype(object)
+    status = np.where(is_run, np.where(good, "GOOD", "SCRAP"), None)
+    weight = np.where(is_run, np.round(base_weight * weight_factor, 1), 0.0)
+    avg_speed = np.where(is_run, np.round(speed, 1), 0.0)
+    article_id = np.where(is_run, np.asarray(names, dtype=object)[article], None)
+    description = np.where(is_stop, np.asarray(STOP_REASONS, dtype=object)[reason], np.where(is_break, "Papírszakadás", None))
+
+    primary = {
+        "day": day[valid], "offset": start[valid], "duration_seconds": duration[valid],
+        "event_type": event_type[valid], "status": status[valid], "weight_kg": weight[valid],
+        "average_speed": avg_speed[valid], "article_id": article_id[valid], "description": description[valid],
+    }
+    size = int(recovery.sum())
+    follow_up = {
+        "day": day[recovery], "offset": (start + duration)[recovery], "duration_seconds": recovery_seconds[recovery],
+        "event_type": np.full(size, "RUN", dtype=object), "status": np.full(size, "SCRAP", dtype=object),
+        "weight_kg": np.round(recovery_weight[recovery], 1), "average_speed": np.round(recovery_speed[recovery], 1),
+        "article_id": np.asarray(names, dtype=object)[article[recovery]],
+        "description": np.full(size, "Felvezetés szakadás után", dtype=object),
+    }
+
+    columns = {key: np.concatenate([primary[key], follow_up[key]]) for key in primary}
+    timestamps = np.datetime64(first_day, "s") + columns.pop("day") * SECONDS_PER_DAY + columns.pop("offset")
+    order = np.argsort(timestamps, kind="stable")
+
+    df = pd.DataFrame({key: values[order] for key, values in columns.items()})
+    df.insert(0, "timestamp", timestamps[order].astype("datetime64[us]"))
+    df.insert(6, "machine_id", machine_id)
+    return df[EVENT_COLUMNS]
+
+def machine_streams(machines: List[str], seed: int) -> List[Tuple[str, np.random.SeedSequence]]:
+    """Gépenként független, a seedből származtatott véletlen folyam (a gépek sorrendje szerint)."""
+    return list(zip(machines, np.random.SeedSequence(seed).spawn(len(machines))))
+
+def machine_events(machine_id: str, seed_seq: np.random.SeedSequence, start_date: date, end_date: date,
+                   use_synthetic_plan: bool) -> Iterator[pd.DataFrame]:
+    """Egy gép eseményei a teljes időszakra, DAYS_PER_BLOCK napos blokkokban."""
+    rng = np.random.default_rng(seed_seq)
+    block_start = start_date
+    while block_start <= end_date:
+        block_end = min(block_start + timedelta(days=DAYS_PER_BLOCK - 1), end_date)
+        days = pd.date_range(block_start, block_end, freq="D")
+        plan = synthetic_plan(rng, len(days)) if use_synthetic_plan else excel_plan(machine_id, days)
+        yield generate_events(rng, machine_id, block_start, plan)
+        block_start = block_end + timedelta(days=1)
+
+def copy_frame(engine: Engine, df: pd.DataFrame) -> None:
+    """Betöltés PostgreSQL COPY-val (CSV stream, a hiányzó érték üres mező)."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S")
+    buffer.seek(0)
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY {SourceEvent.__tablename__} ({', '.join(EVENT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        raw.commit()
+    finally:
+        raw.close()
+
+def insert_frame(engine: Engine, df: pd.DataFrame) -> None:
+    """Betöltés executemany-vel (nem PostgreSQL adatbázisokhoz)."""
+    # Objektum oszlopokként a hiányzó érték None, az időbélyeg pandas Timestamp (datetime)
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    with engine.begin() as conn:
+        conn.execute(SourceEvent.__table__.insert(), records)
+
+def load_events(engine: Engine, frames: Iterator[pd.DataFrame], chunk_size: int) -> int:
+    """A DataFrame blokkok betöltése chunk_size soros darabokban; a betöltött sorok száma."""
+    load = copy_frame if engine.dialect.name == "postgresql" else insert_frame
+    total = 0
+    for df in frames:
+        for start in range(0, len(df), chunk_size):
+            load(engine, df.iloc[start:start + chunk_size])
+        total += len(df)
+    return total
 
 def main() -> None:
     """Forrás adatbázis (MES) inicializálása és feltöltése."""
+    parser = argparse.ArgumentParser(description="MES esemény szimulátor")
+    parser.add_argument("--machines", type=int, default=len(MACHINES), help="Gépek száma (PM1, PM2, ...)")
+    parser.add_argument("--years", type=int, default=1, help="Szimulált évek száma (a záró napig visszafelé)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=END_DATE, help="Utolsó szimulált nap (ÉÉÉÉ-HH-NN)")
+    parser.add_argument("--seed", type=int, default=42, help="Véletlenszám generátor seed")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Betöltési darab mérete (sor)")
+    parser.add_argument("--synthetic-plan", action="store_true",
+                        help="Excel terv helyett szintetikus napi terv (terhelési tesztekhez, tetszőleges gép / év)")
+    args = parser.parse_args()
+
+    machines = [f"PM{i + 1}" for i in range(args.machines)]
+    start_date = args.end_date - timedelta(days=365 * args.years)
+
     print("\nEcoPaper Solutions - MES Esemény Szimulátor")
     print("-" * 50)
-    
+    print(f"{len(machines)} gép | {start_date} - {args.end_date} | seed: {args.seed}")
+
     print(f"Kapcsolódás a forrás (MES) szerverhez")
     source_engine = create_engine(settings.MES_DATABASE_URL)
-    
+
     # Adatbázis resetelése
     SourceBase.metadata.drop_all(bind=source_engine)
     SourceBase.metadata.create_all(bind=source_engine)
-    SourceSession = sessionmaker(bind=source_engine)
-    
-    all_events = []
-    current_date = START_DATE
-    while current_date <= END_DATE:
-        for machine_id in MACHINES:
-            all_events.extend(generate_events_for_day(current_date, machine_id))
-        current_date += timedelta(days=1)
-    
-    print(f"{len(all_events)} esemény mentése folyamatban...")
-    session = SourceSession()
-    try:
-        session.add_all(all_events)
-        session.commit()
-    finally:
-        session.close()
-    
-    print(f"Kész! Forrás adatok mentve a MES SQL szerverre.")
+
+    t0 = time.perf_counter()
+    total = 0
+    for machine_id, seed_seq in machine_streams(machines, args.seed):
+        frames = machine_events(machine_id, seed_seq, start_date, args.end_date, args.synthetic_plan)
+        count = load_events(source_engine, frames, args.chunk_size)
+        total += count
+        print(f"  {machine_id}: {count} esemény betöltve")
+
+    print(f"Kész! {total} esemény mentve a MES SQL szerverre ({time.perf_counter() - t0:.1f} mp).")
     print("-" * 50 + "\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+ADAT-ELÉRHETŐSÉGI KATALÓGUS (DATA CATALOG)
+==========================================
+A szinkronizált napok (synced_days) és a gépenkénti összesítő statisztika
+(machine_data_stats) karbantartása. A Dashboard ezekből olvassa az elérhető
+időszakot és eseményszámot, így nem kell a teljes eseménytáblát átvizsgálnia.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .extractors.events_extractor import as_date
+from .models import ProductionEventDB, ProductionEvent, SyncedDayDB, MachineDataStatsDB, StaleDayDB
+
+logger = logging.getLogger(__name__)
+
+def record_synced_day(
+    db: Session, machine_id: str, day: date,
+    events: List[ProductionEvent], synced_at: Optional[datetime] = None
+) -> None:
+    """
+    Egy (gép, nap) szinkronizálásának rögzítése (Upsert), majd a gép statisztikájának frissítése.
+    A nap egyúttal lekerül az elavult napok listájáról.
+    A hívó munkamenetében fut, így az eseményekkel együtt commitolódik.
+    """
+    for model in (SyncedDayDB, StaleDayDB):
+        db.query(model).filter(
+            model.machine_id == machine_id,
+            model.date == day
+        ).delete()
+
+    timestamps = [e.timestamp for e in events]
+    db.add(SyncedDayDB(
+        machine_id=machine_id,
+        date=day,
+        event_count=len(events),
+        first_event=min(timestamps) if timestamps else None,
+        last_event=max(timestamps) if timestamps else None,
+        synced_at=synced_at or datetime.now()
+    ))
+    db.flush()
+    refresh_machine_stats(db, machine_id)
+
+def refresh_machine_stats(db: Session, machine_id: str) -> None:
+    """A gép statisztikájának újraszámolása a (kis méretű) synced_days katalógusból."""
+    first_event, last_event, event_count, day_count, last_synced_at = db.query(
+        func.min(SyncedDayDB.first_event),
+        func.max(SyncedDayDB.last_event),
+        func.coalesce(func.sum(SyncedDayDB.event_count), 0),
+        func.count(SyncedDayDB.id),
+        func.max(SyncedDayDB.synced_at)
+    ).filter(SyncedDayDB.machine_id == machine_id).one()
+
+    stats = db.get(MachineDataStatsDB, machine_id)
+    if stats is None:
+        stats = MachineDataStatsDB(machine_id=machine_id)
+        db.add(stats)
+    stats.first_event = first_event
+    stats.last_event = last_event
+    stats.event_count = int(event_count or 0)
+    stats.synced_days = int(day_count or 0)
+    stats.last_synced_at = last_synced_at
+
+def rebuild_catalog(db: Session) -> int:
+    """
+    A katalógus teljes újraépítése az eseménytáblából (első telepítéskor).
+    Egyetlen GROUP BY lekérdezés (gép, nap) szerint.
+
+    Returns:
+        int: A katalógusba került napok száma.
+    """
+    day_col = func.date(ProductionEventDB.timestamp)
+    rows = db.query(
+        ProductionEventDB.machine_id, day_col,
+        func.count(ProductionEventDB.id),
+        func.min(ProductionEventDB.timestamp),
+        func.max(ProductionEventDB.timestamp)
+    ).group_by(ProductionEventDB.machine_id, day_col).all()
+
+    db.query(SyncedDayDB).delete(synchronize_session=False)
+    db.query(MachineDataStatsDB).delete(synchronize_session=False)
+
+    now = datetime.now()
+    machines = set()
+    for machine_id, day, count, first_event, last_event in rows:
+        day = as_date(day)
+        db.add(SyncedDayDB(
+            machine_id=machine_id, date=day, event_count=count,
+            first_event=first_event, last_event=last_event, synced_at=now
+        ))
+        machines.add(machine_id)
+    db.flush()
+
+    for machine_id in machines:
+        refresh_machine_stats(db, machine_id)
+    logger.info(f"Adatkatalógus újraépítve: {len(rows)} nap, {len(machines)} gép")
+    return len(rows)
@@ -8,6 +8,7 @@ beállítások automatikus beolvasását .env fájlból vagy környezeti változ
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import List, Optional
 
 class Settings(BaseSettings):
     """
@@ -27,6 +28,11 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     MES_DATABASE_URL: str
 
+    # A Dashboard olvasási útvonala: opcionális olvasási replika (alapértelmezett: DATABASE_URL)
+    # és lekérdezésenkénti időkorlát (PostgreSQL statement_timeout, ms)
+    READ_DATABASE_URL: Optional[str] = None
+    READ_STATEMENT_TIMEOUT_MS: int = 15000
+
     # Egy "hálózati meghajtót" szimulálunk, ahol évekre és hónapokra vannak bontva az Excel fájlok
     NETWORK_SHARE_DIR: Path = DATA_DIR / "network_share"
     
@@ -35,6 +41,39 @@ class Settings(BaseSettings):
     LAB_DATA_DIR: Path = NETWORK_SHARE_DIR / "lab_data"
     UTILITIES_DIR: Path = NETWORK_SHARE_DIR / "utilities"
 
+    # --- PDF JELENTÉS GYORSÍTÓTÁR ---
+    REPORT_CACHE_DIR: Path = DATA_DIR / "report_cache"
+    REPORT_CACHE_MAX_MB: int = 200
+    # Kötegelt (több gép / nap) jelentéskészítés kimeneti könyvtára
+    REPORT_BATCH_DIR: Path = DATA_DIR / "reports"
+
+    # --- TÖMEGES EXPORT ---
+    # A Dashboardról letölthető export legnagyobb sorszáma (a letöltés a munkamenet memóriájában
+    # él); nagyobb exporthoz a scripts/export_data.py használandó
+    EXPORT_DASHBOARD_MAX_ROWS: int = 200000
+
+    # --- IDŐVONAL ---
+    # Többnapos idővonalon legfeljebb ennyi szakasz kerül a böngészőbe; felette
+    # a szakaszok a legalább TIMELINE_MIN_BUCKET_MINUTES hosszú időrésekbe olvadnak
+    TIMELINE_MAX_SEGMENTS: int = 400
+    TIMELINE_MIN_BUCKET_MINUTES: int = 15
+
+    # --- HOSSZÚ TÁVÚ TRENDEK ---
+    # Egy trendgrafikon legfeljebb ennyi pontot kap (LTTB ritkítás)
+    TREND_MAX_POINTS: int = 150
+
+    # --- MŰSZAKNAPTÁR ---
+    # A műszakok kezdő órái (pl. 06/14/22 = három 8 órás műszak)
+    SHIFT_START_HOURS: List[int] = [6, 14, 22]
+
+    # --- MEGBÍZHATÓSÁGI MUTATÓK ---
+    # Gördülő ablakok hossza napokban (MTBF, MTTR, szakadás / 1000 t)
+    RELIABILITY_WINDOWS: List[int] = [7, 30, 90]
+
+    # --- MINŐSÉGSZABÁLYOZÁS (SPC) ---
+    # A grammsúly megengedett eltérése a névleges értéktől (±%), a Cp/Cpk számításhoz
+    SPC_GSM_TOLERANCE_PCT: float = 3.0
+
     # Pydantic-specifikus konfiguráció
     model_config = SettingsConfigDict(
         env_file=".env",              
@@ -7,9 +7,10 @@ technológiát használjuk az adatok kezeléséhez.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator
 
 from .config import settings
 from .models import Base
@@ -21,6 +22,28 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def read_engine_options(url: str) -> Dict[str, Any]:
+    """
+    Az olvasási engine beállításai: AUTOCOMMIT (nincs nyitva tartott tranzakció, nincs COMMIT),
+    PostgreSQL esetén csak olvasható munkamenet és statement_timeout.
+    """
+    options: Dict[str, Any] = {"isolation_level": "AUTOCOMMIT"}
+    if make_url(url).get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "options": f"-c default_transaction_read_only=on -c statement_timeout={settings.READ_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+# Olvasási útvonal (Dashboard): saját kapcsolatkészlet, így az olvasások nem várnak az ETL írásokra.
+# Replika vagy PostgreSQL esetén külön engine; egyébként (pl. SQLite) a fő engine AUTOCOMMIT nézete.
+_read_url = settings.READ_DATABASE_URL or settings.DATABASE_URL
+if settings.READ_DATABASE_URL or make_url(_read_url).get_backend_name() == "postgresql":
+    read_engine = create_engine(_read_url, echo=False, pool_pre_ping=True, **read_engine_options(_read_url))
+else:
+    read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+ReadSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, bind=read_engine)
+
 def init_db() -> None:
     """
     Adatbázis inicializálása.
@@ -46,3 +69,15 @@ def get_db() -> Generator[Session, None, None]:
         raise e
     finally:
         db.close()
+
+@contextmanager
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Csak olvasó munkamenet a Dashboard lekérdezéseihez.
+    AUTOCOMMIT módban fut, ezért kilépéskor nincs COMMIT; írásra a get_db() használandó.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
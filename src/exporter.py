@@ -0,0 +1,223 @@
+"""
+TÖMEGES ADATEXPORT (STREAMING EXPORT)
+=====================================
+Termelési események és napi összesítők exportálása Parquet vagy CSV formátumba,
+opcionális gzip / zstd tömörítéssel. A lekérdezés szerveroldali kurzorral,
+darabokban érkezik, és minden darab azonnal a kimenetre kerül, így a
+memóriaigény a darabmérettel arányos: egy több millió soros éves export sem
+tölti be a teljes eredményt.
+
+Függőségek: Parquet kimenethez pyarrow, zstd tömörítésű CSV-hez a zstandard csomag
+(Parquet esetén a zstd a pyarrow beépített kodekje).
+"""
+
+import gzip
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Integer, Select, func, select
+
+from .database import get_read_db
+from .models import DailySummaryDB, ProductionEventDB
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("parquet", "csv")
+COMPRESSIONS = ("gzip", "zstd")
+
+# Exportálható adatkörök: tábla és rendezés (gépenként, időrendben)
+DATASETS = {
+    "events": (ProductionEventDB, ProductionEventDB.timestamp),
+    "summaries": (DailySummaryDB, DailySummaryDB.date),
+}
+
+def file_extension(fmt: str, compression: Optional[str] = None) -> str:
+    """A kimeneti fájl kiterjesztése (Parquet esetén a tömörítés a fájlon belüli kodek)."""
+    if fmt == "parquet":
+        return ".parquet"
+    return ".csv" + {"gzip": ".gz", "zstd": ".zst"}.get(compression, "")
+
+def _check_dependencies(fmt: str, compression: Optional[str]) -> None:
+    """Az opcionális csomagok ellenőrzése még a kimenet megnyitása előtt."""
+    required = "pyarrow" if fmt == "parquet" else "zstandard" if compression == "zstd" else None
+    if required is None:
+        return
+    try:
+        __import__(required)
+    except ImportError as e:
+        raise RuntimeError(f"A(z) {fmt} / {compression or 'tömörítetlen'} exporthoz a {required} csomag szükséges.") from e
+
+class Exporter:
+    """
+    Szűrt adatkör (gép, dátumtartomány, eseménytípus) darabolt exportja egy fájlba vagy bináris adatfolyamba.
+    """
+
+    def __init__(self, chunk_size: int = 50000) -> None:
+        """
+        Args:
+            chunk_size: Egy darabban lekérdezett és kiírt sorok száma.
+        """
+        self.chunk_size = chunk_size
+
+    def export(
+        self, dataset: str, output: Union[str, Path, BinaryIO],
+        start_date: date, end_date: date,
+        machine_id: Optional[str] = None, event_types: Optional[Sequence[str]] = None,
+        fmt: str = "parquet", compression: Optional[str] = None
+    ) -> int:
+        """
+        Export futtatása.
+
+        Args:
+            dataset: "events" vagy "summaries".
+            output: Kimeneti fájl útvonala vagy írható bináris adatfolyam.
+            start_date: Az időszak első napja.
+            end_date: Az időszak utolsó napja.
+            machine_id: (Opcionális) Csak ezt a gépet exportálja.
+            event_types: (Opcionális) Eseménytípusok szűrése (csak "events" esetén).
+            fmt: "parquet" vagy "csv".
+            compression: None, "gzip" vagy "zstd".
+
+        Returns:
+            int: A kiírt sorok száma.
+        """
+        if dataset not in DATASETS:
+            raise ValueError(f"Ismeretlen adatkör: {dataset}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Ismeretlen formátum: {fmt}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Ismeretlen tömörítés: {compression}")
+        if end_date < start_date:
+            raise ValueError("A kezdő dátum nem lehet nagyobb a zárónál!")
+        if event_types and dataset != "events":
+            raise ValueError("Eseménytípus szűrés csak az események exportjánál adható meg.")
+
+        _check_dependencies(fmt, compression)
+
+        chunks = self.iter_chunks(dataset, start_date, end_date, machine_id, event_types)
+        if isinstance(output, (str, Path)):
+            # Hiba esetén ne maradjon félkész fájl
+            try:
+                with open(output, "wb") as sink:
+                    rows = self._write(dataset, chunks, sink, fmt, compression)
+            except Exception:
+                Path(output).unlink(missing_ok=True)
+                raise
+        else:
+            rows = self._write(dataset, chunks, output, fmt, compression)
+
+        logger.info(f"Export kész: {dataset} {start_date} - {end_date} | {rows} sor ({fmt}, {compression or 'tömörítetlen'})")
+        return rows
+
+    def iter_chunks(
+        self, dataset: str, start_date: date, end_date: date,
+        machine_id: Optional[str] = None, event_types: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """A szűrt lekérdezés eredménye DataFrame darabokban, egységes oszloptípusokkal."""
+        stmt, columns = self._statement(dataset, start_date, end_date, machine_id, event_types)
+        datetime_cols = [c.name for c in columns if isinstance(c.type, DateTime)]
+        date_cols = [c.name for c in columns if isinstance(c.type, Date) and not isinstance(c.type, DateTime)]
+
+        with get_read_db() as db:
+            conn = db.connection().execution_options(stream_results=True)
+            for chunk in pd.read_sql(stmt, conn, chunksize=self.chunk_size, parse_dates=datetime_cols + date_cols):
+                for col in date_cols:
+                    chunk[col] = chunk[col].dt.date
+                yield chunk
+
+    def count(
+        self, dataset: str, start_date: date, end_date: date,
+        machine_id: Optional[str] = None, event_types: Optional[Sequence[str]] = None
+    ) -> int:
+        """Az exportálandó sorok száma (az export előtti méretkorlát ellenőrzéséhez)."""
+        if dataset not in DATASETS:
+            raise ValueError(f"Ismeretlen adatkör: {dataset}")
+        stmt, _ = self._statement(dataset, start_date, end_date, machine_id, event_types)
+        with get_read_db() as db:
+            return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar() or 0
+
+    @staticmethod
+    def _statement(
+        dataset: str, start_date: date, end_date: date,
+        machine_id: Optional[str], event_types: Optional[Sequence[str]]
+    ) -> Tuple[Select, List[Column]]:
+        """A szűrt, rendezett SELECT és az exportált oszlopok."""
+        model, order_col = DATASETS[dataset]
+        columns = [c for c in model.__table__.columns if c.name != "id"]
+        stmt = select(*columns).order_by(model.machine_id, order_col)
+
+        if dataset == "events":
+            stmt = stmt.where(
+                ProductionEventDB.timestamp >= datetime.combine(start_date, datetime.min.time()),
+                ProductionEventDB.timestamp <= datetime.combine(end_date, datetime.max.time())
+            )
+            if event_types:
+                stmt = stmt.where(ProductionEventDB.event_type.in_(list(event_types)))
+        else:
+            stmt = stmt.where(DailySummaryDB.date >= start_date, DailySummaryDB.date <= end_date)
+        if machine_id:
+            stmt = stmt.where(model.machine_id == machine_id)
+        return stmt, columns
+
+    def _write(self, dataset: str, chunks: Iterator[pd.DataFrame], sink: BinaryIO, fmt: str, compression: Optional[str]) -> int:
+        if fmt == "parquet":
+            return self._write_parquet(dataset, chunks, sink, compression)
+        return self._write_csv(chunks, sink, compression)
+
+    @staticmethod
+    def _write_csv(chunks: Iterator[pd.DataFrame], sink: BinaryIO, compression: Optional[str]) -> int:
+        """CSV kiírás darabonként (fejléc csak egyszer), igény szerint tömörítő rétegen át."""
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=sink, mode="wb")
+        elif compression == "zstd":
+            import zstandard
+            stream = zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+        else:
+            stream = sink
+
+        rows = 0
+        try:
+            for chunk in chunks:
+                stream.write(chunk.to_csv(index=False, header=rows == 0, date_format="%Y-%m-%dT%H:%M:%S").encode("utf-8"))
+                rows += len(chunk)
+        finally:
+            if stream is not sink:
+                stream.close()
+        return rows
+
+    @staticmethod
+    def _write_parquet(dataset: str, chunks: Iterator[pd.DataFrame], sink: BinaryIO, compression: Optional[str]) -> int:
+        """Parquet kiírás darabonként egy-egy sorcsoportba, a táblasémából képzett rögzített sémával."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = parquet_schema(dataset)
+        rows = 0
+        with pq.ParquetWriter(sink, schema, compression=compression or "snappy") as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+        return rows
+
+def parquet_schema(dataset: str):
+    """Rögzített Arrow séma az adatkör oszlopaiból (így a csupa NULL darabok típusa sem bizonytalan)."""
+    import pyarrow as pa
+
+    def arrow_type(column):
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us")
+        if isinstance(column.type, Date):
+            return pa.date32()
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        return pa.string()
+
+    model, _ = DATASETS[dataset]
+    return pa.schema([(c.name, arrow_type(c)) for c in model.__table__.columns if c.name != "id"])
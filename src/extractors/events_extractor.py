@@ -8,7 +8,7 @@ adatgyűjtő rendszerrel való kapcsolatot.
 
 import logging
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, func
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
@@ -43,6 +43,19 @@ class SourceEvent(SourceBase):
     article_id = Column(String(50))
     description = Column(String(255))
 
+def as_date(value) -> Optional[date]:
+    """A func.date() eredményének normalizálása (SQLite esetén szöveget ad vissza)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    return None
+
 
 class EventsExtractor:
     """
@@ -121,21 +134,55 @@ class EventsExtractor:
                 SourceEvent.machine_id == machine_id
             ).distinct().all()
             
-            result = []
-            for d in dates:
-                if d[0]:
-                    if isinstance(d[0], date):
-                        result.append(d[0])
-                    elif isinstance(d[0], str):
-                        try:
-                            result.append(datetime.strptime(d[0], '%Y-%m-%d').date())
-                        except ValueError:
-                            continue
-            
-            return sorted(result)
+            result = [as_date(d[0]) for d in dates]
+            return sorted(d for d in result if d)
             
         except Exception as e:
             logger.error(f"Hiba a dátumok lekérésekor ({machine_id}): {e}")
             return []
         finally:
             session.close()
+
+    def get_daily_event_stats(
+        self, start_date: date, end_date: date, machine_id: Optional[str] = None
+    ) -> Dict[Tuple[str, date], Tuple[int, Optional[datetime]]]:
+        """
+        Napi eseményszám és utolsó időbélyeg gépenként, egyetlen aggregáló lekérdezéssel.
+        Az egyeztetés (reconciliation) ezt veti össze a riport adatbázissal.
+        
+        Hiba esetén kivételt dob: az üres eredmény "nincs eltérés"-ként értelmeződne.
+        
+        Args:
+            start_date: Az időszak első napja.
+            end_date: Az időszak utolsó napja.
+            machine_id: (Opcionális) Csak erre a gépre szűr.
+            
+        Returns:
+            Dict: (gép, nap) -> (eseményszám, utolsó esemény időpontja)
+        """
+        session = self.Session()
+        
+        try:
+            day_col = func.date(SourceEvent.timestamp)
+            query = session.query(
+                SourceEvent.machine_id, day_col,
+                func.count(SourceEvent.id), func.max(SourceEvent.timestamp)
+            ).filter(
+                SourceEvent.timestamp >= datetime.combine(start_date, datetime.min.time()),
+                SourceEvent.timestamp <= datetime.combine(end_date, datetime.max.time())
+            )
+            if machine_id:
+                query = query.filter(SourceEvent.machine_id == machine_id)
+            
+            rows = query.group_by(SourceEvent.machine_id, day_col).all()
+            return {
+                (m, as_date(d)): (count, last_event)
+                for m, d, count, last_event in rows
+                if as_date(d)
+            }
+            
+        except Exception as e:
+            logger.error(f"Hiba a napi esemény statisztika lekérésekor ({start_date} - {end_date}): {e}")
+            raise
+        finally:
+            session.close()
@@ -0,0 +1,290 @@
+"""
+HÁTTÉR SZINKRONIZÁCIÓ (JOB MANAGER)
+===================================
+A Dashboardról indított szinkronizációk egy háttérszálban futnak, így a felület
+nem blokkol. A feladatok állapotát (státusz, előrehaladás, napi futásidők) a
+sync_jobs tábla tárolja, ezt kérdezi le a felület a folyamat követéséhez.
+
+- Deduplikáció: ha egy aktív feladat már lefedi a kért napokat, nem indul új futás.
+- Megszakítás: a kérést a worker minden nap feldolgozása előtt ellenőrzi.
+- Egyetlen worker szál: egy folyamaton belül a szinkronizációk soha nem futnak párhuzamosan.
+
+Feltételezés: a Dashboard egyetlen folyamatként fut. Induláskor a RUNNING állapotban
+maradt feladatok (pl. újraindítás miatt) FAILED állapotba kerülnek.
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from .database import get_db
+from .models import SyncJobDB, SyncJob
+
+if TYPE_CHECKING:
+    from .pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+def _default_pipeline() -> "Pipeline":
+    """A Pipeline (és vele a MES kinyerők, Excel olvasó) csak az első feladat futásakor töltődik be."""
+    from .pipeline import Pipeline
+    return Pipeline()
+
+def _to_model(job: SyncJobDB) -> SyncJob:
+    """ORM sor konvertálása a megjelenítési modellre (a munkameneten belül hívandó)."""
+    return SyncJob(
+        id=job.id, machine_id=job.machine_id,
+        start_date=job.start_date, end_date=job.end_date,
+        status=job.status, progress=job.progress or 0.0, current_day=job.current_day,
+        day_timings=json.loads(job.day_timings) if job.day_timings else [],
+        error=job.error, cancel_requested=bool(job.cancel_requested),
+        created_at=job.created_at, started_at=job.started_at, finished_at=job.finished_at
+    )
+
+class JobManager:
+    """
+    Szinkronizációs feladatok sorba állítása és futtatása egy háttérszálon.
+    """
+
+    def __init__(self, pipeline_factory: Callable[[], "Pipeline"] = _default_pipeline) -> None:
+        """
+        Args:
+            pipeline_factory: A feladatonként létrehozott Pipeline gyártófüggvénye.
+        """
+        self.pipeline_factory = pipeline_factory
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, start_date: date, end_date: Optional[date] = None, machine_id: Optional[str] = None) -> int:
+        """
+        Új szinkronizációs feladat sorba állítása.
+        Ha egy aktív feladat már lefedi a kért időszakot és gépet, annak azonosítóját adja vissza.
+
+        Args:
+            start_date: Az első szinkronizálandó nap.
+            end_date: Az utolsó nap (alapértelmezett: start_date).
+            machine_id: (Opcionális) Csak ezt a gépet szinkronizálja.
+
+        Returns:
+            int: A (meglévő vagy új) feladat azonosítója.
+        """
+        end_date = end_date or start_date
+        if end_date < start_date:
+            raise ValueError("A kezdő dátum nem lehet nagyobb a zárónál!")
+
+        with self._lock:
+            with get_db() as db:
+                query = db.query(SyncJobDB).filter(
+                    SyncJobDB.status.in_(ACTIVE_STATUSES),
+                    SyncJobDB.cancel_requested.is_(False),
+                    SyncJobDB.start_date <= start_date,
+                    SyncJobDB.end_date >= end_date
+                )
+                if machine_id:
+                    query = query.filter((SyncJobDB.machine_id.is_(None)) | (SyncJobDB.machine_id == machine_id))
+                else:
+                    query = query.filter(SyncJobDB.machine_id.is_(None))
+                existing = query.order_by(SyncJobDB.id).first()
+                if existing is not None:
+                    logger.info(f"Szinkronizáció már folyamatban (#{existing.id}): {start_date} - {end_date}")
+                    return existing.id
+
+                job = SyncJobDB(
+                    machine_id=machine_id, start_date=start_date, end_date=end_date,
+                    status=JOB_QUEUED, progress=0.0, cancel_requested=False, created_at=datetime.now()
+                )
+                db.add(job)
+                db.flush()
+                job_id = job.id
+
+            logger.info(f"Szinkronizáció sorba állítva (#{job_id}): {start_date} - {end_date}")
+            self._ensure_worker()
+            return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Megszakítási kérés egy aktív feladatra.
+        A sorban álló feladat azonnal törlődik, a futó a következő nap előtt áll le.
+
+        Returns:
+            bool: True, ha a feladat még aktív volt.
+        """
+        with get_db() as db:
+            job = db.get(SyncJobDB, job_id)
+            if job is None or job.status not in ACTIVE_STATUSES:
+                return False
+            job.cancel_requested = True
+            if job.status == JOB_QUEUED:
+                job.status = JOB_CANCELLED
+                job.finished_at = datetime.now()
+        logger.info(f"Szinkronizáció megszakítása kérve (#{job_id})")
+        return True
+
+    def get_job(self, job_id: int) -> Optional[SyncJob]:
+        """Egy feladat aktuális állapota."""
+        with get_db() as db:
+            job = db.get(SyncJobDB, job_id)
+            return _to_model(job) if job is not None else None
+
+    def list_jobs(self, limit: int = 5) -> List[SyncJob]:
+        """A legutóbbi feladatok (legújabb elöl)."""
+        with get_db() as db:
+            jobs = db.query(SyncJobDB).order_by(SyncJobDB.id.desc()).limit(limit).all()
+            return [_to_model(job) for job in jobs]
+
+    def has_active_jobs(self) -> bool:
+        """Van-e sorban álló vagy futó feladat."""
+        with get_db() as db:
+            return db.query(SyncJobDB.id).filter(SyncJobDB.status.in_(ACTIVE_STATUSES)).first() is not None
+
+    def recover_orphans(self) -> int:
+        """
+        Induláskor a RUNNING állapotban maradt feladatok lezárása (a futtató folyamat megszűnt),
+        majd a sorban álló feladatok feldolgozásának elindítása.
+
+        Returns:
+            int: A lezárt feladatok száma.
+        """
+        with self._lock:
+            with get_db() as db:
+                orphans = db.query(SyncJobDB).filter(SyncJobDB.status == JOB_RUNNING).all()
+                for job in orphans:
+                    job.status = JOB_FAILED
+                    job.error = "A feldolgozás megszakadt (az alkalmazás újraindult)."
+                    job.finished_at = datetime.now()
+                has_queued = db.query(SyncJobDB.id).filter(SyncJobDB.status == JOB_QUEUED).first() is not None
+            if orphans:
+                logger.warning(f"{len(orphans)} félbemaradt szinkronizáció lezárva")
+            if has_queued:
+                self._ensure_worker()
+            return len(orphans)
+
+    def run_pending(self) -> int:
+        """
+        A sorban álló feladatok feldolgozása a hívó szálon, amíg a sor ki nem ürül.
+
+        Returns:
+            int: A feldolgozott feladatok száma.
+        """
+        processed = 0
+        while True:
+            with self._lock:
+                job_id = self._claim_next()
+                if job_id is None:
+                    return processed
+            self._run_job(job_id)
+            processed += 1
+
+    def _ensure_worker(self) -> None:
+        """Worker szál indítása, ha még nem fut (a zár alatt hívandó)."""
+        if self._worker is not None:
+            return
+        self._worker = threading.Thread(target=self._worker_loop, name="sync-worker", daemon=True)
+        self._worker.start()
+
+    def _worker_loop(self) -> None:
+        """A worker a sor kiürüléséig dolgozik, majd leáll (a következő submit újraindítja)."""
+        try:
+            while True:
+                with self._lock:
+                    job_id = self._claim_next()
+                    if job_id is None:
+                        self._worker = None
+                        return
+                self._run_job(job_id)
+        finally:
+            # Váratlan hiba (pl. adatbázis kiesés a sor lekérdezésekor) után is indulhasson új worker
+            with self._lock:
+                if self._worker is threading.current_thread():
+                    self._worker = None
+
+    def _claim_next(self) -> Optional[int]:
+        """A legrégebbi sorban álló feladat lefoglalása (RUNNING állapotba állítása)."""
+        with get_db() as db:
+            job = db.query(SyncJobDB).filter(SyncJobDB.status == JOB_QUEUED).order_by(SyncJobDB.id).first()
+            if job is None:
+                return None
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now()
+            return job.id
+
+    def _checkpoint(self, job_id: int, **fields) -> bool:
+        """
+        Állapot mezők frissítése.
+
+        Returns:
+            bool: True, ha a feladatra megszakítást kértek.
+        """
+        with get_db() as db:
+            job = db.get(SyncJobDB, job_id)
+            for field, value in fields.items():
+                setattr(job, field, value)
+            return bool(job.cancel_requested)
+
+    def _run_job(self, job_id: int) -> None:
+        """
+        Egy feladat futtatása. Bármely hiba (a Pipeline létrehozása, állapot írása is) a feladatot
+        FAILED állapotba teszi, így az nem marad RUNNING-ként és nem nyeli el az újabb kéréseket.
+        """
+        try:
+            self._run_days(job_id)
+        except Exception as e:
+            logger.error(f"Szinkronizáció hiba (#{job_id}): {str(e)}")
+            try:
+                self._checkpoint(job_id, status=JOB_FAILED, error=str(e), finished_at=datetime.now())
+            except Exception as checkpoint_error:
+                logger.error(f"A feladat (#{job_id}) állapota nem menthető: {str(checkpoint_error)}")
+
+    def _run_days(self, job_id: int) -> None:
+        """Egy feladat napjainak egymás utáni szinkronizálása."""
+        with get_db() as db:
+            job = db.get(SyncJobDB, job_id)
+            start_date, end_date, machine_id = job.start_date, job.end_date, job.machine_id
+
+        pipeline = self.pipeline_factory()
+        total_days = (end_date - start_date).days + 1
+        timings: List[dict] = []
+
+        for i in range(total_days):
+            current_day = start_date + timedelta(days=i)
+            if self._checkpoint(job_id, current_day=current_day):
+                self._checkpoint(job_id, status=JOB_CANCELLED, finished_at=datetime.now())
+                logger.info(f"Szinkronizáció megszakítva (#{job_id}) a {current_day} nap előtt")
+                return
+
+            t0 = time.perf_counter()
+            try:
+                pipeline.run_full_load(target_date=current_day, target_machine_id=machine_id)
+            except Exception as e:
+                logger.error(f"Szinkronizáció hiba (#{job_id}) | {current_day}: {str(e)}")
+                self._checkpoint(job_id, status=JOB_FAILED, error=f"{current_day}: {str(e)}", finished_at=datetime.now())
+                return
+
+            timings.append({"date": current_day.isoformat(), "seconds": round(time.perf_counter() - t0, 3)})
+            self._checkpoint(job_id, progress=(i + 1) / total_days, day_timings=json.dumps(timings))
+
+        self._checkpoint(job_id, status=JOB_DONE, current_day=None, finished_at=datetime.now())
+        logger.info(f"Szinkronizáció befejeződött (#{job_id}): {total_days} nap, {sum(t['seconds'] for t in timings):.1f} mp")
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    """A folyamatszintű JobManager példány (első híváskor lezárja a félbemaradt feladatokat)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+            _manager.recover_orphans()
+        return _manager
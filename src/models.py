@@ -8,8 +8,8 @@ Két technológiát használunk:
 """
 
 from datetime import datetime, date
-from typing import Optional
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey
+from typing import List, Optional
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Boolean, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, relationship
 from pydantic import BaseModel, ConfigDict
 
@@ -116,17 +116,12 @@ class UtilityConsumptionDB(Base):
     fiber_tons = Column(Float)       
     additives_kg = Column(Float)     
 
-class DailySummaryDB(Base):
+class KpiColumnsMixin:
     """
-    Napi összesítő jelentés (Dashboard alapja).
-    Ide kerülnek a MetricsCalculator által kiszámított KPI mutatók.
-    Ez a tábla szolgál a Dashboard gyors és hatékony megjelenítéséhez.
+    Közös KPI oszlopok az összesítő táblákhoz.
+    A napi, műszakos és óránkénti összesítők ugyanazokat a mutatókat tárolják,
+    így a Dashboard bármelyik granularitáson azonos módon tudja megjeleníteni őket.
     """
-    __tablename__ = "daily_summaries"
-    
-    id = Column(Integer, primary_key=True)
-    date = Column(Date, nullable=False, index=True)
-    machine_id = Column(String(5), ForeignKey("machines.id"))
     
     # --- KPI MUTATÓK ---
     oee_pct = Column(Float)           
@@ -143,6 +138,7 @@ class DailySummaryDB(Base):
     # --- HATÉKONYSÁG ÉS SEBESSÉG ---
     total_downtime_min = Column(Float) 
     break_count = Column(Integer)      
+    break_downtime_min = Column(Float)
     avg_speed_m_min = Column(Float)    
     target_speed_m_min = Column(Float) 
     
@@ -155,6 +151,217 @@ class DailySummaryDB(Base):
     spec_water_m3_t = Column(Float)        
     spec_steam_t_t = Column(Float)         
     spec_fiber_t_t = Column(Float)         
+    
+    # --- ADDITÍV KOMPONENSEK (az időszakos összesítőkhöz) ---
+    run_time_sec = Column(Float)
+    total_time_sec = Column(Float)
+    electricity_kwh = Column(Float)
+    water_m3 = Column(Float)
+    steam_tons = Column(Float)
+    fiber_tons = Column(Float)
+
+class DailySummaryDB(KpiColumnsMixin, Base):
+    """
+    Napi összesítő jelentés (Dashboard alapja).
+    Ide kerülnek a MetricsCalculator által kiszámított KPI mutatók.
+    Ez a tábla szolgál a Dashboard gyors és hatékony megjelenítéséhez.
+    """
+    __tablename__ = "daily_summaries"
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False, index=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+
+class HourlySummaryDB(KpiColumnsMixin, Base):
+    """
+    Óránkénti összesítő.
+    A napi összesítővel egy menetben számolódik, az órák a nap 0-23. óráját fedik le.
+    """
+    __tablename__ = "hourly_summaries"
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False, index=True)
+    period_start = Column(DateTime, nullable=False, index=True)
+    period_end = Column(DateTime, nullable=False)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+
+class ShiftSummaryDB(KpiColumnsMixin, Base):
+    """
+    Műszakonkénti összesítő a konfigurálható műszaknaptár (SHIFT_START_HOURS) alapján.
+    Az éjszakás műszak átnyúlik a következő napra, ezért a 'date' mező
+    mindig a műszak kezdőnapját jelöli.
+    """
+    __tablename__ = "shift_summaries"
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False, index=True)
+    shift_name = Column(String(10), nullable=False)
+    period_start = Column(DateTime, nullable=False, index=True)
+    period_end = Column(DateTime, nullable=False)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+
+class KpiRollupDB(Base):
+    """
+    Heti, havi és éves összesítők (period_type: week / month / year).
+    Csak additív komponenseket tárol, az arányszámok (OEE, fajlagos mutatók)
+    olvasáskor számolódnak, így az időszakok helyesen összegezhetők.
+    A napi összesítő minden változásakor inkrementálisan frissül.
+    """
+    __tablename__ = "kpi_rollups"
+    __table_args__ = (UniqueConstraint("machine_id", "period_type", "period_start"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+    period_type = Column(String(10), nullable=False)
+    period_start = Column(Date, nullable=False, index=True)
+    
+    # --- IDŐ KOMPONENSEK ---
+    run_seconds = Column(Float, default=0.0)
+    total_seconds = Column(Float, default=0.0)
+    downtime_min = Column(Float, default=0.0)
+    break_count = Column(Float, default=0.0)
+    
+    # --- MENNYISÉGI KOMPONENSEK (Tonna) ---
+    total_tons = Column(Float, default=0.0)
+    good_tons = Column(Float, default=0.0)
+    scrap_tons = Column(Float, default=0.0)
+    target_tons = Column(Float, default=0.0)
+    speed_tons_sum = Column(Float, default=0.0)
+    
+    # --- KÖZMŰ KOMPONENSEK ---
+    electricity_kwh = Column(Float, default=0.0)
+    water_m3 = Column(Float, default=0.0)
+    steam_tons = Column(Float, default=0.0)
+    fiber_tons = Column(Float, default=0.0)
+    
+    day_count = Column(Float, default=0.0)
+
+class ReliabilityStatsDB(Base):
+    """
+    Gördülő ablakos megbízhatósági komponensek (pl. 7/30/90 nap) gépenként és naponként.
+    Egy sor a [date - window_days + 1, date] időszak összegeit tárolja; a mutatók
+    (MTBF, MTTR, szakadás / 1000 t) olvasáskor számolódnak ezekből.
+    """
+    __tablename__ = "reliability_stats"
+    __table_args__ = (UniqueConstraint("machine_id", "date", "window_days"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+    date = Column(Date, nullable=False, index=True)
+    window_days = Column(Integer, nullable=False)
+    
+    run_seconds = Column(Float, default=0.0)
+    break_count = Column(Float, default=0.0)
+    break_downtime_min = Column(Float, default=0.0)
+    total_tons = Column(Float, default=0.0)
+    day_count = Column(Float, default=0.0)
+
+class QualityStatsDB(Base):
+    """
+    Napi SPC akkumulátorok (Welford) gépenként, termékenként és mérési metrikánként.
+    Összefésülhetők, így bármely időszak statisztikája számolható a nyers mérések nélkül.
+    """
+    __tablename__ = "quality_stats"
+    __table_args__ = (UniqueConstraint("machine_id", "article_id", "date", "metric"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+    article_id = Column(String(50), ForeignKey("articles.id"))
+    date = Column(Date, nullable=False, index=True)
+    metric = Column(String(20), nullable=False)
+    
+    count = Column(Integer, default=0)
+    mean = Column(Float, default=0.0)
+    m2 = Column(Float, default=0.0)
+    min_value = Column(Float)
+    max_value = Column(Float)
+
+class DataVersionDB(Base):
+    """
+    Adatverzió gépenként és naponként.
+    A pipeline minden sikeres szinkronizáció után növeli az érintett kulcsok verzióját,
+    így a Dashboard gyorsítótára csak az elavult bejegyzéseket érvényteleníti.
+    """
+    __tablename__ = "data_versions"
+    __table_args__ = (UniqueConstraint("machine_id", "date"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"))
+    date = Column(Date, nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+class SyncedDayDB(Base):
+    """
+    Szinkronizált napok katalógusa gépenként.
+    A pipeline minden eseménybetöltéskor frissíti, így az elérhetőség
+    az eseménytábla átvizsgálása nélkül lekérdezhető.
+    """
+    __tablename__ = "synced_days"
+    __table_args__ = (UniqueConstraint("machine_id", "date"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"), index=True)
+    date = Column(Date, nullable=False, index=True)
+    event_count = Column(Integer, default=0)
+    first_event = Column(DateTime)
+    last_event = Column(DateTime)
+    synced_at = Column(DateTime)
+
+class MachineDataStatsDB(Base):
+    """
+    Gépenkénti adat-elérhetőségi statisztika (első/utolsó esemény, darabszám, szinkronizált napok).
+    A synced_days katalógusból számoljuk, az oldalsáv konstans időben olvassa.
+    """
+    __tablename__ = "machine_data_stats"
+    
+    machine_id = Column(String(5), ForeignKey("machines.id"), primary_key=True)
+    first_event = Column(DateTime)
+    last_event = Column(DateTime)
+    event_count = Column(Integer, default=0)
+    synced_days = Column(Integer, default=0)
+    last_synced_at = Column(DateTime)
+
+class StaleDayDB(Base):
+    """
+    Elavult (újraszinkronizálandó) napok listája.
+    A reconciliation job tölti fel a MES forrás és a riport adatbázis napi
+    eseményszámainak / utolsó időbélyegeinek összevetésével.
+    """
+    __tablename__ = "stale_days"
+    __table_args__ = (UniqueConstraint("machine_id", "date"),)
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"), index=True)
+    date = Column(Date, nullable=False, index=True)
+    reason = Column(String(20))  # missing, count, newer, extra
+    source_count = Column(Integer)
+    target_count = Column(Integer)
+    source_last_event = Column(DateTime)
+    target_last_event = Column(DateTime)
+    detected_at = Column(DateTime)
+
+class SyncJobDB(Base):
+    """
+    Háttérben futó szinkronizációs feladat (job).
+    A Dashboard innen követi a futás állapotát és előrehaladását, a napi
+    futásidőket JSON listaként tároljuk (day_timings).
+    """
+    __tablename__ = "sync_jobs"
+    
+    id = Column(Integer, primary_key=True)
+    machine_id = Column(String(5), ForeignKey("machines.id"), nullable=True)  # None = minden gép
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    status = Column(String(10), nullable=False, index=True)  # queued, running, done, failed, cancelled
+    progress = Column(Float, default=0.0)                    # 0.0 - 1.0
+    current_day = Column(Date)
+    day_timings = Column(Text)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
 
 # --- VALIDÁTOR ÉS ADATÁTVITELI MODELLEK (PYDANTIC) ---
 
@@ -228,6 +435,7 @@ class DailySummary(BaseModel):
     target_tons: Optional[float] = 0.0
     total_downtime_min: Optional[float] = 0.0
     break_count: Optional[int] = 0
+    break_downtime_min: Optional[float] = 0.0
     avg_speed_m_min: Optional[float] = 0.0
     target_speed_m_min: Optional[float] = 0.0
     avg_moisture_pct: Optional[float] = 0.0
@@ -236,4 +444,32 @@ class DailySummary(BaseModel):
     spec_water_m3_t: Optional[float] = 0.0
     spec_steam_t_t: Optional[float] = 0.0
     spec_fiber_t_t: Optional[float] = 0.0
+    run_time_sec: Optional[float] = 0.0
+    total_time_sec: Optional[float] = 0.0
+    electricity_kwh: Optional[float] = 0.0
+    water_m3: Optional[float] = 0.0
+    steam_tons: Optional[float] = 0.0
+    fiber_tons: Optional[float] = 0.0
     model_config = ConfigDict(from_attributes=True)
+
+class PeriodSummary(DailySummary):
+    """Állapot-validált óránkénti vagy műszakos KPI összesítő."""
+    period_start: datetime
+    period_end: datetime
+    shift_name: Optional[str] = None
+
+class SyncJob(BaseModel):
+    """Szinkronizációs feladat állapota a megjelenítéshez."""
+    id: int
+    machine_id: Optional[str] = None
+    start_date: date
+    end_date: date
+    status: str
+    progress: float = 0.0
+    current_day: Optional[date] = None
+    day_timings: List[dict] = []
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
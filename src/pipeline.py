@@ -12,11 +12,14 @@ from typing import List, Dict, Any, Optional
 from .extractors.events_extractor import EventsExtractor
 from .extractors.excel_reader import ExcelReader
 from .transformers.production_metrics import MetricsCalculator
+from .transformers.spc import build_daily_accumulators
+from .catalog import record_synced_day
+from .reconciliation import get_stale_days, get_stale_reason
 from .database import get_db
 from .models import (
     ProductionEventDB, ProductionPlanDB, 
-    QualityDataDB, UtilityConsumptionDB,
-    MachineDB, ProductionEvent, DailySummaryDB
+    QualityDataDB, UtilityConsumptionDB, QualityStatsDB,
+    MachineDB, ProductionEvent, DailySummaryDB, DataVersionDB
 )
 
 logger = logging.getLogger(__name__)
@@ -43,6 +46,7 @@ class Pipeline:
         1. Excel adatok beolvasása (Terv, Labor, Közmű).
         2. MES események lekérése a forrás adatbázisból.
         3. KPI mutatók újraszámolása és az összesítő tábla frissítése.
+        4. Az érintett (gép, nap) kulcsok adatverziójának növelése (gyorsítótár érvénytelenítés).
         
         Args:
             target_date: A feldolgozandó dátum.
@@ -55,11 +59,37 @@ class Pipeline:
             self._load_excel_data(target_date)
             self._load_production_events(target_date, target_machine_id)
             self._update_daily_summaries(target_date, target_machine_id)
+            self._bump_data_versions(target_date, target_machine_id)
             logger.info(f"ETL folyamat sikeresen befejeződött: {target_date}")
         except Exception as e:
             logger.error(f"Pipeline hiba a folyamat során: {str(e)}")
             raise
 
+    def run_stale_days(self, machine_id: Optional[str] = None, limit: Optional[int] = None) -> int:
+        """
+        Az egyeztetés (reconciliation) által elavultnak jelölt napok újraszinkronizálása.
+        A sikeresen betöltött napok az eseménymentéskor lekerülnek a listáról,
+        a hibás napok a listán maradnak a következő futásig.
+        
+        Args:
+            machine_id: (Opcionális) Csak ennek a gépnek a napjait dolgozza fel.
+            limit: (Opcionális) Legfeljebb ennyi napot dolgoz fel egy futásban.
+            
+        Returns:
+            int: A sikeresen újraszinkronizált napok száma.
+        """
+        stale = get_stale_days(machine_id, limit)
+        logger.info(f"Elavult napok újraszinkronizálása: {len(stale)} nap")
+        
+        synced = 0
+        for stale_machine_id, stale_date in stale:
+            try:
+                self.run_full_load(target_date=stale_date, target_machine_id=stale_machine_id)
+                synced += 1
+            except Exception as e:
+                logger.error(f"Elavult nap szinkronizálása sikertelen ({stale_machine_id}, {stale_date}): {str(e)}")
+        return synced
+
     def _get_active_machines(self) -> List[str]:
         """Lekéri az adatbázisban regisztrált aktív gépek azonosítóit."""
         with get_db() as db:
@@ -83,13 +113,17 @@ class Pipeline:
             if events:
                 self._save_events(events)
                 logger.debug(f"Betöltve {len(events)} esemény: {machine_id}")
+            elif get_stale_reason(machine_id, target_date) == "extra":
+                # Az egyeztetés szerint a forrásban nincs esemény, a riport adatbázisban igen
+                self._clear_events(machine_id, target_date)
             else:
                 logger.warning(f"Nem található esemény: {machine_id} | {target_date}")
 
     def _save_events(self, events: List[ProductionEvent]) -> None:
         """
         Események mentése az adatbázisba. 
-        Gondoskodik a régi adatok törléséről az adott napra/gépre.
+        Gondoskodik a régi adatok törléséről az adott napra/gépre,
+        és rögzíti a napot az elérhetőségi katalógusban.
         """
         if not events:
             return
@@ -112,8 +146,24 @@ class Pipeline:
                 event_data = event.model_dump()
                 db.add(ProductionEventDB(**event_data))
             
+            # Elérhetőségi katalógus frissítése (ugyanabban a tranzakcióban)
+            record_synced_day(db, machine_id, target_date, events)
             logger.info(f"Eseménynapló frissítve: {machine_id} | {target_date}")
     
+    def _clear_events(self, machine_id: str, target_date: date) -> None:
+        """
+        A forrásból eltűnt nap eseményeinek törlése a riport adatbázisból.
+        A katalógusba üres napként kerül, így lekerül az elavult napok listájáról is.
+        """
+        with get_db() as db:
+            deleted = db.query(ProductionEventDB).filter(
+                ProductionEventDB.machine_id == machine_id,
+                ProductionEventDB.timestamp >= datetime.combine(target_date, datetime.min.time()),
+                ProductionEventDB.timestamp <= datetime.combine(target_date, datetime.max.time())
+            ).delete()
+            record_synced_day(db, machine_id, target_date, [])
+            logger.info(f"Forrásban nem szereplő események törölve: {machine_id} | {target_date} ({deleted} db)")
+    
     def _load_excel_data(self, target_date: date) -> None:
         """Az összes Excel típusú forrásfájl beolvasása és mentése az adott napra."""
         
@@ -147,7 +197,10 @@ class Pipeline:
             logger.info(f"Tervezési adatok (Planning) szinkronizálva: {len(plans)} rekord")
     
     def _save_quality(self, measurements: List[Dict[str, Any]]) -> None:
-        """Minőségi adatok (labor) mentése Upsert logikával."""
+        """
+        Minőségi adatok (labor) mentése Upsert logikával.
+        Ugyanebben a tranzakcióban frissülnek a napi SPC akkumulátorok is.
+        """
         if not measurements: return
         
         to_clear = set((m['machine_id'], m['timestamp'].date()) for m in measurements)
@@ -161,9 +214,21 @@ class Pipeline:
                     QualityDataDB.timestamp >= start,
                     QualityDataDB.timestamp <= end
                 ).delete()
+                db.query(QualityStatsDB).filter(
+                    QualityStatsDB.machine_id == machine_id,
+                    QualityStatsDB.date == q_date
+                ).delete()
                 
             for measurement in measurements:
                 db.add(QualityDataDB(**measurement))
+            
+            # A beolvasás a teljes napot cseréli, így az akkumulátor is a napi mérésekből épül
+            for (machine_id, article_id, q_date, metric), stats in build_daily_accumulators(measurements).items():
+                db.add(QualityStatsDB(
+                    machine_id=machine_id, article_id=article_id, date=q_date, metric=metric,
+                    count=stats.count, mean=stats.mean, m2=stats.m2,
+                    min_value=stats.min_value, max_value=stats.max_value
+                ))
             logger.info(f"Minőségi adatok (Quality) szinkronizálva: {len(measurements)} rekord")
     
     def _save_utilities(self, utilities: List[Dict[str, Any]]) -> None:
@@ -184,10 +249,46 @@ class Pipeline:
             logger.info(f"Közműadatok (Utilities) szinkronizálva: {len(utilities)} rekord")
 
     def _update_daily_summaries(self, target_date: date, target_machine_id: Optional[str] = None) -> None:
-        """KPI mutatók újraszámolása és mentése az összesítő táblába."""
+        """
+        KPI mutatók újraszámolása és mentése az összesítő táblákba.
+        A napi, óránkénti és műszakos összesítők egyetlen kalkulációs menetben készülnek.
+        """
         machines = [target_machine_id] if target_machine_id else self._get_active_machines()
         for machine_id in machines:
-            summary = self.metrics_calculator.calculate_daily_metrics(machine_id, target_date)
+            summary, hourly, shifts = self.metrics_calculator.calculate_all_metrics(machine_id, target_date)
             if summary:
                 self.metrics_calculator.save_summary(summary)
+            else:
+                self.metrics_calculator.delete_summary(machine_id, target_date)
+            self.metrics_calculator.save_period_summaries(machine_id, target_date, hourly, shifts)
         logger.info(f"Napi összesítők frissítve: {target_date}")
+
+    def _bump_data_versions(self, target_date: date, target_machine_id: Optional[str] = None) -> None:
+        """
+        Növeli a szinkronizálás által átírt (gép, nap) kulcsok adatverzióját.
+        A Dashboard gyorsítótára ebből tudja, mely bejegyzései váltak elavulttá.
+
+        Átírt kulcsok: a szinkronizált nap, valamint az azt átfedő műszakok kezdőnapja (az előző
+        napon kezdődő éjszakás műszak sora az előző naphoz tartozik). A heti / havi / éves
+        összesítők és a gördülő megbízhatósági ablakok a szinkronizált nap változását veszik át;
+        ezek olvasói (ui.cache get_rollup_data, get_reliability_trend, get_kpi_trend, a periódus
+        jelentések) a teljes érintett dátumtartomány verzióját figyelik, ezért nem kell az
+        időszak minden napját növelni.
+        """
+        machines = [target_machine_id] if target_machine_id else self._get_active_machines()
+        shift_dates = {start.date() for _, start, _ in self.metrics_calculator.shift_calendar.shifts_overlapping(target_date)}
+        dates = sorted(shift_dates | {target_date})
+        now = datetime.now()
+        with get_db() as db:
+            for machine_id in machines:
+                for version_date in dates:
+                    row = db.query(DataVersionDB).filter(
+                        DataVersionDB.machine_id == machine_id,
+                        DataVersionDB.date == version_date
+                    ).first()
+                    if row:
+                        row.version += 1
+                        row.updated_at = now
+                    else:
+                        db.add(DataVersionDB(machine_id=machine_id, date=version_date, version=1, updated_at=now))
+        logger.debug(f"Adatverzió növelve: {', '.join(map(str, dates))} ({len(machines)} gép)")
@@ -0,0 +1,133 @@
+"""
+ADATEGYEZTETÉS (RECONCILIATION)
+===============================
+Elavult napok felderítése a MES forrás és a riport adatbázis összevetésével.
+Mindkét oldalon egyetlen aggregáló lekérdezés fut (napi eseményszám és utolsó
+időbélyeg gépenként), így egy év egyeztetése két lekérdezés, nem napi letöltések sora.
+
+Egy (gép, nap) kulcs elavult, ha:
+- missing: a forrásban van esemény, a riport adatbázisban nincs,
+- count: az eseményszámok eltérnek,
+- newer: a forrásban későbbi esemény szerepel, mint a betöltött utolsó,
+- extra: a riport adatbázisban van esemény, a forrásban nincs (pl. a MES-ben törölt nap).
+
+A két oldal napjainak unióját vetjük össze, így a csak a riport adatbázisban
+szereplő napok is felkerülnek a listára; újraszinkronizáláskor ezek eseményei törlődnek.
+
+Az eredmény a stale_days táblába kerül, ezt a Pipeline.run_stale_days dolgozza fel.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .database import get_db
+from .extractors.events_extractor import EventsExtractor, as_date
+from .models import ProductionEventDB, StaleDayDB
+
+logger = logging.getLogger(__name__)
+
+DayStats = Dict[Tuple[str, date], Tuple[int, Optional[datetime]]]
+
+def stale_reason(source: Optional[Tuple[int, Optional[datetime]]], target: Optional[Tuple[int, Optional[datetime]]]) -> Optional[str]:
+    """Egy (gép, nap) kulcs elavultságának oka, vagy None, ha a két oldal egyezik."""
+    if source is None:
+        return "extra"
+    if target is None:
+        return "missing"
+    if source[0] != target[0]:
+        return "count"
+    if source[1] and target[1] and source[1] > target[1]:
+        return "newer"
+    return None
+
+class Reconciler:
+    """
+    A forrás és a riport adatbázis napi szintű egyeztetője.
+    """
+
+    def __init__(self, extractor: Optional[EventsExtractor] = None) -> None:
+        """
+        Args:
+            extractor: A MES forrás kinyerője. Alapértelmezett: új EventsExtractor.
+        """
+        self.extractor = extractor or EventsExtractor()
+
+    def reconcile(self, start_date: date, end_date: date, machine_id: Optional[str] = None) -> List[Tuple[str, date, str]]:
+        """
+        Az időszak egyeztetése és az elavult napok listájának felülírása.
+
+        Args:
+            start_date: Az időszak első napja.
+            end_date: Az időszak utolsó napja.
+            machine_id: (Opcionális) Csak ezt a gépet egyezteti.
+
+        Returns:
+            List[Tuple]: A talált elavult napok (gép, nap, ok).
+        """
+        source = self.extractor.get_daily_event_stats(start_date, end_date, machine_id)
+        now = datetime.now()
+
+        with get_db() as db:
+            target = self._target_stats(db, start_date, end_date, machine_id)
+
+            stale = []
+            for m, day in sorted(source.keys() | target.keys()):
+                src, tgt = source.get((m, day)), target.get((m, day))
+                reason = stale_reason(src, tgt)
+                if reason is None:
+                    continue
+                stale.append(StaleDayDB(
+                    machine_id=m, date=day, reason=reason,
+                    source_count=src[0] if src else 0, target_count=tgt[0] if tgt else 0,
+                    source_last_event=src[1] if src else None, target_last_event=tgt[1] if tgt else None,
+                    detected_at=now
+                ))
+
+            # Az időszak korábbi eredményeinek felülírása (Upsert)
+            query = db.query(StaleDayDB).filter(StaleDayDB.date >= start_date, StaleDayDB.date <= end_date)
+            if machine_id:
+                query = query.filter(StaleDayDB.machine_id == machine_id)
+            query.delete(synchronize_session=False)
+            db.add_all(stale)
+            result = [(s.machine_id, s.date, s.reason) for s in stale]
+
+        logger.info(f"Egyeztetés kész: {start_date} - {end_date} | {len(source)} forrás nap, {len(target)} riport nap, {len(result)} elavult")
+        return result
+
+    def _target_stats(self, db: Session, start_date: date, end_date: date, machine_id: Optional[str]) -> DayStats:
+        """Napi eseményszám és utolsó időbélyeg a riport adatbázisból (egy GROUP BY lekérdezés)."""
+        day_col = func.date(ProductionEventDB.timestamp)
+        query = db.query(
+            ProductionEventDB.machine_id, day_col,
+            func.count(ProductionEventDB.id), func.max(ProductionEventDB.timestamp)
+        ).filter(
+            ProductionEventDB.timestamp >= datetime.combine(start_date, datetime.min.time()),
+            ProductionEventDB.timestamp <= datetime.combine(end_date, datetime.max.time())
+        )
+        if machine_id:
+            query = query.filter(ProductionEventDB.machine_id == machine_id)
+
+        return {
+            (m, as_date(d)): (count, last_event)
+            for m, d, count, last_event in query.group_by(ProductionEventDB.machine_id, day_col).all()
+        }
+
+def get_stale_days(machine_id: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[str, date]]:
+    """Az újraszinkronizálandó (gép, nap) kulcsok, a legrégebbi nappal kezdve."""
+    with get_db() as db:
+        query = db.query(StaleDayDB.machine_id, StaleDayDB.date)
+        if machine_id:
+            query = query.filter(StaleDayDB.machine_id == machine_id)
+        query = query.order_by(StaleDayDB.date, StaleDayDB.machine_id)
+        if limit:
+            query = query.limit(limit)
+        return [(m, d) for m, d in query.all()]
+
+def get_stale_reason(machine_id: str, day: date) -> Optional[str]:
+    """Egy (gép, nap) kulcs elavultságának oka, vagy None, ha nincs a listán."""
+    with get_db() as db:
+        row = db.query(StaleDayDB.reason).filter(StaleDayDB.machine_id == machine_id, StaleDayDB.date == day).first()
+        return row[0] if row else None
@@ -6,18 +6,24 @@ Felelős a nyers adatokból (események, közművek, labor) származó
 főbb teljesítménymutatók (OEE, fajlagos fogyasztások) kiszámításáért.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import logging
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..config import settings
 from ..database import get_db
 from ..models import (
     ProductionEventDB, ProductionPlanDB, 
     QualityDataDB, UtilityConsumptionDB, 
-    DailySummaryDB
+    DailySummaryDB, HourlySummaryDB, ShiftSummaryDB
 )
+from .shift_calendar import ShiftCalendar
+from .rollups import RollupCalculator, daily_components
+from .reliability import ReliabilityCalculator, reliability_components
 
 logger = logging.getLogger(__name__)
 
+UTILITY_FIELDS = ("electricity_kwh", "water_m3", "steam_tons", "fiber_tons")
+
 class MetricsCalculator:
     """
     KPI Kalkulátor osztály.
@@ -26,8 +32,10 @@ class MetricsCalculator:
     """
     
     def __init__(self) -> None:
-        """Kalkulátor inicializálása."""
-        pass
+        """Kalkulátor inicializálása a műszaknaptárral és az inkrementális összesítő karbantartókkal."""
+        self.shift_calendar = ShiftCalendar(settings.SHIFT_START_HOURS)
+        self.rollup_calculator = RollupCalculator()
+        self.reliability_calculator = ReliabilityCalculator(settings.RELIABILITY_WINDOWS)
 
     def calculate_daily_metrics(self, machine_id: str, target_date: date) -> Optional[DailySummaryDB]:
         """
@@ -47,133 +55,322 @@ class MetricsCalculator:
         Returns:
             Optional[DailySummaryDB]: A kiszámított mutatókat tartalmazó adatbázis rekord.
         """
+        summary, _, _ = self.calculate_all_metrics(machine_id, target_date)
+        return summary
+
+    def calculate_all_metrics(
+        self, machine_id: str, target_date: date
+    ) -> Tuple[Optional[DailySummaryDB], List[HourlySummaryDB], List[ShiftSummaryDB]]:
+        """
+        Egyetlen adatgyűjtési menetben számolja ki a napi, óránkénti és műszakos mutatókat.
+        
+        Az eseményeket a napot átfedő összes műszak idősávjára kérjük le (pl. előző nap 22:00-tól
+        következő nap 06:00-ig), így a késve érkező események az érintett éjszakás műszakot is frissítik.
+        Az események a kezdési időpontjuk szerint kerülnek a periódusokba, a napi összesítővel azonos módon.
+        A napi terv és közműadatok a periódus hosszával arányosan oszlanak szét.
+        
+        Returns:
+            Tuple: (napi összesítő vagy None, óránkénti összesítők, műszakos összesítők)
+        """
         logger.info(f"KPI kalkuláció indítása: {machine_id} | {target_date}")
         
+        day_start = datetime.combine(target_date, datetime.min.time())
+        day_end = datetime.combine(target_date, datetime.max.time())
+        shift_windows = self.shift_calendar.shifts_overlapping(target_date)
+        window_start = min([day_start] + [w[1] for w in shift_windows])
+        window_end = max([day_start + timedelta(days=1)] + [w[2] for w in shift_windows])
+        
         with get_db() as db:
-            # --- 1. ADATGYŰJTÉS ---
-            start_dt = datetime.combine(target_date, datetime.min.time())
-            end_dt = datetime.combine(target_date, datetime.max.time())
+            # --- 1. ADATGYŰJTÉS (a teljes műszakablakra) ---
             
-            # Minden esemény az adott napon
+            # Minden esemény az érintett idősávban
             events = db.query(ProductionEventDB).filter(
                 ProductionEventDB.machine_id == machine_id,
-                ProductionEventDB.timestamp >= start_dt,
-                ProductionEventDB.timestamp <= end_dt
+                ProductionEventDB.timestamp >= window_start,
+                ProductionEventDB.timestamp < window_end
             ).all()
             
             # Tervezési adatok (napi célok)
             plans = db.query(ProductionPlanDB).filter(
                 ProductionPlanDB.machine_id == machine_id,
-                ProductionPlanDB.date == target_date
+                ProductionPlanDB.date >= window_start.date(),
+                ProductionPlanDB.date <= window_end.date()
             ).all()
             
             # Közműfogyasztási adatok
-            utility = db.query(UtilityConsumptionDB).filter(
+            utilities = db.query(UtilityConsumptionDB).filter(
                 UtilityConsumptionDB.machine_id == machine_id,
-                UtilityConsumptionDB.date == target_date
-            ).first()
+                UtilityConsumptionDB.date >= window_start.date(),
+                UtilityConsumptionDB.date <= window_end.date()
+            ).all()
             
-            if not events:
-                logger.warning(f"Nem található termelési esemény: {machine_id} | {target_date}")
-                return None
-
-            # --- 2. TERMELÉSI ÖSSZESÍTŐK (TONNÁK) ---
+            # Laboratóriumi mérések
+            quality_measurements = db.query(QualityDataDB).filter(
+                QualityDataDB.machine_id == machine_id,
+                QualityDataDB.timestamp >= window_start,
+                QualityDataDB.timestamp < window_end
+            ).all()
             
-            run_events = [e for e in events if e.event_type == "RUN"]
-            total_tons = sum(e.weight_kg for e in run_events) / 1000.0 if run_events else 0.0
-            scrap_tons = sum(e.weight_kg for e in run_events if e.status == "SCRAP") / 1000.0 if run_events else 0.0
-            good_tons = total_tons - scrap_tons
+            # A számítás a munkameneten belül fut, amíg az ORM objektumok elérhetők
+            plans_by_date: Dict[date, List[ProductionPlanDB]] = {}
+            for p in plans:
+                plans_by_date.setdefault(p.date, []).append(p)
+            utilities_by_date = {u.date: u for u in utilities}
             
-            # Súlyozott átlagsebesség (Actual Speed)
-            if total_tons > 0:
-                weighted_actual_speed_sum = sum(e.average_speed * e.weight_kg for e in run_events)
-                avg_speed = weighted_actual_speed_sum / (total_tons * 1000.0)
+            # --- 2. NAPI ÖSSZESÍTŐ ---
+            summary = None
+            day_events = [e for e in events if day_start <= e.timestamp <= day_end]
+            if day_events:
+                day_quality = [q for q in quality_measurements if day_start <= q.timestamp <= day_end]
+                target_tons, target_speed = self._period_targets(plans_by_date, day_start, day_start + timedelta(days=1))
+                utility = self._period_utilities(utilities_by_date, day_start, day_start + timedelta(days=1))
+                summary = DailySummaryDB(
+                    date=target_date,
+                    machine_id=machine_id,
+                    **self._compute_kpis(day_events, target_tons, target_speed, utility, day_quality)
+                )
             else:
-                avg_speed = 0.0
-            
-            # --- 3. IDŐ ÉS HATÉKONYSÁG ---
+                logger.warning(f"Nem található termelési esemény: {machine_id} | {target_date}")
             
-            total_time_sec = sum(e.duration_seconds for e in events) or 1
-            run_time_sec = sum(e.duration_seconds for e in run_events)
-            downtime_sec = sum(e.duration_seconds for e in events if e.event_type in ["STOP", "BREAK"])
-            break_count = len([e for e in events if e.event_type == "BREAK"])
+            # --- 3. ÓRÁNKÉNTI ÉS MŰSZAKOS ÖSSZESÍTŐK ---
+            hourly = [
+                HourlySummaryDB(date=target_date, machine_id=machine_id, period_start=start, period_end=end, **kpis)
+                for start, end, kpis in self._period_kpis(
+                    self.shift_calendar.hours(target_date), events, quality_measurements, plans_by_date, utilities_by_date
+                )
+            ]
+            shifts = [
+                ShiftSummaryDB(
+                    date=start.date(), shift_name=self._shift_name(shift_windows, start),
+                    machine_id=machine_id, period_start=start, period_end=end, **kpis
+                )
+                for start, end, kpis in self._period_kpis(
+                    [(w[1], w[2]) for w in shift_windows], events, quality_measurements, plans_by_date, utilities_by_date
+                )
+            ]
             
-            # Tervezett tonna és tervezett sebesség (súlyozva)
-            target_tons = sum(p.target_quantity_tons for p in plans) if plans else 0.0
-            if target_tons > 0:
-                weighted_target_speed_sum = sum(p.target_speed * p.target_quantity_tons for p in plans)
-                target_speed = weighted_target_speed_sum / target_tons
+            return summary, hourly, shifts
+
+    @staticmethod
+    def _shift_name(shift_windows: List[Tuple[str, datetime, datetime]], start: datetime) -> str:
+        """A kezdési időponthoz tartozó műszak neve."""
+        return next(name for name, s, _ in shift_windows if s == start)
+
+    def _period_kpis(
+        self, windows: List[Tuple[datetime, datetime]], events: List[ProductionEventDB],
+        quality_measurements: List[QualityDataDB], plans_by_date: Dict[date, List[ProductionPlanDB]],
+        utilities_by_date: Dict[date, UtilityConsumptionDB]
+    ) -> Iterator[Tuple[datetime, datetime, Dict[str, Any]]]:
+        """Kiszámítja a KPI-okat minden olyan időablakra, amelyben történt esemény."""
+        for start, end in windows:
+            period_events = [e for e in events if start <= e.timestamp < end]
+            if not period_events:
+                continue
+            period_quality = [q for q in quality_measurements if start <= q.timestamp < end]
+            target_tons, target_speed = self._period_targets(plans_by_date, start, end)
+            utility = self._period_utilities(utilities_by_date, start, end)
+            yield start, end, self._compute_kpis(period_events, target_tons, target_speed, utility, period_quality)
+
+    @staticmethod
+    def _day_fractions(start: datetime, end: datetime) -> List[Tuple[date, float]]:
+        """Megadja, hogy az időablak az egyes napok hányad részét fedi le."""
+        fractions = []
+        day = start.date()
+        while datetime.combine(day, datetime.min.time()) < end:
+            d_start = datetime.combine(day, datetime.min.time())
+            d_end = d_start + timedelta(days=1)
+            overlap = (min(end, d_end) - max(start, d_start)).total_seconds()
+            if overlap > 0:
+                fractions.append((day, overlap / 86400.0))
+            day += timedelta(days=1)
+        return fractions
+
+    def _period_targets(self, plans_by_date: Dict[date, List[ProductionPlanDB]], start: datetime, end: datetime) -> Tuple[float, float]:
+        """Időarányos tervezett tonna és tervezett sebesség (súlyozva) az időablakra."""
+        target_tons = 0.0
+        weighted_speed_sum = 0.0
+        fallback_speeds = []
+        for day, fraction in self._day_fractions(start, end):
+            plans = plans_by_date.get(day, [])
+            if not plans:
+                continue
+            day_tons = sum(p.target_quantity_tons for p in plans)
+            if day_tons > 0:
+                day_speed = sum(p.target_speed * p.target_quantity_tons for p in plans) / day_tons
             else:
-                target_speed = (sum(p.target_speed for p in plans) / len(plans)) if plans else 0.0
-            
-            # --- 4. OEE KOMPONENSEK SZÁMÍTÁSA ---
-            
-            # A) Rendelkezésre állás (Availability) = Hasznos idő / Naptári idő
-            avail_pct = (run_time_sec / total_time_sec * 100.0)
-            
-            # B) Teljesítmény (Performance) = Tényleges Tonna / Tervezett Tonna
-            perf_pct = (total_tons / target_tons * 100.0) if target_tons > 0 else 0.0
-            # A teljesítmény nem haladhatja meg a 100%-ot a standard OEE modellben
-            if perf_pct > 100.0: perf_pct = 100.0 
-            
-            # C) Minőség (Quality) = Jó Tonna / Összes Termelt Tonna
-            qual_pct = (good_tons / total_tons * 100.0) if total_tons > 0 else 0.0
-            
-            # Végleges OEE = A * P * Q
-            oee_pct = (avail_pct/100.0 * perf_pct/100.0 * qual_pct/100.0) * 100.0
-            
-            # --- 5. MINŐSÉGI ÁTLAGOK ---
-            
-            quality_measurements = db.query(QualityDataDB).filter(
-                QualityDataDB.machine_id == machine_id,
-                QualityDataDB.timestamp >= start_dt,
-                QualityDataDB.timestamp <= end_dt
-            ).all()
-            
-            avg_moisture = sum(q.moisture_pct for q in quality_measurements) / len(quality_measurements) if quality_measurements else 0.0
-            avg_gsm = sum(q.gsm_measured for q in quality_measurements) / len(quality_measurements) if quality_measurements else 0.0
+                day_speed = sum(p.target_speed for p in plans) / len(plans)
+            target_tons += day_tons * fraction
+            weighted_speed_sum += day_speed * day_tons * fraction
+            fallback_speeds.append(day_speed)
+        
+        if target_tons > 0:
+            target_speed = weighted_speed_sum / target_tons
+        else:
+            target_speed = (sum(fallback_speeds) / len(fallback_speeds)) if fallback_speeds else 0.0
+        return target_tons, target_speed
 
-            # --- 6. FAJLAGOS KÖZMŰ ÉS ALAPANYAG MUTATÓK ---
-            
-            # A mutatók egy tonna késztermékre (Total Tons) vetítve értendők
-            spec_elec = (utility.electricity_kwh / total_tons) if utility and total_tons > 0 else 0.0
-            spec_water = (utility.water_m3 / total_tons) if utility and total_tons > 0 else 0.0
-            spec_steam = (utility.steam_tons / total_tons) if utility and total_tons > 0 else 0.0
-            spec_fiber = (utility.fiber_tons / total_tons) if utility and total_tons > 0 else 0.0
-            
-            # --- EREDMÉNY OBJEKTUM ÖSSZEÁLLÍTÁSA ---
-            return DailySummaryDB(
-                date=target_date,
-                machine_id=machine_id,
-                oee_pct=round(oee_pct, 2),
-                availability_pct=round(avail_pct, 2),
-                performance_pct=round(perf_pct, 2),
-                quality_pct=round(qual_pct, 2),
-                total_tons=round(total_tons, 2),
-                good_tons=round(good_tons, 2),
-                scrap_tons=round(scrap_tons, 2),
-                target_tons=round(target_tons, 2),
-                total_downtime_min=round(downtime_sec / 60.0, 1),
-                break_count=break_count,
-                avg_speed_m_min=round(avg_speed, 1),
-                target_speed_m_min=round(target_speed, 1),
-                avg_moisture_pct=round(avg_moisture, 2),
-                avg_gsm_measured=round(avg_gsm, 1),
-                spec_electricity_kwh_t=round(spec_elec, 2),
-                spec_water_m3_t=round(spec_water, 2),
-                spec_steam_t_t=round(spec_steam, 2),
-                spec_fiber_t_t=round(spec_fiber, 2)
-            )
+    def _period_utilities(self, utilities_by_date: Dict[date, UtilityConsumptionDB], start: datetime, end: datetime) -> Optional[Dict[str, float]]:
+        """Időarányos közműfogyasztás az időablakra (None, ha nincs közműadat)."""
+        totals = {f: 0.0 for f in UTILITY_FIELDS}
+        found = False
+        for day, fraction in self._day_fractions(start, end):
+            utility = utilities_by_date.get(day)
+            if utility is None:
+                continue
+            found = True
+            for f in UTILITY_FIELDS:
+                totals[f] += (getattr(utility, f) or 0.0) * fraction
+        return totals if found else None
+
+    def _compute_kpis(
+        self, events: List[ProductionEventDB], target_tons: float, target_speed: float,
+        utility: Optional[Dict[str, float]], quality_measurements: List[QualityDataDB]
+    ) -> Dict[str, Any]:
+        """
+        A KPI mutatók kiszámítása egy tetszőleges időszak eseményeiből.
+        A napi, műszakos és óránkénti összesítők mind ezt a logikát használják.
+        """
+        # --- TERMELÉSI ÖSSZESÍTŐK (TONNÁK) ---
+        
+        run_events = [e for e in events if e.event_type == "RUN"]
+        total_tons = sum(e.weight_kg for e in run_events) / 1000.0 if run_events else 0.0
+        scrap_tons = sum(e.weight_kg for e in run_events if e.status == "SCRAP") / 1000.0 if run_events else 0.0
+        good_tons = total_tons - scrap_tons
+        
+        # Súlyozott átlagsebesség (Actual Speed)
+        if total_tons > 0:
+            weighted_actual_speed_sum = sum(e.average_speed * e.weight_kg for e in run_events)
+            avg_speed = weighted_actual_speed_sum / (total_tons * 1000.0)
+        else:
+            avg_speed = 0.0
+        
+        # --- IDŐ ÉS HATÉKONYSÁG ---
+        
+        total_time_sec = sum(e.duration_seconds for e in events) or 1
+        run_time_sec = sum(e.duration_seconds for e in run_events)
+        downtime_sec = sum(e.duration_seconds for e in events if e.event_type in ["STOP", "BREAK"])
+        break_count = len([e for e in events if e.event_type == "BREAK"])
+        break_downtime_sec = sum(e.duration_seconds for e in events if e.event_type == "BREAK")
+        
+        # --- OEE KOMPONENSEK SZÁMÍTÁSA ---
+        
+        # A) Rendelkezésre állás (Availability) = Hasznos idő / Naptári idő
+        avail_pct = (run_time_sec / total_time_sec * 100.0)
+        
+        # B) Teljesítmény (Performance) = Tényleges Tonna / Tervezett Tonna
+        perf_pct = (total_tons / target_tons * 100.0) if target_tons > 0 else 0.0
+        # A teljesítmény nem haladhatja meg a 100%-ot a standard OEE modellben
+        if perf_pct > 100.0: perf_pct = 100.0 
+        
+        # C) Minőség (Quality) = Jó Tonna / Összes Termelt Tonna
+        qual_pct = (good_tons / total_tons * 100.0) if total_tons > 0 else 0.0
+        
+        # Végleges OEE = A * P * Q
+        oee_pct = (avail_pct/100.0 * perf_pct/100.0 * qual_pct/100.0) * 100.0
+        
+        # --- MINŐSÉGI ÁTLAGOK ---
+        
+        avg_moisture = sum(q.moisture_pct for q in quality_measurements) / len(quality_measurements) if quality_measurements else 0.0
+        avg_gsm = sum(q.gsm_measured for q in quality_measurements) / len(quality_measurements) if quality_measurements else 0.0
+
+        # --- FAJLAGOS KÖZMŰ ÉS ALAPANYAG MUTATÓK ---
+        
+        # A mutatók egy tonna késztermékre (Total Tons) vetítve értendők
+        spec_elec = (utility["electricity_kwh"] / total_tons) if utility and total_tons > 0 else 0.0
+        spec_water = (utility["water_m3"] / total_tons) if utility and total_tons > 0 else 0.0
+        spec_steam = (utility["steam_tons"] / total_tons) if utility and total_tons > 0 else 0.0
+        spec_fiber = (utility["fiber_tons"] / total_tons) if utility and total_tons > 0 else 0.0
+        
+        return dict(
+            oee_pct=round(oee_pct, 2),
+            availability_pct=round(avail_pct, 2),
+            performance_pct=round(perf_pct, 2),
+            quality_pct=round(qual_pct, 2),
+            total_tons=round(total_tons, 2),
+            good_tons=round(good_tons, 2),
+            scrap_tons=round(scrap_tons, 2),
+            target_tons=round(target_tons, 2),
+            total_downtime_min=round(downtime_sec / 60.0, 1),
+            break_count=break_count,
+            break_downtime_min=round(break_downtime_sec / 60.0, 1),
+            avg_speed_m_min=round(avg_speed, 1),
+            target_speed_m_min=round(target_speed, 1),
+            avg_moisture_pct=round(avg_moisture, 2),
+            avg_gsm_measured=round(avg_gsm, 1),
+            spec_electricity_kwh_t=round(spec_elec, 2),
+            spec_water_m3_t=round(spec_water, 2),
+            spec_steam_t_t=round(spec_steam, 2),
+            spec_fiber_t_t=round(spec_fiber, 2),
+            run_time_sec=float(run_time_sec),
+            total_time_sec=float(sum(e.duration_seconds for e in events)),
+            electricity_kwh=round(utility["electricity_kwh"], 2) if utility else 0.0,
+            water_m3=round(utility["water_m3"], 2) if utility else 0.0,
+            steam_tons=round(utility["steam_tons"], 3) if utility else 0.0,
+            fiber_tons=round(utility["fiber_tons"], 3) if utility else 0.0
+        )
 
     def save_summary(self, summary: DailySummaryDB) -> None:
         """
         Elmenti vagy frissíti a kiszámított napi összefoglalót.
         Gondoskodik az adatok konzisztenciájáról (Upsert logika).
+        Ugyanabban a tranzakcióban a régi és új sor különbségét átvezeti
+        a heti, havi és éves összesítőkre, valamint a gördülő megbízhatósági ablakokra is.
+        """
+        self._replace_summary(summary.machine_id, summary.date, summary)
+        logger.info(f"Napi riport mentve: {summary.machine_id} | {summary.date}")
+
+    def delete_summary(self, machine_id: str, target_date: date) -> None:
+        """
+        Törli egy esemény nélkül maradt nap összefoglalóját (pl. a MES-ben törölt nap).
+        A kieső sort az időszakos összesítők és a gördülő ablakok is levonják.
         """
+        if self._replace_summary(machine_id, target_date, None):
+            logger.info(f"Napi riport törölve: {machine_id} | {target_date}")
+
+    def _replace_summary(self, machine_id: str, target_date: date, summary: Optional[DailySummaryDB]) -> bool:
+        """A napi sor cseréje (None: törlés) és a különbség átvezetése; False, ha nem volt mit törölni."""
         with get_db() as db:
+            previous = db.query(DailySummaryDB).filter(
+                DailySummaryDB.date == target_date,
+                DailySummaryDB.machine_id == machine_id
+            ).first()
+            if previous is None and summary is None:
+                return False
+            old_components = daily_components(previous)
+            old_reliability = reliability_components(previous)
+            
             db.query(DailySummaryDB).filter(
-                DailySummaryDB.date == summary.date,
-                DailySummaryDB.machine_id == summary.machine_id
+                DailySummaryDB.date == target_date,
+                DailySummaryDB.machine_id == machine_id
+            ).delete()
+            if summary is not None:
+                db.add(summary)
+            self.rollup_calculator.apply_daily_change(
+                db, machine_id, target_date, old_components, daily_components(summary)
+            )
+            self.reliability_calculator.apply_daily_change(
+                db, machine_id, target_date, old_reliability, reliability_components(summary)
+            )
+            return True
+
+    def save_period_summaries(
+        self, machine_id: str, target_date: date,
+        hourly: List[HourlySummaryDB], shifts: List[ShiftSummaryDB]
+    ) -> None:
+        """
+        Elmenti az adott nap óránkénti és az azt átfedő műszakok összesítőit (Upsert logika).
+        Csak az érintett kulcsok törlődnek, így a késve érkező események
+        inkrementálisan frissítik a korábbi (pl. éjszakás) műszakot.
+        """
+        shift_starts = [w[1] for w in self.shift_calendar.shifts_overlapping(target_date)]
+        with get_db() as db:
+            db.query(HourlySummaryDB).filter(
+                HourlySummaryDB.machine_id == machine_id,
+                HourlySummaryDB.date == target_date
             ).delete()
-            db.add(summary)
-            logger.info(f"Napi riport mentve: {summary.machine_id} | {summary.date}")
+            db.query(ShiftSummaryDB).filter(
+                ShiftSummaryDB.machine_id == machine_id,
+                ShiftSummaryDB.period_start.in_(shift_starts)
+            ).delete(synchronize_session=False)
+            db.add_all(hourly + shifts)
+            logger.info(f"Óránkénti és műszakos összesítők mentve: {machine_id} | {target_date} ({len(hourly)} óra, {len(shifts)} műszak)")
@@ -0,0 +1,127 @@
+"""
+MEGBÍZHATÓSÁGI MUTATÓK (RELIABILITY KPIs)
+=========================================
+Gördülő ablakos (pl. 7/30/90 napos) megbízhatósági mutatók gépenként:
+- MTBF: Átlagos üzemidő két szakadás között (óra).
+- MTTR: Átlagos helyreállítási idő szakadásonként (perc).
+- Szakadás / 1000 t: Szakadások száma ezer tonna termelésre vetítve.
+
+Az ablakok összegeit csúszóablakos módszerrel tartjuk karban: minden napi
+összesítő változásakor csak a különbséget vezetjük át az érintett sorokra,
+a nyers eseményeket nem olvassuk újra.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models import DailySummaryDB, ReliabilityStatsDB
+
+logger = logging.getLogger(__name__)
+
+# Ablak oszlop -> napi összesítő mezője
+RELIABILITY_FIELDS = {
+    "run_seconds": "run_time_sec",
+    "break_count": "break_count",
+    "break_downtime_min": "break_downtime_min",
+    "total_tons": "total_tons",
+}
+
+def reliability_components(summary: Optional[DailySummaryDB]) -> Dict[str, float]:
+    """Kinyeri egy napi összesítő megbízhatósági komponenseit (hiányzó nap = nullák)."""
+    if summary is None:
+        return {**{field: 0.0 for field in RELIABILITY_FIELDS}, "day_count": 0.0}
+    values = {field: float(getattr(summary, source) or 0.0) for field, source in RELIABILITY_FIELDS.items()}
+    values["day_count"] = 1.0
+    return values
+
+def derive_reliability(row: Any) -> Dict[str, Optional[float]]:
+    """
+    MTBF, MTTR és szakadási ráta számítása egy ablak összegeiből.
+    Szakadás nélküli ablakban az MTBF és MTTR nem értelmezett (None).
+    """
+    breaks = row.break_count or 0.0
+    tons = row.total_tons or 0.0
+    return {
+        "mtbf_h": (row.run_seconds / 3600.0 / breaks) if breaks > 0 else None,
+        "mttr_min": (row.break_downtime_min / breaks) if breaks > 0 else None,
+        "breaks_per_kt": (breaks / (tons / 1000.0)) if tons > 0 else None,
+    }
+
+class ReliabilityCalculator:
+    """
+    A gördülő ablakos megbízhatósági sorok inkrementális karbantartója.
+    """
+
+    def __init__(self, windows: Optional[List[int]] = None) -> None:
+        """
+        Args:
+            windows: Az ablakok hossza napokban. Alapértelmezett: [7, 30, 90].
+        """
+        self.windows = sorted(set(windows or [7, 30, 90]))
+
+    def apply_daily_change(
+        self, db: Session, machine_id: str, day: date,
+        old: Dict[str, float], new: Dict[str, float]
+    ) -> None:
+        """
+        Egy napi összesítő változásának átvezetése a gördülő ablakokra.
+
+        1. A nap minden olyan meglévő ablakát, amely tartalmazza (day ... day + w - 1),
+           a különbséggel frissíti.
+        2. Ha a napnak még nincs saját sora, az előző nap ablakából csúsztatja
+           (+ új nap, - kieső nap), ennek hiányában a napi összesítőkből összegzi.
+        """
+        delta = {field: new[field] - old[field] for field in new}
+
+        for window in self.windows:
+            rows = db.query(ReliabilityStatsDB).filter(
+                ReliabilityStatsDB.machine_id == machine_id,
+                ReliabilityStatsDB.window_days == window,
+                ReliabilityStatsDB.date >= day,
+                ReliabilityStatsDB.date <= day + timedelta(days=window - 1)
+            ).all()
+
+            if any(delta.values()):
+                for row in rows:
+                    for field, value in delta.items():
+                        setattr(row, field, (getattr(row, field) or 0.0) + value)
+
+            if not any(r.date == day for r in rows):
+                db.add(ReliabilityStatsDB(
+                    machine_id=machine_id, date=day, window_days=window,
+                    **self._seed_window(db, machine_id, day, window, new)
+                ))
+        logger.debug(f"Megbízhatósági ablakok frissítve: {machine_id} | {day}")
+
+    def _seed_window(self, db: Session, machine_id: str, day: date, window: int, new: Dict[str, float]) -> Dict[str, float]:
+        """Egy új ablaksor kezdőértékei (a vizsgált nap a `new` komponensekből kerül bele)."""
+        previous = db.query(ReliabilityStatsDB).filter(
+            ReliabilityStatsDB.machine_id == machine_id,
+            ReliabilityStatsDB.window_days == window,
+            ReliabilityStatsDB.date == day - timedelta(days=1)
+        ).first()
+
+        if previous is not None:
+            # Csúszóablak: előző ablak + belépő nap - kieső nap
+            dropped = db.query(DailySummaryDB).filter(
+                DailySummaryDB.machine_id == machine_id,
+                DailySummaryDB.date == day - timedelta(days=window)
+            ).first()
+            dropped_values = reliability_components(dropped)
+            return {
+                field: (getattr(previous, field) or 0.0) + new[field] - dropped_values[field]
+                for field in new
+            }
+
+        # Nincs előző ablak: a megelőző napok összegzése a napi összesítőkből
+        columns = [func.coalesce(func.sum(getattr(DailySummaryDB, source)), 0.0) for source in RELIABILITY_FIELDS.values()]
+        sums = db.query(*columns, func.count(DailySummaryDB.id)).filter(
+            DailySummaryDB.machine_id == machine_id,
+            DailySummaryDB.date >= day - timedelta(days=window - 1),
+            DailySummaryDB.date < day
+        ).one()
+        seeded = {field: float(sums[i] or 0.0) + new[field] for i, field in enumerate(RELIABILITY_FIELDS)}
+        seeded["day_count"] = float(sums[-1] or 0) + new["day_count"]
+        return seeded
@@ -0,0 +1,181 @@
+"""
+IDŐSZAKOS ÖSSZESÍTŐK (WEEKLY / MONTHLY / YEARLY ROLLUPS)
+========================================================
+Ez a modul a heti, havi és éves összesítő táblák karbantartásáért felel.
+Az összesítők kizárólag additív komponenseket tárolnak (idők, tonnák, közművek),
+mert az arányszámok (pl. OEE) nem átlagolhatók naivan. Az arányokat
+olvasáskor számoljuk újra a komponensekből (derive_kpis).
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models import DailySummaryDB, KpiRollupDB
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PERIODS = ("week", "month", "year")
+
+# Összesítő oszlop -> napi összesítő mezője (vagy számított értéke)
+ADDITIVE_FIELDS = {
+    "run_seconds": lambda s: s.run_time_sec,
+    "total_seconds": lambda s: s.total_time_sec,
+    "downtime_min": lambda s: s.total_downtime_min,
+    "break_count": lambda s: s.break_count,
+    "total_tons": lambda s: s.total_tons,
+    "good_tons": lambda s: s.good_tons,
+    "scrap_tons": lambda s: s.scrap_tons,
+    "target_tons": lambda s: s.target_tons,
+    "speed_tons_sum": lambda s: (s.avg_speed_m_min or 0.0) * (s.total_tons or 0.0),
+    "electricity_kwh": lambda s: s.electricity_kwh,
+    "water_m3": lambda s: s.water_m3,
+    "steam_tons": lambda s: s.steam_tons,
+    "fiber_tons": lambda s: s.fiber_tons,
+    "day_count": lambda s: 1,
+}
+
+def daily_sum_columns() -> List[Any]:
+    """
+    Az ADDITIVE_FIELDS SQL megfelelői: a napi összesítők összegzése egy aggregáló lekérdezésben.
+    Az eredménysor mezőnevei megegyeznek az összesítő oszlopaival, így közvetlenül derive_kpis-be adható.
+    """
+    sources = {
+        "run_seconds": DailySummaryDB.run_time_sec,
+        "total_seconds": DailySummaryDB.total_time_sec,
+        "downtime_min": DailySummaryDB.total_downtime_min,
+        "break_count": DailySummaryDB.break_count,
+        "total_tons": DailySummaryDB.total_tons,
+        "good_tons": DailySummaryDB.good_tons,
+        "scrap_tons": DailySummaryDB.scrap_tons,
+        "target_tons": DailySummaryDB.target_tons,
+        "speed_tons_sum": func.coalesce(DailySummaryDB.avg_speed_m_min, 0.0) * func.coalesce(DailySummaryDB.total_tons, 0.0),
+        "electricity_kwh": DailySummaryDB.electricity_kwh,
+        "water_m3": DailySummaryDB.water_m3,
+        "steam_tons": DailySummaryDB.steam_tons,
+        "fiber_tons": DailySummaryDB.fiber_tons,
+    }
+    columns = [func.coalesce(func.sum(expr), 0.0).label(field) for field, expr in sources.items()]
+    columns.append(func.count(DailySummaryDB.id).label("day_count"))
+    return columns
+
+def period_start(day: date, period_type: str) -> date:
+    """Megadja a naphoz tartozó időszak (hét, hónap, év) első napját."""
+    if period_type == "week":
+        return day - timedelta(days=day.weekday())
+    if period_type == "month":
+        return day.replace(day=1)
+    if period_type == "year":
+        return day.replace(month=1, day=1)
+    raise ValueError(f"Ismeretlen összesítési időszak: {period_type}")
+
+def period_end(start: date, period_type: str) -> date:
+    """Megadja az időszak (hét, hónap, év) utolsó napját az első napjából."""
+    if period_type == "week":
+        return start + timedelta(days=6)
+    if period_type == "month":
+        return (start.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    if period_type == "year":
+        return start.replace(month=12, day=31)
+    raise ValueError(f"Ismeretlen összesítési időszak: {period_type}")
+
+def daily_components(summary: Optional[DailySummaryDB]) -> Dict[str, float]:
+    """Kinyeri egy napi összesítő additív komponenseit (hiányzó érték = 0)."""
+    if summary is None:
+        return {field: 0.0 for field in ADDITIVE_FIELDS}
+    return {field: float(getter(summary) or 0.0) for field, getter in ADDITIVE_FIELDS.items()}
+
+def derive_kpis(row: Any) -> Dict[str, float]:
+    """
+    Arányszámok visszaszámolása az additív komponensekből.
+    Ugyanazokat a képleteket használja, mint a napi KPI kalkuláció.
+    """
+    total_tons = row.total_tons or 0.0
+    avail_pct = (row.run_seconds / row.total_seconds * 100.0) if row.total_seconds else 0.0
+    perf_pct = min((total_tons / row.target_tons * 100.0), 100.0) if row.target_tons else 0.0
+    qual_pct = (row.good_tons / total_tons * 100.0) if total_tons > 0 else 0.0
+    return {
+        "oee_pct": avail_pct / 100.0 * perf_pct / 100.0 * qual_pct,
+        "availability_pct": avail_pct,
+        "performance_pct": perf_pct,
+        "quality_pct": qual_pct,
+        "avg_speed_m_min": (row.speed_tons_sum / total_tons) if total_tons > 0 else 0.0,
+        "spec_electricity_kwh_t": (row.electricity_kwh / total_tons) if total_tons > 0 else 0.0,
+        "spec_water_m3_t": (row.water_m3 / total_tons) if total_tons > 0 else 0.0,
+        "spec_steam_t_t": (row.steam_tons / total_tons) if total_tons > 0 else 0.0,
+        "spec_fiber_t_t": (row.fiber_tons / total_tons) if total_tons > 0 else 0.0,
+    }
+
+class RollupCalculator:
+    """
+    Az időszakos összesítők inkrementális karbantartója.
+    Minden napi összesítő változásakor csak a különbséget (új - régi) adja hozzá
+    az érintett heti, havi és éves sorokhoz, a teljes időszak újraösszegzése nélkül.
+    """
+
+    def apply_daily_change(
+        self, db: Session, machine_id: str, day: date,
+        old: Dict[str, float], new: Dict[str, float]
+    ) -> None:
+        """
+        Egy napi összesítő változásának átvezetése az időszakos összesítőkre.
+        A hívó munkamenetében (tranzakciójában) fut, így a napi sorral együtt commitolódik.
+
+        Args:
+            db: Aktív adatbázis munkamenet.
+            machine_id: A gép azonosítója.
+            day: A megváltozott nap.
+            old: A korábbi napi komponensek (daily_components), új nap esetén nullák.
+            new: Az új napi komponensek, törlés esetén nullák.
+        """
+        delta = {field: new[field] - old[field] for field in ADDITIVE_FIELDS}
+        if not any(delta.values()):
+            return
+
+        for period_type in ROLLUP_PERIODS:
+            start = period_start(day, period_type)
+            row = db.query(KpiRollupDB).filter(
+                KpiRollupDB.machine_id == machine_id,
+                KpiRollupDB.period_type == period_type,
+                KpiRollupDB.period_start == start
+            ).first()
+            if row is None:
+                row = KpiRollupDB(machine_id=machine_id, period_type=period_type, period_start=start,
+                                  **{field: 0.0 for field in ADDITIVE_FIELDS})
+                db.add(row)
+            for field, value in delta.items():
+                setattr(row, field, (getattr(row, field) or 0.0) + value)
+        logger.debug(f"Időszakos összesítők frissítve: {machine_id} | {day}")
+
+    def rebuild(self, db: Session, machine_id: Optional[str] = None) -> int:
+        """
+        Az összesítők teljes újraépítése a napi összesítőkből (pl. első telepítéskor).
+
+        Returns:
+            int: A feldolgozott napi összesítők száma.
+        """
+        rollup_q = db.query(KpiRollupDB)
+        daily_q = db.query(DailySummaryDB)
+        if machine_id:
+            rollup_q = rollup_q.filter(KpiRollupDB.machine_id == machine_id)
+            daily_q = daily_q.filter(DailySummaryDB.machine_id == machine_id)
+        rollup_q.delete(synchronize_session=False)
+
+        totals: Dict[tuple, Dict[str, float]] = {}
+        count = 0
+        for summary in daily_q.yield_per(1000):
+            components = daily_components(summary)
+            for period_type in ROLLUP_PERIODS:
+                key = (summary.machine_id, period_type, period_start(summary.date, period_type))
+                acc = totals.setdefault(key, {field: 0.0 for field in ADDITIVE_FIELDS})
+                for field, value in components.items():
+                    acc[field] += value
+            count += 1
+
+        db.add_all([
+            KpiRollupDB(machine_id=m, period_type=p, period_start=s, **values)
+            for (m, p, s), values in totals.items()
+        ])
+        logger.info(f"Időszakos összesítők újraépítve: {count} napi összesítőből, {len(totals)} sor")
+        return count
@@ -0,0 +1,59 @@
+"""
+MŰSZAKNAPTÁR (SHIFT CALENDAR)
+=============================
+Ez a modul a gyári műszakrend leképezéséért felel.
+A műszakokat a kezdő óráik határozzák meg (pl. 06/14/22), az utolsó műszak
+a következő nap első műszakjáig tart, így átnyúlhat éjfélen.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+# (műszak neve, kezdete, vége)
+ShiftWindow = Tuple[str, datetime, datetime]
+
+class ShiftCalendar:
+    """
+    Konfigurálható műszaknaptár.
+    Megadja, hogy egy adott naphoz mely műszakok és órák időablakai tartoznak.
+    """
+
+    def __init__(self, start_hours: Optional[List[int]] = None) -> None:
+        """
+        Args:
+            start_hours: A műszakok kezdő órái (0-23). Alapértelmezett: [6, 14, 22].
+        """
+        hours = sorted(set(start_hours if start_hours is not None else [6, 14, 22]))
+        if not hours:
+            raise ValueError("A műszaknaptárnak legalább egy műszakot tartalmaznia kell!")
+        if any(h < 0 or h > 23 for h in hours):
+            raise ValueError(f"Érvénytelen műszakkezdési óra: {hours}")
+        self.start_hours = hours
+
+    def _shifts_starting_on(self, day: date) -> List[ShiftWindow]:
+        """Az adott napon kezdődő műszakok időablakai."""
+        day_start = datetime.combine(day, datetime.min.time())
+        windows = []
+        for i, hour in enumerate(self.start_hours):
+            next_hour = self.start_hours[(i + 1) % len(self.start_hours)]
+            start = day_start + timedelta(hours=hour)
+            # Az utolsó műszak a következő nap első műszakkezdéséig tart
+            end_offset = next_hour if next_hour > hour else next_hour + 24
+            end = day_start + timedelta(hours=end_offset)
+            windows.append((f"{hour:02d}-{next_hour:02d}", start, end))
+        return windows
+
+    def shifts_overlapping(self, target_date: date) -> List[ShiftWindow]:
+        """
+        Visszaadja az összes műszakot, amely átfed az adott nappal.
+        Ide tartozik az előző napon kezdődő, éjfélen átnyúló műszak is.
+        """
+        day_start = datetime.combine(target_date, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        candidates = self._shifts_starting_on(target_date - timedelta(days=1)) + self._shifts_starting_on(target_date)
+        return [w for w in candidates if w[1] < day_end and w[2] > day_start]
+
+    def hours(self, target_date: date) -> List[Tuple[datetime, datetime]]:
+        """A nap 24 órás időablakai (kezdet, vége)."""
+        day_start = datetime.combine(target_date, datetime.min.time())
+        return [(day_start + timedelta(hours=h), day_start + timedelta(hours=h + 1)) for h in range(24)]
@@ -0,0 +1,117 @@
+"""
+STATISZTIKAI FOLYAMATSZABÁLYOZÁS (SPC)
+======================================
+Futó (streaming) statisztikák a laboratóriumi mérésekhez gépenként és termékenként.
+A Welford-féle akkumulátorok (darabszám, átlag, négyzetes eltérésösszeg, min, max)
+összefésülhetők (Chan-féle képlet), így bármely időszak szabályozási határai
+a napi akkumulátorokból számolhatók, a nyers mérések újraolvasása nélkül.
+"""
+
+import math
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Mérési metrika -> labor mérés mezője
+SPC_METRICS = {
+    "gsm": "gsm_measured",
+    "moisture": "moisture_pct",
+    "strength": "strength_knm",
+}
+
+class RunningStats:
+    """
+    Összefésülhető Welford-akkumulátor.
+    Numerikusan stabil átlag- és szórásszámítás egyetlen menetben.
+    """
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 min_value: Optional[float] = None, max_value: Optional[float] = None) -> None:
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min_value = min_value
+        self.max_value = max_value
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        """Akkumulátor létrehozása egy értéksorozatból."""
+        stats = cls()
+        for value in values:
+            stats.update(value)
+        return stats
+
+    @classmethod
+    def from_row(cls, row: Any) -> "RunningStats":
+        """Akkumulátor visszaállítása egy tárolt (QualityStatsDB) sorból."""
+        return cls(row.count or 0, row.mean or 0.0, row.m2 or 0.0, row.min_value, row.max_value)
+
+    def update(self, value: Optional[float]) -> None:
+        """Egy új mérés hozzáadása (Welford lépés). A hiányzó értékeket kihagyja."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Két akkumulátor összefésülése (Chan et al.). Az eredmény új objektum."""
+        if other.count == 0:
+            return RunningStats(self.count, self.mean, self.m2, self.min_value, self.max_value)
+        if self.count == 0:
+            return RunningStats(other.count, other.mean, other.m2, other.min_value, other.max_value)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        return RunningStats(
+            count, mean, m2,
+            min(self.min_value, other.min_value),
+            max(self.max_value, other.max_value)
+        )
+
+    @property
+    def variance(self) -> float:
+        """Minta variancia (n-1 nevezővel)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Minta szórás."""
+        return math.sqrt(self.variance)
+
+    def control_limits(self) -> Tuple[float, float]:
+        """Shewhart szabályozási határok (átlag ± 3 szórás)."""
+        return self.mean - 3 * self.std, self.mean + 3 * self.std
+
+    def capability(self, nominal: float, tolerance_pct: float) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Folyamatképesség a névleges érték körüli ± tolerancia alapján.
+
+        Returns:
+            Tuple: (Cp, Cpk), ha a szórás nem értelmezhető, (None, None).
+        """
+        sigma = self.std
+        if not nominal or sigma <= 0:
+            return None, None
+        lsl = nominal * (1 - tolerance_pct / 100.0)
+        usl = nominal * (1 + tolerance_pct / 100.0)
+        cp = (usl - lsl) / (6 * sigma)
+        cpk = min(usl - self.mean, self.mean - lsl) / (3 * sigma)
+        return cp, cpk
+
+def build_daily_accumulators(measurements: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str, date, str], RunningStats]:
+    """
+    Napi akkumulátorok építése a beolvasott labor mérésekből.
+
+    Returns:
+        Dict: (gép, termék, nap, metrika) -> RunningStats
+    """
+    accumulators: Dict[Tuple[str, str, date, str], RunningStats] = {}
+    for m in measurements:
+        for metric, field in SPC_METRICS.items():
+            key = (m["machine_id"], m["article_id"], m["timestamp"].date(), metric)
+            accumulators.setdefault(key, RunningStats()).update(m.get(field))
+    return accumulators
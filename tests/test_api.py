@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime
+from unittest.mock import patch
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from api.app import KpiApi
+from src.models import DailySummaryDB, ProductionEventDB
+from ui.data_loader import iter_events_frames
+
+def _call(app, path, query="", headers=None):
+    """WSGI kérés szimulálása; visszaadja a státuszt, a fejléceket és a teljes törzset."""
+    environ = {"PATH_INFO": path, "QUERY_STRING": query, **(headers or {})}
+    setup_testing_defaults(environ)
+    captured = {}
+    def start_response(status, response_headers):
+        captured["status"] = status
+        captured["headers"] = dict(response_headers)
+    body = b"".join(app(environ, start_response))
+    return captured["status"], captured["headers"], body
+
+@pytest.fixture
+def api(db_session):
+    """API a memóriabeli SQLite adatbázison."""
+    db_session.add_all([
+        DailySummaryDB(machine_id="PM1", date=date(2024, 1, d), oee_pct=70.0 + d, total_tons=100.0 * d)
+        for d in (1, 2, 3)
+    ])
+    db_session.add_all([
+        ProductionEventDB(timestamp=datetime(2024, 1, 1, h), machine_id="PM1", event_type="RUN",
+                          status="GOOD", duration_seconds=3600, weight_kg=1000.0)
+        for h in range(5)
+    ])
+    db_session.commit()
+    with patch("ui.data_loader.get_read_db") as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        yield KpiApi()
+
+def test_summaries_json(api):
+    """A napi összesítők JSON tömbként, dátum szerint rendezve érkeznek."""
+    status, headers, body = _call(api, "/api/summaries", "machine=PM1&start=2024-01-01&end=2024-01-02")
+    
+    rows = json.loads(body)
+    assert status.startswith("200")
+    assert headers["Content-Type"].startswith("application/json")
+    assert [r["total_tons"] for r in rows] == [100.0, 200.0]
+
+def test_events_csv_streams_in_chunks(api):
+    """Az események CSV-je több darabban is egyetlen fejléccel készül."""
+    small_chunks = lambda machine_id, start, end: iter_events_frames(machine_id, start, end, chunk_size=2)
+    with patch("ui.data_loader.iter_events_frames", side_effect=small_chunks):
+        status, headers, body = _call(api, "/api/events", "machine=PM1&start=2024-01-01&format=csv")
+    
+    lines = body.decode("utf-8").strip().splitlines()
+    assert headers["Content-Type"].startswith("text/csv")
+    assert lines[0].startswith("machine_id,timestamp")
+    assert len(lines) == 6
+
+def test_etag_returns_304_until_data_changes(api):
+    """Azonos adatverziónál 304 (törzs nélkül), új verziónál új ETag."""
+    query = "machine=PM1&start=2024-01-01&end=2024-01-03"
+    _, headers, _ = _call(api, "/api/summaries", query)
+    
+    status, _, body = _call(api, "/api/summaries", query, {"HTTP_IF_NONE_MATCH": headers["ETag"]})
+    assert status.startswith("304") and body == b""
+    
+    with patch("ui.data_loader.get_data_version", return_value=99):
+        status, new_headers, _ = _call(api, "/api/summaries", query, {"HTTP_IF_NONE_MATCH": headers["ETag"]})
+    assert status.startswith("200")
+    assert new_headers["ETag"] != headers["ETag"]
+
+def test_invalid_requests(api):
+    """Hibás paraméter: 400, ismeretlen végpont: 404, írási metódus: 405."""
+    assert _call(api, "/api/summaries", "start=2024-13-01")[0].startswith("400")
+    assert _call(api, "/api/trends", "days=30")[0].startswith("400")
+    assert _call(api, "/api/unknown")[0].startswith("404")
+    assert _call(api, "/api/machines", headers={"REQUEST_METHOD": "POST"})[0].startswith("405")
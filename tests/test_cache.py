@@ -0,0 +1,74 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+from ui import cache
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear_cache()
+    yield
+    cache.clear_cache()
+
+def test_cache_hit_and_stats():
+    """Azonos argumentumokkal a második hívás a gyorsítótárból érkezik."""
+    loader = MagicMock(return_value=["PM1"], __name__="loader")
+    cached_loader = cache.cached(ttl=60)(loader)
+    
+    assert cached_loader() == ["PM1"]
+    assert cached_loader() == ["PM1"]
+    
+    loader.assert_called_once()
+    stats = {s["Függvény"]: s for s in cache.cache_stats()}
+    assert stats["loader"]["Találat"] == 1
+    assert stats["loader"]["Tévesztés"] == 1
+
+def test_version_bump_invalidates_only_affected_entries():
+    """Egy nap adatverziójának változása csak az azt lefedő bejegyzést érvényteleníti."""
+    versions = {date(2024, 1, 1): 1, date(2024, 1, 2): 1}
+    
+    def fake_version(machine_id, start, end):
+        return sum(v for d, v in versions.items() if start <= d <= end)
+    
+    loader = MagicMock(side_effect=lambda m, d: f"{m}-{d}", __name__="daily")
+    cached_loader = cache.cached(ttl=60, scope=lambda m, d: (m, d, d))(loader)
+    
+    with patch("ui.cache.data_loader.get_data_version", side_effect=fake_version):
+        cached_loader("PM1", date(2024, 1, 1))
+        cached_loader("PM1", date(2024, 1, 2))
+        versions[date(2024, 1, 2)] += 1  # Pipeline.run_full_load a 2. napra
+        cache.invalidate_versions()
+        cached_loader("PM1", date(2024, 1, 1))
+        cached_loader("PM1", date(2024, 1, 2))
+    
+    assert loader.call_count == 3
+    assert [c.args[1] for c in loader.call_args_list] == [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 2)]
+
+def test_ttl_expiry():
+    """Lejárt élettartam után a függvény újra lefut."""
+    loader = MagicMock(return_value=1, __name__="ttl_loader")
+    cached_loader = cache.cached(ttl=10)(loader)
+    
+    with patch("ui.cache.time.monotonic", side_effect=[100.0, 105.0, 111.0]):
+        cached_loader()
+        cached_loader()
+        cached_loader()
+    
+    assert loader.call_count == 2
+
+def test_hit_reuses_data_version_until_ttl():
+    """Találatkor az adatverzió a megjegyzett értékből jön (nincs lekérdezés), a VERSION_TTL lejárta után újra lekérdeződik."""
+    loader = MagicMock(return_value="PM1", __name__="versioned")
+    cached_loader = cache.cached(ttl=600, scope=lambda m, d: (m, d, d))(loader)
+    
+    with patch("ui.cache.data_loader.get_data_version", return_value=1) as get_version, \
+         patch("ui.cache.time.monotonic", side_effect=[100.0, 101.0, 102.0, 100.0 + cache.VERSION_TTL + 1]):
+        cached_loader("PM1", date(2024, 1, 1))
+        cached_loader("PM1", date(2024, 1, 1))
+        cached_loader("PM1", date(2024, 1, 1))
+        assert get_version.call_count == 1
+        
+        cached_loader("PM1", date(2024, 1, 1))
+        assert get_version.call_count == 2
+    
+    loader.assert_called_once()
+    assert {s["Függvény"]: s["Találat"] for s in cache.cache_stats()}["versioned"] == 3
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+from src.catalog import record_synced_day, rebuild_catalog
+from src.models import ProductionEvent, ProductionEventDB, SyncedDayDB, MachineDataStatsDB
+
+def _events(day, hours):
+    return [
+        ProductionEvent(
+            timestamp=datetime(day.year, day.month, day.day, h), machine_id="PM1",
+            event_type="PRODUCTION", status="GOOD", duration_seconds=3600, article_id="A1"
+        )
+        for h in hours
+    ]
+
+def test_record_synced_day_upserts_and_updates_stats(db_session):
+    """Egy nap újraszinkronizálása felülírja a katalógus sorát, a statisztika követi."""
+    record_synced_day(db_session, "PM1", date(2024, 1, 1), _events(date(2024, 1, 1), [0, 1, 2]))
+    record_synced_day(db_session, "PM1", date(2024, 1, 2), _events(date(2024, 1, 2), [5, 23]))
+    record_synced_day(db_session, "PM1", date(2024, 1, 1), _events(date(2024, 1, 1), [3]))
+    db_session.flush()
+    
+    assert db_session.query(SyncedDayDB).count() == 2
+    stats = db_session.get(MachineDataStatsDB, "PM1")
+    assert stats.event_count == 3
+    assert stats.synced_days == 2
+    assert stats.first_event == datetime(2024, 1, 1, 3)
+    assert stats.last_event == datetime(2024, 1, 2, 23)
+
+def test_rebuild_catalog_matches_events(db_session):
+    """Az újraépítés a (gép, nap) szerinti csoportosítással megegyezik az eseménytáblával."""
+    for event in _events(date(2024, 1, 1), [1, 2]) + _events(date(2024, 1, 3), [4]):
+        db_session.add(ProductionEventDB(**event.model_dump()))
+    db_session.flush()
+    
+    assert rebuild_catalog(db_session) == 2
+    db_session.flush()
+    days = {d.date: d.event_count for d in db_session.query(SyncedDayDB).all()}
+    assert days == {date(2024, 1, 1): 2, date(2024, 1, 3): 1}
+    assert db_session.get(MachineDataStatsDB, "PM1").event_count == 3
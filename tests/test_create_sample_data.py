@@ -0,0 +1,82 @@
+import importlib.util
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "create_sample_data.py"
+START = date(2024, 1, 1)
+
+@pytest.fixture(scope="module")
+def sample_data():
+    """A mintaadat script modulként betöltve (a main() nem fut)."""
+    spec = importlib.util.spec_from_file_location("create_sample_data", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def events_df():
+    """Kis, rögzített RUN eseménysor: PM1 cikkváltásokkal, PM2 eseménye csak a 2. napon."""
+    day0 = datetime.combine(START, datetime.min.time())
+    rows = [(day0 + timedelta(hours=3), "PM1", "KL_150")]
+    # 04:00-04:10 között percenként váltakozó cikk: a minta időbélyege biztosan egybeesik egy eseménnyel
+    rows += [(day0 + timedelta(hours=4, minutes=m), "PM1", ("TL_100", "FL_90")[m % 2]) for m in range(11)]
+    rows += [(day0 + timedelta(days=1, hours=9, minutes=5), "PM1", "WTL_120"),
+             (day0 + timedelta(days=1, hours=13), "PM2", "KL_175"),
+             (day0 + timedelta(days=2, hours=1), "PM2", "TL_140")]
+    return pd.DataFrame(rows, columns=["timestamp", "machine_id", "article_id"]).assign(event_type="RUN")
+
+def _per_row_reference(sample_data, events_df, num_days):
+    """A korábbi, mintánkénti szűréses cikk keresés (a gyorsítás előtti viselkedés)."""
+    events_df = events_df.sort_values("timestamp")
+    start_dt = datetime.combine(START, datetime.min.time())
+    rows = []
+    for day in range(num_days + 1):
+        for machine in sample_data.MACHINES:
+            machine_events = events_df[events_df["machine_id"] == machine]
+            for hour in range(0, 24, 2):
+                timestamp = start_dt + timedelta(days=day, hours=hour, minutes=random.randint(0, 10))
+                past_events = machine_events[machine_events["timestamp"] <= timestamp]
+                if not past_events.empty:
+                    article = past_events.iloc[-1]["article_id"]
+                else:
+                    article = random.choice(list(sample_data.ARTICLE_QUALITY.keys()))
+                specs = sample_data.ARTICLE_QUALITY[article]
+                rows.append({
+                    "Timestamp": timestamp, "Machine": machine, "Article": article,
+                    "Moisture_%": round(specs["moisture"] * random.uniform(0.95, 1.05), 1),
+                    "GSM": round(specs["gsm"] * random.uniform(0.97, 1.03), 1),
+                    "Strength_kNm": round(specs["strength"] * random.uniform(0.95, 1.05), 1),
+                })
+    return pd.DataFrame(rows).sort_values("Timestamp")
+
+def test_lab_data_matches_per_row_lookup(sample_data, events_df, tmp_path, monkeypatch):
+    """Az as-of join cikk hozzárendelése és mérési értékei azonosak a korábbi soronkénti kereséssel, a tartalék cikkel együtt."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'mes.db'}")
+    events_df.to_sql("events", engine, index=False)
+    saved = {}
+    monkeypatch.setattr(sample_data, "engine", engine)
+    monkeypatch.setattr(sample_data, "START_DATE", START)
+    monkeypatch.setattr(sample_data, "NUM_DAYS", 2)
+    monkeypatch.setattr(sample_data, "save_by_year_month", lambda df, prefix, *_: saved.setdefault(prefix, df))
+
+    random.seed(42)
+    sample_data.create_lab_data()
+    random.seed(42)
+    expected = _per_row_reference(sample_data, events_df, 2)
+
+    result = saved["lab_data"]
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+    # Tartalék ág: PM2 2. napi 13:00 előtti 19 mintája sorsolt cikket kap (az as-of join ott üres)
+    pm2 = result[result["Machine"] == "PM2"]
+    assert (pm2["Timestamp"] < datetime(2024, 1, 2, 13)).sum() == 19
+    assert set(pm2.loc[pm2["Timestamp"] > datetime(2024, 1, 3, 1), "Article"]) == {"TL_140"}
+    # Egyező időbélyeg: a mintavétel percében kezdődött esemény már számít
+    pm1 = result[result["Machine"] == "PM1"].set_index("Timestamp")
+    sample = pm1.index[(pm1.index >= datetime(2024, 1, 1, 4)) & (pm1.index < datetime(2024, 1, 1, 5))][0]
+    assert pm1.loc[sample, "Article"] == ("TL_100", "FL_90")[sample.minute % 2]
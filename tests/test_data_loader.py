@@ -1,12 +1,14 @@
+import pytest
 import pandas as pd
 from unittest.mock import MagicMock, patch
 from datetime import date
-from ui.data_loader import load_machines, get_daily_data, get_pareto_data
-from src.models import MachineDB, ProductionEventDB
+from datetime import datetime
+from ui.data_loader import load_machines, get_daily_data, get_pareto_data, get_period_summaries, get_synced_days, get_plant_kpis, get_daily_events_frame, get_kpi_trend, get_period_report_data
+from src.models import MachineDB, ProductionEventDB, ShiftSummaryDB, SyncedDayDB, DailySummaryDB, KpiRollupDB, QualityStatsDB
 
 def test_load_machines():
     """Teszteli a gépek betöltését."""
-    with patch('ui.data_loader.get_db') as mock_get_db:
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
         mock_db = MagicMock()
         mock_get_db.return_value.__enter__.return_value = mock_db
         
@@ -23,7 +25,7 @@ def test_load_machines():
 
 def test_get_daily_data_not_found():
     """Teszteli, ha nincs adat az adott napra."""
-    with patch('ui.data_loader.get_db') as mock_get_db:
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
         mock_db = MagicMock()
         mock_get_db.return_value.__enter__.return_value = mock_db
         
@@ -38,7 +40,7 @@ def test_get_daily_data_not_found():
 
 def test_get_pareto_data():
     """Teszteli a Pareto adatok aggregálását."""
-    with patch('ui.data_loader.get_db') as mock_get_db:
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
         mock_db = MagicMock()
         mock_get_db.return_value.__enter__.return_value = mock_db
         
@@ -63,3 +65,143 @@ def test_get_pareto_data():
         assert mech_fail == 60.0
         # A sorrendnek csökkenőnek kell lennie
         assert df.iloc[0]["Ok"] == "Mechanical fail"
+
+def test_get_period_summaries_shift():
+    """Teszteli a műszakos összesítők betöltését az összesítő táblából."""
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_db = MagicMock()
+        mock_get_db.return_value.__enter__.return_value = mock_db
+        
+        mock_shift = ShiftSummaryDB(
+            date=date(2023, 12, 31), shift_name="22-06", machine_id="PM1",
+            period_start=datetime(2023, 12, 31, 22, 0), period_end=datetime(2024, 1, 1, 6, 0),
+            oee_pct=70.0, availability_pct=90.0, performance_pct=80.0, quality_pct=97.2,
+            total_tons=100.0, good_tons=97.2, scrap_tons=2.8
+        )
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [mock_shift]
+        
+        periods = get_period_summaries("PM1", date(2024, 1, 1), "shift")
+        
+        mock_db.query.assert_called_with(ShiftSummaryDB)
+        assert len(periods) == 1
+        assert periods[0].shift_name == "22-06"
+        assert periods[0].oee_pct == 70.0
+
+def test_get_synced_days_marks_partial_days():
+    """A nap vége előtt szinkronizált nap részlegesnek számít."""
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_db = MagicMock()
+        mock_get_db.return_value.__enter__.return_value = mock_db
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+            SyncedDayDB(machine_id="PM1", date=date(2024, 1, 1), event_count=40, synced_at=datetime(2024, 1, 2, 6, 0)),
+            SyncedDayDB(machine_id="PM1", date=date(2024, 1, 2), event_count=12, synced_at=datetime(2024, 1, 2, 9, 30)),
+        ]
+        
+        df = get_synced_days("PM1", date(2024, 1, 1), date(2024, 1, 31))
+        assert list(df["Állapot"]) == ["Betöltve", "Részleges"]
+        assert list(df["Események"]) == [40, 12]
+
+def test_get_plant_kpis_groups_machines_and_periods(db_session):
+    """Egyetlen aggregáló lekérdezés gépenként, aktuális és előző időszakra bontva."""
+    for machine_id, day, tons in [("PM1", date(2024, 1, 10), 100.0), ("PM1", date(2024, 1, 3), 50.0), ("PM2", date(2024, 1, 9), 80.0)]:
+        db_session.add(DailySummaryDB(
+            machine_id=machine_id, date=day, oee_pct=0, availability_pct=0, performance_pct=0, quality_pct=0,
+            total_tons=tons, good_tons=tons, scrap_tons=0.0, target_tons=tons,
+            run_time_sec=86400.0, total_time_sec=86400.0, break_count=1, total_downtime_min=0.0
+        ))
+    db_session.commit()
+    
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        df = get_plant_kpis(date(2024, 1, 10), days=7)
+    
+    kpis = {(r.machine_id, r.period): r for r in df.itertuples()}
+    assert set(kpis) == {("PM1", "current"), ("PM1", "previous"), ("PM2", "current")}
+    assert kpis[("PM1", "current")].total_tons == 100.0
+    assert kpis[("PM1", "previous")].total_tons == 50.0
+    assert kpis[("PM2", "current")].oee_pct == pytest.approx(100.0)
+
+def test_get_daily_events_frame_is_typed(db_session):
+    """Az oszlopos eseménytábla típusos, a hiányzó számértékek nullák, üres napon is megvan a séma."""
+    db_session.add_all([
+        ProductionEventDB(timestamp=datetime(2024, 1, 1, 8), machine_id="PM1", event_type="RUN", status="GOOD",
+                          duration_seconds=600, weight_kg=500.0, article_id="A1"),
+        ProductionEventDB(timestamp=datetime(2024, 1, 1, 7), machine_id="PM1", event_type="STOP", duration_seconds=None),
+        ProductionEventDB(timestamp=datetime(2024, 1, 2, 7), machine_id="PM1", event_type="STOP", duration_seconds=60),
+    ])
+    db_session.commit()
+    
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        df = get_daily_events_frame("PM1", date(2024, 1, 1))
+        empty = get_daily_events_frame("PM2", date(2024, 1, 1))
+    
+    assert list(df["event_type"]) == ["STOP", "RUN"]
+    assert list(df["duration_seconds"]) == [0, 600]
+    assert str(df["duration_seconds"].dtype) == "int64"
+    assert str(df["timestamp"].dtype) == "datetime64[ns]"
+    assert empty.empty and list(empty.columns) == list(df.columns)
+
+def test_get_kpi_trend_switches_resolution_and_bounds_points(db_session):
+    """Rövid időszakra a napi összesítők, egy évre a heti összesítők kerülnek a trendbe, korlátos pontszámmal."""
+    for i in range(60):
+        day = date(2024, 1, 1) + pd.Timedelta(days=i)
+        db_session.add(DailySummaryDB(
+            machine_id="PM1", date=day, oee_pct=0, availability_pct=0, performance_pct=0, quality_pct=0,
+            total_tons=100.0 + i, good_tons=90.0, scrap_tons=10.0, target_tons=100.0,
+            run_time_sec=86400.0, total_time_sec=86400.0, break_count=0, total_downtime_min=0.0
+        ))
+    db_session.add(KpiRollupDB(
+        machine_id="PM1", period_type="week", period_start=date(2024, 1, 1),
+        run_seconds=7 * 86400.0, total_seconds=7 * 86400.0, total_tons=700.0, good_tons=630.0,
+        scrap_tons=70.0, target_tons=700.0, day_count=7
+    ))
+    db_session.commit()
+    
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        daily = get_kpi_trend("PM1", date(2024, 2, 29), days=60, max_points=20)
+        weekly = get_kpi_trend("PM1", date(2024, 2, 29), days=365)
+    
+    tons = daily[daily["metric"] == "total_tons"]
+    assert set(daily["resolution"]) == {"day"}
+    assert len(tons) == 20
+    assert tons["value"].iloc[0] == 100.0 and tons["value"].iloc[-1] == 159.0
+    assert set(weekly["resolution"]) == {"week"}
+    assert weekly[weekly["metric"] == "scrap_rate_pct"]["value"].tolist() == [pytest.approx(10.0)]
+
+def test_get_period_report_data_aggregates_without_events(db_session):
+    """A heti jelentés bemenete: összesítő a napi sorokból (ha nincs heti), termék és leállás GROUP BY, labor átlag."""
+    for day in (date(2024, 5, 13), date(2024, 5, 14)):
+        db_session.add(DailySummaryDB(
+            machine_id="PM1", date=day, oee_pct=50.0, availability_pct=0, performance_pct=0, quality_pct=0,
+            total_tons=100.0, good_tons=90.0, scrap_tons=10.0, target_tons=100.0,
+            run_time_sec=86400.0, total_time_sec=86400.0, break_count=1, total_downtime_min=30.0
+        ))
+    db_session.add_all([
+        ProductionEventDB(timestamp=datetime(2024, 5, 13, 8), machine_id="PM1", event_type="RUN", duration_seconds=600,
+                          weight_kg=2000.0, average_speed=800.0, article_id="A1"),
+        ProductionEventDB(timestamp=datetime(2024, 5, 14, 8), machine_id="PM1", event_type="RUN", duration_seconds=600,
+                          weight_kg=1000.0, average_speed=0.0, article_id="A1"),
+        ProductionEventDB(timestamp=datetime(2024, 5, 14, 9), machine_id="PM1", event_type="BREAK", duration_seconds=120),
+        ProductionEventDB(timestamp=datetime(2024, 5, 15, 9), machine_id="PM1", event_type="BREAK", duration_seconds=60),
+        # Másik hét: nem számít bele
+        ProductionEventDB(timestamp=datetime(2024, 5, 20, 9), machine_id="PM1", event_type="STOP", duration_seconds=600),
+        QualityStatsDB(machine_id="PM1", article_id="A1", date=date(2024, 5, 13), metric="gsm", count=1, mean=80.0, m2=0.0),
+        QualityStatsDB(machine_id="PM1", article_id="A1", date=date(2024, 5, 14), metric="gsm", count=3, mean=84.0, m2=0.0),
+    ])
+    db_session.commit()
+
+    with patch('ui.data_loader.get_read_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        totals, days, articles, downtime = get_period_report_data("PM1", "week", date(2024, 5, 16))
+        empty = get_period_report_data("PM2", "month", date(2024, 5, 16))
+
+    assert totals["total_tons"] == 200.0 and totals["day_count"] == 2 and totals["break_count"] == 2
+    assert totals["quality_pct"] == pytest.approx(90.0)
+    assert [d.date for d in days] == [date(2024, 5, 13), date(2024, 5, 14)]
+    a1 = articles.iloc[0]
+    assert (a1.article_id, a1.tons, a1.run_min, a1.avg_speed) == ("A1", 3.0, 20.0, 800.0)
+    assert a1.gsm == pytest.approx(83.0) and pd.isna(a1.moisture)
+    assert downtime.to_dict("records") == [{"event_type": "BREAK", "description": None, "minutes": 3.0, "count": 2}]
+    assert empty[0] == {} and empty[1] == [] and empty[2].empty and empty[3].empty
@@ -0,0 +1,27 @@
+from unittest.mock import MagicMock, patch
+
+from src.database import get_read_db, read_engine_options
+
+def test_read_engine_options_postgres_is_read_only_with_timeout():
+    """PostgreSQL olvasási engine: AUTOCOMMIT, csak olvasható munkamenet és statement_timeout."""
+    with patch("src.database.settings") as mock_settings:
+        mock_settings.READ_STATEMENT_TIMEOUT_MS = 5000
+        options = read_engine_options("postgresql+psycopg2://user:pw@replica:5432/production_report")
+    
+    assert options["isolation_level"] == "AUTOCOMMIT"
+    assert "default_transaction_read_only=on" in options["connect_args"]["options"]
+    assert "statement_timeout=5000" in options["connect_args"]["options"]
+
+def test_read_engine_options_sqlite_has_no_server_options():
+    """SQLite esetén csak az AUTOCOMMIT izoláció állítódik."""
+    assert read_engine_options("sqlite:///data/report.db") == {"isolation_level": "AUTOCOMMIT"}
+
+def test_get_read_db_never_commits():
+    """Az olvasó munkamenet kilépéskor nem commitol, csak lezárul."""
+    session = MagicMock()
+    with patch("src.database.ReadSessionLocal", return_value=session):
+        with get_read_db() as db:
+            db.query("x")
+    
+    session.commit.assert_not_called()
+    session.close.assert_called_once()
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from ui.downsampling import lttb_indices, lttb_frame
+
+def test_lttb_keeps_endpoints_and_extremes():
+    """Az első és utolsó pont, valamint a kiugró csúcs megmarad."""
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[500] = 10.0
+    
+    idx = lttb_indices(x, y, 100)
+    
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+    assert np.all(np.diff(idx) > 0)
+
+def test_lttb_short_series_unchanged():
+    """Ha a sor rövidebb a korlátnál, minden pont megmarad."""
+    assert list(lttb_indices(np.arange(5), np.ones(5), 10)) == [0, 1, 2, 3, 4]
+
+def test_lttb_frame_on_dates_skips_missing_values():
+    """Dátum x tengellyel működik, a hiányzó értékű sorok kimaradnak."""
+    df = pd.DataFrame({
+        "period_start": pd.date_range("2020-01-01", periods=400, freq="D"),
+        "value": np.arange(400, dtype=float)
+    })
+    df.loc[10, "value"] = np.nan
+    
+    result = lttb_frame(df, "period_start", "value", 50)
+    
+    assert len(result) == 50
+    assert result["value"].notna().all()
+    assert result["period_start"].iloc[-1] == df["period_start"].iloc[-1]
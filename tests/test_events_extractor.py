@@ -65,3 +65,33 @@ def test_fetch_events_database_error(extractor):
 
     assert result == []
     mock_session.close.assert_called_once()
+
+
+def test_get_daily_event_stats_normalizes_dates(extractor):
+    """Teszteli a napi aggregátumok lekérését (SQLite esetén szöveges dátummal)."""
+    mock_session = MagicMock()
+    extractor.Session.return_value = mock_session
+
+    mock_session.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+        ("PM1", "2024-01-01", 120, datetime(2024, 1, 1, 23, 50)),
+        ("PM2", date(2024, 1, 2), 80, datetime(2024, 1, 2, 22, 0)),
+    ]
+
+    result = extractor.get_daily_event_stats(date(2024, 1, 1), date(2024, 1, 2))
+
+    assert result == {
+        ("PM1", date(2024, 1, 1)): (120, datetime(2024, 1, 1, 23, 50)),
+        ("PM2", date(2024, 1, 2)): (80, datetime(2024, 1, 2, 22, 0)),
+    }
+    mock_session.close.assert_called_once()
+
+
+def test_get_daily_event_stats_raises_on_error(extractor):
+    """Az egyeztetéshez a hiba nem nyelhető el (az üres eredmény "nincs eltérés" lenne)."""
+    mock_session = MagicMock()
+    extractor.Session.return_value = mock_session
+    mock_session.query.side_effect = Exception("Connection refused")
+
+    with pytest.raises(Exception):
+        extractor.get_daily_event_stats(date(2024, 1, 1), date(2024, 1, 2))
+    mock_session.close.assert_called_once()
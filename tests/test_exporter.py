@@ -0,0 +1,77 @@
+import gzip
+import io
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.exporter import Exporter
+from src.models import DailySummaryDB, ProductionEventDB
+
+@pytest.fixture
+def exporter(db_session):
+    """Kis darabméretű exportáló a memóriabeli SQLite adatbázison (több darab már néhány sornál)."""
+    db_session.add_all([
+        ProductionEventDB(timestamp=datetime(2024, 1, 1, h), machine_id=m, event_type=t,
+                          status="GOOD" if t == "RUN" else None, duration_seconds=600 if h else None)
+        for m in ("PM1", "PM2") for h, t in enumerate(["RUN", "STOP", "RUN", "BREAK", "RUN"])
+    ])
+    db_session.add_all([
+        DailySummaryDB(machine_id="PM1", date=date(2024, 1, d), oee_pct=70.0, total_tons=100.0, break_count=d)
+        for d in (1, 2, 3)
+    ])
+    db_session.commit()
+    with patch("src.exporter.get_read_db") as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        yield Exporter(chunk_size=2)
+
+def test_csv_gzip_export_filters_events(exporter):
+    """Gép és eseménytípus szűrés, darabolt CSV egyetlen fejléccel, gzip tömörítéssel."""
+    buffer = io.BytesIO()
+    
+    rows = exporter.export("events", buffer, date(2024, 1, 1), date(2024, 1, 1), machine_id="PM1",
+                           event_types=["STOP", "BREAK"], fmt="csv", compression="gzip")
+    
+    df = pd.read_csv(io.BytesIO(gzip.decompress(buffer.getvalue())))
+    assert rows == 2
+    assert list(df["event_type"]) == ["STOP", "BREAK"]
+    assert set(df["machine_id"]) == {"PM1"}
+
+def test_parquet_export_keeps_types_across_chunks(exporter):
+    """A Parquet séma rögzített: a NULL értékes darabok is egész típusúak maradnak."""
+    buffer = io.BytesIO()
+    
+    rows = exporter.export("events", buffer, date(2024, 1, 1), date(2024, 1, 1), fmt="parquet", compression="zstd")
+    
+    table = pq.read_table(io.BytesIO(buffer.getvalue()))
+    assert rows == 10
+    assert str(table.schema.field("duration_seconds").type) == "int64"
+    assert table.column("duration_seconds").null_count == 2
+    assert str(table.schema.field("timestamp").type) == "timestamp[us]"
+
+def test_summaries_export_to_file(exporter, tmp_path):
+    """A napi összesítők dátum oszloppal, fájlba exportálva."""
+    path = tmp_path / "summaries.parquet"
+    
+    rows = exporter.export("summaries", path, date(2024, 1, 2), date(2024, 1, 3))
+    
+    df = pd.read_parquet(path)
+    assert rows == 2
+    assert list(df["date"]) == [date(2024, 1, 2), date(2024, 1, 3)]
+
+def test_count_matches_export_filters(exporter):
+    """Az előzetes sorszám ugyanazokkal a szűrőkkel számol, mint az export."""
+    assert exporter.count("events", date(2024, 1, 1), date(2024, 1, 1)) == 10
+    assert exporter.count("events", date(2024, 1, 1), date(2024, 1, 1), machine_id="PM1", event_types=["STOP", "BREAK"]) == 2
+    assert exporter.count("summaries", date(2024, 1, 2), date(2024, 1, 3)) == 2
+
+def test_invalid_export_arguments(exporter):
+    """Hibás adatkör, formátum vagy összesítőre adott eseménytípus szűrés: ValueError."""
+    with pytest.raises(ValueError):
+        exporter.export("quality", io.BytesIO(), date(2024, 1, 1), date(2024, 1, 1))
+    with pytest.raises(ValueError):
+        exporter.export("events", io.BytesIO(), date(2024, 1, 1), date(2024, 1, 1), fmt="xlsx")
+    with pytest.raises(ValueError):
+        exporter.export("summaries", io.BytesIO(), date(2024, 1, 1), date(2024, 1, 1), event_types=["STOP"])
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import MagicMock, patch
+from src.jobs import JobManager, JOB_DONE, JOB_FAILED, JOB_CANCELLED, JOB_RUNNING
+from src.models import SyncJobDB
+
+@pytest.fixture
+def manager(db_session):
+    """JobManager valódi SQLite munkamenettel, háttérszál nélkül (run_pending a teszt szálán fut)."""
+    @contextmanager
+    def fake_get_db():
+        yield db_session
+        db_session.commit()
+
+    pipeline = MagicMock()
+    with patch('src.jobs.get_db', fake_get_db), patch.object(JobManager, '_ensure_worker'):
+        manager = JobManager(pipeline_factory=lambda: pipeline)
+        manager.pipeline = pipeline
+        yield manager
+
+def test_submit_deduplicates_covered_days(manager):
+    """Egy aktív feladat által lefedett nap újabb kérése nem indít új futást."""
+    job_id = manager.submit(date(2024, 1, 1), date(2024, 1, 3))
+    
+    assert manager.submit(date(2024, 1, 2)) == job_id
+    assert manager.submit(date(2024, 1, 2), machine_id="PM1") == job_id
+    assert manager.submit(date(2024, 1, 4)) != job_id
+
+def test_run_pending_records_progress_and_timings(manager):
+    """A worker naponként futtatja a pipeline-t és rögzíti a futásidőket."""
+    job_id = manager.submit(date(2024, 1, 1), date(2024, 1, 3))
+    
+    assert manager.run_pending() == 1
+    job = manager.get_job(job_id)
+    assert job.status == JOB_DONE
+    assert job.progress == 1.0
+    assert [t["date"] for t in job.day_timings] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert manager.pipeline.run_full_load.call_count == 3
+    # Befejezés után ugyanarra a napra új feladat indulhat
+    assert manager.submit(date(2024, 1, 2)) != job_id
+
+def test_cancel_stops_before_next_day(manager):
+    """A futó feladat megszakítása a következő nap előtt érvényesül."""
+    job_id = manager.submit(date(2024, 1, 1), date(2024, 1, 5))
+    manager.pipeline.run_full_load.side_effect = lambda **kwargs: manager.cancel(job_id)
+    
+    manager.run_pending()
+    job = manager.get_job(job_id)
+    assert job.status == JOB_CANCELLED
+    assert manager.pipeline.run_full_load.call_count == 1
+    assert len(job.day_timings) == 1
+
+def test_failed_day_marks_job_failed(manager):
+    """Hiba esetén a feladat FAILED állapotba kerül a hibás nap megjelölésével."""
+    job_id = manager.submit(date(2024, 1, 1), date(2024, 1, 2))
+    manager.pipeline.run_full_load.side_effect = [None, RuntimeError("MES nem elérhető")]
+    
+    manager.run_pending()
+    job = manager.get_job(job_id)
+    assert job.status == JOB_FAILED
+    assert job.error == "2024-01-02: MES nem elérhető"
+    assert job.progress == 0.5
+
+def test_pipeline_factory_error_fails_job_and_frees_worker(manager):
+    """Ha már a Pipeline létrehozása hibára fut, a feladat FAILED lesz és a következő kérés lefut."""
+    manager.pipeline_factory = MagicMock(side_effect=[RuntimeError("Hibás MES kapcsolat"), manager.pipeline])
+    failed_id = manager.submit(date(2024, 1, 1))
+    manager._worker = threading.current_thread()
+    
+    manager._worker_loop()
+    job = manager.get_job(failed_id)
+    assert job.status == JOB_FAILED
+    assert job.error == "Hibás MES kapcsolat"
+    assert manager._worker is None
+    
+    # Az új kérés nem a hibás feladatra deduplikálódik
+    job_id = manager.submit(date(2024, 1, 1))
+    assert job_id != failed_id
+    assert manager.run_pending() == 1
+    assert manager.get_job(job_id).status == JOB_DONE
+
+def test_worker_error_outside_job_frees_worker(manager):
+    """A sor lekérdezésének hibája után a worker helye felszabadul (a következő submit új szálat indít)."""
+    manager._worker = threading.current_thread()
+    
+    with patch.object(manager, '_claim_next', side_effect=RuntimeError("Adatbázis nem elérhető")):
+        with pytest.raises(RuntimeError):
+            manager._worker_loop()
+    assert manager._worker is None
+
+def test_recover_orphans(manager, db_session):
+    """Újraindítás után a RUNNING állapotban maradt feladat FAILED lesz."""
+    job_id = manager.submit(date(2024, 1, 1))
+    db_session.get(SyncJobDB, job_id).status = JOB_RUNNING
+    db_session.commit()
+    
+    assert manager.recover_orphans() == 1
+    assert manager.get_job(job_id).status == JOB_FAILED
+    assert not manager.has_active_jobs()
@@ -0,0 +1,150 @@
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Flowable, SimpleDocTemplate
+
+from src.models import DailySummary, ProductionEvent
+from ui.pdf_export import (
+    FlowableStream, ReportTemplate, _row_chunks, EVENT_APPENDIX_COLUMNS, generate_pdf_report, generate_period_report, get_template
+)
+
+def _inputs():
+    """Egy órányi percenkénti esemény és a napi összesítő."""
+    summary = DailySummary(
+        date=date(2024, 1, 1), machine_id="PM1", oee_pct=80.0, availability_pct=90.0, performance_pct=95.0,
+        quality_pct=97.0, total_tons=100.0, good_tons=97.0, scrap_tons=3.0
+    )
+    events = [
+        ProductionEvent(
+            timestamp=datetime(2024, 1, 1) + timedelta(minutes=i), duration_seconds=60,
+            event_type="STOP" if i % 5 == 0 else "RUN", weight_kg=100.0, average_speed=900.0,
+            machine_id="PM1", article_id="A1"
+        )
+        for i in range(60)
+    ]
+    return summary, events
+
+def test_template_is_shared_between_reports():
+    """A jelentések ugyanazt a folyamatszintű sablont használják."""
+    summary, events = _inputs()
+    template = get_template()
+
+    first = generate_pdf_report("PM1", date(2024, 1, 1), summary, events, article_names={"A1": "Termék"})
+    second = generate_pdf_report("PM1", date(2024, 1, 2), summary, events, article_names={"A1": "Termék"})
+
+    assert get_template() is template
+    assert first.getvalue().startswith(b"%PDF") and second.getvalue().startswith(b"%PDF")
+
+def test_template_without_logo_falls_back_to_text_header(tmp_path):
+    """Hiányzó logó esetén nincs logó flowable; egyébként dokumentumonként új, előre lemért flowable."""
+    template = ReportTemplate(logo_path=str(tmp_path / "nincs.jpeg"))
+    assert template.logo() is None
+
+    logo_template = get_template()
+    first, second = logo_template.logo(), logo_template.logo()
+    # Dokumentumonként új flowable, de ugyanabból a beolvasott képből
+    assert first is not second
+    assert first.wrap(500, 500) == (logo_template.logo_width, 40)
+
+def test_period_report_from_aggregates():
+    """A heti / havi jelentés az aggregátumokból készül, üres időszakra is érvényes PDF-fel."""
+    summary, _ = _inputs()
+    totals = {
+        "total_tons": 100.0, "good_tons": 97.0, "scrap_tons": 3.0, "target_tons": 120.0, "downtime_min": 30.0,
+        "break_count": 2, "day_count": 1, "electricity_kwh": 1.0, "water_m3": 1.0, "steam_tons": 1.0, "fiber_tons": 1.0,
+        "oee_pct": 80.0, "availability_pct": 90.0, "performance_pct": 95.0, "quality_pct": 97.0, "avg_speed_m_min": 900.0,
+        "spec_electricity_kwh_t": 1.0, "spec_water_m3_t": 1.0, "spec_steam_t_t": 1.0, "spec_fiber_t_t": 1.0
+    }
+    articles = pd.DataFrame([{"article_id": "A1", "tons": 100.0, "run_min": 600.0, "avg_speed": 900.0,
+                              "gsm": 80.0, "moisture": None, "strength": None}])
+    downtime = pd.DataFrame([{"event_type": "STOP", "description": None, "minutes": 30.0, "count": 2}])
+
+    pdf = generate_period_report("PM1", "month", date(2024, 1, 1), date(2024, 1, 31), (totals, [summary], articles, downtime))
+    empty = generate_period_report("PM1", "week", date(2024, 1, 1), date(2024, 1, 7), ({}, [], articles.iloc[0:0], downtime.iloc[0:0]))
+
+    assert pdf.getvalue().startswith(b"%PDF") and empty.getvalue().startswith(b"%PDF")
+
+def _event_frame(start, count):
+    """count darab percenkénti RUN esemény a nap start-adik percétől."""
+    return pd.DataFrame({
+        "timestamp": pd.date_range(datetime(2024, 1, 1) + timedelta(minutes=start), periods=count, freq="min"),
+        "event_type": "RUN", "status": "GOOD", "article_id": "A1", "duration_seconds": 60,
+        "weight_kg": 100.0, "average_speed": 900.0, "description": None
+    })
+
+def test_flowable_stream_pulls_lazily():
+    """A FlowableStream hossz lekérdezéskor legfeljebb lookahead elemet húz be a generátorból."""
+    pulled = []
+    def source():
+        for i in range(10):
+            pulled.append(i)
+            yield i
+
+    stream = FlowableStream(source(), lookahead=3)
+    assert len(stream) == 3 and pulled == [0, 1, 2]
+    stream.pop(0)
+    assert len(stream) == 3 and pulled == [0, 1, 2, 3]
+
+def test_flowable_stream_is_consumed_lazily_by_doc_build():
+    """A teljes doc.build is lépésenként húzza be az elemeket (a ReportLab len() alapú ciklusa)."""
+    drawn, ahead = [], []
+
+    class Marker(Flowable):
+        def wrap(self, availWidth, availHeight):
+            return 10, 10
+
+        def draw(self):
+            drawn.append(self)
+
+    def source():
+        for i in range(300):
+            # A behúzott, de még ki nem rajzolt elemek száma
+            ahead.append(i - len(drawn))
+            yield Marker()
+
+    SimpleDocTemplate(BytesIO(), pagesize=A4).build(FlowableStream(source(), lookahead=3))
+
+    assert len(drawn) == 300
+    assert max(ahead) <= 3
+
+def test_row_chunks_span_frame_boundaries():
+    """A táblázatnyi sorcsomagok átnyúlnak a DataFrame darabok határán (üres darab kimarad)."""
+    frames = [_event_frame(0, 7), pd.DataFrame(), _event_frame(7, 6)]
+    chunks = list(_row_chunks(frames, EVENT_APPENDIX_COLUMNS, 5, {"A1": "Termék"}))
+
+    assert [len(c) for c in chunks] == [5, 5, 3]
+    assert chunks[1][2][0] == "01-01 00:07:00"
+    assert chunks[0][0][3] == "Termék" and chunks[0][0][7] == ""
+
+def test_report_with_appendix_written_to_file(tmp_path):
+    """Melléklettel fájlba írt jelentés: Path visszatérési érték, ideiglenes fájl nem marad."""
+    summary, events = _inputs()
+    quality = pd.DataFrame({"timestamp": [datetime(2024, 1, 1, 8)], "article_id": ["A1"],
+                            "gsm_measured": [80.0], "moisture_pct": [None], "strength_knm": [5.0]})
+    appendix = ((_event_frame(i * 500, 500) for i in range(3)), iter([quality]))
+
+    path = generate_pdf_report("PM1", date(2024, 1, 1), summary, events, appendix=appendix, output_path=tmp_path / "r.pdf")
+
+    assert isinstance(path, Path) and path.read_bytes().startswith(b"%PDF")
+    assert list(tmp_path.iterdir()) == [path]
+    # 1500 esemény a napi jelentés után: oldalanként kb. 75 sor
+    assert path.read_bytes().count(b"/Type /Page\n") > 20
+
+def test_appendix_falls_back_to_stock_reportlab_path(tmp_path):
+    """Nem tesztelt ReportLab verzión a melléklet a szabványos listával és Canvas-szal készül, azonos oldalszámmal."""
+    summary, events = _inputs()
+
+    def build(name):
+        appendix = ((_event_frame(i * 500, 500) for i in range(2)), iter([]))
+        return generate_pdf_report("PM1", date(2024, 1, 1), summary, events, appendix=appendix, output_path=tmp_path / name)
+
+    compact = build("compact.pdf").read_bytes()
+    with patch("ui.pdf_export.REPORTLAB_INTERNALS_OK", False):
+        stock = build("stock.pdf").read_bytes()
+
+    assert stock.startswith(b"%PDF")
+    assert stock.count(b"/Type /Page\n") == compact.count(b"/Type /Page\n")
@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from datetime import date
+from contextlib import contextmanager
+from datetime import date, datetime
+from src.models import DataVersionDB, ProductionEventDB, StaleDayDB, SyncedDayDB
 from src.pipeline import Pipeline
+from src.transformers.shift_calendar import ShiftCalendar
 
 @pytest.fixture
 def pipeline():
@@ -19,12 +22,14 @@ def test_pipeline_full_load_calls(pipeline):
     pipeline._load_excel_data = MagicMock()
     pipeline._load_production_events = MagicMock()
     pipeline._update_daily_summaries = MagicMock()
+    pipeline._bump_data_versions = MagicMock()
     
     pipeline.run_full_load(target_date)
     
     pipeline._load_excel_data.assert_called_once()
     pipeline._load_production_events.assert_called_with(target_date, None)
     pipeline._update_daily_summaries.assert_called_with(target_date, None)
+    pipeline._bump_data_versions.assert_called_with(target_date, None)
 
 def test_get_active_machines(pipeline):
     """Teszteli az aktív gépek lekérését."""
@@ -37,3 +42,65 @@ def test_get_active_machines(pipeline):
         
         machines = pipeline._get_active_machines()
         assert machines == ["PM1", "PM2"]
+
+def test_failed_load_does_not_bump_versions(pipeline):
+    """Hibás futás esetén az adatverzió nem változik (a gyorsítótár érvényes marad)."""
+    pipeline._load_excel_data = MagicMock()
+    pipeline._load_production_events = MagicMock(side_effect=RuntimeError("MES nem elérhető"))
+    pipeline._bump_data_versions = MagicMock()
+    
+    with pytest.raises(RuntimeError):
+        pipeline.run_full_load(date(2024, 1, 1), "PM1")
+    
+    pipeline._bump_data_versions.assert_not_called()
+
+def test_run_stale_days_continues_after_failure(pipeline):
+    """Egy hibás elavult nap nem állítja le a többi feldolgozását."""
+    stale = [("PM1", date(2024, 1, 1)), ("PM2", date(2024, 1, 1)), ("PM1", date(2024, 1, 2))]
+    pipeline.run_full_load = MagicMock(side_effect=[None, RuntimeError("MES nem elérhető"), None])
+    
+    with patch('src.pipeline.get_stale_days', return_value=stale):
+        assert pipeline.run_stale_days() == 2
+    
+    pipeline.run_full_load.assert_any_call(target_date=date(2024, 1, 2), target_machine_id="PM1")
+
+def test_bump_data_versions_covers_overlapping_night_shift(pipeline, db_session):
+    """Egy nap szinkronizálása az előző napon kezdődő éjszakás műszak napjának verzióját is növeli."""
+    @contextmanager
+    def fake_get_db():
+        yield db_session
+        db_session.commit()
+    
+    pipeline.metrics_calculator.shift_calendar = ShiftCalendar([6, 14, 22])
+    with patch('src.pipeline.get_db', fake_get_db):
+        pipeline._bump_data_versions(date(2024, 1, 2), "PM1")
+        pipeline._bump_data_versions(date(2024, 1, 2), "PM1")
+    
+    versions = {row.date: row.version for row in db_session.query(DataVersionDB).filter(DataVersionDB.machine_id == "PM1")}
+    assert versions == {date(2024, 1, 1): 2, date(2024, 1, 2): 2}
+
+def test_target_only_stale_day_is_cleared(pipeline, db_session):
+    """A forrásból eltűnt (extra) nap eseményei törlődnek, a nap lekerül az elavult listáról; más üres nap érintetlen."""
+    @contextmanager
+    def fake_get_db():
+        yield db_session
+        db_session.commit()
+    
+    for day in (1, 2):
+        db_session.add(ProductionEventDB(timestamp=datetime(2024, 1, day, 8), machine_id="PM1",
+                                         event_type="RUN", duration_seconds=3600))
+    db_session.add(StaleDayDB(machine_id="PM1", date=date(2024, 1, 1), reason="extra"))
+    db_session.commit()
+    pipeline.events_extractor.fetch_events.return_value = []
+    
+    with patch('src.pipeline.get_db', fake_get_db), patch('src.reconciliation.get_db', fake_get_db):
+        pipeline._load_production_events(date(2024, 1, 1), "PM1")
+        pipeline._load_production_events(date(2024, 1, 2), "PM1")
+    
+    assert [e.timestamp.date() for e in db_session.query(ProductionEventDB)] == [date(2024, 1, 2)]
+    assert db_session.query(StaleDayDB).count() == 0
+    assert db_session.query(SyncedDayDB).one().event_count == 0
+    
+    pipeline.metrics_calculator.calculate_all_metrics.return_value = (None, [], [])
+    pipeline._update_daily_summaries(date(2024, 1, 1), "PM1")
+    pipeline.metrics_calculator.delete_summary.assert_called_once_with("PM1", date(2024, 1, 1))
@@ -1,10 +1,12 @@
 import pytest
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 from datetime import date, datetime
 from src.transformers.production_metrics import MetricsCalculator
 from src.models import (
     ProductionEventDB, ProductionPlanDB, 
-    UtilityConsumptionDB, QualityDataDB
+    UtilityConsumptionDB, QualityDataDB,
+    DailySummaryDB, KpiRollupDB, ReliabilityStatsDB
 )
 
 @pytest.fixture
@@ -81,6 +83,7 @@ def test_calculate_daily_metrics_with_data(calculator):
                 mock_q.filter.return_value.all.return_value = mock_plans
             elif model == UtilityConsumptionDB:
                 mock_q.filter.return_value.first.return_value = mock_utility
+                mock_q.filter.return_value.all.return_value = [mock_utility]
             elif model == QualityDataDB:
                 mock_q.filter.return_value.all.return_value = []
             return mock_q
@@ -105,3 +108,84 @@ def test_calculate_daily_metrics_with_data(calculator):
         assert result.spec_electricity_kwh_t == 100.0 # 2000 / 20
         assert result.spec_water_m3_t == 10.0 # 200 / 20
         assert result.spec_fiber_t_t == 1.1 # 22 / 20
+
+def test_calculate_all_metrics_hourly_and_shift(calculator):
+    """Teszteli az óránkénti és műszakos összesítők számítását ugyanabból a lekérdezésből."""
+    with patch('src.transformers.production_metrics.get_db') as mock_get_db:
+        mock_db = MagicMock()
+        mock_get_db.return_value.__enter__.return_value = mock_db
+        
+        target_date = date(2024, 1, 2)
+        machine_id = "PM1"
+        
+        mock_events = [
+            # Előző nap éjszakás műszakja (22-06), nem része a napi összesítőnek
+            ProductionEventDB(event_type="RUN", status="GOOD", weight_kg=5000, duration_seconds=3600,
+                              average_speed=100.0, machine_id=machine_id, timestamp=datetime(2024, 1, 1, 23, 0)),
+            # Ugyanaz a műszak, már a vizsgált napon
+            ProductionEventDB(event_type="RUN", status="SCRAP", weight_kg=1000, duration_seconds=3600,
+                              average_speed=100.0, machine_id=machine_id, timestamp=datetime(2024, 1, 2, 1, 0)),
+            # Délelőttös műszak (06-14)
+            ProductionEventDB(event_type="BREAK", duration_seconds=1800,
+                              machine_id=machine_id, timestamp=datetime(2024, 1, 2, 7, 0)),
+        ]
+        mock_plans = [
+            ProductionPlanDB(machine_id=machine_id, date=date(2024, 1, 1), target_quantity_tons=24.0, target_speed=100.0),
+            ProductionPlanDB(machine_id=machine_id, date=date(2024, 1, 2), target_quantity_tons=48.0, target_speed=100.0),
+        ]
+        
+        def mock_query(model):
+            mock_q = MagicMock()
+            if model == ProductionEventDB:
+                mock_q.filter.return_value.all.return_value = mock_events
+            elif model == ProductionPlanDB:
+                mock_q.filter.return_value.all.return_value = mock_plans
+            else:
+                mock_q.filter.return_value.all.return_value = []
+            return mock_q
+        
+        mock_db.query.side_effect = mock_query
+        
+        summary, hourly, shifts = calculator.calculate_all_metrics(machine_id, target_date)
+        
+        # A napi összesítő csak a vizsgált nap eseményeit tartalmazza
+        assert summary.total_tons == 1.0
+        assert summary.break_count == 1
+        
+        # Óránként csak azok az órák, ahol volt esemény
+        assert [h.period_start.hour for h in hourly] == [1, 7]
+        assert all(h.date == target_date for h in hourly)
+        
+        # Az éjszakás műszak mindkét nap eseményeit tartalmazza
+        night = next(s for s in shifts if s.period_start == datetime(2024, 1, 1, 22, 0))
+        assert night.shift_name == "22-06"
+        assert night.date == date(2024, 1, 1)
+        assert night.total_tons == 6.0
+        assert night.scrap_tons == 1.0
+        # Időarányos terv: 2 óra az első napból (24 t) + 6 óra a másodikból (48 t)
+        assert night.target_tons == pytest.approx(24.0 * 2 / 24 + 48.0 * 6 / 24, 0.01)
+        
+        morning = next(s for s in shifts if s.shift_name == "06-14")
+        assert morning.break_count == 1
+        assert morning.availability_pct == 0.0
+
+def test_delete_summary_reverts_rollups_and_windows(calculator, db_session):
+    """A törölt napi összesítőt a heti összesítő és a gördülő ablak is levonja; hiányzó nap törlése nem csinál semmit."""
+    @contextmanager
+    def fake_get_db():
+        yield db_session
+        db_session.commit()
+    
+    with patch('src.transformers.production_metrics.get_db', fake_get_db):
+        for day, tons in ((1, 100.0), (2, 40.0)):
+            calculator.save_summary(DailySummaryDB(date=date(2024, 1, day), machine_id="PM1", total_tons=tons,
+                                                   run_time_sec=3600.0, break_count=1))
+        calculator.delete_summary("PM1", date(2024, 1, 2))
+        calculator.delete_summary("PM1", date(2024, 1, 3))
+    
+    assert [s.date for s in db_session.query(DailySummaryDB)] == [date(2024, 1, 1)]
+    week = db_session.query(KpiRollupDB).filter_by(machine_id="PM1", period_type="week").one()
+    assert (week.total_tons, week.day_count) == (100.0, 1.0)
+    window = db_session.query(ReliabilityStatsDB).filter_by(machine_id="PM1", date=date(2024, 1, 2),
+                                                            window_days=calculator.reliability_calculator.windows[0]).one()
+    assert (window.total_tons, window.break_count, window.day_count) == (100.0, 1.0, 1.0)
@@ -0,0 +1,89 @@
+import pytest
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from src.catalog import record_synced_day
+from src.models import ProductionEvent, ProductionEventDB, StaleDayDB
+from src.reconciliation import Reconciler, get_stale_days, get_stale_reason
+
+def _add_events(db, machine_id, day, hours):
+    events = [
+        ProductionEvent(timestamp=datetime(day.year, day.month, day.day, h), machine_id=machine_id,
+                        event_type="PRODUCTION", duration_seconds=3600)
+        for h in hours
+    ]
+    for event in events:
+        db.add(ProductionEventDB(**event.model_dump()))
+    return events
+
+@pytest.fixture
+def patched_db(db_session):
+    """A reconciliation modul get_db hívásait a teszt munkamenetére irányítja."""
+    @contextmanager
+    def fake_get_db():
+        yield db_session
+        db_session.commit()
+    
+    with patch('src.reconciliation.get_db', fake_get_db):
+        yield db_session
+
+def test_reconcile_detects_missing_count_and_newer_days(patched_db):
+    """A forrás és a riport napi aggregátumainak összevetése."""
+    _add_events(patched_db, "PM1", date(2024, 1, 1), [1, 2, 3])   # egyezik
+    _add_events(patched_db, "PM1", date(2024, 1, 2), [1, 2])      # hiányzik egy esemény
+    _add_events(patched_db, "PM1", date(2024, 1, 3), [1, 2])      # ugyanannyi, de újabb a forrás
+    patched_db.commit()
+    
+    extractor = MagicMock()
+    extractor.get_daily_event_stats.return_value = {
+        ("PM1", date(2024, 1, 1)): (3, datetime(2024, 1, 1, 3)),
+        ("PM1", date(2024, 1, 2)): (3, datetime(2024, 1, 2, 5)),
+        ("PM1", date(2024, 1, 3)): (2, datetime(2024, 1, 3, 4)),
+        ("PM1", date(2024, 1, 4)): (10, datetime(2024, 1, 4, 23)),
+    }
+    
+    stale = Reconciler(extractor).reconcile(date(2024, 1, 1), date(2024, 1, 4))
+    
+    assert stale == [
+        ("PM1", date(2024, 1, 2), "count"),
+        ("PM1", date(2024, 1, 3), "newer"),
+        ("PM1", date(2024, 1, 4), "missing"),
+    ]
+    extractor.get_daily_event_stats.assert_called_once()
+    with patch('src.reconciliation.get_db') as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = patched_db
+        assert get_stale_days(limit=1) == [("PM1", date(2024, 1, 2))]
+
+def test_reconcile_overwrites_previous_result_and_sync_clears_day(patched_db):
+    """Az ismételt egyeztetés felülírja a listát, a sikeres betöltés leveszi róla a napot."""
+    extractor = MagicMock()
+    extractor.get_daily_event_stats.return_value = {("PM1", date(2024, 1, 1)): (1, datetime(2024, 1, 1, 1))}
+    reconciler = Reconciler(extractor)
+    
+    reconciler.reconcile(date(2024, 1, 1), date(2024, 1, 1))
+    reconciler.reconcile(date(2024, 1, 1), date(2024, 1, 1))
+    assert patched_db.query(StaleDayDB).count() == 1
+    
+    events = _add_events(patched_db, "PM1", date(2024, 1, 1), [1])
+    record_synced_day(patched_db, "PM1", date(2024, 1, 1), events)
+    patched_db.commit()
+    assert patched_db.query(StaleDayDB).count() == 0
+    assert reconciler.reconcile(date(2024, 1, 1), date(2024, 1, 1)) == []
+
+def test_reconcile_flags_days_only_in_target(patched_db):
+    """A csak a riport adatbázisban szereplő (a forrásból törölt) nap is elavult."""
+    _add_events(patched_db, "PM1", date(2024, 1, 1), [1])
+    _add_events(patched_db, "PM1", date(2024, 1, 2), [1, 2])
+    _add_events(patched_db, "PM2", date(2024, 1, 2), [5])
+    patched_db.commit()
+    
+    extractor = MagicMock()
+    extractor.get_daily_event_stats.return_value = {("PM1", date(2024, 1, 1)): (1, datetime(2024, 1, 1, 1))}
+    
+    stale = Reconciler(extractor).reconcile(date(2024, 1, 1), date(2024, 1, 2))
+    
+    assert stale == [("PM1", date(2024, 1, 2), "extra"), ("PM2", date(2024, 1, 2), "extra")]
+    row = patched_db.query(StaleDayDB).filter(StaleDayDB.machine_id == "PM1").one()
+    assert (row.source_count, row.target_count, row.source_last_event) == (0, 2, None)
+    assert get_stale_reason("PM2", date(2024, 1, 2)) == "extra"
+    assert get_stale_reason("PM1", date(2024, 1, 1)) is None
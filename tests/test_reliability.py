@@ -0,0 +1,73 @@
+import pytest
+from datetime import date, timedelta
+from src.models import DailySummaryDB, ReliabilityStatsDB
+from src.transformers.reliability import (
+    ReliabilityCalculator, reliability_components, derive_reliability
+)
+
+START = date(2024, 1, 1)
+
+def _daily(day, breaks, tons=100.0):
+    return DailySummaryDB(
+        date=day, machine_id="PM1", run_time_sec=72000.0, break_count=breaks,
+        break_downtime_min=15.0 * breaks, total_tons=tons
+    )
+
+def _save(db, calc, summary):
+    """A MetricsCalculator.save_summary lépéseinek egyszerűsített mása."""
+    previous = db.query(DailySummaryDB).filter_by(machine_id="PM1", date=summary.date).first()
+    old = reliability_components(previous)
+    if previous is not None:
+        db.delete(previous)
+        db.flush()
+    db.add(summary)
+    calc.apply_daily_change(db, "PM1", summary.date, old, reliability_components(summary))
+    db.flush()
+
+def _brute_force(db, day, window):
+    rows = db.query(DailySummaryDB).filter(
+        DailySummaryDB.date > day - timedelta(days=window), DailySummaryDB.date <= day
+    ).all()
+    return sum(r.break_count for r in rows), sum(r.total_tons for r in rows)
+
+def test_sliding_window_matches_brute_force(db_session):
+    """A csúszóablakos összegek megegyeznek a teljes újraösszegzéssel, késői módosítás után is."""
+    calc = ReliabilityCalculator([3, 7])
+    for i in range(12):
+        _save(db_session, calc, _daily(START + timedelta(days=i), breaks=i % 4))
+    
+    # Késve érkező adat: a 6. nap újraszámolása
+    _save(db_session, calc, _daily(START + timedelta(days=5), breaks=10, tons=50.0))
+    
+    for window in (3, 7):
+        for i in range(12):
+            day = START + timedelta(days=i)
+            row = db_session.query(ReliabilityStatsDB).filter_by(date=day, window_days=window).one()
+            breaks, tons = _brute_force(db_session, day, window)
+            assert row.break_count == breaks
+            assert row.total_tons == pytest.approx(tons)
+            assert row.day_count == min(i + 1, window)
+
+def test_out_of_order_seed_from_daily_summaries(db_session):
+    """Ha nincs előző napi ablak, a napi összesítőkből indul az ablak."""
+    db_session.add_all([_daily(START, breaks=1), _daily(START + timedelta(days=1), breaks=2)])
+    db_session.flush()
+    
+    calc = ReliabilityCalculator([7])
+    _save(db_session, calc, _daily(START + timedelta(days=2), breaks=3))
+    
+    row = db_session.query(ReliabilityStatsDB).filter_by(date=START + timedelta(days=2)).one()
+    assert row.break_count == 6
+    assert row.day_count == 3
+
+def test_derive_reliability():
+    """MTBF, MTTR és szakadási ráta számítása."""
+    row = ReliabilityStatsDB(run_seconds=36000.0, break_count=4.0, break_downtime_min=60.0, total_tons=2000.0)
+    kpis = derive_reliability(row)
+    assert kpis["mtbf_h"] == pytest.approx(2.5)
+    assert kpis["mttr_min"] == pytest.approx(15.0)
+    assert kpis["breaks_per_kt"] == pytest.approx(2.0)
+    
+    no_breaks = derive_reliability(ReliabilityStatsDB(run_seconds=3600.0, break_count=0.0, break_downtime_min=0.0, total_tons=0.0))
+    assert no_breaks["mtbf_h"] is None
+    assert no_breaks["breaks_per_kt"] is None
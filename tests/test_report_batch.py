@@ -0,0 +1,51 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.models import DailySummaryDB, DataVersionDB, ProductionEventDB
+from ui.report_batch import BatchReportRunner
+
+# Minden KPI oszlop kitöltve (a PDF minden mezőt formáz)
+KPI_VALUES = {c.name: 1.0 for c in DailySummaryDB.__table__.columns if c.name not in ("id", "date", "machine_id")}
+KPI_VALUES["break_count"] = 1
+
+@pytest.fixture
+def runner(db_session, tmp_path):
+    """Kötegelt futtató a memóriabeli adatbázison, szálkészlettel (a teszt folyamaton belül)."""
+    for machine_id in ("PM1", "PM2"):
+        for day in (1, 2):
+            db_session.add(DailySummaryDB(machine_id=machine_id, date=date(2024, 1, day), **KPI_VALUES))
+            db_session.add(ProductionEventDB(timestamp=datetime(2024, 1, day, 8), machine_id=machine_id,
+                                             event_type="RUN", status="GOOD", duration_seconds=3600, weight_kg=1000.0))
+    # PM2 2. napján nincs esemény: üres jelentés, nem készül el
+    db_session.query(ProductionEventDB).filter(ProductionEventDB.machine_id == "PM2", ProductionEventDB.timestamp >= datetime(2024, 1, 2)).delete()
+    db_session.add(DataVersionDB(machine_id="PM1", date=date(2024, 1, 1), version=1))
+    db_session.commit()
+
+    with patch("ui.data_loader.get_read_db") as mock_get_db, \
+         patch("ui.report_batch.ProcessPoolExecutor", ThreadPoolExecutor):
+        mock_get_db.return_value.__enter__.return_value = db_session
+        yield BatchReportRunner(output_dir=tmp_path, workers=2)
+
+def test_run_renders_reports_and_writes_manifest(runner, tmp_path):
+    """Minden adattal rendelkező (gép, nap) kulcsra készül jelentés, a manifest rögzíti a verziót."""
+    stats = runner.run(date(2024, 1, 1), date(2024, 1, 2))
+    
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["reports"]
+    assert stats == {"rendered": 3, "skipped": 0, "empty": 1, "failed": 0}
+    assert manifest["PM1/2024-01-01"]["version"] == 1
+    assert (tmp_path / "Report_PM2_2024-01-01.pdf").read_bytes().startswith(b"%PDF")
+
+def test_rerun_skips_unchanged_and_rebuilds_new_versions(runner, db_session):
+    """Újrafuttatáskor csak a megváltozott verziójú nap készül el újra."""
+    runner.run(date(2024, 1, 1), date(2024, 1, 2))
+    db_session.query(DataVersionDB).filter(DataVersionDB.machine_id == "PM1").update({"version": 2})
+    db_session.commit()
+    
+    stats = runner.run(date(2024, 1, 1), date(2024, 1, 2), machine_ids=["PM1"])
+    
+    assert stats["rendered"] == 1
+    assert stats["skipped"] == 1
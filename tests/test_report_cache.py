@@ -0,0 +1,54 @@
+import os
+from datetime import date
+from io import BytesIO
+from unittest.mock import MagicMock
+from ui.report_cache import ReportCache
+
+def test_get_or_build_builds_once(tmp_path):
+    """Az első kérés elkészíti a jelentést, az ismételt letöltés a lemezről érkezik."""
+    cache = ReportCache(tmp_path, max_bytes=10_000)
+    builder = MagicMock(return_value=BytesIO(b"%PDF-1"))
+    
+    assert cache.get_or_build("PM1", date(2024, 1, 1), 1, builder) == b"%PDF-1"
+    assert cache.get_or_build("PM1", date(2024, 1, 1), 1, builder) == b"%PDF-1"
+    builder.assert_called_once()
+
+def test_new_version_replaces_old_file(tmp_path):
+    """Újraszinkronizálás után (új verzió) a régi jelentés törlődik."""
+    cache = ReportCache(tmp_path, max_bytes=10_000)
+    cache.put("PM1", date(2024, 1, 1), 1, b"old")
+    cache.put("PM1", date(2024, 1, 1), 2, b"new")
+    
+    assert cache.get("PM1", date(2024, 1, 1), 1) is None
+    assert cache.get("PM1", date(2024, 1, 1), 2) == b"new"
+
+def test_builder_without_data_is_not_cached(tmp_path):
+    """Ha nincs adat (a builder None-t ad), nem keletkezik fájl."""
+    cache = ReportCache(tmp_path, max_bytes=10_000)
+    assert cache.get_or_build("PM1", date(2024, 1, 1), 1, lambda: None) is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_lru_eviction(tmp_path):
+    """A méretkorlát túllépésekor a legrégebben használt fájl törlődik."""
+    cache = ReportCache(tmp_path, max_bytes=250)
+    for day, mtime in ((1, 1000), (2, 2000)):
+        path = cache.put("PM1", date(2024, 1, day), 1, b"x" * 100)
+        os.utime(path, (mtime, mtime))
+    
+    # Az 1. napi jelentés használata frissebbé teszi, mint a 2. napit
+    cache.get("PM1", date(2024, 1, 1), 1)
+    cache.put("PM1", date(2024, 1, 3), 1, b"x" * 100)
+    
+    assert cache.get("PM1", date(2024, 1, 2), 1) is None
+    assert cache.get("PM1", date(2024, 1, 1), 1) is not None
+    assert cache.get("PM1", date(2024, 1, 3), 1) is not None
+
+def test_period_reports_do_not_collide_with_daily(tmp_path):
+    """A heti jelentés ugyanarra a kezdőnapra külön fájl, a napi jelentés új verziója nem törli."""
+    cache = ReportCache(tmp_path, max_bytes=10_000)
+    cache.put("PM1", date(2024, 1, 1), 1, b"week", kind="week")
+    cache.put("PM1", date(2024, 1, 1), 2, b"day")
+
+    assert cache.get("PM1", date(2024, 1, 1), 1, kind="week") == b"week"
+    assert cache.get("PM1", date(2024, 1, 1), 1) is None
+    assert cache.get("PM1", date(2024, 1, 1), 2) == b"day"
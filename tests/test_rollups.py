@@ -0,0 +1,96 @@
+import pytest
+from datetime import date
+from src.models import DailySummaryDB, KpiRollupDB
+from src.transformers.rollups import (
+    RollupCalculator, period_start, period_end, daily_components, derive_kpis, daily_sum_columns
+)
+
+def _daily(day, total_tons=100.0, good_tons=95.0, target_tons=120.0, run=72000.0):
+    return DailySummaryDB(
+        date=day, machine_id="PM1", total_tons=total_tons, good_tons=good_tons,
+        scrap_tons=total_tons - good_tons, target_tons=target_tons, run_time_sec=run,
+        total_time_sec=86400.0, total_downtime_min=240.0, break_count=2,
+        avg_speed_m_min=800.0, electricity_kwh=35000.0, water_m3=700.0,
+        steam_tons=400.0, fiber_tons=110.0
+    )
+
+def test_period_start():
+    """Teszteli a hét / hónap / év kezdőnapjának meghatározását."""
+    day = date(2024, 5, 16)  # csütörtök
+    assert period_start(day, "week") == date(2024, 5, 13)
+    assert period_start(day, "month") == date(2024, 5, 1)
+    assert period_start(day, "year") == date(2024, 1, 1)
+    with pytest.raises(ValueError):
+        period_start(day, "quarter")
+
+def test_period_end():
+    """Teszteli a hét / hónap / év utolsó napjának meghatározását (szökőév februárja is)."""
+    assert period_end(date(2024, 5, 13), "week") == date(2024, 5, 19)
+    assert period_end(date(2024, 2, 1), "month") == date(2024, 2, 29)
+    assert period_end(date(2024, 12, 1), "month") == date(2024, 12, 31)
+    assert period_end(date(2024, 1, 1), "year") == date(2024, 12, 31)
+
+def test_apply_daily_change_is_incremental(db_session):
+    """Új nap hozzáadása, majd ugyanannak a napnak a módosítása csak a különbséget vezeti át."""
+    calc = RollupCalculator()
+    day = date(2024, 5, 16)
+    
+    calc.apply_daily_change(db_session, "PM1", day, daily_components(None), daily_components(_daily(day)))
+    calc.apply_daily_change(db_session, "PM1", date(2024, 5, 17), daily_components(None), daily_components(_daily(date(2024, 5, 17))))
+    db_session.flush()
+    
+    week = db_session.query(KpiRollupDB).filter_by(period_type="week", period_start=date(2024, 5, 13)).one()
+    assert week.total_tons == 200.0
+    assert week.day_count == 2
+    
+    # Késve érkező adatok: a nap újraszámolása 110 tonnával
+    calc.apply_daily_change(db_session, "PM1", day, daily_components(_daily(day)), daily_components(_daily(day, total_tons=110.0, good_tons=105.0)))
+    db_session.flush()
+    
+    for period_type in ("week", "month", "year"):
+        row = db_session.query(KpiRollupDB).filter_by(period_type=period_type).one()
+        assert row.total_tons == 210.0
+        assert row.good_tons == 200.0
+        assert row.day_count == 2
+
+def test_derive_kpis_from_components(db_session):
+    """Az OEE az összegzett komponensekből számolódik, nem a napi OEE-k átlagából."""
+    calc = RollupCalculator()
+    calc.apply_daily_change(db_session, "PM1", date(2024, 5, 13), daily_components(None),
+                            daily_components(_daily(date(2024, 5, 13), total_tons=100.0, good_tons=100.0, target_tons=100.0, run=86400.0)))
+    calc.apply_daily_change(db_session, "PM1", date(2024, 5, 14), daily_components(None),
+                            daily_components(_daily(date(2024, 5, 14), total_tons=50.0, good_tons=40.0, target_tons=100.0, run=43200.0)))
+    db_session.flush()
+    
+    week = db_session.query(KpiRollupDB).filter_by(period_type="week").one()
+    kpis = derive_kpis(week)
+    
+    assert kpis["availability_pct"] == pytest.approx(75.0)
+    assert kpis["performance_pct"] == pytest.approx(75.0)
+    assert kpis["quality_pct"] == pytest.approx(140.0 / 150.0 * 100.0)
+    assert kpis["oee_pct"] == pytest.approx(0.75 * 0.75 * (140.0 / 150.0) * 100.0)
+    assert kpis["spec_electricity_kwh_t"] == pytest.approx(70000.0 / 150.0)
+
+def test_rebuild_from_daily_summaries(db_session):
+    """Teszteli az összesítők teljes újraépítését a napi táblából."""
+    db_session.add_all([_daily(date(2024, 1, 31)), _daily(date(2024, 2, 1))])
+    db_session.flush()
+    
+    count = RollupCalculator().rebuild(db_session)
+    db_session.flush()
+    
+    assert count == 2
+    months = db_session.query(KpiRollupDB).filter_by(period_type="month").order_by(KpiRollupDB.period_start).all()
+    assert [m.period_start for m in months] == [date(2024, 1, 1), date(2024, 2, 1)]
+    year = db_session.query(KpiRollupDB).filter_by(period_type="year").one()
+    assert year.total_tons == 200.0
+
+def test_daily_sum_columns_match_daily_components(db_session):
+    """Az SQL aggregátum ugyanazt adja, mint a napi komponensek Pythonban összegezve."""
+    days = [_daily(date(2024, 1, 1)), _daily(date(2024, 1, 2), total_tons=80.0, good_tons=70.0, run=60000.0)]
+    db_session.add_all(days)
+    db_session.flush()
+    
+    row = db_session.query(*daily_sum_columns()).one()
+    for field, value in daily_components(days[0]).items():
+        assert getattr(row, field) == pytest.approx(value + daily_components(days[1])[field])
@@ -0,0 +1,77 @@
+import pandas as pd
+
+from ui.segments import run_length_segments, state_durations, dominant_buckets, downsample_segments
+
+def _frame(rows):
+    start = pd.Timestamp("2024-01-01 06:00")
+    return pd.DataFrame({
+        "Kezdet": [start + pd.Timedelta(minutes=10 * i) for i in range(len(rows))],
+        "Vége": [start + pd.Timedelta(minutes=10 * (i + 1)) for i in range(len(rows))],
+        "Állapot": [r[0] for r in rows],
+        "Termék": [r[1] for r in rows],
+    })
+
+def test_run_length_segments_merges_consecutive_rows():
+    """Az azonos állapotú és termékű egymást követő sorok egy szakasszá olvadnak."""
+    df = _frame([("GOOD", "A"), ("GOOD", "A"), ("STOP", "A"), ("GOOD", "A"), ("GOOD", "B"), ("GOOD", "B")])
+    
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    assert list(segments["Állapot"]) == ["GOOD", "STOP", "GOOD", "GOOD"]
+    assert list(segments["Termék"]) == ["A", "A", "A", "B"]
+    assert segments["Kezdet"].iloc[0] == df["Kezdet"].iloc[0]
+    assert segments["Vége"].iloc[0] == df["Vége"].iloc[1]
+    assert segments["Vége"].iloc[-1] == df["Vége"].iloc[-1]
+
+def test_run_length_segments_treats_missing_keys_as_equal():
+    """A hiányzó termék (pl. leállás alatt) nem bontja szét a szakaszt."""
+    df = _frame([("STOP", None), ("STOP", None), ("STOP", "A")])
+    
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    assert len(segments) == 2
+    assert segments["Vége"].iloc[0] == df["Vége"].iloc[1]
+
+def test_run_length_segments_empty_input():
+    """Üres bemenetre üres, azonos oszlopszerkezetű eredmény."""
+    df = _frame([])
+    
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    assert segments.empty
+    assert list(segments.columns) == list(df.columns)
+
+def test_state_durations_sums_minutes_and_segments():
+    """Állapotonkénti összes perc és szakaszszám, csökkenő sorrendben."""
+    df = _frame([("GOOD", "A"), ("GOOD", "A"), ("STOP", "A"), ("GOOD", "B")])
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    states = state_durations(segments, "Állapot", "Kezdet", "Vége")
+    
+    assert list(states["Állapot"]) == ["GOOD", "STOP"]
+    assert list(states["Perc"]) == [30.0, 10.0]
+    assert list(states["Szakaszok"]) == [2, 1]
+
+def test_dominant_buckets_picks_longest_state_per_bucket():
+    """Óránkénti résekben a leghosszabb ideig fennálló állapot nyer, az azonos szomszédos rések összeolvadnak."""
+    # 06:00-07:00: 40 perc GOOD + 20 perc STOP, 07:00-08:00: 10 perc GOOD + 50 perc STOP
+    df = _frame([("GOOD", "A")] * 4 + [("STOP", "A")] * 2 + [("GOOD", "A")] + [("STOP", "A")] * 5)
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    buckets = dominant_buckets(segments, ["Állapot", "Termék"], "Kezdet", "Vége", pd.Timedelta(hours=1))
+    
+    assert list(buckets["Állapot"]) == ["GOOD", "STOP"]
+    assert buckets["Kezdet"].iloc[1] == pd.Timestamp("2024-01-01 07:00")
+    assert buckets["Vége"].iloc[-1] == df["Vége"].iloc[-1]
+
+def test_downsample_segments_bounds_segment_count():
+    """Sok szakasznál az eredmény a megadott korlát alatt marad; kevésnél változatlan."""
+    df = _frame([("GOOD" if i % 2 else "STOP", "A") for i in range(30 * 144)])
+    segments = run_length_segments(df, ["Állapot", "Termék"], "Kezdet", "Vége")
+    
+    small, small_width = downsample_segments(segments.head(10), ["Állapot"], "Kezdet", "Vége", 50, 15)
+    reduced, width = downsample_segments(segments, ["Állapot"], "Kezdet", "Vége", 50, 15)
+    
+    assert small_width is None and len(small) == 10
+    assert width >= pd.Timedelta(minutes=15)
+    assert len(reduced) <= 50
@@ -0,0 +1,35 @@
+import pytest
+from datetime import date, datetime
+from src.transformers.shift_calendar import ShiftCalendar
+
+def test_shifts_overlapping_includes_previous_night_shift():
+    """Teszteli, hogy az előző nap éjszakás műszakja is a naphoz tartozik."""
+    calendar = ShiftCalendar([6, 14, 22])
+    shifts = calendar.shifts_overlapping(date(2024, 1, 2))
+    
+    assert [s[0] for s in shifts] == ["22-06", "06-14", "14-22", "22-06"]
+    assert shifts[0][1] == datetime(2024, 1, 1, 22, 0)
+    assert shifts[0][2] == datetime(2024, 1, 2, 6, 0)
+    assert shifts[-1][2] == datetime(2024, 1, 3, 6, 0)
+
+def test_shifts_aligned_to_midnight():
+    """Éjfélkor kezdődő műszakrendnél nincs átnyúló műszak."""
+    calendar = ShiftCalendar([0, 12])
+    shifts = calendar.shifts_overlapping(date(2024, 1, 2))
+    
+    assert [(s[1].hour, s[2].hour) for s in shifts] == [(0, 12), (12, 0)]
+    assert shifts[-1][2] == datetime(2024, 1, 3, 0, 0)
+
+def test_hours_cover_whole_day():
+    """A nap 24 órás időablakainak ellenőrzése."""
+    hours = ShiftCalendar().hours(date(2024, 1, 1))
+    assert len(hours) == 24
+    assert hours[0][0] == datetime(2024, 1, 1, 0, 0)
+    assert hours[-1][1] == datetime(2024, 1, 2, 0, 0)
+
+def test_invalid_start_hours():
+    """Érvénytelen műszakkezdési órák elutasítása."""
+    with pytest.raises(ValueError):
+        ShiftCalendar([])
+    with pytest.raises(ValueError):
+        ShiftCalendar([6, 25])
@@ -0,0 +1,59 @@
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "simulate_events.py"
+START, END = date(2024, 1, 1), date(2024, 1, 20)
+
+@pytest.fixture(scope="module")
+def simulator():
+    """A szimulátor script modulként betöltve (a main() nem fut)."""
+    spec = importlib.util.spec_from_file_location("simulate_events", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _run(simulator, machines, seed=7):
+    """Gépenkénti események egy DataFrame-ben (szintetikus terv, több blokkon át)."""
+    return {
+        machine_id: pd.concat(list(simulator.machine_events(machine_id, seed_seq, START, END, True)), ignore_index=True)
+        for machine_id, seed_seq in simulator.machine_streams(machines, seed)
+    }
+
+def test_same_seed_gives_identical_events(simulator, monkeypatch):
+    """Azonos seed mellett a kimenet sorról sorra azonos, eltérő seed mellett nem."""
+    monkeypatch.setattr(simulator, "DAYS_PER_BLOCK", 7)
+    first, second = _run(simulator, ["PM1", "PM2"]), _run(simulator, ["PM1", "PM2"])
+
+    for machine_id in ("PM1", "PM2"):
+        assert len(first[machine_id]) > 0
+        pd.testing.assert_frame_equal(first[machine_id], second[machine_id])
+    assert not first["PM1"].equals(_run(simulator, ["PM1"], seed=8)["PM1"])
+
+def test_adding_machine_keeps_other_streams(simulator, monkeypatch):
+    """Egy új gép hozzáadása nem változtatja meg a meglévő gépek eseményeit."""
+    monkeypatch.setattr(simulator, "DAYS_PER_BLOCK", 7)
+    two = _run(simulator, ["PM1", "PM2"])
+    three = _run(simulator, ["PM1", "PM2", "PM3"])
+
+    for machine_id in ("PM1", "PM2"):
+        pd.testing.assert_frame_equal(two[machine_id], three[machine_id])
+    assert not three["PM3"].equals(three["PM1"])
+
+def test_events_are_contiguous_within_day(simulator, monkeypatch):
+    """Egy napon az események éjféltől éjfélig hézag és átfedés nélkül követik egymást."""
+    monkeypatch.setattr(simulator, "DAYS_PER_BLOCK", 7)
+    df = _run(simulator, ["PM1"])["PM1"]
+
+    assert set(df["machine_id"]) == {"PM1"}
+    ends = df["timestamp"] + pd.to_timedelta(df["duration_seconds"], unit="s")
+    for day, idx in df.groupby(df["timestamp"].dt.normalize()).groups.items():
+        starts, day_ends = df.loc[idx, "timestamp"].to_numpy(), ends[idx].to_numpy()
+        assert starts[0] == day.to_datetime64()
+        np.testing.assert_array_equal(starts[1:], day_ends[:-1])
+        assert day_ends[-1] == (day + pd.Timedelta(days=1)).to_datetime64()
+    assert df["timestamp"].dt.normalize().nunique() == (END - START).days + 1
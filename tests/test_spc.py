@@ -0,0 +1,48 @@
+import pytest
+import statistics
+from datetime import datetime
+from src.transformers.spc import RunningStats, build_daily_accumulators
+
+VALUES = [148.2, 151.0, 149.7, 150.3, 152.1, 147.9, 150.0, 149.1]
+
+def test_running_stats_matches_batch():
+    """A Welford-akkumulátor eredménye megegyezik a hagyományos számítással."""
+    stats = RunningStats.from_values(VALUES)
+    assert stats.count == len(VALUES)
+    assert stats.mean == pytest.approx(statistics.mean(VALUES))
+    assert stats.variance == pytest.approx(statistics.variance(VALUES))
+    assert stats.min_value == min(VALUES)
+    assert stats.max_value == max(VALUES)
+
+def test_merge_is_equivalent_to_single_pass():
+    """Két részakkumulátor összefésülése azonos a teljes sorozat akkumulátorával."""
+    merged = RunningStats.from_values(VALUES[:3]).merge(RunningStats.from_values(VALUES[3:]))
+    full = RunningStats.from_values(VALUES)
+    assert merged.count == full.count
+    assert merged.mean == pytest.approx(full.mean)
+    assert merged.m2 == pytest.approx(full.m2)
+    assert RunningStats().merge(full).mean == pytest.approx(full.mean)
+
+def test_capability():
+    """Cp / Cpk számítása névleges GSM és ±3% tolerancia alapján."""
+    stats = RunningStats.from_values(VALUES)
+    cp, cpk = stats.capability(150.0, 3.0)
+    sigma = statistics.stdev(VALUES)
+    assert cp == pytest.approx(9.0 / (6 * sigma))
+    assert cpk == pytest.approx(min(154.5 - stats.mean, stats.mean - 145.5) / (3 * sigma))
+    assert RunningStats.from_values([150.0]).capability(150.0, 3.0) == (None, None)
+
+def test_build_daily_accumulators():
+    """A beolvasott mérésekből gépenként, termékenként és metrikánként épül akkumulátor."""
+    measurements = [
+        {"timestamp": datetime(2024, 1, 1, 8), "machine_id": "PM1", "article_id": "KL_150",
+         "gsm_measured": 150.0, "moisture_pct": 6.5, "strength_knm": 5.5},
+        {"timestamp": datetime(2024, 1, 1, 10), "machine_id": "PM1", "article_id": "KL_150",
+         "gsm_measured": 152.0, "moisture_pct": 6.7, "strength_knm": float("nan")},
+    ]
+    acc = build_daily_accumulators(measurements)
+    gsm = acc[("PM1", "KL_150", datetime(2024, 1, 1).date(), "gsm")]
+    assert gsm.count == 2
+    assert gsm.mean == pytest.approx(151.0)
+    # A hiányzó (NaN) mérést kihagyja
+    assert acc[("PM1", "KL_150", datetime(2024, 1, 1).date(), "strength")].count == 1
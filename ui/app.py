@@ -8,6 +8,10 @@ vizualizációjáért és az interaktív funkciók (szűrés, exportálás) keze
 
 import streamlit as st
 import pandas as pd
+import functools
+import logging
+import tempfile
+import time
 from datetime import timedelta, date
 from pathlib import Path
 import sys
@@ -17,17 +21,29 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
 from ui.styles import apply_custom_css
-from ui.data_loader import (
+from ui.cache import (
     load_machines, get_daily_data, get_pareto_data, 
-    get_trend_data, get_data_availability, load_articles_map
+    get_daily_events_frame, get_events_frame, get_daily_quality_frame, get_daily_summary,
+    get_trend_data, get_kpi_trend, get_data_availability, load_articles_map,
+    get_period_summaries, get_rollup_data, get_reliability_trend,
+    get_spc_summary, get_synced_days, cache_stats, invalidate_versions
 )
 from ui.charts import (
     render_sparkline, create_timeline_chart, create_status_pie_chart,
     create_article_bar_chart, create_article_pie_chart, create_quality_charts,
-    create_pareto_chart
+    create_pareto_chart, create_period_kpi_chart, create_sync_calendar_chart,
+    create_kpi_trend_chart, build_timeline_frame, build_article_mix
 )
-from ui.pdf_export import generate_pdf_report
-from src.pipeline import Pipeline
+from ui.data_loader import get_data_version, get_period_report_data
+from ui.overview import render_overview_page
+from ui.report_cache import ReportCache
+from ui.segments import run_length_segments, state_durations, downsample_segments
+from src.config import settings
+from src.transformers.rollups import period_start as rollup_period_start, period_end as rollup_period_end
+from src.exporter import Exporter, file_extension
+from src.jobs import get_job_manager, ACTIVE_STATUSES
+
+logger = logging.getLogger(__name__)
 
 # --- KONFIGURÁCIÓ ÉS STÍLUS ---
 st.set_page_config(
@@ -43,6 +59,129 @@ st.markdown("<div id='top' style='position:absolute; top:0;'></div>", unsafe_all
 # Egyedi CSS alkalmazása
 apply_custom_css()
 
+# Az elkészült PDF jelentések lemezes gyorsítótára (munkamenetek között közös)
+report_cache = ReportCache()
+
+JOB_STATUS_LABELS = {
+    "queued": "Sorban áll",
+    "running": "Fut",
+    "done": "Kész",
+    "failed": "Hiba",
+    "cancelled": "Megszakítva",
+}
+
+def render_sync_jobs():
+    """A legutóbbi szinkronizációs feladatok állapota, előrehaladása és megszakítása."""
+    job_manager = get_job_manager()
+    jobs = job_manager.list_jobs(limit=3)
+    if not jobs:
+        return
+
+    watched = st.session_state.setdefault("watched_sync_jobs", set())
+    finished = []
+    for job in jobs:
+        label = f"#{job.id} {job.start_date}" + (f" - {job.end_date}" if job.end_date != job.start_date else "")
+        if job.status in ACTIVE_STATUSES:
+            watched.add(job.id)
+            current = job.current_day or "várakozik"
+            st.progress(job.progress, text=f"{label}: {current} ({job.progress * 100:.0f}%)")
+            if not job.cancel_requested and st.button("Megszakítás", key=f"cancel_job_{job.id}", use_container_width=True):
+                job_manager.cancel(job.id)
+                st.rerun()
+            continue
+
+        if job.id in watched:
+            watched.discard(job.id)
+            finished.append(job)
+        timings = job.day_timings
+        details = f", {len(timings)} nap, átlag {sum(t['seconds'] for t in timings) / len(timings):.1f} mp/nap" if timings else ""
+        st.caption(f"{label}: {JOB_STATUS_LABELS.get(job.status, job.status)}{details}")
+        if job.error:
+            st.caption(f"⚠ {job.error}")
+
+    # Befejezett feladat után a teljes oldal frissítése (a gyorsítótár az adatverzió alapján frissül)
+    if finished:
+        invalidate_versions()
+        st.toast(f"Szinkronizáció befejeződött: {', '.join(f'#{j.id}' for j in finished)}")
+        st.rerun()
+
+# Aktív feladat esetén csak ez a részlet fut újra 2 másodpercenként, nem a teljes oldal
+render_sync_jobs_live = st.fragment(run_every=2)(render_sync_jobs)
+
+PERIOD_REPORTS = {"week": "Heti", "month": "Havi"}
+
+def render_period_report(selected_machine_id, selected_date):
+    """Heti / havi PDF jelentés a kiválasztott napot tartalmazó időszakra (az összesítőkből készül)."""
+    period_type = st.radio("Időszakos jelentés", options=list(PERIOD_REPORTS), format_func=PERIOD_REPORTS.get,
+                           horizontal=True, key="period_report_type")
+    start_date = rollup_period_start(selected_date, period_type)
+    end_date = rollup_period_end(start_date, period_type)
+    version = get_data_version(selected_machine_id, start_date, end_date)
+    pdf_bytes = report_cache.get(selected_machine_id, start_date, version, kind=period_type)
+
+    if pdf_bytes is None and st.button(f"{PERIOD_REPORTS[period_type]} jelentés készítése", width="stretch", key="period_report_build"):
+        def build_report():
+            from ui.pdf_export import generate_period_report
+            data = get_period_report_data(selected_machine_id, period_type, selected_date)
+            if not data[1]:
+                return None
+            return generate_period_report(selected_machine_id, period_type, start_date, end_date, data, article_names=load_articles_map())
+
+        with st.spinner("Jelentés készítése..."):
+            pdf_bytes = report_cache.get_or_build(selected_machine_id, start_date, version, build_report, kind=period_type)
+        if pdf_bytes is None:
+            st.info("Nincs napi összesítő ebben az időszakban.")
+
+    if pdf_bytes is not None:
+        st.download_button(
+            label=f"{PERIOD_REPORTS[period_type]} jelentés (PDF)",
+            data=pdf_bytes,
+            file_name=f"Report_{selected_machine_id}_{period_type}_{start_date}_{end_date}.pdf",
+            mime="application/pdf",
+            width="stretch",
+            key="period_report_download"
+        )
+
+EXPORT_DATASETS = {"events": "Termelési események", "summaries": "Napi összesítők"}
+
+def render_bulk_export(selected_machine_id, selected_date):
+    """Események / napi összesítők letöltése Parquet vagy CSV formátumban (darabolt export)."""
+    with st.expander("Tömeges adatexport"):
+        dataset = st.selectbox("Adatkör", options=list(EXPORT_DATASETS), format_func=EXPORT_DATASETS.get, key="export_dataset")
+        export_range = st.date_input("Időszak", value=(selected_date - timedelta(days=89), selected_date), key="export_range")
+        event_types = st.multiselect("Eseménytípus", ["RUN", "STOP", "BREAK"], key="export_event_types") if dataset == "events" else None
+        all_machines = st.checkbox("Minden gép", value=False, key="export_all_machines")
+        fmt = st.radio("Formátum", ["parquet", "csv"], horizontal=True, key="export_format")
+        compression = st.radio("Tömörítés", [None, "gzip"], format_func=lambda c: c or "nincs", horizontal=True, key="export_compression") if fmt == "csv" else None
+
+        if len(export_range) != 2:
+            return
+        start_date, end_date = export_range
+        machine_id = None if all_machines else selected_machine_id
+
+        if st.button("Export készítése", width="stretch", key="export_build"):
+            exporter = Exporter()
+            # A letöltés a munkamenet memóriájában él, ezért a Dashboardról csak korlátos méretű export indul
+            expected = exporter.count(dataset, start_date, end_date, machine_id=machine_id, event_types=event_types or None)
+            if expected > settings.EXPORT_DASHBOARD_MAX_ROWS:
+                st.warning(
+                    f"Az export {expected:,} sort tartalmazna (Dashboardról legfeljebb {settings.EXPORT_DASHBOARD_MAX_ROWS:,}). "
+                    f"Szűkítse az időszakot / gépet, vagy futtassa a scripts/export_data.py szkriptet."
+                )
+                return
+            # Az export ideiglenes fájlba íródik darabonként; a letöltés innen olvas
+            with tempfile.TemporaryFile() as tmp, st.spinner("Export készítése..."):
+                rows = exporter.export(dataset, tmp, start_date, end_date, machine_id=machine_id,
+                                         event_types=event_types or None, fmt=fmt, compression=compression)
+                tmp.seek(0)
+                st.download_button(
+                    label=f"Letöltés ({rows:,} sor)",
+                    data=tmp.read(),
+                    file_name=f"{dataset}_{machine_id or 'all'}_{start_date}_{end_date}{file_extension(fmt, compression)}",
+                    mime="application/octet-stream",
+                    width="stretch"
+                )
+
 def render_sidebar():
     """Az oldalsáv (sidebar) tartalmának felépítése."""
     with st.sidebar:
@@ -53,6 +192,16 @@ def render_sidebar():
         st.title("Vezérlőpult")
         st.markdown("---")
         
+        # Nézet választás (egy gép részletei vagy az egész üzem áttekintése)
+        view_options = {"machine": "Gép részletei", "overview": "Üzemi áttekintés"}
+        selected_view = st.radio(
+            "NÉZET",
+            options=list(view_options.keys()),
+            format_func=lambda x: view_options[x],
+            horizontal=True,
+            key="view"
+        )
+        
         # Adat elérhetőség lekérése
         min_date, max_date, total_events = get_data_availability()
         
@@ -82,17 +231,41 @@ def render_sidebar():
             value=default_date,
             help="Válaszd ki az elemzés napját"
         )
+        
+        # A választott hónap szinkronizált napjai (katalógusból, eseménytábla olvasása nélkül)
+        month_start = selected_date.replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        synced_days = get_synced_days(selected_machine_id, month_start, month_end)
+        day_status = synced_days[synced_days["Dátum"] == selected_date]
+        if day_status.empty:
+            st.caption("A választott nap még nincs szinkronizálva.")
+        elif pd.isna(day_status.iloc[0]["Szinkronizálva"]):
+            st.caption("A választott nap elérhető a MES-ben, de még nincs szinkronizálva.")
+        else:
+            row = day_status.iloc[0]
+            st.caption(f"{row['Állapot']}: {row['Események']} esemény, szinkronizálva {row['Szinkronizálva']:%Y-%m-%d %H:%M}")
+        with st.expander("Szinkronizált napok"):
+            st.plotly_chart(create_sync_calendar_chart(synced_days, month_start, month_end), width="stretch", key="sync_calendar")
+        
+        # Időbontás (granularitás) választás
+        granularity_options = {"day": "Nap", "shift": "Műszak", "hour": "Óra"}
+        selected_granularity = st.radio(
+            "IDŐBONTÁS",
+            options=list(granularity_options.keys()),
+            format_func=lambda x: granularity_options[x],
+            horizontal=True,
+            help="A KPI mutatók műszakos vagy óránkénti bontása az előre kiszámolt összesítőkből"
+        )
             
-        # Egyedi napi adat szinkronizáció (ETL indítása)
+        # Egyedi napi adat szinkronizáció (háttérben futó feladatként)
+        job_manager = get_job_manager()
         if st.button("Napi adatok szinkronizálása", help="Tipp: A szinkronizáció többször is lefuttatható egy nap, a meglévő adatok felülíródnak.", use_container_width=True):
-            with st.spinner(f"Szinkronizálás folyamatban ({selected_date})..."):
-                try:
-                    pipeline = Pipeline()
-                    pipeline.run_full_load(target_date=selected_date)
-                    st.toast(f"Sikeres szinkronizáció: {selected_date}")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Hiba a szinkronizáció során: {str(e)}")
+            try:
+                job_id = job_manager.submit(selected_date)
+                st.toast(f"Szinkronizáció elindítva (#{job_id}): {selected_date}")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Hiba a szinkronizáció indításakor: {str(e)}")
                     
         # Tömeges (Bulk) Szinkronizáló
         with st.expander("Tömeges szinkronizáció"):
@@ -101,48 +274,62 @@ def render_sidebar():
             bulk_end = st.date_input("Záró dátum", value=default_date)
             
             if st.button("Napok szinkronizálása", use_container_width=True):
-                delta = bulk_end - bulk_start
-                if delta.days < 0:
+                if bulk_end < bulk_start:
                     st.error("A kezdő dátum nem lehet nagyobb a zárónál!")
                 else:
-                    pipeline = Pipeline()
-                    progress_text = "Feldolgozás alatt... Kérlek várj!"
-                    my_bar = st.progress(0, text=progress_text)
-                    
-                    try:
-                        for i in range(delta.days + 1):
-                            current_day = bulk_start + timedelta(days=i)
-                            pipeline.run_full_load(target_date=current_day)
-                            # Betöltő sáv frissítése
-                            progress = float(i + 1) / (delta.days + 1)
-                            my_bar.progress(progress, text=f"Szinkronizálás: {current_day} ({(progress*100):.0f}%)")
-                            
-                        st.toast("Tömeges szinkronizáció befejeződött!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Hiba a {current_day} szinkronizálása közben: {str(e)}")
-
-        # PDF Exportálás
+                    job_id = job_manager.submit(bulk_start, bulk_end)
+                    st.toast(f"Tömeges szinkronizáció elindítva (#{job_id})")
+                    st.rerun()
+
+        # Futó és legutóbbi szinkronizációk (aktív feladat esetén automatikusan frissül)
+        if job_manager.has_active_jobs():
+            render_sync_jobs_live()
+        else:
+            render_sync_jobs()
+
+        # PDF Exportálás (igény szerint készül, a kész jelentés lemezről szolgálható ki)
         if total_events > 0:
             st.markdown("---")
             st.subheader("Exportálás")
             try:
-                e, s, q = get_daily_data(selected_machine_id, selected_date)
-                art_map = load_articles_map()
-                if e:
-                    pdf_buffer = generate_pdf_report(selected_machine_id, selected_date, s, e, quality=q, article_names=art_map)
+                version = get_data_version(selected_machine_id, selected_date, selected_date)
+                pdf_bytes = report_cache.get(selected_machine_id, selected_date, version)
+
+                if pdf_bytes is None and st.button("PDF jelentés készítése", width="stretch"):
+                    def build_report():
+                        # A ReportLab csak az első jelentés készítésekor töltődik be
+                        from ui.pdf_export import generate_pdf_report
+                        e, s, q = get_daily_data(selected_machine_id, selected_date)
+                        if not e:
+                            return None
+                        return generate_pdf_report(selected_machine_id, selected_date, s, e, quality=q, article_names=load_articles_map())
+
+                    with st.spinner("Jelentés készítése..."):
+                        pdf_bytes = report_cache.get_or_build(selected_machine_id, selected_date, version, build_report)
+                    if pdf_bytes is None:
+                        st.info("Nincs adat ezen a napon.")
+
+                if pdf_bytes is not None:
                     st.download_button(
                         label="Napi jelentés (PDF)",
-                        data=pdf_buffer,
+                        data=pdf_bytes,
                         file_name=f"Report_{selected_machine_id}_{selected_date}.pdf",
                         mime="application/pdf",
                         width="stretch"
                     )
-                else:
-                    st.info("Nincs adat ezen a napon.")
             except Exception as ex:
                 st.error(f"PDF hiba: {str(ex)}")
 
+            try:
+                render_period_report(selected_machine_id, selected_date)
+            except Exception as ex:
+                st.error(f"PDF hiba: {str(ex)}")
+
+            try:
+                render_bulk_export(selected_machine_id, selected_date)
+            except Exception as ex:
+                st.error(f"Export hiba: {str(ex)}")
+
         st.markdown("---")
         if total_events > 0 and min_date and max_date:
             st.markdown(f"""
@@ -154,8 +341,32 @@ def render_sidebar():
             """, unsafe_allow_html=True)
         else:
             st.info("Nincs adat az adatbázisban.")
+        
+        # Gyorsítótár állapota (munkamenetek között közös)
+        with st.expander("Gyorsítótár statisztika"):
+            stats = cache_stats()
+            if stats:
+                st.dataframe(pd.DataFrame(stats), hide_index=True, width="stretch")
+            else:
+                st.caption("Még nincs gyorsítótárazott lekérdezés.")
                 
-    return selected_machine_id, selected_date, machine_options
+    return selected_view, selected_machine_id, selected_date, machine_options, selected_granularity
+
+def dashboard_section(name):
+    """
+    Dekorátor: a szekciót önállóan újrafuttatható fragmentté alakítja, és naplózza
+    a renderelési idejét (teljes oldal- és fragment-szintű futásnál egyaránt).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                logger.info(f"Szekció renderelve: {name} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        return st.fragment(timed)
+    return decorator
 
 def render_header(machine_name, selected_date):
     """A főoldal fejlécének megjelenítése."""
@@ -171,171 +382,330 @@ def render_header(machine_name, selected_date):
         st.title(f"{machine_name} Operations Dashboard")
         st.markdown(f"**Gyártáselemzési jelentés** | {selected_date.strftime('%Y. %m. %d.')}")
 
-def main():
-    """A Dashboard fő logikája."""
-    selected_machine_id, selected_date, machine_options = render_sidebar()
-    render_header(machine_options[selected_machine_id], selected_date)
+@dashboard_section("reliability")
+def render_reliability_section(machine_id, selected_date):
+    """Gördülő ablakos megbízhatósági KPI kártyák (MTBF, MTTR, szakadási ráta) sparkline-okkal."""
+    r1, r2 = st.columns([0.7, 0.3])
+    with r1: st.subheader("Megbízhatósági mutatók")
+    with r2:
+        window_days = st.radio(
+            "Gördülő ablak", options=[7, 30, 90], index=1,
+            format_func=lambda x: f"{x} nap", horizontal=True, key="reliability_window"
+        )
     
-    # Adatok betöltése
-    article_names = load_articles_map()
-    events, summary, quality = get_daily_data(selected_machine_id, selected_date)
-    trend_summaries = get_trend_data(selected_machine_id, selected_date)
+    df_rel = get_reliability_trend(machine_id, selected_date, window_days)
+    if df_rel.empty or df_rel.iloc[-1]["date"] != selected_date:
+        st.info("Nincsenek megbízhatósági adatok erre a napra. Futtasd újra a szinkronizációt.")
+        return
     
-    if not events:
-        st.info("Ezen a napon nem található adat. töltsd be az adatokat a 'Napi adatok szinkronizálása' gombbal.")
+    current = df_rel.iloc[-1]
+    fmt = lambda v, pattern: pattern.format(v) if pd.notna(v) else "–"
+    r_col1, r_col2, r_col3 = st.columns(3)
+    with r_col1:
+        st.metric("MTBF", fmt(current["mtbf_h"], "{:.1f} óra"),
+                  help=f"Átlagos üzemidő két papírszakadás között az utolsó {window_days} napban.")
+        st.plotly_chart(render_sparkline(df_rel["mtbf_h"].dropna().tolist(), "#16a085"), width="stretch", config={'displayModeBar': False}, key="spark_mtbf")
+    with r_col2:
+        st.metric("MTTR", fmt(current["mttr_min"], "{:.1f} perc"),
+                  help=f"Átlagos helyreállítási idő szakadásonként az utolsó {window_days} napban.")
+        st.plotly_chart(render_sparkline(df_rel["mttr_min"].dropna().tolist(), "#e67e22"), width="stretch", config={'displayModeBar': False}, key="spark_mttr")
+    with r_col3:
+        st.metric("SZAKADÁS / 1000 t", fmt(current["breaks_per_kt"], "{:.2f}"),
+                  help=f"Szakadások száma ezer tonna termelésre vetítve az utolsó {window_days} napban ({current['break_count']} db).")
+        st.plotly_chart(render_sparkline(df_rel["breaks_per_kt"].dropna().tolist(), "#c0392b"), width="stretch", config={'displayModeBar': False}, key="spark_breaks")
+
+@dashboard_section("periods")
+def render_period_section(machine_id, selected_date, granularity):
+    """Műszakos vagy óránkénti KPI bontás az összesítő táblákból."""
+    st.subheader("Műszakonkénti bontás" if granularity == "shift" else "Óránkénti bontás")
+    periods = get_period_summaries(machine_id, selected_date, granularity)
+    if not periods:
+        st.info("Nincs bontott összesítő erre a napra. Futtasd újra a szinkronizációt.")
         return
 
-    # --- 1. KPI SZEKCIÓ (FŐ MUTATÓK ÉS KÖZMŰVEK) ---
-    if summary:
-        k1, k2 = st.columns([0.05, 0.95])
-        with k1: st.image("assets/oee.png", width=64)
-        with k2: st.subheader("Napi teljesítménymutatók")
+    df_periods = pd.DataFrame([
+        {
+            "Periódus": (f"{p.period_start.strftime('%m.%d. %H:%M')} ({p.shift_name})" if p.shift_name
+                         else p.period_start.strftime('%H:%M')),
+            "OEE %": p.oee_pct,
+            "Rendelkezésre állás %": p.availability_pct,
+            "Tonna": p.total_tons,
+            "Selejt (t)": p.scrap_tons,
+            "Állásidő (perc)": p.total_downtime_min,
+            "Szakadás (db)": p.break_count
+        } for p in periods
+    ])
+    p_col1, p_col2 = st.columns([2, 1])
+    with p_col1:
+        st.plotly_chart(create_period_kpi_chart(df_periods), width="stretch")
+    with p_col2:
+        st.dataframe(df_periods, hide_index=True, width="stretch", height=300)
 
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # KPI 1: Termelés
-        with col1:
-            prod_delta = (summary.total_tons / summary.target_tons - 1) * 100 if summary.target_tons > 0 else 0
-            st.metric("TERMELÉS", f"{summary.total_tons:.1f} t", 
-                    delta=f"{prod_delta:.1f} %" if summary.target_tons > 0 else None,
-                    help="A gép által termelt összes papír súlya (tonna).")
-            st.plotly_chart(render_sparkline([s.total_tons for s in trend_summaries], "#2ecc71"), width="stretch", config={'displayModeBar': False}, key="spark_prod")
-        
-        # KPI 2: OEE (Efficiency)
-        with col2:
-            oee_formula = f"{summary.availability_pct:.1f}% (R) × {summary.performance_pct:.1f}% (T) × {summary.quality_pct:.1f}% (M)"
-            st.metric("OEE MUTATÓ", f"{summary.oee_pct:.1f} %", 
-                    help=f"Teljes eszközhatékonyság számítása:\n\n{oee_formula} = {summary.oee_pct:.1f}%\n\n"
-                         f"R = Rendelkezésre állás\n"
-                         f"T = Teljesítmény index\n"
-                         f"M = Minőségi mutató")
-            st.plotly_chart(render_sparkline([s.oee_pct for s in trend_summaries], "#3498db"), width="stretch", config={'displayModeBar': False}, key="spark_oee")
-        
-        # KPI 3: Rendelkezésre állás
-        with col3:
-            st.metric("RENDELKEZÉSRE ÁLLÁS", f"{summary.availability_pct:.1f} %",
-                    help="A gép üzemidejének aránya a teljes naptári időhöz képest.")
-            st.plotly_chart(render_sparkline([s.availability_pct for s in trend_summaries], "#9b59b6"), width="stretch", config={'displayModeBar': False}, key="spark_avail")
-        
-        # KPI 4: Selejtarány
-        with col4:
-            scrap_rate = (summary.scrap_tons / summary.total_tons * 100) if summary.total_tons > 0 else 0
-            st.metric("SELEJTARÁNY", f"{scrap_rate:.1f} %",
-                    help="A nem megfelelő minőségű termelés aránya az összes termeléshez képest.")
-            trend_scraps = [(s.scrap_tons / s.total_tons * 100) if s.total_tons > 0 else 0 for s in trend_summaries]
-            st.plotly_chart(render_sparkline(trend_scraps, "#e74c3c"), width="stretch", config={'displayModeBar': False}, key="spark_scrap")
-
-        # --- ERŐFORRÁS SZEKCIÓ ---
-        u1, u2 = st.columns([0.05, 0.95])
-        with u1: st.image("assets/power.png", width=64)
-        with u2: st.subheader("Fajlagos erőforrás-felhasználás")
-
-        u_col1, u_col2, u_col3, u_col4 = st.columns(4)
-        u_col1.metric("VILLAMOS ENERGIA", f"{summary.spec_electricity_kwh_t:.0f} kWh/t", help="Fajlagos villamosenergia-felhasználás egy tonna késztermékre vetítve.")
-        u_col2.metric("VÍZFELHASZNÁLÁS", f"{summary.spec_water_m3_t:.1f} m³/t", help="Fajlagos frissvíz-felhasználás egy tonna késztermékre vetítve.")
-        u_col3.metric("GŐZFELHASZNÁLÁS", f"{summary.spec_steam_t_t:.2f} t/t", help="Fajlagos gőzfelhasználás egy tonna késztermékre vetítve.")
-        u_col4.metric("ALAPANYAG (ROST)", f"{summary.spec_fiber_t_t:.2f} t/t", help="Fajlagos rostfelhasználás (Recovered Paper) egy tonna késztermékre vetítve.")
+@dashboard_section("long_range")
+def render_long_range_section(machine_id, selected_date):
+    """Hosszú távú (heti / havi / éves) trendek az időszakos összesítőkből."""
+    r1, r2 = st.columns([0.05, 0.95])
+    with r1: st.image("assets/oee.png", width=64)
+    with r2: st.subheader("Hosszú távú teljesítmény")
     
-    st.divider()
+    period_options = {"week": ("Heti", 26 * 7), "month": ("Havi", 730), "year": ("Éves", 3650)}
+    period_type = st.radio(
+        "Összesítési időszak",
+        options=list(period_options.keys()),
+        format_func=lambda x: period_options[x][0],
+        horizontal=True,
+        key="rollup_period"
+    )
+    start_date = selected_date - timedelta(days=period_options[period_type][1])
+    df_rollup = get_rollup_data(machine_id, period_type, start_date, selected_date)
+    if df_rollup.empty:
+        st.info("Nincsenek időszakos összesítők. Futtasd a scripts/rebuild_rollups.py-t.")
+        return
     
-    # --- 2. IDŐVONAL ÉS ESEMÉNYEK ---
-    c1, c2 = st.columns([0.05, 0.95])
+    df_chart = pd.DataFrame({
+        "Periódus": df_rollup["period_start"].astype(str),
+        "Tonna": df_rollup["total_tons"],
+        "OEE %": df_rollup["oee_pct"]
+    })
+    st.plotly_chart(create_period_kpi_chart(df_chart), width="stretch")
+
+TREND_WINDOWS = {30: "30 nap", 90: "90 nap", 365: "1 év", None: "Teljes időszak"}
+TREND_RESOLUTION_LABELS = {"day": "napi", "week": "heti", "month": "havi"}
+
+@dashboard_section("trends")
+def render_trend_section(machine_id, selected_date):
+    """KPI trendek (OEE, termelés, fajlagos energia, selejtarány) automatikus felbontással."""
+    window = st.radio(
+        "Trend időszak", options=list(TREND_WINDOWS.keys()), index=1,
+        format_func=lambda x: TREND_WINDOWS[x], horizontal=True, key="trend_window"
+    )
+    df_trend = get_kpi_trend(machine_id, selected_date, window)
+    if df_trend.empty:
+        st.info("Nincs adat a kiválasztott időszakra.")
+        return
+    st.plotly_chart(create_kpi_trend_chart(df_trend), width="stretch")
+    st.caption(f"Felbontás: {TREND_RESOLUTION_LABELS[df_trend['resolution'].iloc[0]]} összesítők, "
+               f"mutatónként legfeljebb {settings.TREND_MAX_POINTS} pont.")
+
+@dashboard_section("kpi")
+def render_kpi_section(selected_machine_id, selected_date):
+    """Napi KPI kártyák sparkline-okkal és a fajlagos erőforrás-felhasználás."""
+    summary = get_daily_summary(selected_machine_id, selected_date)
+    trend_summaries = get_trend_data(selected_machine_id, selected_date)
+    if not summary:
+        return
+
+    k1, k2 = st.columns([0.05, 0.95])
+    with k1: st.image("assets/oee.png", width=64)
+    with k2: st.subheader("Napi teljesítménymutatók")
+
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # KPI 1: Termelés
+    with col1:
+        prod_delta = (summary.total_tons / summary.target_tons - 1) * 100 if summary.target_tons > 0 else 0
+        st.metric("TERMELÉS", f"{summary.total_tons:.1f} t", 
+                delta=f"{prod_delta:.1f} %" if summary.target_tons > 0 else None,
+                help="A gép által termelt összes papír súlya (tonna).")
+        st.plotly_chart(render_sparkline([s.total_tons for s in trend_summaries], "#2ecc71"), width="stretch", config={'displayModeBar': False}, key="spark_prod")
+    
+    # KPI 2: OEE (Efficiency)
+    with col2:
+        oee_formula = f"{summary.availability_pct:.1f}% (R) × {summary.performance_pct:.1f}% (T) × {summary.quality_pct:.1f}% (M)"
+        st.metric("OEE MUTATÓ", f"{summary.oee_pct:.1f} %", 
+                help=f"Teljes eszközhatékonyság számítása:\n\n{oee_formula} = {summary.oee_pct:.1f}%\n\n"
+                     f"R = Rendelkezésre állás\n"
+                     f"T = Teljesítmény index\n"
+                     f"M = Minőségi mutató")
+        st.plotly_chart(render_sparkline([s.oee_pct for s in trend_summaries], "#3498db"), width="stretch", config={'displayModeBar': False}, key="spark_oee")
+    
+    # KPI 3: Rendelkezésre állás
+    with col3:
+        st.metric("RENDELKEZÉSRE ÁLLÁS", f"{summary.availability_pct:.1f} %",
+                help="A gép üzemidejének aránya a teljes naptári időhöz képest.")
+        st.plotly_chart(render_sparkline([s.availability_pct for s in trend_summaries], "#9b59b6"), width="stretch", config={'displayModeBar': False}, key="spark_avail")
+    
+    # KPI 4: Selejtarány
+    with col4:
+        scrap_rate = (summary.scrap_tons / summary.total_tons * 100) if summary.total_tons > 0 else 0
+        st.metric("SELEJTARÁNY", f"{scrap_rate:.1f} %",
+                help="A nem megfelelő minőségű termelés aránya az összes termeléshez képest.")
+        trend_scraps = [(s.scrap_tons / s.total_tons * 100) if s.total_tons > 0 else 0 for s in trend_summaries]
+        st.plotly_chart(render_sparkline(trend_scraps, "#e74c3c"), width="stretch", config={'displayModeBar': False}, key="spark_scrap")
+
+    # --- ERŐFORRÁS SZEKCIÓ ---
+    u1, u2 = st.columns([0.05, 0.95])
+    with u1: st.image("assets/power.png", width=64)
+    with u2: st.subheader("Fajlagos erőforrás-felhasználás")
+
+    u_col1, u_col2, u_col3, u_col4 = st.columns(4)
+    u_col1.metric("VILLAMOS ENERGIA", f"{summary.spec_electricity_kwh_t:.0f} kWh/t", help="Fajlagos villamosenergia-felhasználás egy tonna késztermékre vetítve.")
+    u_col2.metric("VÍZFELHASZNÁLÁS", f"{summary.spec_water_m3_t:.1f} m³/t", help="Fajlagos frissvíz-felhasználás egy tonna késztermékre vetítve.")
+    u_col3.metric("GŐZFELHASZNÁLÁS", f"{summary.spec_steam_t_t:.2f} t/t", help="Fajlagos gőzfelhasználás egy tonna késztermékre vetítve.")
+    u_col4.metric("ALAPANYAG (ROST)", f"{summary.spec_fiber_t_t:.2f} t/t", help="Fajlagos rostfelhasználás (Recovered Paper) egy tonna késztermékre vetítve.")
+
+@dashboard_section("timeline")
+def render_timeline_section(selected_machine_id, selected_date, machine_name):
+    """A termelési események idővonala (1 / 7 / 30 nap) és az állapotok megoszlása."""
+    article_names = load_articles_map()
+
+    c1, c2, c3 = st.columns([0.05, 0.65, 0.30])
     with c1: st.image("assets/events.png", width=64)
     with c2: st.subheader("Termelési események")
+    with c3:
+        timeline_days = st.radio(
+            "Idővonal hossza", options=[1, 7, 30], index=0,
+            format_func=lambda x: f"{x} nap", horizontal=True, key="timeline_days"
+        )
 
-    # Esemény adatok előkészítése a grafikonhoz
-    df_raw = pd.DataFrame([
-        {
-            "Kezdet": e.timestamp,
-            "Vége": e.timestamp + timedelta(seconds=e.duration_seconds or 0),
-            "Állapot": e.status if e.event_type == "RUN" else e.event_type,
-            "Termék": article_names.get(e.article_id, "Nincs gyártás") if e.article_id else "Nincs gyártás",
-            "Gép": machine_options[selected_machine_id]
-        } for e in events
-    ])
+    if timeline_days == 1:
+        events = get_daily_events_frame(selected_machine_id, selected_date)
+    else:
+        events = get_events_frame(selected_machine_id, selected_date - timedelta(days=timeline_days - 1), selected_date)
+
+    # Esemény adatok előkészítése a grafikonhoz (oszlopos műveletekkel)
+    df_raw = build_timeline_frame(events, article_names, machine_name)
     
     # Események összevonása (ha az állapot és a termék ugyanaz)
-    merged = []
-    if not df_raw.empty:
-        curr = df_raw.iloc[0].to_dict()
-        for i in range(1, len(df_raw)):
-            row = df_raw.iloc[i].to_dict()
-            if row["Állapot"] == curr["Állapot"] and row["Termék"] == curr["Termék"]:
-                curr["Vége"] = row["Vége"]
-            else:
-                merged.append(curr)
-                curr = row
-        merged.append(curr)
-    
-    df_events = pd.DataFrame(merged)
+    df_events = run_length_segments(df_raw, ["Állapot", "Termék"], "Kezdet", "Vége")
     if not df_events.empty:
-        df_events["Időtartam_perc"] = (df_events["Vége"] - df_events["Kezdet"]).dt.total_seconds() / 60
+        # A böngészőbe küldött szakaszok száma korlátos: sok szakasznál domináns állapotú időrések
+        df_plot, bucket = downsample_segments(
+            df_events, ["Állapot", "Termék"], "Kezdet", "Vége",
+            settings.TIMELINE_MAX_SEGMENTS, settings.TIMELINE_MIN_BUCKET_MINUTES
+        )
+        df_plot = df_plot.assign(Gép=machine_name)
+
         t_colA, t_colB = st.columns([2, 1])
         with t_colA:
-            st.plotly_chart(create_timeline_chart(df_events), width="stretch")
+            st.plotly_chart(create_timeline_chart(df_plot, multi_day=timeline_days > 1), width="stretch")
+            if bucket is not None:
+                st.caption(f"{len(df_events)} szakasz összevonva {bucket.total_seconds() / 60:.0f} perces időrésekre (a rés színe a benne domináns állapot).")
         with t_colB:
-            df_states = df_events.groupby("Állapot")["Időtartam_perc"].sum().reset_index(name="Perc")
+            # A megoszlás a pontos (nem összevont) szakaszokból számolódik
+            df_states = state_durations(df_events, "Állapot", "Kezdet", "Vége")
             st.plotly_chart(create_status_pie_chart(df_states), width="stretch")
 
-    st.divider()
+@dashboard_section("products")
+def render_product_section(selected_machine_id, selected_date):
+    """A gyártott termékek mennyisége és futásideje."""
+    events = get_daily_events_frame(selected_machine_id, selected_date)
+    article_names = load_articles_map()
 
-    # --- 3. TERMÉKELEMZÉS ---
     s1, s2 = st.columns([0.05, 0.95])
     with s1: st.image("assets/layer.png", width=64)
     with s2: st.subheader("Gyártott termékek elemzése")
     
-    df_prod = pd.DataFrame([
-        {
-            "Termék": article_names.get(e.article_id, "N/A") if e.article_id else "N/A",
-            "Súly (kg)": e.weight_kg or 0,
-            "Időtartam (perc)": (e.duration_seconds / 60) if e.duration_seconds else 0
-        } for e in events if e.event_type == "RUN"
-    ])
-    
-    if not df_prod.empty:
-        mix = df_prod.groupby("Termék").agg({"Súly (kg)": "sum", "Időtartam (perc)": "sum"}).reset_index()
-        mix["Tonna"] = mix["Súly (kg)"] / 1000
+    mix = build_article_mix(events, article_names)
+    if not mix.empty:
         p_col1, p_col2 = st.columns([2, 1])
         with p_col1: st.plotly_chart(create_article_bar_chart(mix), width="stretch")
         with p_col2: st.plotly_chart(create_article_pie_chart(mix), width="stretch")
 
-    st.divider()
+@dashboard_section("quality")
+def render_quality_section(selected_machine_id, selected_date):
+    """Labor mérések trendjei és SPC összefoglaló."""
+    quality = get_daily_quality_frame(selected_machine_id, selected_date)
+    article_names = load_articles_map()
 
-    # --- 4. MINŐSÉGI ANALÍTIKA (LABOR) ---
     q1, q2 = st.columns([0.05, 0.95])
     with q1: st.image("assets/flask.png", width=64)
     with q2: st.subheader("Minőségi analitika (Labor)")
     
-    if quality:
-        df_q = pd.DataFrame([
-            {
-                "Idő": q.timestamp, "Nedvesség %": q.moisture_pct, 
-                "Súly (GSM)": q.gsm_measured, "Szilárdság": q.strength_knm,
-                "Termék": article_names.get(q.article_id, "Ismeretlen")
-            } for q in quality
-        ]).sort_values("Idő")
-        st.plotly_chart(create_quality_charts(df_q), width="stretch")
+    if not quality.empty:
+        st.plotly_chart(create_quality_charts(quality, article_names), width="stretch")
+        
+        # SPC: szabályozási határok és folyamatképesség az utolsó 30 napra
+        df_spc = get_spc_summary(selected_machine_id, selected_date - timedelta(days=29), selected_date)
+        if not df_spc.empty:
+            st.markdown("**Grammsúly folyamatképesség (utolsó 30 nap)**")
+            st.dataframe(
+                df_spc.drop(columns=["article_id"]),
+                hide_index=True, width="stretch",
+                column_config={c: st.column_config.NumberColumn(format="%.2f") for c in ["Átlag", "Szórás", "Min", "Max", "LCL", "UCL", "Cp", "Cpk"]}
+            )
     else:
         st.info("Nincsenek laboradatok az adott napra.")
 
-    st.divider()
+@dashboard_section("downtime")
+def render_downtime_section(selected_machine_id, selected_date):
+    """Állásidők és a leállási okok Pareto elemzése (választható időablakkal)."""
+    summary = get_daily_summary(selected_machine_id, selected_date)
+    if not summary:
+        return
 
-    # --- 5. TERMELÉSI ZAVAROK (PARETO) ---
     a1, a2 = st.columns([0.05, 0.95])
     with a1: st.image("assets/alert.png", width=64)
     with a2: st.subheader("Termelési zavarok és állásidők")
     
+    d_col1, d_col2 = st.columns([1, 2])
+    with d_col1:
+        st.metric("ÖSSZES ÁLLÁSIDŐ", f"{summary.total_downtime_min:.0f} perc")
+        st.metric("SZAKADÁSSZÁM", f"{summary.break_count} db")
+        pareto_days = st.radio(
+            "Pareto időablak", options=[7, 30, 90], index=1,
+            format_func=lambda x: f"{x} nap", horizontal=True, key="pareto_window"
+        )
+    pareto_df = get_pareto_data(selected_machine_id, selected_date, pareto_days)
+    if not pareto_df.empty:
+        with d_col2: st.plotly_chart(create_pareto_chart(pareto_df, pareto_days), width="stretch")
+    else:
+        with d_col2: st.info("Nincs elegendő adat a Pareto elemzéshez.")
+
+def main():
+    """
+    A Dashboard fő logikája.
+    Az egyes szekciók önállóan újrafuttatható fragmentek: egy szekción belüli vezérlő
+    (pl. a Pareto időablak) csak az adott szekciót számolja újra. A szekciók a
+    (gép, nap) kulcsból maguk töltik be az adataikat a közös gyorsítótárból.
+    """
+    selected_view, selected_machine_id, selected_date, machine_options, selected_granularity = render_sidebar()
+    if selected_view == "overview":
+        render_overview_page(selected_date)
+        return
+    
+    render_header(machine_options[selected_machine_id], selected_date)
+    
+    events = get_daily_events_frame(selected_machine_id, selected_date)
+    summary = get_daily_summary(selected_machine_id, selected_date)
+    if events.empty:
+        st.info("Ezen a napon nem található adat. töltsd be az adatokat a 'Napi adatok szinkronizálása' gombbal.")
+        return
+
+    # --- 1. KPI SZEKCIÓ (FŐ MUTATÓK, KÖZMŰVEK, MEGBÍZHATÓSÁG) ---
+    render_kpi_section(selected_machine_id, selected_date)
     if summary:
-        d_col1, d_col2 = st.columns([1, 2])
-        with d_col1:
-            st.metric("ÖSSZES ÁLLÁSIDŐ", f"{summary.total_downtime_min:.0f} perc")
-            st.metric("SZAKADÁSSZÁM", f"{summary.break_count} db")
-        
-        pareto_df = get_pareto_data(selected_machine_id, selected_date)
-        if not pareto_df.empty:
-            with d_col2: st.plotly_chart(create_pareto_chart(pareto_df), width="stretch")
-        else:
-            with d_col2: st.info("Nincs elegendő adat a Pareto elemzéshez.")
+        render_reliability_section(selected_machine_id, selected_date)
+
+    # --- MŰSZAKOS / ÓRÁNKÉNTI BONTÁS ---
+    if selected_granularity != "day":
+        render_period_section(selected_machine_id, selected_date, selected_granularity)
+    
+    st.divider()
+    
+    # --- HOSSZÚ TÁVÚ NÉZET (IDŐSZAKOS ÖSSZESÍTŐK) ---
+    render_long_range_section(selected_machine_id, selected_date)
+    render_trend_section(selected_machine_id, selected_date)
+    
+    st.divider()
+    
+    # --- 2. IDŐVONAL ÉS ESEMÉNYEK ---
+    render_timeline_section(selected_machine_id, selected_date, machine_options[selected_machine_id])
+
+    st.divider()
+
+    # --- 3. TERMÉKELEMZÉS ---
+    render_product_section(selected_machine_id, selected_date)
+
+    st.divider()
+
+    # --- 4. MINŐSÉGI ANALÍTIKA (LABOR) ---
+    render_quality_section(selected_machine_id, selected_date)
+
+    st.divider()
+
+    # --- 5. TERMELÉSI ZAVAROK (PARETO) ---
+    render_downtime_section(selected_machine_id, selected_date)
 
     # --- LÁBLÉC ---
     st.divider()
@@ -0,0 +1,204 @@
+"""
+UI GYORSÍTÓTÁR (DATA-LAYER CACHE)
+=================================
+Folyamatszintű, munkamenetek között megosztott gyorsítótár a data_loader függvényeihez.
+Minden függvény saját élettartammal (TTL) rendelkezik, a bejegyzések kulcsa pedig
+tartalmazza az érintett (gép, dátumtartomány) kulcstér adatverzióját is.
+Amikor a pipeline egy napot újraszinkronizál, csak az azt lefedő bejegyzések válnak
+elavulttá, a többi továbbra is kiszolgálható.
+
+Az adatverzió lekérdezése kulcsterenként VERSION_TTL másodpercig újrahasznosul, így egy
+találat nem jár adatbázis-lekérdezéssel. Más folyamat szinkronizálása legfeljebb ennyi
+késéssel látszik; a saját folyamatban befejezett szinkronizálás után az invalidate_versions()
+azonnal üríti a verziókat.
+
+A gyorsítótárazott értékek megosztottak: a hívók nem módosíthatják őket helyben.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ui import data_loader
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 512
+VERSION_TTL = 5.0
+
+# (gép, kezdő dátum, záró dátum) -> None érték = nincs szűrés az adott dimenzióra
+VersionScope = Tuple[Optional[str], Optional[date], Optional[date]]
+
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+_stats: Dict[str, Dict[str, int]] = {}
+_versions: Dict[VersionScope, Tuple[float, int]] = {}
+
+def _record(name: str, outcome: str) -> None:
+    """Találat / tévesztés számláló növelése (a zár alatt hívandó)."""
+    counters = _stats.setdefault(name, {"hits": 0, "misses": 0})
+    counters[outcome] += 1
+
+def _data_version(version_scope: VersionScope, now: float) -> int:
+    """A kulcstér adatverziója, VERSION_TTL másodpercig a korábbi lekérdezésből."""
+    with _lock:
+        entry = _versions.get(version_scope)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+    version = data_loader.get_data_version(*version_scope)
+
+    with _lock:
+        if len(_versions) >= MAX_ENTRIES:
+            for key in [k for k, (expires, _) in _versions.items() if expires <= now]:
+                del _versions[key]
+        _versions[version_scope] = (now + VERSION_TTL, version)
+    return version
+
+def invalidate_versions() -> None:
+    """A megjegyzett adatverziók eldobása (pl. befejezett szinkronizálás után); a bejegyzések megmaradnak."""
+    with _lock:
+        _versions.clear()
+
+def cached(ttl: float, scope: Optional[Callable[..., VersionScope]] = None) -> Callable:
+    """
+    Dekorátor: gyorsítótárazza a függvény eredményét a megadott élettartamig.
+
+    Args:
+        ttl: Élettartam másodpercben.
+        scope: A hívási argumentumokból az érintett adatverzió-kulcsteret adja vissza.
+               Ha nincs megadva, a bejegyzés csak a TTL lejártával frissül (pl. törzsadatok).
+    """
+    def decorator(func: Callable) -> Callable:
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            now = time.monotonic()
+            version = _data_version(scope(*args, **kwargs), now) if scope else None
+            key = (name, args, tuple(sorted(kwargs.items())), version)
+
+            with _lock:
+                entry = _entries.get(key)
+                if entry is not None and entry[0] > now:
+                    _entries.move_to_end(key)
+                    _record(name, "hits")
+                    return entry[1]
+                _record(name, "misses")
+
+            value = func(*args, **kwargs)
+
+            with _lock:
+                _entries[key] = (now + ttl, value)
+                _entries.move_to_end(key)
+                while len(_entries) > MAX_ENTRIES:
+                    _entries.popitem(last=False)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Függvényenkénti találat / tévesztés statisztika a megjelenítéshez."""
+    with _lock:
+        sizes: Dict[str, int] = {}
+        for key in _entries:
+            sizes[key[0]] = sizes.get(key[0], 0) + 1
+        return [
+            {
+                "Függvény": name,
+                "Találat": c["hits"],
+                "Tévesztés": c["misses"],
+                "Találati arány %": round(c["hits"] / (c["hits"] + c["misses"]) * 100, 1) if (c["hits"] + c["misses"]) else 0.0,
+                "Bejegyzések": sizes.get(name, 0)
+            }
+            for name, c in sorted(_stats.items())
+        ]
+
+def clear_cache() -> None:
+    """A teljes gyorsítótár és a statisztikák törlése."""
+    with _lock:
+        _entries.clear()
+        _stats.clear()
+        _versions.clear()
+    logger.info("UI gyorsítótár törölve")
+
+# --- GYORSÍTÓTÁRAZOTT ADATELÉRÉS ---
+# Törzsadatok: csak TTL alapú frissítés
+load_machines = cached(ttl=3600)(data_loader.load_machines)
+load_articles_map = cached(ttl=3600)(data_loader.load_articles_map)
+
+# Napi adatok: csak az adott (gép, nap) szinkronizálása érvényteleníti
+get_daily_data = cached(ttl=600, scope=lambda machine_id, target_date: (machine_id, target_date, target_date))(data_loader.get_daily_data)
+
+get_daily_events_frame = cached(ttl=600, scope=lambda machine_id, target_date: (machine_id, target_date, target_date))(data_loader.get_daily_events_frame)
+get_events_frame = cached(ttl=600, scope=lambda machine_id, start_date, end_date: (machine_id, start_date, end_date))(data_loader.get_events_frame)
+get_daily_quality_frame = cached(ttl=600, scope=lambda machine_id, target_date: (machine_id, target_date, target_date))(data_loader.get_daily_quality_frame)
+get_daily_summary = cached(ttl=600, scope=lambda machine_id, target_date: (machine_id, target_date, target_date))(data_loader.get_daily_summary)
+
+get_trend_data = cached(
+    ttl=600,
+    scope=lambda machine_id, target_date, days=10: (machine_id, target_date - timedelta(days=days - 1), target_date)
+)(data_loader.get_trend_data)
+
+# Heti / havi felbontásnál az első időszak a kezdőnap előtt indulhat (max. egy hónappal);
+# a teljes történet (days=None) a gép minden napját figyeli
+get_kpi_trend = cached(
+    ttl=1800,
+    scope=lambda machine_id, end_date, days=30, max_points=None: (machine_id, end_date - timedelta(days=days + 31) if days else None, end_date)
+)(data_loader.get_kpi_trend)
+
+# A Pareto lekérdezés felülről nyitott, ezért a kezdőnaptól minden napot figyel
+get_pareto_data = cached(
+    ttl=600,
+    scope=lambda machine_id, target_date, days=30: (machine_id, target_date - timedelta(days=days), None)
+)(data_loader.get_pareto_data)
+
+get_data_availability = cached(ttl=300, scope=lambda: (None, None, None))(data_loader.get_data_availability)
+
+get_synced_days = cached(
+    ttl=300,
+    scope=lambda machine_id, start_date, end_date: (machine_id, start_date, end_date)
+)(data_loader.get_synced_days)
+
+# A műszakos nézet a szomszédos napok szinkronizálásától is függ (éjszakás műszak)
+get_period_summaries = cached(
+    ttl=600,
+    scope=lambda machine_id, target_date, granularity="shift": (machine_id, target_date - timedelta(days=1), target_date + timedelta(days=1))
+)(data_loader.get_period_summaries)
+
+get_rollup_data = cached(
+    ttl=1800,
+    scope=lambda machine_id, period_type, start_date, end_date: (machine_id, start_date, None)
+)(data_loader.get_rollup_data)
+
+get_reliability_trend = cached(
+    ttl=600,
+    scope=lambda machine_id, target_date, window_days=30, days=10: (machine_id, target_date - timedelta(days=days + window_days), target_date)
+)(data_loader.get_reliability_trend)
+
+get_spc_summary = cached(
+    ttl=1800,
+    scope=lambda machine_id, start_date, end_date, metric="gsm": (machine_id, start_date, end_date)
+)(data_loader.get_spc_summary)
+
+# Üzemi áttekintő: minden gépet érint, ezért a teljes dátumtartomány verzióját figyeli
+get_plant_kpis = cached(
+    ttl=600,
+    scope=lambda target_date, days=30: (None, target_date - timedelta(days=2 * days), target_date)
+)(data_loader.get_plant_kpis)
+
+get_oee_calendar = cached(
+    ttl=1800,
+    scope=lambda end_date, days=365: (None, end_date - timedelta(days=days), end_date)
+)(data_loader.get_oee_calendar)
+
+get_consumption_comparison = cached(
+    ttl=1800,
+    scope=lambda start_date, end_date: (None, start_date.replace(day=1), None)
+)(data_loader.get_consumption_comparison)
@@ -6,6 +6,8 @@ Tartalmazza a trendvonalakat, idővonalakat, kördiagramokat és a minőségi
 analitikai grafikonokat is.
 """
 
+from datetime import timedelta
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -44,11 +46,190 @@ def render_sparkline(values, color="#0d6efd"):
     )
     return fig
 
-def create_timeline_chart(df_events):
+def create_period_kpi_chart(df_periods):
+    """
+    Kombinált diagram a műszakos / óránkénti bontáshoz.
+    Oszlopok: termelt tonna, vonal: OEE (másodlagos tengelyen).
+    """
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Bar(
+        x=df_periods["Periódus"], y=df_periods["Tonna"],
+        name="Termelés (t)", marker_color="#2ecc71",
+        hovertemplate="%{x}<br>Termelés: %{y:.1f} t<extra></extra>"
+    ), secondary_y=False)
+    fig.add_trace(go.Scatter(
+        x=df_periods["Periódus"], y=df_periods["OEE %"],
+        name="OEE %", mode="lines+markers", line=dict(color="#3498db", width=3),
+        hovertemplate="%{x}<br>OEE: %{y:.1f} %<extra></extra>"
+    ), secondary_y=True)
+    fig.update_layout(
+        template=PLOTLY_THEME,
+        height=300,
+        margin=dict(t=30, b=0, l=0, r=0),
+        legend=dict(orientation="h", yanchor="bottom", y=1.05, xanchor="left", x=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_yaxes(title_text="Tonna", secondary_y=False, showgrid=True, gridcolor='rgba(0,0,0,0.05)')
+    fig.update_yaxes(title_text="OEE %", secondary_y=True, range=[0, 100], showgrid=False)
+    return fig
+
+def create_sync_calendar_chart(df_days, start_date, end_date):
+    """
+    Naptár nézet a szinkronizált napokról (hetek x napok rács).
+    Szürke: nincs adat, sárga: részleges (a nap vége előtt szinkronizálva), zöld: betöltve,
+    piros: elavult (eltér a MES forrástól, újraszinkronizálandó).
+    """
+    status_map = dict(zip(df_days["Dátum"], df_days["Állapot"])) if not df_days.empty else {}
+    first_monday = start_date - timedelta(days=start_date.weekday())
+    weeks = (end_date - first_monday).days // 7 + 1
+    
+    z = [[None] * weeks for _ in range(7)]
+    text = [[""] * weeks for _ in range(7)]
+    day = start_date
+    while day <= end_date:
+        week, weekday = (day - first_monday).days // 7, day.weekday()
+        status = status_map.get(day)
+        z[weekday][week] = {"Elavult": 3, "Betöltve": 2, "Részleges": 1}.get(status, 0)
+        text[weekday][week] = f"{day}: {status or 'Nincs adat'}"
+        day += timedelta(days=1)
+    
+    fig = go.Figure(go.Heatmap(
+        z=z, text=text, hoverinfo="text",
+        x=list(range(weeks)), y=["H", "K", "Sze", "Cs", "P", "Szo", "V"],
+        zmin=0, zmax=3, showscale=False, xgap=3, ygap=3,
+        colorscale=[
+            [0, "#e9ecef"], [0.2, "#e9ecef"], [0.2, "#f1c40f"], [0.5, "#f1c40f"],
+            [0.5, "#2ecc71"], [0.8, "#2ecc71"], [0.8, "#e74c3c"], [1, "#e74c3c"]
+        ]
+    ))
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(autorange="reversed", tickfont=dict(size=9))
+    fig.update_layout(
+        template=PLOTLY_THEME,
+        height=170,
+        margin=dict(t=0, b=0, l=0, r=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+TREND_LABELS = {
+    "oee_pct": ("OEE (%)", "#0d6efd"),
+    "total_tons": ("Termelés (t)", "#2ecc71"),
+    "spec_electricity_kwh_t": ("Fajlagos energia (kWh/t)", "#fd7e14"),
+    "scrap_rate_pct": ("Selejtarány (%)", "#dc3545"),
+}
+
+def create_kpi_trend_chart(df_trend):
+    """
+    Négy mezős (2x2) trendgrafikon a hosszú távú KPI-khoz.
+    A bemenet a data_loader.get_kpi_trend hosszú formátumú, már ritkított eredménye.
+    """
+    fig = make_subplots(rows=2, cols=2, subplot_titles=[label for label, _ in TREND_LABELS.values()],
+                        shared_xaxes=True, vertical_spacing=0.12)
+    for i, (metric, (label, color)) in enumerate(TREND_LABELS.items()):
+        df_m = df_trend[df_trend["metric"] == metric]
+        fig.add_trace(go.Scatter(
+            x=df_m["period_start"], y=df_m["value"], mode="lines",
+            name=label, line=dict(color=color, width=2),
+            hovertemplate="%{x|%Y-%m-%d}<br>" + label + ": %{y:.1f}<extra></extra>"
+        ), row=i // 2 + 1, col=i % 2 + 1)
+
+    fig.update_layout(
+        template=PLOTLY_THEME,
+        height=450,
+        showlegend=False,
+        margin=dict(t=40, b=0, l=0, r=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+def create_oee_calendar_chart(df_calendar, start_date, end_date):
+    """
+    Éves naptár hőtérkép a napi OEE-ről, gépenként egy sávval (hetek x napok rács).
+    """
+    machines = list(dict.fromkeys(df_calendar["machine_id"]))
+    first_monday = start_date - timedelta(days=start_date.weekday())
+    weeks = (end_date - first_monday).days // 7 + 1
+    week_starts = [first_monday + timedelta(weeks=w) for w in range(weeks)]
+    
+    fig = make_subplots(rows=len(machines), cols=1, shared_xaxes=True, vertical_spacing=0.06, subplot_titles=machines)
+    for i, machine_id in enumerate(machines, start=1):
+        df_m = df_calendar[df_calendar["machine_id"] == machine_id]
+        z = [[None] * weeks for _ in range(7)]
+        for day, oee in zip(df_m["date"], df_m["oee_pct"]):
+            z[day.weekday()][(day - first_monday).days // 7] = oee
+        fig.add_trace(go.Heatmap(
+            z=z, x=week_starts, y=["H", "K", "Sze", "Cs", "P", "Szo", "V"],
+            zmin=0, zmax=100, xgap=2, ygap=2,
+            colorscale=[[0, "#e74c3c"], [0.5, "#f1c40f"], [1, "#2ecc71"]],
+            showscale=(i == 1), colorbar=dict(title="OEE %", thickness=10),
+            hovertemplate="%{x|%Y-%m-%d} hete, %{y}<br>OEE: %{z:.1f} %<extra>" + machine_id + "</extra>"
+        ), row=i, col=1)
+        fig.update_yaxes(autorange="reversed", tickfont=dict(size=9), row=i, col=1)
+    
+    fig.update_layout(
+        template=PLOTLY_THEME,
+        height=60 + 160 * len(machines),
+        margin=dict(t=30, b=0, l=0, r=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+def create_consumption_comparison_chart(df_consumption, metric, title):
+    """Fajlagos fogyasztás havi összevetése a gépek között (csoportosított oszlopdiagram)."""
+    fig = px.bar(
+        df_consumption, x="period_start", y=metric, color="machine_id",
+        barmode="group", title=title,
+        labels={"period_start": "", metric: "", "machine_id": "Gép"},
+        template=PLOTLY_THEME,
+        color_discrete_sequence=COLOR_PALETTE,
+        height=300
+    )
+    fig.update_layout(
+        margin=dict(t=40, b=0, l=0, r=0),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=""),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_xaxes(dtick="M1", tickformat="%Y-%m")
+    return fig
+
+def build_timeline_frame(df_events, article_names, machine_name):
+    """
+    Az oszlopos eseménytáblából (data_loader.get_daily_events_frame) az idővonal nyers sorai.
+    Termelésnél az állapot a minőségi státusz (GOOD / SCRAP), egyébként az esemény típusa.
+    """
+    event_type = df_events["event_type"].astype(object)
+    return pd.DataFrame({
+        "Kezdet": df_events["timestamp"],
+        "Vége": df_events["timestamp"] + pd.to_timedelta(df_events["duration_seconds"], unit="s"),
+        "Állapot": df_events["status"].astype(object).where(event_type == "RUN", event_type),
+        "Termék": df_events["article_id"].astype(object).map(article_names).fillna("Nincs gyártás"),
+        "Gép": machine_name
+    })
+
+def build_article_mix(df_events, article_names):
+    """Termékenkénti mennyiség (tonna) és futásidő (perc) a termelési eseményekből."""
+    run = df_events[df_events["event_type"] == "RUN"]
+    mix = pd.DataFrame({
+        "Termék": run["article_id"].astype(object).map(article_names).fillna("N/A"),
+        "Súly (kg)": run["weight_kg"],
+        "Időtartam (perc)": run["duration_seconds"] / 60
+    }).groupby("Termék", as_index=False).sum()
+    mix["Tonna"] = mix["Súly (kg)"] / 1000
+    return mix
+
+def create_timeline_chart(df_events, multi_day=False):
     """
     Interaktív Gantt-diagram (idővonal) a termelési eseményekhez.
     Megjeleníti a gép állapotát (RUN, STOP, BREAK) az idő függvényében.
+    Többnapos nézetben a felirat a dátumot is mutatja.
     """
+    time_format = "|%m.%d %H:%M" if multi_day else "|%H:%M"
     fig = px.timeline(
         df_events, 
         x_start="Kezdet", 
@@ -58,8 +239,8 @@ def create_timeline_chart(df_events):
         hover_name="Termék",
         hover_data={
             "Állapot": True,
-            "Kezdet": "|%H:%M",
-            "Vége": "|%H:%M",
+            "Kezdet": time_format,
+            "Vége": time_format,
             "Gép": False,
             "Termék": False
         },
@@ -148,8 +329,18 @@ def create_article_pie_chart(article_mix):
     )
     return fig
 
-def create_quality_charts(df_q):
-    """Összetett (3 szintes) grafikon a fő minőségi paraméterek trendjeihez."""
+def create_quality_charts(df_quality, article_names):
+    """
+    Összetett (3 szintes) grafikon a fő minőségi paraméterek trendjeihez.
+    Az oszlopos labor táblát (data_loader.get_daily_quality_frame) fogadja.
+    """
+    df_q = pd.DataFrame({
+        "Idő": df_quality["timestamp"],
+        "Nedvesség %": df_quality["moisture_pct"],
+        "Súly (GSM)": df_quality["gsm_measured"],
+        "Szilárdság": df_quality["strength_knm"],
+        "Termék": df_quality["article_id"].astype(object).map(article_names).fillna("Ismeretlen")
+    }).sort_values("Idő")
     fig_q = make_subplots(
         rows=3, cols=1, 
         shared_xaxes=True,
@@ -195,11 +386,11 @@ def create_quality_charts(df_q):
     fig_q.update_yaxes(showgrid=True, gridcolor='rgba(0,0,0,0.05)', autorange=True)
     return fig_q
 
-def create_pareto_chart(pareto_df):
+def create_pareto_chart(pareto_df, days=30):
     """Pareto diagram a leállási okok elemzéséhez és vizualizálásához."""
     fig = px.bar(
         pareto_df, x="Ok", y="Időtartam (perc)", 
-        title="Leggyakoribb leállási okok (30 nap)", 
+        title=f"Leggyakoribb leállási okok ({days} nap)", 
         color="Ok", template=PLOTLY_THEME, height=300
     )
     fig.update_layout(showlegend=False, margin=dict(t=40, b=0, l=0, r=0))
@@ -8,13 +8,19 @@ történő validálásáért a megjelenítés előtt.
 
 import pandas as pd
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Tuple, Optional
-from sqlalchemy import func
-from src.database import get_db
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional
+from sqlalchemy import func, case, select
+from src.config import settings
+from src.database import get_read_db
+from src.transformers.rollups import derive_kpis, daily_sum_columns, period_start as rollup_period_start, period_end as rollup_period_end
+from src.transformers.reliability import derive_reliability
+from src.transformers.spc import RunningStats
+from ui.downsampling import lttb_frame
 from src.models import (
     MachineDB, ArticleDB, ProductionEventDB, 
-    DailySummaryDB, QualityDataDB,
-    Machine, ProductionEvent, QualityMeasurement, DailySummary
+    DailySummaryDB, QualityDataDB, HourlySummaryDB, ShiftSummaryDB, KpiRollupDB,
+    ReliabilityStatsDB, QualityStatsDB, DataVersionDB, SyncedDayDB, MachineDataStatsDB, StaleDayDB,
+    Machine, ProductionEvent, QualityMeasurement, DailySummary, PeriodSummary
 )
 
 def load_articles_map() -> Dict[str, str]:
@@ -22,7 +28,7 @@ def load_articles_map() -> Dict[str, str]:
     Betölti a termék törzsadatokat és egy formázott név-térképet ad vissza.
     A kulcs a termék azonosítója, az érték pedig a név és grammsúly kombinációja.
     """
-    with get_db() as db:
+    with get_read_db() as db:
         articles = db.query(ArticleDB).all()
         return {a.id: f"{a.name} {a.nominal_gsm:.0f}g" for a in articles}
 
@@ -30,7 +36,7 @@ def load_machines() -> List[Machine]:
     """
     Betölti a regisztrált papírgépek listáját.
     """
-    with get_db() as db:
+    with get_read_db() as db:
         db_machines = db.query(MachineDB).all()
         return [Machine.model_validate(m) for m in db_machines]
 
@@ -43,7 +49,7 @@ def get_daily_data(machine_id: str, target_date: date) -> Tuple[List[ProductionE
     2. Előre kalkulált napi összefoglaló (KPI mutatók).
     3. Minőségi labor mérések.
     """
-    with get_db() as db:
+    with get_read_db() as db:
         start_dt = datetime.combine(target_date, datetime.min.time())
         end_dt = datetime.combine(target_date, datetime.max.time())
         
@@ -72,12 +78,192 @@ def get_daily_data(machine_id: str, target_date: date) -> Tuple[List[ProductionE
 
         return events, summary, quality
 
+DailyData = Tuple[List[ProductionEvent], Optional[DailySummary], List[QualityMeasurement]]
+
+def get_daily_data_bulk(start_date: date, end_date: date, machine_ids: Optional[Iterable[str]] = None) -> Dict[Tuple[str, date], DailyData]:
+    """
+    A get_daily_data tartalma egy dátumtartomány minden (gép, nap) kulcsára, három lekérdezéssel
+    (események, összesítők, labor) a napi / gépenkénti lekérdezések sora helyett. A kötegelt
+    jelentéskészítés előtölti vele a bemeneteket.
+
+    Returns:
+        Dict: (gép, nap) -> (események, napi összesítő, labor mérések)
+    """
+    machine_ids = list(machine_ids) if machine_ids is not None else None
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    result: Dict[Tuple[str, date], DailyData] = {}
+
+    def entry(machine_id: str, day: date) -> DailyData:
+        return result.setdefault((machine_id, day), ([], None, []))
+
+    with get_read_db() as db:
+        events_q = db.query(ProductionEventDB).filter(ProductionEventDB.timestamp >= start_dt, ProductionEventDB.timestamp <= end_dt)
+        summaries_q = db.query(DailySummaryDB).filter(DailySummaryDB.date >= start_date, DailySummaryDB.date <= end_date)
+        quality_q = db.query(QualityDataDB).filter(QualityDataDB.timestamp >= start_dt, QualityDataDB.timestamp <= end_dt)
+        if machine_ids is not None:
+            events_q = events_q.filter(ProductionEventDB.machine_id.in_(machine_ids))
+            summaries_q = summaries_q.filter(DailySummaryDB.machine_id.in_(machine_ids))
+            quality_q = quality_q.filter(QualityDataDB.machine_id.in_(machine_ids))
+
+        for e in events_q.order_by(ProductionEventDB.machine_id, ProductionEventDB.timestamp):
+            entry(e.machine_id, e.timestamp.date())[0].append(ProductionEvent.model_validate(e))
+        for s in summaries_q:
+            events, _, quality = entry(s.machine_id, s.date)
+            result[(s.machine_id, s.date)] = (events, DailySummary.model_validate(s), quality)
+        for q in quality_q:
+            entry(q.machine_id, q.timestamp.date())[2].append(QualityMeasurement.model_validate(q))
+
+    return result
+
+# Oszlopos (columnar) lekérdezések típusai: SQL -> DataFrame, soronkénti modellépítés nélkül
+EVENT_FRAME_DTYPES = {
+    "timestamp": "datetime64[ns]",
+    "duration_seconds": "int64",
+    "event_type": "category",
+    "status": "category",
+    "weight_kg": "float64",
+    "average_speed": "float64",
+    "article_id": "category",
+    "description": "object",
+}
+
+QUALITY_FRAME_DTYPES = {
+    "timestamp": "datetime64[ns]",
+    "article_id": "category",
+    "gsm_measured": "float64",
+    "moisture_pct": "float64",
+    "strength_knm": "float64",
+}
+
+def _typed_frame(db, stmt, dtypes: Dict[str, str], fill: Optional[Dict[str, object]] = None) -> pd.DataFrame:
+    """Egy SELECT eredménye közvetlenül típusos DataFrame-be (üres eredménynél is a teljes sémával)."""
+    df = pd.read_sql(stmt, db.connection())
+    if fill:
+        df = df.fillna(fill)
+    return df.astype(dtypes)
+
+def get_daily_events_frame(machine_id: str, target_date: date) -> pd.DataFrame:
+    """
+    Egy nap eseményei oszlopos formában (a get_daily_data eseménylistájának gyors változata).
+    Nagy eseményszámnál a Pydantic validáció és a visszaalakítás a költség nagy része.
+
+    Returns:
+        DataFrame: timestamp, duration_seconds, event_type, status, weight_kg,
+                   average_speed, article_id, description (időrendben)
+    """
+    return get_events_frame(machine_id, target_date, target_date)
+
+def get_events_frame(machine_id: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Egy dátumtartomány eseményei oszlopos formában (a többnapos idővonalhoz).
+    Oszlopai megegyeznek a get_daily_events_frame eredményével.
+    """
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    stmt = select(*[getattr(ProductionEventDB, c) for c in EVENT_FRAME_DTYPES]).where(
+        ProductionEventDB.machine_id == machine_id,
+        ProductionEventDB.timestamp >= start_dt,
+        ProductionEventDB.timestamp <= end_dt
+    ).order_by(ProductionEventDB.timestamp)
+
+    with get_read_db() as db:
+        return _typed_frame(db, stmt, EVENT_FRAME_DTYPES, fill={"duration_seconds": 0, "weight_kg": 0.0, "average_speed": 0.0})
+
+def _iter_frames(stmt, dtypes: Optional[Dict[str, str]] = None, fill: Optional[Dict[str, object]] = None, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Egy SELECT eredménye DataFrame darabokban, szerveroldali kurzorral (stream_results).
+    A memóriaigény a darabmérettel arányos, nem a teljes eredménnyel; a munkamenet a
+    generátor kimerüléséig (vagy lezárásáig) nyitva marad.
+    """
+    with get_read_db() as db:
+        conn = db.connection().execution_options(stream_results=True)
+        for chunk in pd.read_sql(stmt, conn, chunksize=chunk_size):
+            if fill:
+                chunk = chunk.fillna(fill)
+            yield chunk.astype(dtypes) if dtypes else chunk
+
+def iter_events_frames(machine_id: Optional[str], start_date: date, end_date: date, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Nagy időszakok eseményei darabokban (API / export), gépenként és időrendben.
+
+    Yields:
+        DataFrame: machine_id és a get_events_frame oszlopai.
+    """
+    stmt = select(ProductionEventDB.machine_id, *[getattr(ProductionEventDB, c) for c in EVENT_FRAME_DTYPES]).where(
+        ProductionEventDB.timestamp >= datetime.combine(start_date, datetime.min.time()),
+        ProductionEventDB.timestamp <= datetime.combine(end_date, datetime.max.time())
+    ).order_by(ProductionEventDB.machine_id, ProductionEventDB.timestamp)
+    if machine_id:
+        stmt = stmt.where(ProductionEventDB.machine_id == machine_id)
+    # Darabonként a kategória típus nem térül meg (a darabok kategóriái eltérnének)
+    dtypes = {c: t for c, t in EVENT_FRAME_DTYPES.items() if t != "category"}
+    yield from _iter_frames(stmt, dtypes, fill={"duration_seconds": 0, "weight_kg": 0.0, "average_speed": 0.0}, chunk_size=chunk_size)
+
+def iter_quality_frames(machine_id: str, start_date: date, end_date: date, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Egy gép labor mérései egy dátumtartományra darabokban (a PDF melléklethez), időrendben.
+
+    Yields:
+        DataFrame: a get_daily_quality_frame oszlopai.
+    """
+    stmt = select(*[getattr(QualityDataDB, c) for c in QUALITY_FRAME_DTYPES]).where(
+        QualityDataDB.machine_id == machine_id,
+        QualityDataDB.timestamp >= datetime.combine(start_date, datetime.min.time()),
+        QualityDataDB.timestamp <= datetime.combine(end_date, datetime.max.time())
+    ).order_by(QualityDataDB.timestamp)
+    dtypes = {c: t for c, t in QUALITY_FRAME_DTYPES.items() if t != "category"}
+    yield from _iter_frames(stmt, dtypes, chunk_size=chunk_size)
+
+def iter_daily_summary_frames(machine_id: Optional[str], start_date: date, end_date: date, chunk_size: int = 5000) -> Iterator[pd.DataFrame]:
+    """
+    Napi összesítők egy dátumtartományra darabokban (API / export), gépenként és dátum szerint.
+
+    Yields:
+        DataFrame: a daily_summaries tábla oszlopai (az id nélkül).
+    """
+    columns = [c for c in DailySummaryDB.__table__.columns if c.name != "id"]
+    stmt = select(*columns).where(
+        DailySummaryDB.date >= start_date,
+        DailySummaryDB.date <= end_date
+    ).order_by(DailySummaryDB.machine_id, DailySummaryDB.date)
+    if machine_id:
+        stmt = stmt.where(DailySummaryDB.machine_id == machine_id)
+    yield from _iter_frames(stmt, chunk_size=chunk_size)
+
+def get_daily_quality_frame(machine_id: str, target_date: date) -> pd.DataFrame:
+    """
+    Egy nap labor mérései oszlopos formában, időrendben.
+
+    Returns:
+        DataFrame: timestamp, article_id, gsm_measured, moisture_pct, strength_knm
+    """
+    start_dt = datetime.combine(target_date, datetime.min.time())
+    end_dt = datetime.combine(target_date, datetime.max.time())
+    stmt = select(*[getattr(QualityDataDB, c) for c in QUALITY_FRAME_DTYPES]).where(
+        QualityDataDB.machine_id == machine_id,
+        QualityDataDB.timestamp >= start_dt,
+        QualityDataDB.timestamp <= end_dt
+    ).order_by(QualityDataDB.timestamp)
+
+    with get_read_db() as db:
+        return _typed_frame(db, stmt, QUALITY_FRAME_DTYPES)
+
+def get_daily_summary(machine_id: str, target_date: date) -> Optional[DailySummary]:
+    """Egy nap előre kalkulált KPI összefoglalója (események betöltése nélkül)."""
+    with get_read_db() as db:
+        db_summary = db.query(DailySummaryDB).filter(
+            DailySummaryDB.machine_id == machine_id,
+            DailySummaryDB.date == target_date
+        ).first()
+        return DailySummary.model_validate(db_summary) if db_summary else None
+
 def get_pareto_data(machine_id: str, target_date: date, days: int = 30) -> pd.DataFrame:
     """
     Összesíti az állásidőket okok szerint a Pareto elemzéshez.
     Alapértelmezetten az elmúlt 30 nap adatait vizsgálja a statisztikai súlyhoz.
     """
-    with get_db() as db:
+    with get_read_db() as db:
         start_date = target_date - timedelta(days=days)
         
         stops = db.query(ProductionEventDB).filter(
@@ -104,7 +290,7 @@ def get_trend_data(machine_id: str, target_date: date, days: int = 10) -> List[D
     Lekéri a KPI mutatók alakulását az utolsó X napra vonatkozóan.
     Ezt használják a KPI kártyák alatti kisméretű trendvonalak (sparklines).
     """
-    with get_db() as db:
+    with get_read_db() as db:
         start_date = target_date - timedelta(days=days-1)
         db_summaries = db.query(DailySummaryDB).filter(
             DailySummaryDB.machine_id == machine_id,
@@ -114,15 +300,445 @@ def get_trend_data(machine_id: str, target_date: date, days: int = 10) -> List[D
         
         return [DailySummary.model_validate(s) for s in db_summaries]
 
+# Hosszú távú trendek: a mutató kulcsa és a számítása (összesítő sor, derive_kpis eredménye)
+TREND_METRICS = {
+    "oee_pct": lambda row, kpis: kpis["oee_pct"],
+    "total_tons": lambda row, kpis: row.total_tons,
+    "spec_electricity_kwh_t": lambda row, kpis: kpis["spec_electricity_kwh_t"],
+    "scrap_rate_pct": lambda row, kpis: (row.scrap_tons / row.total_tons * 100.0) if row.total_tons else 0.0,
+}
+
+def trend_resolution(span_days: int) -> str:
+    """Az időszak hosszához illő adatforrás: napi összesítő (≤ 120 nap), heti (≤ 3 év) vagy havi összesítő."""
+    if span_days <= 120:
+        return "day"
+    if span_days <= 3 * 365:
+        return "week"
+    return "month"
+
+def get_kpi_trend(machine_id: str, end_date: date, days: Optional[int] = 30, max_points: Optional[int] = None) -> pd.DataFrame:
+    """
+    Hosszú távú KPI trendek (OEE, termelés, fajlagos energia, selejtarány) 30 / 90 / 365 napra
+    vagy a teljes történetre (days=None). A felbontás az időszak hosszából adódik (trend_resolution),
+    így egy több éves nézet is csak a havi összesítőket olvassa. Mutatónként legfeljebb
+    max_points pont marad (LTTB ritkítás).
+
+    Returns:
+        DataFrame: period_start, metric, value, resolution (mutatónként időrendben)
+    """
+    max_points = max_points or settings.TREND_MAX_POINTS
+    columns = ["period_start", "metric", "value", "resolution"]
+
+    with get_read_db() as db:
+        if days is None:
+            start_date = db.query(func.min(DailySummaryDB.date)).filter(DailySummaryDB.machine_id == machine_id).scalar()
+            if start_date is None:
+                return pd.DataFrame(columns=columns)
+        else:
+            start_date = end_date - timedelta(days=days - 1)
+
+        resolution = trend_resolution((end_date - start_date).days + 1)
+        if resolution == "day":
+            rows = db.query(DailySummaryDB.date.label("period_start"), *daily_sum_columns()).filter(
+                DailySummaryDB.machine_id == machine_id,
+                DailySummaryDB.date >= start_date,
+                DailySummaryDB.date <= end_date
+            ).group_by(DailySummaryDB.date).order_by(DailySummaryDB.date).all()
+        else:
+            rows = db.query(KpiRollupDB).filter(
+                KpiRollupDB.machine_id == machine_id,
+                KpiRollupDB.period_type == resolution,
+                KpiRollupDB.period_start >= rollup_period_start(start_date, resolution),
+                KpiRollupDB.period_start <= end_date
+            ).order_by(KpiRollupDB.period_start).all()
+
+        records = []
+        for r in rows:
+            kpis = derive_kpis(r)
+            records.append({"period_start": r.period_start, **{m: calc(r, kpis) for m, calc in TREND_METRICS.items()}})
+
+    if not records:
+        return pd.DataFrame(columns=columns)
+
+    wide = pd.DataFrame(records)
+    wide["period_start"] = pd.to_datetime(wide["period_start"])
+    frames = [
+        lttb_frame(wide[["period_start", metric]], "period_start", metric, max_points)
+        .rename(columns={metric: "value"}).assign(metric=metric)
+        for metric in TREND_METRICS
+    ]
+    return pd.concat(frames, ignore_index=True).assign(resolution=resolution)[columns]
+
+def get_period_summaries(machine_id: str, target_date: date, granularity: str = "shift") -> List[PeriodSummary]:
+    """
+    Lekéri egy nap óránkénti ("hour") vagy műszakos ("shift") KPI összesítőit.
+    Kizárólag az előre kiszámolt összesítő táblákat olvassa, a nyers eseménynaplót nem.
+    Műszakos bontásnál az előző napon kezdődő, éjfélen átnyúló műszak is szerepel.
+    """
+    model = HourlySummaryDB if granularity == "hour" else ShiftSummaryDB
+    with get_read_db() as db:
+        if model is ShiftSummaryDB:
+            day_start = datetime.combine(target_date, datetime.min.time())
+            day_end = day_start + timedelta(days=1)
+            period_filter = [model.period_start < day_end, model.period_end > day_start]
+        else:
+            period_filter = [model.date == target_date]
+        
+        db_periods = db.query(model).filter(
+            model.machine_id == machine_id,
+            *period_filter
+        ).order_by(model.period_start).all()
+        
+        return [PeriodSummary.model_validate(p) for p in db_periods]
+
+def get_rollup_data(machine_id: str, period_type: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Heti / havi / éves összesítők lekérése a hosszú távú nézetekhez.
+    Az arányszámokat (OEE, fajlagos mutatók) az additív komponensekből számolja.
+    """
+    with get_read_db() as db:
+        rows = db.query(KpiRollupDB).filter(
+            KpiRollupDB.machine_id == machine_id,
+            KpiRollupDB.period_type == period_type,
+            KpiRollupDB.period_start >= start_date,
+            KpiRollupDB.period_start <= end_date
+        ).order_by(KpiRollupDB.period_start).all()
+        
+        data = [
+            {
+                "period_start": r.period_start,
+                "total_tons": r.total_tons,
+                "good_tons": r.good_tons,
+                "scrap_tons": r.scrap_tons,
+                "target_tons": r.target_tons,
+                "downtime_min": r.downtime_min,
+                "break_count": int(r.break_count or 0),
+                "day_count": int(r.day_count or 0),
+                **derive_kpis(r)
+            } for r in rows
+        ]
+        return pd.DataFrame(data)
+
+# Időszakos jelentés bemenete: (időszak összesítő, napi összesítők, termékenkénti és leállási okonkénti aggregátumok)
+PeriodData = Tuple[Dict[str, float], List[DailySummary], pd.DataFrame, pd.DataFrame]
+
+def get_period_report_data(machine_id: str, period_type: str, target_date: date) -> PeriodData:
+    """
+    A heti / havi jelentés bemenetei a target_date napot tartalmazó időszakra.
+    Csak összesítőket és aggregáló lekérdezéseket olvas (időszakos összesítő, napi összesítők,
+    termékenkénti és leállási okonkénti GROUP BY, labor akkumulátorok), nyers eseménysorokat nem,
+    így a memóriaigény az időszak eseményszámától független.
+
+    Returns:
+        Tuple: (összesítő dict a komponensekkel és a derive_kpis mezőivel (üres, ha nincs adat),
+                napi összesítők, termékek: article_id, tons, run_min, avg_speed, gsm, moisture, strength,
+                leállások: event_type, description, minutes, count)
+    """
+    start_date = rollup_period_start(target_date, period_type)
+    end_date = rollup_period_end(start_date, period_type)
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+
+    with get_read_db() as db:
+        days = [DailySummary.model_validate(s) for s in db.query(DailySummaryDB).filter(
+            DailySummaryDB.machine_id == machine_id,
+            DailySummaryDB.date >= start_date,
+            DailySummaryDB.date <= end_date
+        ).order_by(DailySummaryDB.date)]
+
+        # Az időszakos összesítő az elsődleges forrás; ha még nem készült el, a napi összesítők összege
+        totals_row = db.query(KpiRollupDB).filter(
+            KpiRollupDB.machine_id == machine_id,
+            KpiRollupDB.period_type == period_type,
+            KpiRollupDB.period_start == start_date
+        ).first()
+        if totals_row is None and days:
+            totals_row = db.query(*daily_sum_columns()).filter(
+                DailySummaryDB.machine_id == machine_id,
+                DailySummaryDB.date >= start_date,
+                DailySummaryDB.date <= end_date
+            ).first()
+        totals = {}
+        if totals_row is not None and totals_row.day_count:
+            totals = {
+                "total_tons": totals_row.total_tons,
+                "good_tons": totals_row.good_tons,
+                "scrap_tons": totals_row.scrap_tons,
+                "target_tons": totals_row.target_tons,
+                "downtime_min": totals_row.downtime_min,
+                "break_count": int(totals_row.break_count or 0),
+                "day_count": int(totals_row.day_count or 0),
+                "electricity_kwh": totals_row.electricity_kwh,
+                "water_m3": totals_row.water_m3,
+                "steam_tons": totals_row.steam_tons,
+                "fiber_tons": totals_row.fiber_tons,
+                **derive_kpis(totals_row)
+            }
+
+        event_filter = [
+            ProductionEventDB.machine_id == machine_id,
+            ProductionEventDB.timestamp >= start_dt,
+            ProductionEventDB.timestamp <= end_dt
+        ]
+        articles = pd.DataFrame(db.query(
+            ProductionEventDB.article_id,
+            (func.coalesce(func.sum(ProductionEventDB.weight_kg), 0.0) / 1000.0).label("tons"),
+            (func.coalesce(func.sum(ProductionEventDB.duration_seconds), 0) / 60.0).label("run_min"),
+            func.avg(case((ProductionEventDB.average_speed > 0, ProductionEventDB.average_speed))).label("avg_speed")
+        ).filter(*event_filter, ProductionEventDB.event_type == "RUN").group_by(ProductionEventDB.article_id).all(),
+            columns=["article_id", "tons", "run_min", "avg_speed"])
+
+        # Termékenkénti labor átlagok a napi SPC akkumulátorokból (darabszámmal súlyozva)
+        quality = db.query(
+            QualityStatsDB.article_id, QualityStatsDB.metric,
+            (func.sum(QualityStatsDB.mean * QualityStatsDB.count) / func.nullif(func.sum(QualityStatsDB.count), 0)).label("mean")
+        ).filter(
+            QualityStatsDB.machine_id == machine_id,
+            QualityStatsDB.date >= start_date,
+            QualityStatsDB.date <= end_date
+        ).group_by(QualityStatsDB.article_id, QualityStatsDB.metric).all()
+        for metric in ("gsm", "moisture", "strength"):
+            means = {a: m for a, q_metric, m in quality if q_metric == metric}
+            articles[metric] = articles["article_id"].map(means).astype(float)
+
+        downtime = pd.DataFrame(db.query(
+            ProductionEventDB.event_type, ProductionEventDB.description,
+            (func.coalesce(func.sum(ProductionEventDB.duration_seconds), 0) / 60.0).label("minutes"),
+            func.count(ProductionEventDB.id).label("count")
+        ).filter(*event_filter, ProductionEventDB.event_type.in_(["STOP", "BREAK"])).group_by(
+            ProductionEventDB.event_type, ProductionEventDB.description
+        ).all(), columns=["event_type", "description", "minutes", "count"])
+
+    articles = articles.sort_values("tons", ascending=False, ignore_index=True)
+    downtime = downtime.sort_values("minutes", ascending=False, ignore_index=True)
+    return totals, days, articles, downtime
+
+def get_plant_kpis(target_date: date, days: int = 30) -> pd.DataFrame:
+    """
+    Üzemi áttekintő: gépenkénti KPI-k az utolsó X napra és az azt megelőző azonos hosszú időszakra.
+    Egyetlen aggregáló lekérdezés a napi összesítőkön (gép és időszak szerint csoportosítva),
+    az arányszámokat a komponensekből számolja (derive_kpis).
+
+    Returns:
+        DataFrame: machine_id, period ("current" / "previous"), total_tons, downtime_min,
+                   break_count, day_count és a derive_kpis mezői.
+    """
+    current_start = target_date - timedelta(days=days - 1)
+    previous_start = current_start - timedelta(days=days)
+    period = case((DailySummaryDB.date >= current_start, "current"), else_="previous").label("period")
+
+    with get_read_db() as db:
+        rows = db.query(DailySummaryDB.machine_id, period, *daily_sum_columns()).filter(
+            DailySummaryDB.date >= previous_start,
+            DailySummaryDB.date <= target_date
+        ).group_by(DailySummaryDB.machine_id, period).all()
+
+        return pd.DataFrame([
+            {
+                "machine_id": r.machine_id,
+                "period": r.period,
+                "total_tons": r.total_tons,
+                "downtime_min": r.downtime_min,
+                "break_count": int(r.break_count or 0),
+                "day_count": int(r.day_count or 0),
+                **derive_kpis(r)
+            } for r in rows
+        ])
+
+def get_oee_calendar(end_date: date, days: int = 365) -> pd.DataFrame:
+    """
+    Napi OEE minden gépre egy teljes évre (naptár hőtérképhez), egyetlen lekérdezéssel.
+
+    Returns:
+        DataFrame: machine_id, date, oee_pct, total_tons
+    """
+    start_date = end_date - timedelta(days=days - 1)
+    with get_read_db() as db:
+        rows = db.query(
+            DailySummaryDB.machine_id, DailySummaryDB.date,
+            DailySummaryDB.oee_pct, DailySummaryDB.total_tons
+        ).filter(
+            DailySummaryDB.date >= start_date,
+            DailySummaryDB.date <= end_date
+        ).order_by(DailySummaryDB.machine_id, DailySummaryDB.date).all()
+        return pd.DataFrame(rows, columns=["machine_id", "date", "oee_pct", "total_tons"])
+
+def get_consumption_comparison(start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Gépek közötti fajlagos fogyasztás összevetés havi bontásban.
+    Egyetlen lekérdezés a havi összesítőkön (kpi_rollups), minden gépre.
+
+    Returns:
+        DataFrame: machine_id, period_start, total_tons és a fajlagos mutatók (spec_*).
+    """
+    with get_read_db() as db:
+        rows = db.query(KpiRollupDB).filter(
+            KpiRollupDB.period_type == "month",
+            KpiRollupDB.period_start >= start_date.replace(day=1),
+            KpiRollupDB.period_start <= end_date
+        ).order_by(KpiRollupDB.period_start, KpiRollupDB.machine_id).all()
+
+        data = []
+        for r in rows:
+            kpis = derive_kpis(r)
+            data.append({
+                "machine_id": r.machine_id,
+                "period_start": r.period_start,
+                "total_tons": r.total_tons,
+                **{k: v for k, v in kpis.items() if k.startswith("spec_")}
+            })
+        return pd.DataFrame(data)
+
+def get_reliability_trend(machine_id: str, target_date: date, window_days: int = 30, days: int = 10) -> pd.DataFrame:
+    """
+    Gördülő ablakos megbízhatósági mutatók (MTBF, MTTR, szakadás / 1000 t) az utolsó X napra.
+    Az utolsó sor a kiválasztott nap aktuális értéke, a korábbiak a sparkline-ok alapját adják.
+    """
+    with get_read_db() as db:
+        start_date = target_date - timedelta(days=days-1)
+        rows = db.query(ReliabilityStatsDB).filter(
+            ReliabilityStatsDB.machine_id == machine_id,
+            ReliabilityStatsDB.window_days == window_days,
+            ReliabilityStatsDB.date >= start_date,
+            ReliabilityStatsDB.date <= target_date
+        ).order_by(ReliabilityStatsDB.date).all()
+        
+        return pd.DataFrame([
+            {"date": r.date, "break_count": int(r.break_count or 0), **derive_reliability(r)}
+            for r in rows
+        ])
+
+def get_spc_summary(machine_id: str, start_date: date, end_date: date, metric: str = "gsm") -> pd.DataFrame:
+    """
+    Termékenkénti SPC statisztika egy időszakra a napi Welford-akkumulátorok összefésülésével.
+    Grammsúly esetén a folyamatképességet (Cp, Cpk) is kiszámolja a névleges GSM alapján.
+    """
+    with get_read_db() as db:
+        rows = db.query(QualityStatsDB, ArticleDB.name, ArticleDB.nominal_gsm).outerjoin(
+            ArticleDB, ArticleDB.id == QualityStatsDB.article_id
+        ).filter(
+            QualityStatsDB.machine_id == machine_id,
+            QualityStatsDB.metric == metric,
+            QualityStatsDB.date >= start_date,
+            QualityStatsDB.date <= end_date
+        ).all()
+        
+        merged: Dict[str, Tuple[RunningStats, Optional[str], Optional[float]]] = {}
+        for row, name, nominal in rows:
+            stats, _, _ = merged.get(row.article_id, (RunningStats(), name, nominal))
+            merged[row.article_id] = (stats.merge(RunningStats.from_row(row)), name, nominal)
+    
+    data = []
+    for article_id, (stats, name, nominal) in merged.items():
+        lcl, ucl = stats.control_limits()
+        cp, cpk = stats.capability(nominal, settings.SPC_GSM_TOLERANCE_PCT) if metric == "gsm" else (None, None)
+        data.append({
+            "article_id": article_id,
+            "Termék": name or article_id,
+            "Névleges": nominal if metric == "gsm" else None,
+            "n": stats.count,
+            "Átlag": stats.mean,
+            "Szórás": stats.std,
+            "Min": stats.min_value,
+            "Max": stats.max_value,
+            "LCL": lcl,
+            "UCL": ucl,
+            "Cp": cp,
+            "Cpk": cpk
+        })
+    return pd.DataFrame(data)
+
 def get_data_availability() -> Tuple[Optional[datetime], Optional[datetime], int]:
     """
     Meghatározza az adatbázis aktuális állapotát.
     Visszaadja a legkorábbi és legfrissebb dátumot, valamint az összes esemény darabszámát.
+    A pipeline által karbantartott gépenkénti statisztikából olvas (gépenként egy sor).
     """
-    with get_db() as db:
+    with get_read_db() as db:
         res = db.query(
-            func.min(ProductionEventDB.timestamp),
-            func.max(ProductionEventDB.timestamp),
-            func.count(ProductionEventDB.id)
+            func.min(MachineDataStatsDB.first_event),
+            func.max(MachineDataStatsDB.last_event),
+            func.coalesce(func.sum(MachineDataStatsDB.event_count), 0)
         ).first()
-        return res
+        return res[0], res[1], int(res[2] or 0)
+
+def get_synced_days(machine_id: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    A szinkronizált napok naptára egy gépre.
+    Részleges az a nap, amelyet még a nap vége előtt szinkronizáltak (azóta újabb adat érkezhetett),
+    elavult az, amelyen az egyeztetés eltérést talált a MES forráshoz képest.
+
+    Returns:
+        DataFrame: Dátum, Események, Szinkronizálva, Állapot ("Betöltve" / "Részleges" / "Elavult").
+    """
+    with get_read_db() as db:
+        rows = db.query(SyncedDayDB).filter(
+            SyncedDayDB.machine_id == machine_id,
+            SyncedDayDB.date >= start_date,
+            SyncedDayDB.date <= end_date
+        ).order_by(SyncedDayDB.date).all()
+        stale = {d for (d,) in db.query(StaleDayDB.date).filter(
+            StaleDayDB.machine_id == machine_id,
+            StaleDayDB.date >= start_date,
+            StaleDayDB.date <= end_date
+        ).all()}
+
+        def status(r: SyncedDayDB) -> str:
+            if r.date in stale:
+                return "Elavult"
+            if r.synced_at and r.synced_at < datetime.combine(r.date + timedelta(days=1), datetime.min.time()):
+                return "Részleges"
+            return "Betöltve"
+
+        records = [{
+            "Dátum": r.date,
+            "Események": r.event_count,
+            "Szinkronizálva": r.synced_at,
+            "Állapot": status(r)
+        } for r in rows]
+        # A forrásban már létező, de még be nem töltött napok
+        synced = {r.date for r in rows}
+        records += [
+            {"Dátum": d, "Események": 0, "Szinkronizálva": None, "Állapot": "Elavult"}
+            for d in sorted(stale - synced)
+        ]
+        return pd.DataFrame(records, columns=["Dátum", "Események", "Szinkronizálva", "Állapot"])
+
+def get_data_version(machine_id: Optional[str] = None, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    """
+    Adatverzió-token egy (gép, dátumtartomány) kulcstérre.
+    A verziók csak nőhetnek, így az összegük bármely érintett kulcs szinkronizálásakor változik.
+    A gyorsítótár ezt a tokent használja a bejegyzések érvényességének eldöntésére.
+    """
+    with get_read_db() as db:
+        q = db.query(func.coalesce(func.sum(DataVersionDB.version), 0))
+        if machine_id:
+            q = q.filter(DataVersionDB.machine_id == machine_id)
+        if start_date:
+            q = q.filter(DataVersionDB.date >= start_date)
+        if end_date:
+            q = q.filter(DataVersionDB.date <= end_date)
+        return int(q.scalar() or 0)
+
+def get_data_versions(start_date: date, end_date: date, machine_id: Optional[str] = None) -> Dict[Tuple[str, date], int]:
+    """
+    Adatverzió (gép, nap) kulcsonként egy dátumtartományra.
+    Egy kulcs értéke megegyezik a get_data_version(gép, nap, nap) eredményével; a verzió nélküli,
+    de napi összesítővel rendelkező napok (pl. közvetlenül betöltött adatok) 0 verzióval szerepelnek.
+    """
+    with get_read_db() as db:
+        summaries = db.query(DailySummaryDB.machine_id, DailySummaryDB.date).filter(
+            DailySummaryDB.date >= start_date,
+            DailySummaryDB.date <= end_date
+        )
+        versions = db.query(DataVersionDB.machine_id, DataVersionDB.date, DataVersionDB.version).filter(
+            DataVersionDB.date >= start_date,
+            DataVersionDB.date <= end_date
+        )
+        if machine_id:
+            summaries = summaries.filter(DailySummaryDB.machine_id == machine_id)
+            versions = versions.filter(DataVersionDB.machine_id == machine_id)
+
+        result = {(m, d): 0 for m, d in summaries.all()}
+        result.update({(m, d): int(v or 0) for m, d, v in versions.all()})
+        return result
@@ -0,0 +1,61 @@
+"""
+IDŐSOR RITKÍTÁS (LTTB DOWNSAMPLING)
+===================================
+Largest-Triangle-Three-Buckets ritkítás hosszú idősorokhoz. Az első és az
+utolsó pont mindig megmarad, a köztes szakaszokból pedig vödrönként az a pont,
+amely a legnagyobb háromszöget zárja be az előző kiválasztott ponttal és a
+következő vödör átlagával. Így a csúcsok és völgyek megmaradnak, a pontszám
+pedig korlátos, bármilyen hosszú az időszak.
+"""
+
+import numpy as np
+import pandas as pd
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    A megtartandó pontok indexei (növekvő sorrendben).
+
+    Args:
+        x: Az x koordináták (növekvő, numerikus).
+        y: Az y értékek (NaN nélkül).
+        threshold: A megtartandó pontok maximális száma.
+
+    Returns:
+        np.ndarray: Legfeljebb threshold darab index.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # A következő vödör átlaga (az utolsó vödörnél ez maga az utolsó pont)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def lttb_frame(df: pd.DataFrame, x_col: str, y_col: str, threshold: int) -> pd.DataFrame:
+    """
+    DataFrame ritkítása egy (dátum vagy numerikus) x és egy y oszlop alapján.
+    A hiányzó y értékű sorok kimaradnak.
+    """
+    df = df.dropna(subset=[y_col])
+    if len(df) <= threshold:
+        return df
+    x = pd.to_datetime(df[x_col]).to_numpy(dtype="datetime64[ns]").astype(np.int64) \
+        if not pd.api.types.is_numeric_dtype(df[x_col]) else df[x_col].to_numpy()
+    return df.iloc[lttb_indices(x, df[y_col].to_numpy(), threshold)]
@@ -0,0 +1,90 @@
+"""
+ÜZEMI ÁTTEKINTŐ OLDAL (PLANT OVERVIEW)
+======================================
+Minden gép egy oldalon: KPI kártyák, éves OEE naptár és fajlagos fogyasztás összevetés.
+Minden vizualizáció egyetlen aggregáló lekérdezésre épül (napi összesítők vagy havi
+összesítők), így a gépek számának növekedésével sem nő a lekérdezések száma.
+"""
+
+from datetime import timedelta
+import streamlit as st
+
+from ui.cache import get_plant_kpis, get_oee_calendar, get_consumption_comparison
+from ui.charts import create_oee_calendar_chart, create_consumption_comparison_chart
+
+CARDS_PER_ROW = 4
+
+CONSUMPTION_METRICS = {
+    "spec_electricity_kwh_t": "Villamos energia (kWh/t)",
+    "spec_water_m3_t": "Vízfelhasználás (m³/t)",
+    "spec_steam_t_t": "Gőzfelhasználás (t/t)",
+    "spec_fiber_t_t": "Alapanyag / rost (t/t)",
+}
+
+def render_kpi_cards(selected_date, days=30):
+    """Gépenkénti KPI kártyák az utolsó X napra, az előző időszakhoz mért változással."""
+    st.subheader(f"Gépek teljesítménye (utolsó {days} nap)")
+    df = get_plant_kpis(selected_date, days)
+    if df.empty:
+        st.info("Nincs összesített adat a választott időszakban.")
+        return
+
+    current = df[df["period"] == "current"].set_index("machine_id")
+    previous = df[df["period"] == "previous"].set_index("machine_id")
+    machines = sorted(current.index)
+
+    for row_start in range(0, len(machines), CARDS_PER_ROW):
+        cols = st.columns(CARDS_PER_ROW)
+        for col, machine_id in zip(cols, machines[row_start:row_start + CARDS_PER_ROW]):
+            kpi = current.loc[machine_id]
+            delta = kpi["oee_pct"] - previous.loc[machine_id, "oee_pct"] if machine_id in previous.index else None
+            with col.container(border=True):
+                st.metric(machine_id, f"{kpi['oee_pct']:.1f} % OEE", delta=f"{delta:.1f} %p" if delta is not None else None,
+                          help="Az időszak OEE-je az összesített komponensekből, a változás az előző azonos hosszú időszakhoz képest.")
+                st.caption(
+                    f"Termelés: **{kpi['total_tons']:,.0f} t** ({kpi['day_count']} nap)  \n"
+                    f"Rendelkezésre állás: **{kpi['availability_pct']:.1f} %**  \n"
+                    f"Szakadás: **{kpi['break_count']} db** | Állás: **{kpi['downtime_min']:,.0f} perc**  \n"
+                    f"Villamos energia: **{kpi['spec_electricity_kwh_t']:.0f} kWh/t**"
+                )
+
+def render_oee_calendar(selected_date, days=365):
+    """Éves OEE naptár hőtérkép gépenként."""
+    st.subheader("OEE naptár (utolsó 12 hónap)")
+    df = get_oee_calendar(selected_date, days)
+    if df.empty:
+        st.info("Nincs napi összesítő a választott időszakban.")
+        return
+    start_date = selected_date - timedelta(days=days - 1)
+    st.plotly_chart(create_oee_calendar_chart(df, start_date, selected_date), width="stretch", key="overview_oee_calendar")
+
+def render_consumption_comparison(selected_date, months=12):
+    """Fajlagos fogyasztások havi összevetése a gépek között."""
+    st.subheader("Fajlagos fogyasztás összevetése")
+    start_date = (selected_date.replace(day=1) - timedelta(days=31 * (months - 1))).replace(day=1)
+    df = get_consumption_comparison(start_date, selected_date)
+    if df.empty:
+        st.info("Nincs havi összesítő a választott időszakban.")
+        return
+
+    metric = st.radio(
+        "Mutató", options=list(CONSUMPTION_METRICS.keys()),
+        format_func=lambda x: CONSUMPTION_METRICS[x],
+        horizontal=True, key="overview_consumption_metric", label_visibility="collapsed"
+    )
+    st.plotly_chart(create_consumption_comparison_chart(df, metric, CONSUMPTION_METRICS[metric]), width="stretch", key="overview_consumption")
+
+def render_overview_page(selected_date):
+    """Az üzemi áttekintő oldal felépítése."""
+    st.subheader("EcoPaper Solutions")
+    st.title("Üzemi áttekintés")
+    st.markdown(f"**Minden termelőegység** | {selected_date.strftime('%Y. %m. %d.')}")
+
+    render_kpi_cards(selected_date)
+    st.divider()
+    render_oee_calendar(selected_date)
+    st.divider()
+    render_consumption_comparison(selected_date)
+
+    st.divider()
+    st.caption("EcoPaper Solutions Operations Dashboard | Kremzner Gábor 2026")
@@ -3,85 +3,422 @@ PDF EXPORTÁLÓ MODUL (PDF REPORT GENERATION)
 ==========================================
 Ez a modul felelős a professzionális, nyomtatható PDF gyártási jelentések 
 generálásáért a ReportLab könyvtár segítségével.
+
+A változatlan erőforrások (betűtípusok, stílusok, logó) egy folyamatszintű
+ReportTemplate példányban élnek, így a jelentések csak a tartalmat építik fel.
+A heti / havi jelentés (generate_period_report) nyers események helyett az
+összesítőkből és aggregátumokból készül, ReportLab vektoros grafikonokkal.
 """
 
 from io import BytesIO
+import reportlab
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Flowable, PageBreak
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase.pdfmetrics import registerFontFamily
+from reportlab.pdfbase.pdfutils import readJPEGInfo
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream, PDFZCompress
+from reportlab.pdfgen.canvas import Canvas
+import functools
+import itertools
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 
+from ui.segments import run_length_segments, state_durations
+
 # --- BETŰTÍPUS REGISZTRÁCIÓ A MAGYAR ÉKEZETEKHEZ ---
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 FONT_PATH = os.path.join(BASE_DIR, "assets", "fonts", "Arial.ttf")
 FONT_BOLD_PATH = os.path.join(BASE_DIR, "assets", "fonts", "Arial-Bold.ttf")
 
-try:
-    if os.path.exists(FONT_PATH):
-        pdfmetrics.registerFont(TTFont('Arial', FONT_PATH))
-        pdfmetrics.registerFont(TTFont('Arial-Bold', FONT_BOLD_PATH))
-        registerFontFamily('Arial', normal='Arial', bold='Arial-Bold')
-        BASE_FONT = 'Arial'
-        BOLD_FONT = 'Arial-Bold'
-    else:
-        BASE_FONT = 'Helvetica'
-        BOLD_FONT = 'Helvetica-Bold'
-except Exception:
-    BASE_FONT = 'Helvetica'
-    BOLD_FONT = 'Helvetica-Bold'
-
-def generate_pdf_report(machine_id, selected_date, summary, events, quality=None, article_names=None):
-    """Létrehoz egy részletes, professzionális PDF jelentést magyar ékezet támogatással."""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-    styles = getSampleStyleSheet()
-    
-    # Központi stílusok
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontName=BOLD_FONT, fontSize=18, alignment=1)
-    section_style = ParagraphStyle('Section', parent=styles['Heading2'], fontName=BOLD_FONT, fontSize=12, color=colors.HexColor("#0d6efd"), spaceBefore=12, spaceAfter=8)
-    normal_style = ParagraphStyle('Normal', parent=styles['Normal'], fontName=BASE_FONT, fontSize=9)
-    normal_bold_style = ParagraphStyle('NormalBold', parent=styles['Normal'], fontName=BOLD_FONT, fontSize=9)
+@functools.lru_cache(maxsize=None)
+def register_fonts() -> Tuple[str, str]:
+    """
+    A TTF betűtípusok regisztrálása folyamatonként egyszer, az első jelentés készítésekor
+    (a TTF fájlok beolvasása ne lassítsa a Dashboard indulását).
 
-    elements = []
+    Returns:
+        Tuple: (alap betűtípus, félkövér betűtípus) neve; hiba esetén a beépített Helvetica.
+    """
+    try:
+        if os.path.exists(FONT_PATH):
+            pdfmetrics.registerFont(TTFont('Arial', FONT_PATH))
+            pdfmetrics.registerFont(TTFont('Arial-Bold', FONT_BOLD_PATH))
+            registerFontFamily('Arial', normal='Arial', bold='Arial-Bold')
+            return 'Arial', 'Arial-Bold'
+    except Exception:
+        pass
+    return 'Helvetica', 'Helvetica-Bold'
 
-    # --- 1. FEJLÉC (Logó + Cím) ---
-    logo_path = os.path.join(os.path.dirname(__file__), "..", "assets", "logo.jpeg")
-    if os.path.exists(logo_path):
-        img = Image(logo_path)
-        aspect = img.imageWidth / img.imageHeight
-        img.drawHeight = 40
-        img.drawWidth = 40 * aspect
-        header_table_data = [[img, Paragraph("NAPI TERMELÉSI JELENTÉS", title_style), ""]]
-        header_table = Table(header_table_data, colWidths=[60, 415, 60])
-        header_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-        ]))
-        elements.append(header_table)
+# Fejléc logó (a méret a sablon felépítésekor egyszer kerül lemérésre, a JPEG dekódolás nélkül ágyazódik be)
+LOGO_PATH = os.path.join(BASE_DIR, "assets", "logo.jpeg")
+LOGO_HEIGHT = 40
+
+class LogoFlowable(Flowable):
+    """
+    Előre lemért méretű JPEG logó. A platypus Image a fájlt minden példányosításkor újra lemérné,
+    a memóriából (BytesIO) betöltött kép pedig rajzoláskor teljes dekódolást igényelne.
+    """
+
+    def __init__(self, path: str, width: float, height: float) -> None:
+        super().__init__()
+        self.path, self.width, self.height = path, width, height
+
+    def wrap(self, availWidth: float, availHeight: float) -> Tuple[float, float]:
+        return self.width, self.height
+
+    def draw(self) -> None:
+        self.canv.drawImage(self.path, 0, 0, self.width, self.height)
+
+class ReportTemplate:
+    """
+    A jelentések közös, változatlan erőforrásai: betűtípusok, bekezdés- és táblázatstílusok,
+    valamint a lemért logó. Folyamatonként egyszer készül (lásd get_template),
+    a jelentések csak olvassák, így a kötegelt készítés sem építi újra jelentésenként.
+    """
+
+    def __init__(self, logo_path: str = LOGO_PATH) -> None:
+        """
+        Args:
+            logo_path: A fejléc logó (JPEG) elérési útja; ha nem létezik, a fejléc szöveges.
+        """
+        self.base_font, self.bold_font = register_fonts()
+        styles = getSampleStyleSheet()
+
+        # Központi stílusok
+        self.title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontName=self.bold_font, fontSize=18, alignment=1)
+        self.section_style = ParagraphStyle('Section', parent=styles['Heading2'], fontName=self.bold_font, fontSize=12, color=colors.HexColor("#0d6efd"), spaceBefore=12, spaceAfter=8)
+        self.normal_style = ParagraphStyle('Normal', parent=styles['Normal'], fontName=self.base_font, fontSize=9)
+        self.normal_bold_style = ParagraphStyle('NormalBold', parent=styles['Normal'], fontName=self.bold_font, fontSize=9)
+        self.normal_right_style = ParagraphStyle('NormalRight', parent=self.normal_style, alignment=2)
+
+        self.table_styles = {
+            "header": TableStyle([
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+            ]),
+            "info": TableStyle([
+                ('LEFTPADDING', (0, 0), (0, 0), 0),
+                ('RIGHTPADDING', (1, 0), (1, 0), 0),
+                ('VALIGN', (0, 0), (-1, -1), 'BOTTOM'),
+            ]),
+            "kpi": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0d6efd")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ]),
+            "utility": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#6c757d")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ]),
+            "product": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2ecc71")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ]),
+            "state": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#6c757d")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ]),
+            "stop": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#dc3545")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ]),
+            # Időszakos jelentés: napi bontás és leállási okok (számoszlopok jobbra zárva)
+            "days": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0d6efd")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+                ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ]),
+            # Melléklet: rövid darabok, kis betűméret, sávos sorok
+            "appendix": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('FONTSIZE', (0, 0), (-1, -1), 7),
+                ('LEADING', (0, 0), (-1, -1), 8),
+                ('FONTNAME', (0, 0), (-1, 0), self.bold_font),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#6c757d")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#f1f3f5")]),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+                ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ]),
+            "downtime": TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.base_font),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#dc3545")),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ]),
+        }
+
+        # A JPEG mérete egyszer kerül lemérésre; a PDF-be fájlnévvel, dekódolás nélkül ágyazódik be
+        self.logo_path: Optional[str] = None
+        self.logo_width = 0.0
+        if os.path.exists(logo_path):
+            with open(logo_path, "rb") as f:
+                width, height = readJPEGInfo(f)[:2]
+            self.logo_path = logo_path
+            self.logo_width = LOGO_HEIGHT * width / height
+
+    def logo(self) -> Optional[Flowable]:
+        """A fejléc logó flowable-je (egy flowable csak egy dokumentumban használható), vagy None."""
+        if self.logo_path is None:
+            return None
+        return LogoFlowable(self.logo_path, self.logo_width, LOGO_HEIGHT)
+
+    def table(self, data: List[List[Any]], col_widths: List[float], style: str, repeat_rows: int = 0) -> Table:
+        """Táblázat a megnevezett közös stílussal (repeat_rows: oldaltöréskor megismételt fejlécsorok)."""
+        table = Table(data, colWidths=col_widths, repeatRows=repeat_rows)
+        table.setStyle(self.table_styles[style])
+        return table
+
+@functools.lru_cache(maxsize=None)
+def get_template() -> ReportTemplate:
+    """A folyamatszintű jelentés sablon (első híváskor épül fel)."""
+    return ReportTemplate()
+
+def stop_reason(event_type: str, description: Optional[str]) -> str:
+    """A leállás megjelenített oka: a leírás, ennek hiányában a típus szerinti alapértelmezés."""
+    return description if description else ("Tervszerű leállás" if event_type == "STOP" else "Papiros szakadás")
+
+def _header(template: ReportTemplate, title: str, info: str) -> List[Any]:
+    """A jelentés fejléce: logó és cím, alatta az info sor (bal) és a generálás ideje (jobb)."""
+    elements: List[Any] = []
+    logo = template.logo()
+    if logo is not None:
+        header_table_data = [[logo, Paragraph(title, template.title_style), ""]]
+        elements.append(template.table(header_table_data, [60, 415, 60], "header"))
     else:
-        elements.append(Paragraph(f"NAPI TERMELÉSI JELENTÉS", title_style))
-        elements.append(Paragraph(f"<b>Cég:</b> EcoPaper Solutions", normal_style))
+        elements.append(Paragraph(title, template.title_style))
+        elements.append(Paragraph(f"<b>Cég:</b> EcoPaper Solutions", template.normal_style))
 
-    # Info táblázat: Gép/Dátum (bal) és Generálás ideje (jobb)
-    info_style_right = ParagraphStyle('NormalRight', parent=normal_style, alignment=2)
     info_data = [[
-        Paragraph(f"<b>Gép:</b> {machine_id} | <b>Dátum:</b> {selected_date.strftime('%Y-%m-%d')}", normal_style),
-        Paragraph(f"Jelentés készült: {pd.Timestamp.now(tz='Europe/Budapest').strftime('%Y-%m-%d %H:%M')}", info_style_right)
+        Paragraph(info, template.normal_style),
+        Paragraph(f"Jelentés készült: {pd.Timestamp.now(tz='Europe/Budapest').strftime('%Y-%m-%d %H:%M')}", template.normal_right_style)
     ]]
-    info_table = Table(info_data, colWidths=[300, 235])
-    info_table.setStyle(TableStyle([
-        ('LEFTPADDING', (0, 0), (0, 0), 0),
-        ('RIGHTPADDING', (1, 0), (1, 0), 0),
-        ('VALIGN', (0, 0), (-1, -1), 'BOTTOM'),
-    ]))
-    elements.append(info_table)
+    elements.append(template.table(info_data, [300, 235], "info"))
     elements.append(Spacer(1, 10))
+    return elements
+
+# --- MELLÉKLET (MINDEN ESEMÉNY ÉS LABOR MÉRÉS) ---
+# A melléklet táblázatai legfeljebb ennyi soros darabokban készülnek; az oldalhatáron kettévágott
+# darab folytatása is megkapja a fejlécet
+APPENDIX_ROWS_PER_TABLE = 60
+
+# A melléklet bemenete: (esemény DataFrame darabok, labor DataFrame darabok), pl. data_loader.iter_*_frames
+Appendix = Tuple[Iterable[pd.DataFrame], Iterable[pd.DataFrame]]
+
+def _cell(fmt: str) -> Callable[[Any], str]:
+    """Cellaformázó: a hiányzó érték "-", a többi a formátum szerint."""
+    def format_value(value: Any) -> str:
+        if value is None or (isinstance(value, float) and value != value):
+            return "-"
+        return fmt.format(value)
+    return format_value
+
+def _text(limit: int) -> Callable[[Any], str]:
+    """Szöveges cella levágva (a sor egysoros marad, a táblázat magassága a sorok számával arányos)."""
+    def format_value(value: Any) -> str:
+        if value is None or (isinstance(value, float) and value != value):
+            return ""
+        value = str(value)
+        return value if len(value) <= limit else value[:limit - 1] + "…"
+    return format_value
+
+# A lusta flowable sor (FlowableStream) és az oldalankénti tömörítés (CompactCanvas) a ReportLab
+# belső működésére épül; csak a tesztelt verziókon kapcsol be. Más verzión a szabványos út fut
+# (teljes flowable lista, tömörítés mentéskor): a PDF ugyanaz, csak a memóriaigény nem korlátos.
+REPORTLAB_TESTED_VERSIONS = ("5.0.",)
+REPORTLAB_INTERNALS_OK = reportlab.Version.startswith(REPORTLAB_TESTED_VERSIONS)
+
+# Oszlop, fejléc, szélesség, formázó
+EVENT_APPENDIX_COLUMNS = [
+    ("timestamp", "Időpont", 75, _cell("{:%m-%d %H:%M:%S}")),
+    ("event_type", "Típus", 40, _text(8)),
+    ("status", "Állapot", 45, _text(8)),
+    ("article_id", "Termék", 100, _text(24)),
+    ("duration_seconds", "Idő (mp)", 40, _cell("{:.0f}")),
+    ("weight_kg", "Súly (kg)", 45, _cell("{:.0f}")),
+    ("average_speed", "Seb (m/p)", 45, _cell("{:.0f}")),
+    ("description", "Leírás", 145, _text(34)),
+]
+QUALITY_APPENDIX_COLUMNS = [
+    ("timestamp", "Időpont", 90, _cell("{:%Y-%m-%d %H:%M}")),
+    ("article_id", "Termék", 175, _text(40)),
+    ("gsm_measured", "GSM (g/m²)", 80, _cell("{:.1f}")),
+    ("moisture_pct", "Nedv (%)", 80, _cell("{:.2f}")),
+    ("strength_knm", "Szil (kN/m)", 80, _cell("{:.2f}")),
+]
+
+class FlowableStream(list):
+    """
+    Generátorból lustán töltődő flowable sor a doc.build számára.
+    A ReportLab minden flowable feldolgozása előtt lekérdezi a sor hosszát; ekkor legfeljebb
+    lookahead elem kerül a listába, így egyszerre csak néhány (oldalnyi) flowable él a memóriában.
+
+    A ReportLab belső működésére épül (REPORTLAB_TESTED_VERSIONS): a BaseDocTemplate.build
+    `while len(flowables):` ciklusa a handle_flowable-lel mindig a lista elejéről vesz ki
+    (flowables[0], pop / del / insert), a listát nem másolja és nem iterálja végig. Ha egy
+    újabb verzió ezt megváltoztatja, a test_flowable_stream_is_consumed_lazily_by_doc_build jelez.
+    """
+
+    def __init__(self, flowables: Iterable[Any], lookahead: int = 4) -> None:
+        super().__init__()
+        self._source: Optional[Iterator[Any]] = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self) -> int:
+        while self._source is not None and super().__len__() < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return super().__len__()
+
+def _row_chunks(frames: Iterable[pd.DataFrame], columns: List[Tuple], rows_per_table: int,
+                names: Optional[dict] = None) -> Iterator[List[List[str]]]:
+    """A DataFrame darabok formázott sorai rows_per_table méretű csomagokban (a darabhatárokon átnyúlva)."""
+    pending: List[List[str]] = []
+    for frame in frames:
+        if frame.empty:
+            continue
+        if names and "article_id" in frame:
+            frame = frame.assign(article_id=frame["article_id"].map(lambda a: names.get(a, a)))
+        # Egyszerre csak egy táblázatnyi sor kerül Python objektumokká alakításra
+        for start in range(0, len(frame), rows_per_table):
+            part = frame.iloc[start:start + rows_per_table]
+            values = [part[col].tolist() for col, _, _, _ in columns]
+            for row in zip(*values):
+                pending.append([fmt(v) for (_, _, _, fmt), v in zip(columns, row)])
+                if len(pending) == rows_per_table:
+                    yield pending
+                    pending = []
+    if pending:
+        yield pending
+
+def _appendix_section(template: ReportTemplate, title: str, frames: Iterable[pd.DataFrame], columns: List[Tuple],
+                      names: Optional[dict], rows_per_table: int) -> Iterator[Any]:
+    """Egy melléklet szakasz: új oldalon cím, majd darabonként egy fejléces táblázat."""
+    yield PageBreak()
+    yield Paragraph(title, template.section_style)
+    header = [h for _, h, _, _ in columns]
+    widths = [w for _, _, w, _ in columns]
+    count = 0
+    for rows in _row_chunks(frames, columns, rows_per_table, names):
+        count += len(rows)
+        yield template.table([header] + rows, widths, "appendix", repeat_rows=1)
+    if count == 0:
+        yield Paragraph("Nincs adat.", template.normal_style)
+
+def appendix_flowables(template: ReportTemplate, appendix: Appendix, article_names: Optional[dict] = None,
+                       rows_per_table: int = APPENDIX_ROWS_PER_TABLE) -> Iterator[Any]:
+    """A melléklet flowable-jei generátorként: előbb minden esemény, majd minden labor mérés."""
+    event_frames, quality_frames = appendix
+    yield from _appendix_section(template, "Melléklet A - Termelési események", event_frames, EVENT_APPENDIX_COLUMNS, article_names, rows_per_table)
+    yield from _appendix_section(template, "Melléklet B - Labor mérések", quality_frames, QUALITY_APPENDIX_COLUMNS, article_names, rows_per_table)
+
+class CompactCanvas(Canvas):
+    """
+    Canvas, amely minden lezárt oldal tartalmát azonnal tömöríti.
+    A ReportLab az oldalak tartalmát a mentésig tömörítetlen szövegként tartja; hosszú
+    mellékletnél ez oldalanként több tíz kB. Az előre tömörített (Filter megadott) stream
+    mentéskor változatlanul kerül a fájlba. A lap belső (Contents / stream) mezőit írja át,
+    ezért csak REPORTLAB_INTERNALS_OK esetén használatos.
+    """
+
+    def showPage(self) -> None:
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if self._pageCompression and page.stream:
+            contents = PDFStream(content=PDFZCompress.encode(page.stream))
+            contents.dictionary["Filter"] = PDFArray([PDFName(PDFZCompress.pdfname)])
+            page.Contents, page.stream = contents, None
+
+def _build(elements: List[Any], output_path: Optional[Union[str, Path]] = None, appendix: Optional[Appendix] = None,
+           article_names: Optional[dict] = None) -> Union[BytesIO, Path]:
+    """
+    A dokumentum felépítése memóriába (BytesIO) vagy közvetlenül fájlba.
+    Melléklet esetén a flowable-ök lustán, oldalnyi darabokban készülnek (FlowableStream), így a
+    memóriában tartott flowable-ök és eseménysorok mennyisége a melléklet hosszától független;
+    a mentésig csak a kész oldalak tömörített tartalma gyűlik (CompactCanvas).
+    Nem tesztelt ReportLab verzión a szabványos lista és Canvas fut (lásd REPORTLAB_INTERNALS_OK).
+    A fájl atomikusan (ideiglenes fájl + átnevezés) kerül a helyére.
+    """
+    if appendix is not None:
+        flowables = itertools.chain(elements, appendix_flowables(get_template(), appendix, article_names))
+        elements = FlowableStream(flowables) if REPORTLAB_INTERNALS_OK else list(flowables)
+    canvasmaker = CompactCanvas if REPORTLAB_INTERNALS_OK else Canvas
+
+    margins = dict(rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
+    if output_path is None:
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4, **margins).build(elements, canvasmaker=canvasmaker)
+        buffer.seek(0)
+        return buffer
+
+    path = Path(output_path)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        SimpleDocTemplate(str(tmp), pagesize=A4, **margins).build(elements, canvasmaker=canvasmaker)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+def generate_pdf_report(machine_id, selected_date, summary, events, quality=None, article_names=None,
+                        appendix: Optional[Appendix] = None, output_path: Optional[Union[str, Path]] = None):
+    """
+    Létrehoz egy részletes, professzionális PDF jelentést magyar ékezet támogatással.
+
+    Args:
+        appendix: (Opcionális) Melléklet minden eseménnyel és labor méréssel, DataFrame darabokból
+                  (pl. data_loader.iter_events_frames / iter_quality_frames).
+        output_path: (Opcionális) A jelentés ide íródik, és az elérési utat adja vissza (BytesIO helyett).
+    """
+    template = get_template()
+    section_style, normal_style = template.section_style, template.normal_style
+
+    elements = []
+
+    # --- 1. FEJLÉC (Logó + Cím) ---
+    elements.extend(_header(template, "NAPI TERMELÉSI JELENTÉS", f"<b>Gép:</b> {machine_id} | <b>Dátum:</b> {selected_date.strftime('%Y-%m-%d')}"))
 
     # --- 2. KPI ÖSSZEFOGLALÓ ---
     if summary:
@@ -97,18 +434,7 @@ def generate_pdf_report(machine_id, selected_date, summary, events, quality=None
             [Paragraph("ÖSSZES ÁLLÁSIDŐ", normal_style), f"{summary.total_downtime_min:.0f}", "perc"],
             [Paragraph("SZAKADÁSSZÁM", normal_style), f"{summary.break_count}", "db"]
         ]
-        kt = Table(kpi_data, colWidths=[250, 100, 100])
-        kt.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), BASE_FONT),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0d6efd")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), BOLD_FONT),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(kt)
+        elements.append(template.table(kpi_data, [250, 100, 100], "kpi"))
         elements.append(Spacer(1, 15))
 
         # --- 3. KÖZMŰVEK (Abszolút + Fajlagos) ---
@@ -120,17 +446,7 @@ def generate_pdf_report(machine_id, selected_date, summary, events, quality=None
             ["Gőz", f"{(summary.spec_steam_t_t * summary.total_tons):.1f} t", f"{summary.spec_steam_t_t:.2f} t/t"],
             ["Alapanyag (Rost)", f"{(summary.spec_fiber_t_t * summary.total_tons):.1f} t", f"{summary.spec_fiber_t_t:.2f} t/t"]
         ]
-        ut = Table(u_data, colWidths=[150, 150, 150])
-        ut.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), BASE_FONT),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#6c757d")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), BOLD_FONT),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(ut)
+        elements.append(template.table(u_data, [150, 150, 150], "utility"))
         elements.append(Spacer(1, 10))
 
     # --- 4. GYÁRTOTT TERMÉKEK ÉS MINŐSÉG ---
@@ -183,26 +499,36 @@ def generate_pdf_report(machine_id, selected_date, summary, events, quality=None
                 f"{avg_str:.1f}" if avg_str > 0 else "-"
             ])
 
-        pt = Table(table_data, colWidths=[150, 60, 60, 60, 60, 60])
-        pt.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), BASE_FONT),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2ecc71")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(pt)
+        elements.append(template.table(table_data, [150, 60, 60, 60, 60, 60], "product"))
+        elements.append(Spacer(1, 15))
+
+    # --- 5. GÉPÁLLAPOTOK (összevont szakaszokból, mint a Dashboard kördiagramja) ---
+    if events:
+        df_raw = pd.DataFrame({
+            "Kezdet": pd.to_datetime([e.timestamp for e in events]),
+            "Állapot": [e.status if e.event_type == "RUN" else e.event_type for e in events],
+        })
+        df_raw["Vége"] = df_raw["Kezdet"] + pd.to_timedelta([e.duration_seconds or 0 for e in events], unit="s")
+        df_states = state_durations(run_length_segments(df_raw, ["Állapot"], "Kezdet", "Vége"), "Állapot", "Kezdet", "Vége")
+        total_min = df_states["Perc"].sum()
+
+        elements.append(Paragraph("Gépállapotok megoszlása", section_style))
+        state_data = [[Paragraph("<b>Állapot</b>", normal_style), Paragraph("<b>Időtartam (perc)</b>", normal_style),
+                       Paragraph("<b>Arány (%)</b>", normal_style), Paragraph("<b>Szakaszok (db)</b>", normal_style)]]
+        for row in df_states.itertuples(index=False):
+            share = row.Perc / total_min * 100 if total_min > 0 else 0
+            state_data.append([str(row.Állapot), f"{row.Perc:.0f}", f"{share:.1f}", f"{row.Szakaszok}"])
+        
+        elements.append(template.table(state_data, [150, 100, 100, 100], "state"))
         elements.append(Spacer(1, 15))
 
-    # --- 5. LEÁLLÁSI STATISZTIKA ---
+    # --- 6. LEÁLLÁSI STATISZTIKA ---
     stop_events = [e for e in events if e.event_type in ["STOP", "BREAK"]]
     if stop_events:
         elements.append(Paragraph("Állásidők és leállási okok", section_style))
         stop_stats = {}
         for s in stop_events:
-            reason = s.description if s.description else ("Tervszerű leállás" if s.event_type == "STOP" else "Papiros szakadás")
+            reason = stop_reason(s.event_type, s.description)
             if reason not in stop_stats:
                 stop_stats[reason] = 0
             stop_stats[reason] += (s.duration_seconds / 60)
@@ -212,17 +538,175 @@ def generate_pdf_report(machine_id, selected_date, summary, events, quality=None
         for reason in sorted(stop_stats, key=stop_stats.get, reverse=True):
             stop_table_data.append([Paragraph(reason, normal_style), f"{stop_stats[reason]:.0f}"])
             
-        st = Table(stop_table_data, colWidths=[350, 100])
-        st.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), BASE_FONT),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#dc3545")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-        ]))
-        elements.append(st)
-
-
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+        elements.append(template.table(stop_table_data, [350, 100], "stop"))
+
+    return _build(elements, output_path, appendix, article_names)
+
+# --- IDŐSZAKOS (HETI / HAVI) JELENTÉS ---
+PERIOD_TITLES = {"week": "HETI TERMELÉSI JELENTÉS", "month": "HAVI TERMELÉSI JELENTÉS"}
+CHART_WIDTH = 260
+CHART_HEIGHT = 140
+
+def _chart_frame(title: str, font: str) -> Drawing:
+    """Üres, címmel ellátott grafikon vászon."""
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    drawing.add(String(CHART_WIDTH / 2, CHART_HEIGHT - 10, title, fontName=font, fontSize=9, textAnchor="middle"))
+    return drawing
+
+def _style_axes(chart: Any, labels: List[str], font: str) -> None:
+    """A napi grafikonok közös tengelybeállításai (a sűrű napcímkék kisebb betűvel)."""
+    chart.x, chart.y = 30, 20
+    chart.width, chart.height = CHART_WIDTH - 40, CHART_HEIGHT - 45
+    chart.categoryAxis.categoryNames = labels
+    chart.categoryAxis.labels.fontName = font
+    chart.categoryAxis.labels.fontSize = 6 if len(labels) > 10 else 7
+    chart.valueAxis.labels.fontName = font
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+
+def production_chart(labels: List[str], tons: List[float], target: List[float], font: str) -> Drawing:
+    """Napi termelés (oszlop) a napi céllal (szürke oszlop) összevetve."""
+    drawing = _chart_frame("Napi termelés (t) - tény / cél", font)
+    chart = VerticalBarChart()
+    _style_axes(chart, labels, font)
+    chart.data = [target, tons]
+    chart.groupSpacing = 2
+    chart.bars[0].fillColor = colors.HexColor("#ced4da")
+    chart.bars[1].fillColor = colors.HexColor("#0d6efd")
+    chart.bars.strokeWidth = 0
+    drawing.add(chart)
+    return drawing
+
+def oee_chart(labels: List[str], oee: List[Optional[float]], font: str) -> Drawing:
+    """Napi OEE vonaldiagram (a hiányzó napok szakadást okoznak a vonalban)."""
+    drawing = _chart_frame("Napi OEE (%)", font)
+    chart = HorizontalLineChart()
+    _style_axes(chart, labels, font)
+    chart.data = [oee]
+    chart.valueAxis.valueMax = 100
+    chart.valueAxis.valueStep = 20
+    chart.lines[0].strokeColor = colors.HexColor("#2ecc71")
+    chart.lines[0].strokeWidth = 1.5
+    drawing.add(chart)
+    return drawing
+
+def generate_period_report(machine_id: str, period_type: str, start_date: date, end_date: date,
+                           data: Tuple, article_names: Optional[dict] = None, appendix: Optional[Appendix] = None,
+                           output_path: Optional[Union[str, Path]] = None) -> Union[BytesIO, Path]:
+    """
+    Heti / havi PDF jelentés az előre kiszámolt összesítőkből (data_loader.get_period_report_data).
+    Napi bontású táblázatot, vektoros napi grafikonokat, termékenkénti és leállási okonkénti
+    összesítést tartalmaz; nyers eseményeket nem kap, így a mérete és memóriaigénye az
+    időszak eseményszámától független.
+
+    Args:
+        machine_id: A gép azonosítója.
+        period_type: "week" vagy "month".
+        start_date: Az időszak első napja.
+        end_date: Az időszak utolsó napja.
+        data: (összesítő, napi összesítők, termékek, leállások)
+        article_names: Termékazonosító -> megjelenített név.
+        appendix: (Opcionális) Melléklet minden eseménnyel és labor méréssel (lásd generate_pdf_report).
+        output_path: (Opcionális) A jelentés ide íródik, és az elérési utat adja vissza.
+    """
+    totals, days, articles, downtime = data
+    template = get_template()
+    section_style, normal_style = template.section_style, template.normal_style
+    article_names = article_names or {}
+
+    period = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+    elements = _header(template, PERIOD_TITLES.get(period_type, "IDŐSZAKOS TERMELÉSI JELENTÉS"),
+                       f"<b>Gép:</b> {machine_id} | <b>Időszak:</b> {period} ({len(days)} nap adattal)")
+
+    # --- 1. IDŐSZAK ÖSSZESÍTŐ ---
+    if totals:
+        elements.append(Paragraph("Teljesítménymutatók", section_style))
+        kpi_data = [
+            [Paragraph("<b>Megnevezés</b>", normal_style), Paragraph("<b>Érték</b>", normal_style), Paragraph("<b>Mérték</b>", normal_style)],
+            [Paragraph("TERMELÉS (Tény / Cél)", normal_style), f"{totals['total_tons']:.1f} / {totals['target_tons']:.1f}", "t"],
+            [Paragraph("OEE MUTATÓ", normal_style), f"{totals['oee_pct']:.1f}", "%"],
+            [Paragraph("  - Rendelkezésre állás", normal_style), f"{totals['availability_pct']:.1f}", "%"],
+            [Paragraph("  - Teljesítmény index", normal_style), f"{totals['performance_pct']:.1f}", "%"],
+            [Paragraph("  - Minőségi mutató", normal_style), f"{totals['quality_pct']:.1f}", "%"],
+            [Paragraph("ÁTLAGSEBESSÉG", normal_style), f"{totals['avg_speed_m_min']:.0f}", "m/perc"],
+            [Paragraph("ÖSSZES ÁLLÁSIDŐ", normal_style), f"{totals['downtime_min']:.0f}", "perc"],
+            [Paragraph("SZAKADÁSSZÁM", normal_style), f"{totals['break_count']}", "db"]
+        ]
+        elements.append(template.table(kpi_data, [250, 100, 100], "kpi"))
+        elements.append(Spacer(1, 15))
+
+        elements.append(Paragraph("Erőforrás-felhasználás", section_style))
+        u_data = [
+            [Paragraph("<b>Erőforrás</b>", normal_style), Paragraph("<b>Összes fogyasztás</b>", normal_style), Paragraph("<b>Fajlagos mutató</b>", normal_style)],
+            ["Villamos energia", f"{totals['electricity_kwh']:.0f} kWh", f"{totals['spec_electricity_kwh_t']:.0f} kWh/t"],
+            ["Frissvíz", f"{totals['water_m3']:.0f} m³", f"{totals['spec_water_m3_t']:.1f} m³/t"],
+            ["Gőz", f"{totals['steam_tons']:.1f} t", f"{totals['spec_steam_t_t']:.2f} t/t"],
+            ["Alapanyag (Rost)", f"{totals['fiber_tons']:.1f} t", f"{totals['spec_fiber_t_t']:.2f} t/t"]
+        ]
+        elements.append(template.table(u_data, [150, 150, 150], "utility"))
+        elements.append(Spacer(1, 10))
+
+    # --- 2. NAPI GRAFIKONOK ÉS BONTÁS (az időszak minden napja, a hiányzók üresen) ---
+    if days:
+        by_day = {d.date: d for d in days}
+        calendar = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        labels = [d.strftime("%m.%d") if period_type == "week" else str(d.day) for d in calendar]
+        tons = [by_day[d].total_tons if d in by_day else 0.0 for d in calendar]
+        target = [(by_day[d].target_tons or 0.0) if d in by_day else 0.0 for d in calendar]
+        oee = [by_day[d].oee_pct if d in by_day else None for d in calendar]
+
+        elements.append(Paragraph("Napi alakulás", section_style))
+        charts = Table([[production_chart(labels, tons, target, template.base_font), oee_chart(labels, oee, template.base_font)]],
+                       colWidths=[270, 265])
+        elements.append(charts)
+        elements.append(Spacer(1, 10))
+
+        header = ["Dátum", "Termelés (t)", "Cél (t)", "OEE (%)", "Rend. (%)", "Telj. (%)", "Min. (%)", "Állásidő (perc)", "Szakadás (db)"]
+        day_data = [[Paragraph(f"<b>{h}</b>", normal_style) for h in header]]
+        for d in days:
+            day_data.append([
+                d.date.strftime("%Y-%m-%d"), f"{d.total_tons:.1f}", f"{d.target_tons or 0:.1f}",
+                f"{d.oee_pct:.1f}", f"{d.availability_pct:.1f}", f"{d.performance_pct:.1f}", f"{d.quality_pct:.1f}",
+                f"{d.total_downtime_min or 0:.0f}", f"{d.break_count or 0}"
+            ])
+        elements.append(template.table(day_data, [67, 60, 52, 50, 55, 55, 52, 70, 64], "days", repeat_rows=1))
+        elements.append(Spacer(1, 15))
+
+    # --- 3. TERMÉKEK ---
+    if not articles.empty:
+        elements.append(Paragraph("Gyártási és minőségi adatok termékenként", section_style))
+        header = ["Termék megnevezése", "Súly (t)", "Futás (óra)", "Seb (m/p)", "GSM", "Nedv (%)", "Szil (kN/m)"]
+        table_data = [[Paragraph(f"<b>{h}</b>", normal_style) for h in header]]
+        for row in articles.itertuples(index=False):
+            table_data.append([
+                Paragraph(str(article_names.get(row.article_id, row.article_id)), normal_style),
+                f"{row.tons:.1f}",
+                f"{row.run_min / 60:.1f}",
+                f"{row.avg_speed:.0f}" if pd.notna(row.avg_speed) else "-",
+                f"{row.gsm:.1f}" if pd.notna(row.gsm) else "-",
+                f"{row.moisture:.1f}" if pd.notna(row.moisture) else "-",
+                f"{row.strength:.1f}" if pd.notna(row.strength) else "-"
+            ])
+        elements.append(template.table(table_data, [155, 60, 60, 60, 55, 55, 60], "product"))
+        elements.append(Spacer(1, 15))
+
+    # --- 4. LEÁLLÁSI OKOK ---
+    if not downtime.empty:
+        elements.append(Paragraph("Állásidők és leállási okok", section_style))
+        reasons = (
+            downtime.assign(reason=[stop_reason(t, d) for t, d in zip(downtime["event_type"], downtime["description"])])
+            .groupby("reason", sort=False)[["minutes", "count"]].sum()
+            .sort_values("minutes", ascending=False)
+        )
+        total_min = reasons["minutes"].sum()
+        stop_data = [[Paragraph("<b>Leállás oka / típusa</b>", normal_style), Paragraph("<b>Esetek (db)</b>", normal_style),
+                      Paragraph("<b>Időtartam (perc)</b>", normal_style), Paragraph("<b>Arány (%)</b>", normal_style)]]
+        for reason, row in reasons.iterrows():
+            share = row["minutes"] / total_min * 100 if total_min > 0 else 0
+            stop_data.append([Paragraph(reason, normal_style), f"{int(row['count'])}", f"{row['minutes']:.0f}", f"{share:.1f}"])
+        elements.append(template.table(stop_data, [275, 60, 90, 60], "downtime"))
+
+    if not totals and not days and articles.empty and downtime.empty:
+        elements.append(Paragraph("Nincs adat ebben az időszakban.", normal_style))
+
+    return _build(elements, output_path, appendix, article_names)
@@ -0,0 +1,162 @@
+"""
+KÖTEGELT PDF JELENTÉSKÉSZÍTÉS (BATCH REPORTS)
+=============================================
+Napi jelentések minden gépre egy dátumtartományban, párhuzamosan egy
+folyamatkészleten (ProcessPoolExecutor). A bemenetek napok kötegeiben, néhány
+tömeges lekérdezéssel töltődnek elő, a kész fájlok a kimeneti könyvtárba
+kerülnek, a manifest.json pedig rögzíti, melyik jelentés melyik adatverzióból
+készült. Az újrafuttatás csak a megváltozott (vagy hiányzó) jelentéseket készíti el.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import settings
+from ui import data_loader
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+def report_file_name(machine_id: str, target_date: date) -> str:
+    """A napi jelentés fájlneve (megegyezik a Dashboard letöltésének nevével)."""
+    return f"Report_{machine_id}_{target_date.isoformat()}.pdf"
+
+def _render_report(task: Tuple) -> Tuple[str, date, int, str, int, float]:
+    """
+    Egy jelentés elkészítése egy munkafolyamatban (a folyamatkészlet ezt hívja).
+    A fájl atomikusan (ideiglenes fájl + átnevezés) kerül a helyére.
+
+    Returns:
+        Tuple: (gép, nap, verzió, fájlnév, méret bájtban, futásidő mp-ben)
+    """
+    from ui.pdf_export import generate_pdf_report
+
+    machine_id, target_date, version, (events, summary, quality), article_names, output_dir = task
+    t0 = time.perf_counter()
+    pdf = generate_pdf_report(machine_id, target_date, summary, events, quality=quality, article_names=article_names)
+
+    name = report_file_name(machine_id, target_date)
+    path = Path(output_dir) / name
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(pdf.getvalue())
+    os.replace(tmp, path)
+    return machine_id, target_date, version, name, path.stat().st_size, time.perf_counter() - t0
+
+class BatchReportRunner:
+    """
+    Napi jelentések kötegelt, párhuzamos elkészítése manifest alapú kihagyással.
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None, workers: Optional[int] = None, batch_days: int = 7) -> None:
+        """
+        Args:
+            output_dir: A jelentések könyvtára. Alapértelmezett: settings.REPORT_BATCH_DIR.
+            workers: A munkafolyamatok száma. Alapértelmezett: a CPU magok száma.
+            batch_days: Egy előtöltési kötegben feldolgozott napok száma (a memóriaigény ezzel arányos).
+        """
+        self.output_dir = Path(output_dir or settings.REPORT_BATCH_DIR)
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_days = batch_days
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """A korábban elkészült jelentések nyilvántartása ("gép/nap" -> bejegyzés)."""
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8")).get("reports", {})
+
+    def save_manifest(self, reports: Dict[str, Dict[str, Any]]) -> None:
+        """A manifest atomikus mentése."""
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"updated_at": datetime.now().isoformat(timespec="seconds"), "reports": reports},
+                                  indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def is_current(self, reports: Dict[str, Dict[str, Any]], machine_id: str, target_date: date, version: int) -> bool:
+        """Az adott verzióból készült jelentés már megvan-e a kimeneti könyvtárban."""
+        entry = reports.get(f"{machine_id}/{target_date.isoformat()}")
+        return bool(entry) and entry["version"] == version and (self.output_dir / entry["file"]).exists()
+
+    def run(self, start_date: date, end_date: date, machine_ids: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Jelentések elkészítése a dátumtartomány minden adattal rendelkező (gép, nap) kulcsára.
+
+        Args:
+            start_date: Az első nap.
+            end_date: Az utolsó nap.
+            machine_ids: (Opcionális) Csak ezek a gépek. Alapértelmezett: minden gép.
+            force: A változatlan jelentéseket is újra elkészíti.
+
+        Returns:
+            Dict: rendered / skipped / empty / failed darabszámok.
+        """
+        if end_date < start_date:
+            raise ValueError("A kezdő dátum nem lehet nagyobb a zárónál!")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        machine_filter = set(machine_ids) if machine_ids else None
+        reports = self.load_manifest()
+        article_names = data_loader.load_articles_map()
+        stats = {"rendered": 0, "skipped": 0, "empty": 0, "failed": 0}
+        t0 = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            batch_start = start_date
+            while batch_start <= end_date:
+                batch_end = min(batch_start + timedelta(days=self.batch_days - 1), end_date)
+                self._run_batch(pool, batch_start, batch_end, machine_filter, force, reports, article_names, stats)
+                self.save_manifest(reports)
+                batch_start = batch_end + timedelta(days=1)
+
+        logger.info(
+            f"Kötegelt jelentéskészítés kész: {start_date} - {end_date} | {stats['rendered']} elkészült, "
+            f"{stats['skipped']} változatlan, {stats['empty']} üres, {stats['failed']} hibás ({time.perf_counter() - t0:.1f} mp)"
+        )
+        return stats
+
+    def _run_batch(
+        self, pool: ProcessPoolExecutor, batch_start: date, batch_end: date, machine_filter: Optional[set],
+        force: bool, reports: Dict[str, Dict[str, Any]], article_names: Dict[str, str], stats: Dict[str, int]
+    ) -> None:
+        """Egy napköteg: verziók összevetése, a szükséges bemenetek előtöltése és a jelentések elkészítése."""
+        versions = data_loader.get_data_versions(batch_start, batch_end)
+        todo: List[Tuple[str, date, int]] = []
+        for (machine_id, day), version in sorted(versions.items(), key=lambda item: (item[0][1], item[0][0])):
+            if machine_filter is not None and machine_id not in machine_filter:
+                continue
+            if not force and self.is_current(reports, machine_id, day, version):
+                stats["skipped"] += 1
+            else:
+                todo.append((machine_id, day, version))
+        if not todo:
+            return
+
+        inputs = data_loader.get_daily_data_bulk(batch_start, batch_end, {m for m, _, _ in todo})
+        futures = {}
+        for machine_id, day, version in todo:
+            data = inputs.get((machine_id, day))
+            if data is None or not data[0]:
+                stats["empty"] += 1
+                continue
+            task = (machine_id, day, version, data, article_names, str(self.output_dir))
+            futures[pool.submit(_render_report, task)] = (machine_id, day)
+
+        for future in as_completed(futures):
+            try:
+                machine_id, day, version, name, size, seconds = future.result()
+            except Exception as e:
+                failed_machine, failed_day = futures[future]
+                logger.error(f"Jelentés hiba | {failed_machine} {failed_day}: {str(e)}")
+                stats["failed"] += 1
+                continue
+            reports[f"{machine_id}/{day.isoformat()}"] = {
+                "version": version, "file": name, "bytes": size,
+                "seconds": round(seconds, 3), "generated_at": datetime.now().isoformat(timespec="seconds")
+            }
+            stats["rendered"] += 1
@@ -0,0 +1,122 @@
+"""
+PDF JELENTÉS GYORSÍTÓTÁR (REPORT CACHE)
+=======================================
+Lemezen tárolt gyorsítótár az elkészült PDF jelentésekhez.
+A kulcs a (gép, dátum, adatverzió) hármas, így egy nap újraszinkronizálása után
+automatikusan új jelentés készül. A heti / havi jelentések külön fájlnévvel (kind),
+az időszak első napjával és az időszak adatverziójával kerülnek tárolásra. A könyvtár méretét a legrégebben használt
+fájlok törlésével korlátozzuk (LRU, a módosítási idő alapján).
+"""
+
+import logging
+import os
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ReportCache:
+    """
+    Méretkorlátos, lemezalapú PDF gyorsítótár.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Args:
+            directory: A gyorsítótár könyvtára. Alapértelmezett: settings.REPORT_CACHE_DIR.
+            max_bytes: A könyvtár maximális mérete bájtban. Alapértelmezett: settings.REPORT_CACHE_MAX_MB.
+        """
+        self.directory = Path(directory or settings.REPORT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.REPORT_CACHE_MAX_MB * 1024 * 1024
+
+    def _stem(self, machine_id: str, target_date: date, kind: str) -> str:
+        """A jelentés fájlnevének verzió nélküli része (a napi jelentés neve nem tartalmazza a típust)."""
+        if kind == "daily":
+            return f"Report_{machine_id}_{target_date.isoformat()}"
+        return f"Report_{machine_id}_{kind}_{target_date.isoformat()}"
+
+    def path_for(self, machine_id: str, target_date: date, version: int, kind: str = "daily") -> Path:
+        """A jelentés fájl elérési útja a gyorsítótárban."""
+        return self.directory / f"{self._stem(machine_id, target_date, kind)}_v{version}.pdf"
+
+    def get(self, machine_id: str, target_date: date, version: int, kind: str = "daily") -> Optional[bytes]:
+        """Visszaadja a tárolt jelentést, vagy None-t, ha még nem készült el."""
+        path = self.path_for(machine_id, target_date, version, kind)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Használati idő frissítése az LRU kiürítéshez
+        os.utime(path, None)
+        return data
+
+    def put(self, machine_id: str, target_date: date, version: int, data: bytes, kind: str = "daily") -> Path:
+        """
+        Elmenti a jelentést (atomikus csere), törli ugyanannak a napnak a korábbi
+        verzióit, majd szükség esetén kiüríti a legrégebben használt fájlokat.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(machine_id, target_date, version, kind)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        for stale in self.directory.glob(f"{self._stem(machine_id, target_date, kind)}_v*.pdf"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+        self.evict(keep=path)
+        return path
+
+    def get_or_build(
+        self, machine_id: str, target_date: date, version: int,
+        builder: Callable[[], Optional[Union[bytes, BytesIO]]], kind: str = "daily"
+    ) -> Optional[bytes]:
+        """
+        Gyorsítótárból szolgálja ki a jelentést, vagy a builder hívásával elkészíti és eltárolja.
+        Ha a builder None-t ad vissza (pl. nincs adat), semmi nem kerül tárolásra.
+        """
+        data = self.get(machine_id, target_date, version, kind)
+        if data is not None:
+            return data
+
+        built = builder()
+        if built is None:
+            return None
+        data = built.getvalue() if isinstance(built, BytesIO) else built
+        self.put(machine_id, target_date, version, data, kind)
+        logger.info(f"PDF jelentés gyorsítótárazva: {machine_id} | {kind} {target_date} (v{version}, {len(data) / 1024:.0f} kB)")
+        return data
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        A legrégebben használt fájlok törlése, amíg a könyvtár mérete a korlát alá nem kerül.
+
+        Returns:
+            int: A törölt fájlok száma.
+        """
+        files = []
+        for path in self.directory.glob("Report_*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"PDF gyorsítótár kiürítés: {removed} fájl törölve")
+        return removed
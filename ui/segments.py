@@ -0,0 +1,138 @@
+"""
+ÁLLAPOT SZAKASZOK (RUN-LENGTH SEGMENTATION)
+===========================================
+Az egymást követő, azonos kulcsú (pl. állapot + termék) események összevonása
+folytonos szakaszokká, valamint az állapotok időtartamának összesítése.
+Tömbműveletekkel, lineáris időben fut (nincs soronkénti Python ciklus), így
+az idővonal, az állapot kördiagram és a PDF jelentés is ugyanezt használja.
+
+Többnapos idővonalnál a szakaszok száma korlátos marad: ha túl sok lenne, a
+szakaszok rögzített szélességű időrésekbe olvadnak, és minden rés a benne
+leghosszabb ideig fennálló állapotot (és terméket) kapja.
+"""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+def run_length_segments(df: pd.DataFrame, keys: Sequence[str], start_col: str, end_col: str) -> pd.DataFrame:
+    """
+    Egymást követő, azonos kulcsú sorok összevonása.
+    Minden szakasz az első sorának értékeit kapja, a vége pedig az utolsó sor vége.
+    A hiányzó (None / NaN) kulcsértékek egymással egyezőnek számítanak.
+
+    Args:
+        df: Időrendbe rendezett események.
+        keys: Az összevonás kulcsoszlopai.
+        start_col: A kezdő időpont oszlopa.
+        end_col: A záró időpont oszlopa.
+
+    Returns:
+        DataFrame: Szakaszonként egy sor, az eredeti oszlopokkal.
+    """
+    n = len(df)
+    if n == 0:
+        return df.iloc[0:0].copy()
+
+    # Szakaszhatár ott, ahol bármelyik kulcs értéke változik
+    boundary = np.zeros(n, dtype=bool)
+    boundary[0] = True
+    for key in keys:
+        codes, _ = pd.factorize(df[key], use_na_sentinel=True)
+        boundary[1:] |= codes[1:] != codes[:-1]
+
+    starts = np.flatnonzero(boundary)
+    last_rows = np.append(starts[1:], n) - 1
+
+    segments = df.iloc[starts].reset_index(drop=True)
+    segments[end_col] = df[end_col].to_numpy()[last_rows]
+    return segments
+
+def state_durations(segments: pd.DataFrame, state_col: str, start_col: str, end_col: str) -> pd.DataFrame:
+    """
+    Állapotonkénti összes időtartam (perc) és szakaszszám.
+
+    Returns:
+        DataFrame: <state_col>, Perc, Szakaszok (csökkenő időtartam szerint)
+    """
+    minutes = (segments[end_col] - segments[start_col]).dt.total_seconds() / 60
+    result = (
+        pd.DataFrame({state_col: segments[state_col], "Perc": minutes})
+        .groupby(state_col, sort=False, observed=True)
+        .agg(Perc=("Perc", "sum"), Szakaszok=("Perc", "size"))
+        .reset_index()
+    )
+    return result.sort_values("Perc", ascending=False, ignore_index=True)
+
+# Választható időrés-szélességek percben (a legkisebb megfelelő kerül alkalmazásra)
+BUCKET_MINUTES = (15, 30, 60, 120, 240, 480, 720, 1440)
+
+def bucket_width(span: pd.Timedelta, max_segments: int, min_minutes: int) -> pd.Timedelta:
+    """A legkisebb (legalább min_minutes perces) időrés, amellyel a tartomány legfeljebb max_segments résre oszlik."""
+    for minutes in BUCKET_MINUTES:
+        width = pd.Timedelta(minutes=minutes)
+        if minutes >= min_minutes and span / width <= max_segments:
+            return width
+    days = int(np.ceil(span / pd.Timedelta(days=1) / max_segments))
+    return pd.Timedelta(days=max(days, 1))
+
+def dominant_buckets(segments: pd.DataFrame, keys: Sequence[str], start_col: str, end_col: str, width: pd.Timedelta) -> pd.DataFrame:
+    """
+    Szakaszok összevonása rögzített szélességű időrésekbe.
+    Minden rés kulcsonként azt az értéket kapja, amely a résen belül a leghosszabb ideig állt fenn;
+    a több résen átnyúló szakaszok az átfedés arányában számítanak. Az azonos értékű szomszédos
+    rések végül egy szakasszá olvadnak, így az eredmény legfeljebb annyi sor, ahány rés.
+
+    Returns:
+        DataFrame: start_col, end_col és a kulcsoszlopok.
+    """
+    if segments.empty:
+        return pd.DataFrame(columns=[start_col, end_col, *keys])
+
+    start = segments[start_col].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    end = np.maximum(segments[end_col].to_numpy(dtype="datetime64[ns]").astype(np.int64), start)
+    w = width.value
+
+    # Szakaszok szétosztása a lefedett résekre (szakaszonként b0..b1)
+    b0 = start // w
+    b1 = np.maximum(end - 1, start) // w
+    counts = b1 - b0 + 1
+    seg_idx = np.repeat(np.arange(len(segments)), counts)
+    bucket = b0[seg_idx] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    bucket_start = bucket * w
+    part_start = np.maximum(start[seg_idx], bucket_start)
+    part_end = np.minimum(end[seg_idx], bucket_start + w)
+
+    # A rés határai a ténylegesen lefedett időre szűkülnek (adathiány nem tűnik termelésnek)
+    parts = pd.DataFrame({"bucket": bucket, "part_start": part_start, "part_end": part_end, "weight": part_end - part_start})
+    result = parts.groupby("bucket", sort=True).agg(part_start=("part_start", "min"), part_end=("part_end", "max"))
+
+    for key in keys:
+        parts["value"] = segments[key].to_numpy()[seg_idx]
+        weights = parts.groupby(["bucket", "value"], sort=False, dropna=False)["weight"].sum().reset_index()
+        dominant = weights.sort_values("weight", ascending=False, kind="stable").drop_duplicates("bucket")
+        result[key] = dominant.set_index("bucket")["value"]
+
+    result = pd.DataFrame({
+        start_col: pd.to_datetime(result["part_start"].to_numpy()),
+        end_col: pd.to_datetime(result["part_end"].to_numpy()),
+        **{key: result[key].to_numpy() for key in keys}
+    })
+    return run_length_segments(result, keys, start_col, end_col)
+
+def downsample_segments(
+    segments: pd.DataFrame, keys: Sequence[str], start_col: str, end_col: str,
+    max_segments: int, min_bucket_minutes: int
+) -> Tuple[pd.DataFrame, Optional[pd.Timedelta]]:
+    """
+    Az idővonal szakaszainak korlátozása: ha legfeljebb max_segments szakasz van, változatlanul
+    adja vissza őket, egyébként a domináns állapotú időrésekre összevont változatot.
+
+    Returns:
+        Tuple: (szakaszok, az alkalmazott résszélesség vagy None)
+    """
+    if len(segments) <= max_segments:
+        return segments, None
+    span = segments[end_col].max() - segments[start_col].min()
+    width = bucket_width(span, max_segments, min_bucket_minutes)
+    return dominant_buckets(segments, keys, start_col, end_col, width), width